@@ -110,6 +110,8 @@ LOCAL_APPS = [
     *_ADMIN_OAUTH2_APP,
     'datahub.admin_report',
     'datahub.search.apps.SearchConfig',
+    'datahub.search.query_profile.apps.QueryProfileConfig',
+    'datahub.search.sync_watermark.apps.SyncWatermarkConfig',
     'datahub.user',
     'datahub.user.company_list',
     'datahub.dbmaintenance',
@@ -125,7 +127,7 @@ LOCAL_APPS = [
     'datahub.activity_stream.apps.ActivityStreamConfig',
     'datahub.user_event_log',
     'datahub.activity_feed',
-    'datahub.dataset',
+    'datahub.dataset.apps.DatasetConfig',
     'datahub.testfixtureapi',
 ]
 
@@ -360,6 +362,7 @@ DEFAULT_SERVICE_TIMEOUT = float(env('DEFAULT_SERVICE_TIMEOUT', default=5.0))  #
 MPTT_ADMIN_LEVEL_INDENT = 30
 
 SEARCH_APPS = [
+    'datahub.search.adviser.AdviserSearchApp',
     'datahub.search.company.CompanySearchApp',
     'datahub.search.contact.ContactSearchApp',
     'datahub.search.event.EventSearchApp',
@@ -382,13 +385,46 @@ ES_VERIFY_CERTS = env.bool('ES_VERIFY_CERTS', True)
 ES_INDEX_PREFIX = env('ES_INDEX_PREFIX')
 ES_INDEX_SETTINGS = {}
 ES_BULK_MAX_CHUNK_BYTES = 10 * 1024 * 1024  # 10MB
+# Number of concurrent bulk requests (and additional buffered chunks) used when indexing
+ES_BULK_THREAD_COUNT = env.int('ES_BULK_THREAD_COUNT', default=4)
+ES_BULK_QUEUE_SIZE = env.int('ES_BULK_QUEUE_SIZE', default=4)
+# Number of times items rejected with a 429 response are retried during bulk indexing
+ES_BULK_MAX_RETRIES = env.int('ES_BULK_MAX_RETRIES', default=5)
 ES_SEARCH_REQUEST_TIMEOUT = env.int('ES_SEARCH_REQUEST_TIMEOUT', default=20)  # seconds
 ES_SEARCH_REQUEST_WARNING_THRESHOLD = env.int(
     'ES_SEARCH_REQUEST_WARNING_THRESHOLD',
     default=10,  # seconds
 )
-SEARCH_EXPORT_MAX_RESULTS = 5000
 SEARCH_EXPORT_SCROLL_CHUNK_SIZE = 1000
+# When enabled, mapping migrations that don't add, remove or move document fields copy
+# documents using the Elasticsearch reindex API (see datahub.search.reindex_migration)
+SEARCH_MIGRATION_REINDEX_ENABLED = env.bool('SEARCH_MIGRATION_REINDEX_ENABLED', default=False)
+# When enabled, entity search responses are cached (and invalidated when documents are synced)
+SEARCH_RESULT_CACHE_ENABLED = env.bool('SEARCH_RESULT_CACHE_ENABLED', default=False)
+SEARCH_RESULT_CACHE_TIMEOUT = env.int('SEARCH_RESULT_CACHE_TIMEOUT', default=30)  # seconds
+# When enabled, the search apps that each adviser can access (and the corresponding permission
+# filters) are cached (and invalidated when permissions, groups or team roles change)
+SEARCH_PERMISSION_CACHE_ENABLED = env.bool('SEARCH_PERMISSION_CACHE_ENABLED', default=False)
+SEARCH_PERMISSION_CACHE_TIMEOUT = env.int('SEARCH_PERMISSION_CACHE_TIMEOUT', default=300)  # seconds
+# The fraction of search requests (between 0 and 1) that are profiled using the Elasticsearch
+# profile API (see datahub.search.query_profile)
+SEARCH_QUERY_PROFILING_SAMPLE_RATE = env.float('SEARCH_QUERY_PROFILING_SAMPLE_RATE', default=0.0)
+# When enabled, all search requests from staff users are profiled
+SEARCH_QUERY_PROFILING_STAFF_ENABLED = env.bool(
+    'SEARCH_QUERY_PROFILING_STAFF_ENABLED',
+    default=False,
+)
+# How long (in seconds) typeahead search responses are cached for (0 disables the cache)
+SEARCH_TYPEAHEAD_CACHE_TIMEOUT = env.int('SEARCH_TYPEAHEAD_CACHE_TIMEOUT', default=10)
+# When set, full syncs split the primary keys of each model into ranges of this size and sync
+# them in parallel
+SEARCH_SYNC_PARTITION_SIZE = env.int('SEARCH_SYNC_PARTITION_SIZE', default=None)
+# Number of threads used for partitioned resyncs after a mapping migration
+SEARCH_SYNC_NUM_WORKERS = env.int('SEARCH_SYNC_NUM_WORKERS', default=4)
+# When enabled, objects saved are added to a Redis-backed queue (per search app) that is
+# periodically drained and synced in bulk, rather than a Celery task being scheduled per save
+SEARCH_SYNC_QUEUE_ENABLED = env.bool('SEARCH_SYNC_QUEUE_ENABLED', default=False)
+SEARCH_SYNC_QUEUE_DRAIN_INTERVAL = env.float('SEARCH_SYNC_QUEUE_DRAIN_INTERVAL', default=5.0)
 SEARCH_CONFIGURE_CONNECTION_ON_READY = True
 SEARCH_CONNECT_SIGNAL_RECEIVERS_ON_READY = True
 CHAR_FIELD_MAX_LENGTH = 255
@@ -471,6 +507,10 @@ if REDIS_BASE_URL:
                 'simulate': True,
             }
         },
+        'delete_old_dataset_deleted_records': {
+            'task': 'datahub.dataset.tasks.delete_old_deleted_records',
+            'schedule': crontab(minute=30, hour=2),
+        },
         'simulate_automatic_contact_archive': {
             'task': 'datahub.company.tasks.automatic_contact_archive',
             'schedule': crontab(minute=0, hour=21, day_of_week='SAT'),
@@ -503,6 +543,18 @@ if REDIS_BASE_URL:
             'schedule': crontab(minute=0, hour=1),
         }
 
+    if env.bool('ENABLE_INCREMENTAL_ES_SYNC', False):
+        CELERY_BEAT_SCHEDULE['incremental_sync_es'] = {
+            'task': 'datahub.search.tasks.sync_all_models_incrementally',
+            'schedule': env.float('INCREMENTAL_ES_SYNC_INTERVAL', default=60.0),
+        }
+
+    if SEARCH_SYNC_QUEUE_ENABLED:
+        CELERY_BEAT_SCHEDULE['drain_search_sync_queues'] = {
+            'task': 'datahub.search.tasks.drain_sync_queues',
+            'schedule': SEARCH_SYNC_QUEUE_DRAIN_INTERVAL,
+        }
+
     if env.bool('ENABLE_SPI_REPORT_GENERATION', False):
         CELERY_BEAT_SCHEDULE['spi_report'] = {
             'task': 'datahub.investment.project.report.tasks.generate_spi_report',
@@ -653,6 +705,10 @@ _add_hawk_credentials(
     (HawkScope.public_omis,),
 )
 
+# How long (in days) entries in the dataset deletion log are kept for. The modified_since query
+# parameter of dataset endpoints can't be set to a time before this period.
+DATASET_DELETED_RECORD_RETENTION_DAYS = env.int('DATASET_DELETED_RECORD_RETENTION_DAYS', default=90)
+
 # Sending messages to Slack
 ENABLE_SLACK_MESSAGING = env.bool('ENABLE_SLACK_MESSAGING', default=False)
 if ENABLE_SLACK_MESSAGING:
@@ -668,6 +724,17 @@ ACTIVITY_STREAM_OUTGOING_URL = env('ACTIVITY_STREAM_OUTGOING_URL', default=None)
 ACTIVITY_STREAM_OUTGOING_ACCESS_KEY_ID = env('ACTIVITY_STREAM_OUTGOING_ACCESS_KEY_ID', default=None)
 ACTIVITY_STREAM_OUTGOING_SECRET_ACCESS_KEY = env('ACTIVITY_STREAM_OUTGOING_SECRET_ACCESS_KEY', default=None)
 
+# When enabled, the newest page of each activity stream endpoint (which is frequently polled) is
+# cached until an object of the endpoint's model is saved or deleted
+ACTIVITY_STREAM_TAIL_PAGE_CACHE_ENABLED = env.bool(
+    'ACTIVITY_STREAM_TAIL_PAGE_CACHE_ENABLED',
+    default=False,
+)
+ACTIVITY_STREAM_TAIL_PAGE_CACHE_TIMEOUT = env.int(
+    'ACTIVITY_STREAM_TAIL_PAGE_CACHE_TIMEOUT',
+    default=300,
+)  # seconds
+
 DOCUMENT_BUCKETS = {
     'default': {
         'bucket': env('DEFAULT_BUCKET'),
@@ -1,60 +1,93 @@
-from datahub.activity_stream.serializers import ActivitySerializer
+from datahub.activity_stream.serializers import (
+    ActivitySerializer,
+    ADVISER_WITH_TEAM_FIELDS,
+    COMPANY_FIELDS,
+    CONTACT_FIELDS,
+    get_contact_url_expression,
+    get_related_data,
+    get_related_fields,
+)
 from datahub.company_referral.models import CompanyReferral
+from datahub.core.query_utils import get_front_end_url_expression
 
 
 class CompanyReferralActivitySerializer(ActivitySerializer):
     """Company Referral serialiser for activity stream."""
 
+    values_fields = (
+        'pk',
+        'created_on',
+        'modified_on',
+        'subject',
+        'status',
+        'completed_on',
+        *get_related_fields('company', COMPANY_FIELDS),
+        *get_related_fields('contact', CONTACT_FIELDS),
+        *get_related_fields('created_by', ADVISER_WITH_TEAM_FIELDS),
+        *get_related_fields('recipient', ADVISER_WITH_TEAM_FIELDS),
+        *get_related_fields('completed_by', ADVISER_WITH_TEAM_FIELDS),
+    )
+
     class Meta:
         model = CompanyReferral
 
+    @classmethod
+    def get_values_expressions(cls):
+        """Gets the URLs of the referral and its contact."""
+        return {
+            'url': get_front_end_url_expression('companyreferral', 'pk'),
+            'contact__url': get_contact_url_expression('contact'),
+        }
+
     def to_representation(self, instance):
         """
         Serialize the interaction as per Activity Stream spec:
         https://www.w3.org/TR/activitystreams-core/
         """
-        company_referral_id = f'dit:DataHubCompanyReferral:{instance.pk}'
+        company_referral_id = f'dit:DataHubCompanyReferral:{instance["pk"]}'
         company_referral = {
             'id': f'{company_referral_id}:Announce',
             'type': 'Announce',
-            'published': instance.modified_on,
+            'published': instance['modified_on'],
             'generator': self._get_generator(),
             'object': {
                 'id': company_referral_id,
                 'type': ['dit:CompanyReferral'],
-                'startTime': instance.created_on,
-                'dit:subject': instance.subject,
-                'dit:status': str(instance.status),
+                'startTime': instance['created_on'],
+                'dit:subject': instance['subject'],
+                'dit:status': str(instance['status']),
                 'attributedTo': [
-                    self._get_company(instance.company),
+                    self._get_company(get_related_data(instance, 'company')),
                     self._get_adviser_with_team_and_role(
-                        instance.created_by,
+                        get_related_data(instance, 'created_by'),
                         'sender',
                         'DataHubCompanyReferral',
                     ),
                     self._get_adviser_with_team_and_role(
-                        instance.recipient,
+                        get_related_data(instance, 'recipient'),
                         'recipient',
                         'DataHubCompanyReferral',
                     ),
                 ],
-                'url': instance.get_absolute_url(),
+                'url': instance['url'],
             },
         }
 
-        if instance.completed_by:
-            company_referral['object']['dit:completedOn'] = instance.completed_on
+        completed_by = get_related_data(instance, 'completed_by')
+        if completed_by:
+            company_referral['object']['dit:completedOn'] = instance['completed_on']
             company_referral['object']['attributedTo'].append(
                 self._get_adviser_with_team_and_role(
-                    instance.completed_by,
+                    completed_by,
                     'completer',
                     'DataHubCompanyReferral',
                 ),
             )
 
-        if instance.contact:
+        contact = get_related_data(instance, 'contact')
+        if contact:
             company_referral['object']['attributedTo'].append(
-                self._get_contact(instance.contact),
+                self._get_contact(contact),
             )
 
         return company_referral
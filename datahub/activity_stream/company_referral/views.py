@@ -23,10 +23,4 @@ class CompanyReferralActivityViewSet(ActivityViewSet):
 
     pagination_class = CompanyReferralCursorPagination
     serializer_class = CompanyReferralActivitySerializer
-    queryset = CompanyReferral.objects.select_related(
-        'company',
-        'contact',
-        'created_by__dit_team',
-        'completed_by__dit_team',
-        'recipient__dit_team',
-    )
+    queryset = CompanyReferral.objects.all()
@@ -1,5 +1,19 @@
-from datahub.activity_stream.serializers import ActivitySerializer
-from datahub.interaction.models import Interaction
+from django.db.models import Q
+
+from datahub.activity_stream.serializers import (
+    ActivitySerializer,
+    ADVISER_FIELDS,
+    COMPANY_FIELDS,
+    CONTACT_FIELDS,
+    get_contact_url_expression,
+    get_related_data,
+    get_related_fields,
+    get_related_objects_subquery,
+    TEAM_FIELDS,
+)
+from datahub.core.query_utils import get_front_end_url_expression
+from datahub.interaction.models import Interaction, InteractionDITParticipant
+from datahub.metadata.query_utils import get_service_name_subquery
 
 
 class InteractionActivitySerializer(ActivitySerializer):
@@ -10,43 +24,106 @@ class InteractionActivitySerializer(ActivitySerializer):
         Interaction.Kind.SERVICE_DELIVERY: 'ServiceDelivery',
     }
 
+    values_fields = (
+        'pk',
+        'created_on',
+        'modified_on',
+        'kind',
+        'date',
+        'status',
+        'archived',
+        'subject',
+        'communication_channel__name',
+        'investment_project__pk',
+        'investment_project__name',
+        'event__pk',
+        'event__name',
+        'event__start_date',
+        'event__end_date',
+        'event__event_type__name',
+        *get_related_fields('event__lead_team', TEAM_FIELDS),
+    )
+
     class Meta:
         model = Interaction
 
+    @classmethod
+    def get_values_expressions(cls):
+        """
+        Gets the URLs, service name, companies, contacts and DIT participants of the
+        interaction.
+
+        Participants without an adviser are excluded.
+        """
+        return {
+            'url': get_front_end_url_expression('interaction', 'pk'),
+            'investment_project__url': get_front_end_url_expression(
+                'investmentproject',
+                'investment_project__pk',
+            ),
+            'event__url': get_front_end_url_expression('event', 'event__pk'),
+            'service__name': get_service_name_subquery('service'),
+            'companies': get_related_objects_subquery(
+                Interaction.companies.through,
+                'interaction',
+                'company',
+                COMPANY_FIELDS,
+            ),
+            'contacts': get_related_objects_subquery(
+                Interaction.contacts.through,
+                'interaction',
+                'contact',
+                CONTACT_FIELDS,
+                expressions={'url': get_contact_url_expression('contact')},
+            ),
+            'dit_participants': get_related_objects_subquery(
+                InteractionDITParticipant,
+                'interaction',
+                'adviser',
+                ADVISER_FIELDS,
+                expressions={
+                    f'team__{field}': f'team__{field}' for field in TEAM_FIELDS
+                },
+                filter=Q(adviser__isnull=False),
+                ordering=('pk',),
+            ),
+        }
+
     def _get_project_context(self, project):
         return {} if project is None else {
-            'id': f'dit:DataHubInvestmentProject:{project.pk}',
+            'id': f'dit:DataHubInvestmentProject:{project["pk"]}',
             'type': 'dit:InvestmentProject',
-            'name': project.name,
-            'url': project.get_absolute_url(),
+            'name': project['name'],
+            'url': project['url'],
         }
 
     def _get_event_context(self, event):
         return {} if event is None else {
-            'id': f'dit:DataHubEvent:{event.pk}',
+            'id': f'dit:DataHubEvent:{event["pk"]}',
             'type': 'dit:Event',
-            'dit:eventType': {'name': event.event_type.name},
-            'name': event.name,
-            'startTime': event.start_date,
-            'endTime': event.end_date,
-            'dit:team': self._get_team(event.lead_team),
-            'url': event.get_absolute_url(),
+            'dit:eventType': {'name': event['event_type__name']},
+            'name': event['name'],
+            'startTime': event['start_date'],
+            'endTime': event['end_date'],
+            'dit:team': self._get_team(get_related_data(event, 'lead_team')),
+            'url': event['url'],
         }
 
     def _get_context(self, instance):
-        if instance.kind == Interaction.Kind.INTERACTION:
-            context = self._get_project_context(instance.investment_project)
-        elif instance.kind == Interaction.Kind.SERVICE_DELIVERY:
-            context = self._get_event_context(instance.event)
+        if instance['kind'] == Interaction.Kind.INTERACTION:
+            context = self._get_project_context(
+                get_related_data(instance, 'investment_project'),
+            )
+        elif instance['kind'] == Interaction.Kind.SERVICE_DELIVERY:
+            context = self._get_event_context(get_related_data(instance, 'event'))
         else:
             context = {}
         return context
 
     def _get_dit_participants(self, participants):
         return [
-            self._get_adviser_with_team(participant.adviser, participant.team)
-            for participant in participants.all()
-            if participant.adviser is not None
+            self._get_adviser_with_team(participant, get_related_data(participant, 'team'))
+            for participant in participants or ()
         ]
 
     def to_representation(self, instance):
@@ -54,25 +131,25 @@ class InteractionActivitySerializer(ActivitySerializer):
         Serialize the interaction as per Activity Stream spec:
         https://www.w3.org/TR/activitystreams-core/
         """
-        interaction_id = f'dit:DataHubInteraction:{instance.pk}'
+        interaction_id = f'dit:DataHubInteraction:{instance["pk"]}'
         interaction = {
             'id': f'{interaction_id}:Announce',
             'type': 'Announce',
-            'published': instance.created_on,
+            'published': instance['created_on'],
             'generator': self._get_generator(),
             'object': {
                 'id': interaction_id,
-                'type': ['dit:Event', f'dit:{self.KINDS_JSON[instance.kind]}'],
-                'startTime': instance.date,
-                'dit:status': instance.status,
-                'dit:archived': instance.archived,
-                'dit:subject': instance.subject,
+                'type': ['dit:Event', f'dit:{self.KINDS_JSON[instance["kind"]]}'],
+                'startTime': instance['date'],
+                'dit:status': instance['status'],
+                'dit:archived': instance['archived'],
+                'dit:subject': instance['subject'],
                 'attributedTo': [
-                    *self._get_companies(instance.companies),
-                    *self._get_dit_participants(instance.dit_participants),
-                    *self._get_contacts(instance.contacts),
+                    *self._get_companies(instance['companies']),
+                    *self._get_dit_participants(instance['dit_participants']),
+                    *self._get_contacts(instance['contacts']),
                 ],
-                'url': instance.get_absolute_url(),
+                'url': instance['url'],
             },
         }
 
@@ -81,16 +158,16 @@ class InteractionActivitySerializer(ActivitySerializer):
             interaction['object']['context'] = [context]
 
         if (
-            instance.kind == Interaction.Kind.INTERACTION
-            and instance.communication_channel is not None
+            instance['kind'] == Interaction.Kind.INTERACTION
+            and instance['communication_channel__name'] is not None
         ):
             interaction['object']['dit:communicationChannel'] = {
-                'name': instance.communication_channel.name,
+                'name': instance['communication_channel__name'],
             }
 
-        if instance.service is not None:
+        if instance['service__name'] is not None:
             interaction['object']['dit:service'] = {
-                'name': instance.service.name,
+                'name': instance['service__name'],
             }
 
         return interaction
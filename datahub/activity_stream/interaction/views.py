@@ -1,7 +1,7 @@
 from datahub.activity_stream.interaction.serializers import InteractionActivitySerializer
 from datahub.activity_stream.pagination import ActivityCursorPagination
 from datahub.activity_stream.views import ActivityViewSet
-from datahub.interaction.queryset import get_base_interaction_queryset
+from datahub.interaction.models import Interaction
 
 
 class InteractionCursorPagination(ActivityCursorPagination):
@@ -24,4 +24,4 @@ class InteractionActivityViewSet(ActivityViewSet):
 
     pagination_class = InteractionCursorPagination
     serializer_class = InteractionActivitySerializer
-    queryset = get_base_interaction_queryset()
+    queryset = Interaction.objects.all()
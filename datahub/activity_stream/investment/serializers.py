@@ -1,4 +1,14 @@
-from datahub.activity_stream.serializers import ActivitySerializer
+from datahub.activity_stream.serializers import (
+    ActivitySerializer,
+    ADVISER_FIELDS,
+    COMPANY_FIELDS,
+    CONTACT_FIELDS,
+    get_contact_url_expression,
+    get_related_data,
+    get_related_fields,
+    get_related_objects_subquery,
+)
+from datahub.core.query_utils import get_front_end_url_expression
 from datahub.investment.project.models import InvestmentProject
 
 
@@ -7,52 +17,84 @@ class IProjectCreatedSerializer(ActivitySerializer):
     Investment Projects added serializer for activity stream.
     """
 
+    values_fields = (
+        'pk',
+        'created_on',
+        'modified_on',
+        'name',
+        'investment_type__name',
+        'estimated_land_date',
+        'total_investment',
+        'foreign_equity_investment',
+        'number_new_jobs',
+        'gross_value_added',
+        *get_related_fields('investor_company', COMPANY_FIELDS),
+        *get_related_fields('created_by', ADVISER_FIELDS),
+    )
+
     class Meta:
         model = InvestmentProject
 
+    @classmethod
+    def get_values_expressions(cls):
+        """Gets the URL and client contacts of the project."""
+        return {
+            'url': get_front_end_url_expression('investmentproject', 'pk'),
+            'client_contacts': get_related_objects_subquery(
+                InvestmentProject.client_contacts.through,
+                'investmentproject',
+                'contact',
+                CONTACT_FIELDS,
+                expressions={'url': get_contact_url_expression('contact')},
+            ),
+        }
+
     def to_representation(self, instance):
         """
         Serialize the investment project as per Activity Stream spec:
         https://www.w3.org/TR/activitystreams-core/
         """
-        project_id = f'dit:DataHubInvestmentProject:{instance.pk}'
+        project_id = f'dit:DataHubInvestmentProject:{instance["pk"]}'
         project = {
             'id': f'{project_id}:Add',
             'type': 'Add',
-            'published': instance.created_on,
+            'published': instance['created_on'],
             'generator': self._get_generator(),
             'object': {
                 'id': project_id,
                 'type': ['dit:InvestmentProject'],
-                'startTime': instance.created_on,
-                'name': instance.name,
+                'startTime': instance['created_on'],
+                'name': instance['name'],
                 'dit:investmentType': {
-                    'name': instance.investment_type.name,
+                    'name': instance['investment_type__name'],
                 },
                 'attributedTo': [
-                    self._get_company(instance.investor_company),
-                    *self._get_contacts(instance.client_contacts),
+                    self._get_company(get_related_data(instance, 'investor_company')),
+                    *self._get_contacts(instance['client_contacts']),
                 ],
-                'url': instance.get_absolute_url(),
+                'url': instance['url'],
             },
         }
 
-        if instance.created_by is not None:
-            project['actor'] = self._get_adviser(instance.created_by)
+        created_by = get_related_data(instance, 'created_by')
+        if created_by is not None:
+            project['actor'] = self._get_adviser(created_by)
 
-        if instance.estimated_land_date is not None:
-            project['object']['dit:estimatedLandDate'] = instance.estimated_land_date
+        if instance['estimated_land_date'] is not None:
+            project['object']['dit:estimatedLandDate'] = instance['estimated_land_date']
 
-        if instance.total_investment is not None:
-            project['object']['dit:totalInvestment'] = instance.total_investment
+        if instance['total_investment'] is not None:
+            project['object']['dit:totalInvestment'] = instance['total_investment']
 
-        if instance.foreign_equity_investment is not None:
-            project['object']['dit:foreignEquityInvestment'] = instance.foreign_equity_investment
+        if instance['foreign_equity_investment'] is not None:
+            project['object']['dit:foreignEquityInvestment'] = (
+                instance['foreign_equity_investment']
+            )
 
-        if instance.number_new_jobs is not None:
-            project['object']['dit:numberNewJobs'] = instance.number_new_jobs
+        if instance['number_new_jobs'] is not None:
+            project['object']['dit:numberNewJobs'] = instance['number_new_jobs']
 
-        if instance.gross_value_added is not None:
-            project['object']['dit:grossValueAdded'] = instance.gross_value_added
+        if instance['gross_value_added'] is not None:
+            project['object']['dit:grossValueAdded'] = instance['gross_value_added']
 
         return project
@@ -1,9 +1,6 @@
-from django.db.models import Prefetch
-
 from datahub.activity_stream.investment.serializers import IProjectCreatedSerializer
 from datahub.activity_stream.pagination import ActivityCursorPagination
 from datahub.activity_stream.views import ActivityViewSet
-from datahub.company.models import Contact
 from datahub.investment.project.models import InvestmentProject
 
 
@@ -23,12 +20,4 @@ class IProjectCreatedViewSet(ActivityViewSet):
 
     pagination_class = IProjectCreatedPagination
     serializer_class = IProjectCreatedSerializer
-    queryset = InvestmentProject.objects.select_related(
-        'created_by',
-        'investment_type',
-        'investor_company',
-        'investment_type',
-        'stage',
-    ).prefetch_related(
-        Prefetch('client_contacts', queryset=Contact.objects.order_by('pk')),
-    )
+    queryset = InvestmentProject.objects.all()
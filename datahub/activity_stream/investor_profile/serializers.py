@@ -1,31 +1,96 @@
-from datahub.activity_stream.serializers import ActivitySerializer
+from datahub.activity_stream.serializers import (
+    ActivitySerializer,
+    ADVISER_WITH_TEAM_FIELDS,
+    COMPANY_FIELDS,
+    get_related_data,
+    get_related_fields,
+    get_related_names_subquery,
+)
+from datahub.core.query_utils import get_front_end_url_expression
 from datahub.investment.investor_profile.models import LargeCapitalInvestorProfile
 
 
 class LargeCapitalInvestorProfileActivitySerializer(ActivitySerializer):
     """Large Capital Investor serialiser for Activity Stream."""
 
+    # Maps attribute names to the values() fields of their names
+    optional_named_attributes = {
+        'country_of_origin': 'investor_company__address_country__name',
+        'investor_type': 'investor_type__name',
+        'required_checks_conducted': 'required_checks_conducted__name',
+        'minimum_return_rate': 'minimum_return_rate__name',
+        'minimum_equity_percentage': 'minimum_equity_percentage__name',
+    }
+
+    optional_multiple_named_attributes = [
+        'deal_ticket_sizes',
+        'investment_types',
+        'time_horizons',
+        'construction_risks',
+        'desired_deal_roles',
+        'restrictions',
+        'asset_classes_of_interest',
+        'uk_region_locations',
+        'other_countries_being_considered',
+    ]
+
+    optional_attributes = [
+        'investable_capital',
+        'global_assets_under_management',
+        'investor_description',
+        'required_checks_conducted_on',
+        'notes_on_locations',
+    ]
+
+    values_fields = (
+        'pk',
+        'created_on',
+        'modified_on',
+        *optional_named_attributes.values(),
+        *optional_attributes,
+        *get_related_fields('investor_company', COMPANY_FIELDS),
+        *get_related_fields('created_by', ADVISER_WITH_TEAM_FIELDS),
+        *get_related_fields('modified_by', ADVISER_WITH_TEAM_FIELDS),
+        *get_related_fields('required_checks_conducted_by', ADVISER_WITH_TEAM_FIELDS),
+    )
+
     class Meta:
         model = LargeCapitalInvestorProfile
 
+    @classmethod
+    def get_values_expressions(cls):
+        """
+        Gets the URL of the profile and the names of the objects in its many-to-many fields
+        (as <field name>_names).
+        """
+        return {
+            'url': get_front_end_url_expression('largecapitalinvestorprofile', 'pk'),
+            **{
+                f'{attr}_names': get_related_names_subquery(LargeCapitalInvestorProfile, attr)
+                for attr in cls.optional_multiple_named_attributes
+            },
+        }
+
     def _get_attributed_to(self, instance):
         attributed_to = [
-            self._get_company(instance.investor_company),
+            self._get_company(get_related_data(instance, 'investor_company')),
         ]
 
-        if instance.created_by:
+        created_by = get_related_data(instance, 'created_by')
+        if created_by:
             attributed_to.append(
                 self._get_adviser_with_team_and_role(
-                    instance.created_by,
+                    created_by,
                     'creator',
                     'DataHubLargeCapitalInvestorProfile',
                 ),
             )
 
-        if instance.modified_by:
+        modified_by = get_related_data(instance, 'modified_by')
+        if modified_by:
             attributed_to.append(
                 self._get_adviser_with_team_and_role(
-                    instance.modified_by,
+                    modified_by,
                     'modifier',
                     'DataHubLargeCapitalInvestorProfile',
                 ),
@@ -38,26 +103,30 @@ class LargeCapitalInvestorProfileActivitySerializer(ActivitySerializer):
         Serialize the interaction as per Activity Stream spec:
         https://www.w3.org/TR/activitystreams-core/
         """
-        investor_profile_id = f'dit:DataHubLargeCapitalInvestorProfile:{instance.pk}'
+        investor_profile_id = f'dit:DataHubLargeCapitalInvestorProfile:{instance["pk"]}'
         investor_profile = {
             'id': f'{investor_profile_id}:Announce',
             'type': 'Announce',
-            'published': instance.modified_on,
+            'published': instance['modified_on'],
             'generator': self._get_generator(),
             'object': {
                 'id': investor_profile_id,
                 'type': ['dit:LargeCapitalInvestorProfile'],
-                'startTime': instance.created_on,
+                'startTime': instance['created_on'],
                 'attributedTo': self._get_attributed_to(instance),
-                'url': instance.get_absolute_url(),
+                'url': instance['url'],
             },
         }
 
-        if instance.required_checks_conducted_by:
+        required_checks_conducted_by = get_related_data(
+            instance,
+            'required_checks_conducted_by',
+        )
+        if required_checks_conducted_by:
             investor_profile['object']['dit:requiredChecksConductedBy'] = (
                 self._get_adviser_with_team(
-                    instance.required_checks_conducted_by,
-                    instance.required_checks_conducted_by.dit_team,
+                    required_checks_conducted_by,
+                    get_related_data(required_checks_conducted_by, 'dit_team'),
                 ),
             )
 
@@ -65,49 +134,21 @@ class LargeCapitalInvestorProfileActivitySerializer(ActivitySerializer):
             first, *rest = name.split('_')
             return first + ''.join(word.capitalize() for word in rest)
 
-        optional_named_attributes = [
-            'country_of_origin',
-            'investor_type',
-            'required_checks_conducted',
-            'minimum_return_rate',
-            'minimum_equity_percentage',
-        ]
-
-        for attr in optional_named_attributes:
-            if getattr(instance, attr):
+        for attr, name_field in self.optional_named_attributes.items():
+            if instance[name_field] is not None:
                 investor_profile['object'][f'dit:{format_key(attr)}'] = {
-                    'name': getattr(instance, attr).name,
+                    'name': instance[name_field],
                 }
 
-        optional_multiple_named_attributes = [
-            'deal_ticket_sizes',
-            'investment_types',
-            'time_horizons',
-            'construction_risks',
-            'desired_deal_roles',
-            'restrictions',
-            'asset_classes_of_interest',
-            'uk_region_locations',
-            'other_countries_being_considered',
-        ]
-
-        for attr in optional_multiple_named_attributes:
-            values = getattr(instance, attr).all()
-            if len(values) > 0:
+        for attr in self.optional_multiple_named_attributes:
+            names = instance[f'{attr}_names']
+            if names:
                 investor_profile['object'][f'dit:{format_key(attr)}'] = [
-                    {'name': value.name} for value in values
+                    {'name': name} for name in names
                 ]
 
-        optional_attributes = [
-            'investable_capital',
-            'global_assets_under_management',
-            'investor_description',
-            'required_checks_conducted_on',
-            'notes_on_locations',
-        ]
-
-        for attr in optional_attributes:
-            if getattr(instance, attr):
-                investor_profile['object'][f'dit:{format_key(attr)}'] = getattr(instance, attr)
+        for attr in self.optional_attributes:
+            if instance[attr]:
+                investor_profile['object'][f'dit:{format_key(attr)}'] = instance[attr]
 
         return investor_profile
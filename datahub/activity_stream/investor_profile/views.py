@@ -25,13 +25,4 @@ class LargeCapitalInvestorProfileActivityViewSet(ActivityViewSet):
 
     pagination_class = LargeCapitalInvestorProfileCursorPagination
     serializer_class = LargeCapitalInvestorProfileActivitySerializer
-    queryset = LargeCapitalInvestorProfile.objects.select_related(
-        'created_by',
-        'modified_by',
-        'investor_company',
-        'investor_type',
-        'required_checks_conducted',
-        'required_checks_conducted_by',
-        'minimum_return_rate',
-        'minimum_equity_percentage',
-    )
+    queryset = LargeCapitalInvestorProfile.objects.all()
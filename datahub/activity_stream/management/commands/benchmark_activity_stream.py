@@ -0,0 +1,129 @@
+from statistics import median
+from time import perf_counter
+
+from django.core.management.base import BaseCommand
+from rest_framework.pagination import Cursor
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory
+
+from datahub.activity_stream.urls import activity_stream_urls
+
+BASE_URL = 'http://testserver/'
+# Page query modes being compared (the value of use_lean_page_query)
+PAGE_QUERY_MODES = {
+    'lean': True,
+    'full': False,
+}
+
+
+class Command(BaseCommand):
+    """
+    Command to measure how long it takes to fetch pages of activity stream endpoints.
+
+    For each endpoint, the first, middle and last pages are fetched (in the same way as by
+    the activity stream pagination class) using both the lean and the full page query. The
+    median time taken to fetch each page (including the values() rows used for serialisation)
+    is reported. Serialisation itself is not included.
+    """
+
+    help = 'Measures the time taken to fetch pages of activity stream endpoints.'
+
+    def add_arguments(self, parser):
+        """Define extra arguments."""
+        parser.add_argument(
+            '--endpoint',
+            action='append',
+            choices=sorted(_get_viewsets_by_name()),
+            help='Endpoint to benchmark. Defaults to all activity stream endpoints.',
+        )
+        parser.add_argument(
+            '--runs',
+            type=int,
+            default=5,
+            help='The number of times to fetch each page.',
+        )
+
+    def handle(self, *args, **options):
+        """Run the benchmark for each of the specified endpoints."""
+        viewsets_by_name = _get_viewsets_by_name()
+        endpoint_names = options['endpoint'] or sorted(viewsets_by_name)
+
+        for endpoint_name in endpoint_names:
+            viewset_cls = viewsets_by_name[endpoint_name]
+            self._benchmark_viewset(endpoint_name, viewset_cls, options['runs'])
+
+    def _benchmark_viewset(self, endpoint_name, viewset_cls, num_runs):
+        view = viewset_cls()
+        queryset = viewset_cls.queryset
+        pagination_class = viewset_cls.pagination_class
+        num_objects = queryset.count()
+
+        if not num_objects:
+            self.stdout.write(f'{endpoint_name}: no objects to benchmark, skipping')
+            return
+
+        positions = _get_page_positions(pagination_class, queryset, num_objects)
+
+        for mode, use_lean_page_query in PAGE_QUERY_MODES.items():
+            formatted_durations = []
+
+            for page_name, position in positions.items():
+                durations = [
+                    _time_page(view, queryset, position, use_lean_page_query)
+                    for _ in range(num_runs)
+                ]
+                formatted_durations.append(f'{page_name} page {median(durations):.1f}ms')
+
+            self.stdout.write(
+                f'{endpoint_name} ({num_objects} objects, {mode} page query): '
+                f'{", ".join(formatted_durations)}',
+            )
+
+
+def _get_viewsets_by_name():
+    return {pattern.name: pattern.callback.cls for pattern in activity_stream_urls}
+
+
+def _get_page_positions(pagination_class, queryset, num_objects):
+    """
+    Gets the cursor positions of the first, middle and last pages of a queryset.
+
+    (The position of the first page is None, as it doesn't have a cursor.)
+    """
+    paginator = pagination_class()
+    offsets = {
+        'middle': num_objects // 2,
+        'last': max(num_objects - paginator.page_size - 1, 0),
+    }
+    ordered_queryset = queryset.order_by(*paginator.ordering)
+
+    return {
+        'first': None,
+        **{
+            page_name: paginator._get_position_from_instance(
+                ordered_queryset[offset],
+                paginator.ordering,
+            )
+            for page_name, offset in offsets.items()
+        },
+    }
+
+
+def _time_page(view, queryset, position, use_lean_page_query):
+    paginator = view.pagination_class()
+    paginator.use_lean_page_query = use_lean_page_query
+    request = _make_request(paginator, position)
+
+    start = perf_counter()
+    paginator.paginate_queryset(queryset, request, view=view)
+    return (perf_counter() - start) * 1000
+
+
+def _make_request(paginator, position):
+    url = BASE_URL
+
+    if position is not None:
+        paginator.base_url = BASE_URL
+        url = paginator.encode_cursor(Cursor(offset=0, reverse=False, position=position))
+
+    return Request(APIRequestFactory().get(url))
@@ -1,4 +1,13 @@
-from datahub.activity_stream.serializers import ActivitySerializer
+from datahub.activity_stream.serializers import (
+    ActivitySerializer,
+    ADVISER_FIELDS,
+    COMPANY_FIELDS,
+    CONTACT_FIELDS,
+    get_contact_url_expression,
+    get_related_data,
+    get_related_fields,
+)
+from datahub.core.query_utils import get_front_end_url_expression
 
 
 class OMISOrderAddedSerializer(ActivitySerializer):
@@ -6,41 +15,62 @@ class OMISOrderAddedSerializer(ActivitySerializer):
     OMIS Order added serializer for activity stream.
     """
 
+    values_fields = (
+        'pk',
+        'created_on',
+        'modified_on',
+        'reference',
+        'primary_market__name',
+        'uk_region__name',
+        *get_related_fields('company', COMPANY_FIELDS),
+        *get_related_fields('contact', CONTACT_FIELDS),
+        *get_related_fields('created_by', ADVISER_FIELDS),
+    )
+
+    @classmethod
+    def get_values_expressions(cls):
+        """Gets the URLs of the order and its contact."""
+        return {
+            'url': get_front_end_url_expression('order', 'pk'),
+            'contact__url': get_contact_url_expression('contact'),
+        }
+
     def to_representation(self, instance):
         """
         Serialize the OMIS order as per activity stream spec:
         https://www.w3.org/TR/activitystreams-core/
         """
-        order_id = f'dit:DataHubOMISOrder:{instance.pk}'
+        order_id = f'dit:DataHubOMISOrder:{instance["pk"]}'
         order = {
             'id': f'{order_id}:Add',
             'type': 'Add',
-            'published': instance.created_on,
+            'published': instance['created_on'],
             'generator': self._get_generator(),
             'object': {
                 'id': order_id,
                 'type': ['dit:OMISOrder'],
-                'startTime': instance.created_on,
-                'name': instance.reference,
+                'startTime': instance['created_on'],
+                'name': instance['reference'],
                 'attributedTo': [
-                    self._get_company(instance.company),
-                    self._get_contact(instance.contact),
+                    self._get_company(get_related_data(instance, 'company')),
+                    self._get_contact(get_related_data(instance, 'contact')),
                 ],
-                'url': instance.get_absolute_url(),
+                'url': instance['url'],
             },
         }
 
-        if instance.created_by is not None:
-            order['actor'] = self._get_adviser(instance.created_by)
+        created_by = get_related_data(instance, 'created_by')
+        if created_by is not None:
+            order['actor'] = self._get_adviser(created_by)
 
-        if instance.primary_market is not None:
+        if instance['primary_market__name'] is not None:
             order['object']['dit:country'] = {
-                'name': instance.primary_market.name,
+                'name': instance['primary_market__name'],
             }
 
-        if instance.uk_region is not None:
+        if instance['uk_region__name'] is not None:
             order['object']['dit:ukRegion'] = {
-                'name': instance.uk_region.name,
+                'name': instance['uk_region__name'],
             }
 
         return order
@@ -1,9 +1,7 @@
-from django.db.models import Prefetch
-
 from datahub.activity_stream.omis.serializers import OMISOrderAddedSerializer
 from datahub.activity_stream.pagination import ActivityCursorPagination
 from datahub.activity_stream.views import ActivityViewSet
-from datahub.omis.order.models import Order, OrderAssignee
+from datahub.omis.order.models import Order
 
 
 class OMISOrderAddedPagination(ActivityCursorPagination):
@@ -22,12 +20,4 @@ class OMISOrderAddedViewSet(ActivityViewSet):
 
     pagination_class = OMISOrderAddedPagination
     serializer_class = OMISOrderAddedSerializer
-    queryset = Order.objects.select_related(
-        'company',
-        'contact',
-        'created_by',
-        'primary_market',
-        'uk_region',
-    ).prefetch_related(
-        Prefetch('assignees', queryset=OrderAssignee.objects.order_by('pk')),
-    )
+    queryset = Order.objects.all()
@@ -1,33 +1,105 @@
-from datahub.activity_stream.serializers import ActivitySerializer
+from datahub.activity_stream.serializers import (
+    ActivitySerializer,
+    ADVISER_FIELDS,
+    ADVISER_WITH_TEAM_FIELDS,
+    COMPANY_FIELDS,
+    get_related_data,
+    get_related_fields,
+    get_related_names_subquery,
+    get_related_objects_subquery,
+)
+from datahub.core.query_utils import get_front_end_url_expression
 from datahub.investment.opportunity.models import LargeCapitalOpportunity
 
 
 class LargeCapitalOpportunityActivitySerializer(ActivitySerializer):
     """Large Capital Opportunity serialiser for Activity Stream."""
 
+    optional_named_attributes = [
+        'required_checks_conducted',
+        'opportunity_value_type',
+    ]
+
+    optional_multiple_named_attributes = [
+        'asset_classes',
+        'investment_types',
+        'construction_risks',
+        'time_horizons',
+        'sources_of_funding',
+        'reasons_for_abandonment',
+        'uk_region_locations',
+    ]
+
+    optional_attributes = [
+        'total_investment_sought',
+        'current_investment_secured',
+        'opportunity_value',
+        'required_checks_conducted_on',
+        'dit_support_provided',
+        'status_id',
+        'required_checks_conducted_id',
+        'estimated_return_rate_id',
+    ]
+
+    values_fields = (
+        'pk',
+        'created_on',
+        'modified_on',
+        'name',
+        'description',
+        *(f'{attr}__name' for attr in optional_named_attributes),
+        *optional_attributes,
+        *get_related_fields('lead_dit_relationship_manager', ADVISER_FIELDS),
+        *get_related_fields('created_by', ADVISER_WITH_TEAM_FIELDS),
+        *get_related_fields('modified_by', ADVISER_WITH_TEAM_FIELDS),
+        *get_related_fields('required_checks_conducted_by', ADVISER_WITH_TEAM_FIELDS),
+    )
+
     class Meta:
         model = LargeCapitalOpportunity
 
+    @classmethod
+    def get_values_expressions(cls):
+        """
+        Gets the URL and promoters of the opportunity and the names of the objects in its
+        many-to-many fields (as <field name>_names).
+        """
+        return {
+            'url': get_front_end_url_expression('largecapitalopportunity', 'pk'),
+            'promoters': get_related_objects_subquery(
+                LargeCapitalOpportunity.promoters.through,
+                'largecapitalopportunity',
+                'company',
+                COMPANY_FIELDS,
+            ),
+            **{
+                f'{attr}_names': get_related_names_subquery(LargeCapitalOpportunity, attr)
+                for attr in cls.optional_multiple_named_attributes
+            },
+        }
+
     def _get_attributed_to(self, instance):
         attributed_to = []
 
         attributed_to.append(
-            self._get_adviser(instance.lead_dit_relationship_manager),
+            self._get_adviser(get_related_data(instance, 'lead_dit_relationship_manager')),
         )
 
-        if instance.created_by:
+        created_by = get_related_data(instance, 'created_by')
+        if created_by:
             attributed_to.append(
                 self._get_adviser_with_team_and_role(
-                    instance.created_by,
+                    created_by,
                     'creator',
                     'DataHubLargeCapitalOpportunity',
                 ),
             )
 
-        if instance.modified_by:
+        modified_by = get_related_data(instance, 'modified_by')
+        if modified_by:
             attributed_to.append(
                 self._get_adviser_with_team_and_role(
-                    instance.modified_by,
+                    modified_by,
                     'modifier',
                     'DataHubLargeCapitalOpportunity',
                 ),
@@ -40,32 +112,33 @@ class LargeCapitalOpportunityActivitySerializer(ActivitySerializer):
         Serialize the interaction as per Activity Stream spec:
         https://www.w3.org/TR/activitystreams-core/
         """
-        investment_opportunity_id = f'dit:DataHubLargeCapitalOpportunity:{instance.pk}'
+        investment_opportunity_id = f'dit:DataHubLargeCapitalOpportunity:{instance["pk"]}'
         investment_opportunity = {
             'id': f'{investment_opportunity_id}:Announce',
             'type': 'Announce',
-            'published': instance.modified_on,
+            'published': instance['modified_on'],
             'generator': self._get_generator(),
             'object': {
                 'id': investment_opportunity_id,
                 'type': ['dit:LargeCapitalOpportunity'],
-                'startTime': instance.created_on,
-                'name': instance.name,
-                'description': instance.description,
+                'startTime': instance['created_on'],
+                'name': instance['name'],
+                'description': instance['description'],
                 'attributedTo': self._get_attributed_to(instance),
-                'url': instance.get_absolute_url(),
+                'url': instance['url'],
+                'dit:promoters': self._get_companies(instance['promoters']),
             },
         }
-        if instance.promoters:
-            investment_opportunity['object']['dit:promoters'] = (
-                self._get_companies(instance.promoters)
-            )
 
-        if instance.required_checks_conducted_by:
+        required_checks_conducted_by = get_related_data(
+            instance,
+            'required_checks_conducted_by',
+        )
+        if required_checks_conducted_by:
             investment_opportunity['object']['dit:requiredChecksConductedBy'] = (
                 self._get_adviser_with_team(
-                    instance.required_checks_conducted_by,
-                    instance.required_checks_conducted_by.dit_team,
+                    required_checks_conducted_by,
+                    get_related_data(required_checks_conducted_by, 'dit_team'),
                 ),
             )
 
@@ -73,49 +146,21 @@ class LargeCapitalOpportunityActivitySerializer(ActivitySerializer):
             first, *rest = name.split('_')
             return first + ''.join(word.capitalize() for word in rest)
 
-        optional_named_attributes = [
-            'required_checks_conducted',
-            'opportunity_value_type',
-        ]
-
-        for attr in optional_named_attributes:
-            if getattr(instance, attr):
+        for attr in self.optional_named_attributes:
+            if instance[f'{attr}__name'] is not None:
                 investment_opportunity['object'][f'dit:{format_key(attr)}'] = {
-                    'name': getattr(instance, attr).name,
+                    'name': instance[f'{attr}__name'],
                 }
 
-        optional_multiple_named_attributes = [
-            'asset_classes',
-            'investment_types',
-            'construction_risks',
-            'time_horizons',
-            'sources_of_funding',
-            'reasons_for_abandonment',
-            'uk_region_locations',
-        ]
-
-        for attr in optional_multiple_named_attributes:
-            values = getattr(instance, attr).all()
-            if len(values) > 0:
+        for attr in self.optional_multiple_named_attributes:
+            names = instance[f'{attr}_names']
+            if names:
                 investment_opportunity['object'][f'dit:{format_key(attr)}'] = [
-                    {'name': value.name} for value in values
+                    {'name': name} for name in names
                 ]
 
-        optional_attributes = [
-            'total_investment_sought',
-            'current_investment_secured',
-            'opportunity_value',
-            'required_checks_conducted_on',
-            'dit_support_provided',
-            'status_id',
-            'required_checks_conducted_id',
-            'estimated_return_rate_id',
-        ]
-
-        for attr in optional_attributes:
-            if getattr(instance, attr):
-                investment_opportunity['object'][f'dit:{format_key(attr)}'] = getattr(
-                    instance, attr,
-                )
+        for attr in self.optional_attributes:
+            if instance[attr]:
+                investment_opportunity['object'][f'dit:{format_key(attr)}'] = instance[attr]
 
         return investment_opportunity
@@ -23,9 +23,62 @@ class ActivityCursorPagination(CursorPagination):
         field that is only set once, on creation."
 
     Ref: https://www.django-rest-framework.org/api-guide/pagination/#cursorpagination
+
+    Pages are fetched in two steps (when use_lean_page_query is True):
+
+    - the position and primary key of the objects in the page are fetched using a lean query
+    (without any of the joins or prefetches of the view's queryset). When the ordering
+    fields are indexed together (which they should be), this only needs to read the index
+    - the objects in the page are then fetched by primary key using the view's page queryset
+    (so related objects are loaded for the page only)
+
+    This keeps the time taken to generate a page roughly constant regardless of the size of
+    the table and the position of the page in it.
     """
 
     summary = None
+    use_lean_page_query = True
+
+    def paginate_queryset(self, queryset, request, view=None):
+        """Gets the objects in the requested page."""
+        if not self.use_lean_page_query:
+            return super().paginate_queryset(
+                _get_page_queryset(queryset, view),
+                request,
+                view=view,
+            )
+
+        lean_page = self.paginate_lean_queryset(queryset, request, view=view)
+        return self.get_page_from_lean_page(queryset, lean_page, view=view)
+
+    def paginate_lean_queryset(self, queryset, request, view=None):
+        """
+        Gets the position and primary key of the objects in the requested page.
+
+        This is the first step of paginate_queryset(). (Afterwards, has_next indicates whether
+        there is a next page.)
+        """
+        return super().paginate_queryset(
+            _get_lean_page_queryset(queryset, self.get_ordering(request, queryset, view)),
+            request,
+            view=view,
+        )
+
+    def get_page_from_lean_page(self, queryset, lean_page, view=None):
+        """
+        Gets the objects in a page returned by paginate_lean_queryset().
+
+        This is the second step of paginate_queryset().
+        """
+        if not lean_page:
+            return lean_page
+
+        page_pks = [row['pk'] for row in lean_page]
+        page_queryset = _get_page_queryset(queryset.filter(pk__in=page_pks).order_by(), view)
+        objects_by_pk = {_get_pk(obj): obj for obj in page_queryset}
+        # Objects deleted in between the two queries are omitted
+        self.page = [objects_by_pk[pk] for pk in page_pks if pk in objects_by_pk]
+        return self.page
 
     def _get_url(self):
         return self.encode_cursor(self.cursor) if self.cursor else self.base_url
@@ -55,3 +108,29 @@ class ActivityCursorPagination(CursorPagination):
                 'previous': self.get_previous_link(),
             },
         )
+
+
+def _get_lean_page_queryset(queryset, ordering):
+    """
+    Gets a values() queryset that only loads the fields needed to paginate a queryset
+    (without any related objects).
+    """
+    ordering_fields = [field.lstrip('-') for field in ordering]
+    return queryset.prefetch_related(None).values('pk', *ordering_fields)
+
+
+def _get_page_queryset(queryset, view):
+    """
+    Gets the queryset used to fetch the objects in a page.
+
+    This is the view's page queryset (see ActivityViewSet.get_page_queryset()) when there is a
+    view.
+    """
+    if view is None:
+        return queryset
+    return view.get_page_queryset(queryset)
+
+
+def _get_pk(obj):
+    """Gets the primary key of a model instance or values() row."""
+    return obj['pk'] if isinstance(obj, dict) else obj.pk
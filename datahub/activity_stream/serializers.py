@@ -1,66 +1,185 @@
 from rest_framework import serializers
 
+from datahub.core.query_utils import (
+    get_array_agg_subquery,
+    get_front_end_url_expression,
+    JSONBBuildObject,
+)
+from datahub.core.utils import join_truthy_strings
+
+# Fields of related objects used when serialising activities
+ADVISER_FIELDS = ('pk', 'first_name', 'last_name', 'contact_email', 'email')
+ADVISER_WITH_TEAM_FIELDS = (*ADVISER_FIELDS, 'dit_team__pk', 'dit_team__name')
+COMPANY_FIELDS = ('pk', 'name', 'duns_number', 'company_number')
+CONTACT_FIELDS = ('pk', 'first_name', 'last_name', 'email', 'job_title')
+TEAM_FIELDS = ('pk', 'name')
+
+
+def get_related_fields(relation_name, fields):
+    """
+    Gets the values() field names for fields of a to-one related object.
+
+    Usage example:
+        get_related_fields('company', COMPANY_FIELDS)
+    """
+    return tuple(f'{relation_name}__{field}' for field in fields)
+
+
+def get_contact_url_expression(relation_name):
+    """Gets an expression for the front-end URL of a related contact."""
+    return get_front_end_url_expression('contact', f'{relation_name}__pk')
+
+
+def get_related_objects_subquery(
+    model,
+    join_field_name,
+    relation_name,
+    fields,
+    expressions=None,
+    filter=None,
+    ordering=None,
+):
+    """
+    Gets a subquery that aggregates the fields of to-many related objects as an array of
+    JSON objects (ordered by the primary key of the related objects by default).
+
+    model should be a through model (or any other model with a foreign key to the model being
+    queried) and relation_name the name of the relation to the related objects on it.
+
+    Usage example:
+        get_related_objects_subquery(
+            Interaction.contacts.through,
+            'interaction',
+            'contact',
+            CONTACT_FIELDS,
+        )
+    """
+    json_object = JSONBBuildObject(
+        **{field: f'{relation_name}__{field}' for field in fields},
+        **(expressions or {}),
+    )
+    return get_array_agg_subquery(
+        model,
+        join_field_name,
+        json_object,
+        filter=filter,
+        ordering=ordering or (f'{relation_name}__pk',),
+    )
+
+
+def get_related_names_subquery(model, field_name):
+    """
+    Gets a subquery that aggregates the names of the objects in a many-to-many field as an
+    array, using the default ordering of the related model.
+
+    Usage example:
+        get_related_names_subquery(LargeCapitalOpportunity, 'asset_classes')
+    """
+    field = model._meta.get_field(field_name)
+    target_field_name = field.m2m_reverse_field_name()
+    ordering = [
+        f'-{target_field_name}__{order[1:]}'
+        if order.startswith('-') else f'{target_field_name}__{order}'
+        for order in field.related_model._meta.ordering
+    ]
+
+    return get_array_agg_subquery(
+        field.remote_field.through,
+        field.m2m_field_name(),
+        f'{target_field_name}__name',
+        ordering=ordering,
+    )
+
+
+def get_related_data(data, relation_name):
+    """
+    Gets the fields of a to-one related object from a values() row (or the data of another
+    related object) as a dict without the relation name prefix.
+
+    Returns None if there is no related object.
+    """
+    prefix = f'{relation_name}__'
+    related_data = {
+        key[len(prefix):]: value for key, value in data.items() if key.startswith(prefix)
+    }
+    return related_data if related_data.get('pk') is not None else None
+
 
 class ActivitySerializer(serializers.Serializer):
     """
     Generic serializer for activity.
 
+    Activities are serialised from values() rows (rather than model instances) to avoid
+    instantiating models and loading related objects for every activity. Subclasses declare
+    the fields they need in values_fields (using the __ notation for to-one related objects)
+    and any expressions (e.g. subqueries for to-many related objects) in
+    get_values_expressions(). Related objects are passed to the helper methods below as
+    dicts of their fields (see get_related_data()).
+
     Implements methods for serializing objects that are common across
     activity stream serializers.
     """
 
+    values_fields = ()
+
+    @classmethod
+    def get_values_expressions(cls):
+        """Gets expressions to add to values() rows, keyed by name."""
+        return {}
+
+    @classmethod
+    def get_values_queryset(cls, queryset):
+        """Gets a values() queryset with the fields and expressions used by the serializer."""
+        return queryset.values(*cls.values_fields, **cls.get_values_expressions())
+
     def _get_company(self, company):
         """
         Get a serialized representation of a Company.
         """
         return {} if company is None else {
-            'id': f'dit:DataHubCompany:{company.pk}',
-            'dit:dunsNumber': company.duns_number,
-            'dit:companiesHouseNumber': company.company_number,
+            'id': f'dit:DataHubCompany:{company["pk"]}',
+            'dit:dunsNumber': company['duns_number'],
+            'dit:companiesHouseNumber': company['company_number'],
             'type': ['Organization', 'dit:Company'],
-            'name': company.name,
+            'name': company['name'],
         }
 
     def _get_companies(self, companies):
         """
         Get a serialized representation of a list of Companies.
         """
-        return [
-            self._get_company(company)
-            for company in companies.order_by('pk')
-        ]
+        return [self._get_company(company) for company in companies or ()]
 
     def _get_contact(self, contact):
         """
         Get a serialized representation of a contact.
+
+        The contact data must include its front-end URL (see get_contact_url_expression()).
         """
         return {
-            'id': f'dit:DataHubContact:{contact.pk}',
+            'id': f'dit:DataHubContact:{contact["pk"]}',
             'type': ['Person', 'dit:Contact'],
-            'url': contact.get_absolute_url(),
-            'dit:emailAddress': contact.email,
-            'dit:jobTitle': contact.job_title,
-            'name': contact.name,
+            'url': contact['url'],
+            'dit:emailAddress': contact['email'],
+            'dit:jobTitle': contact['job_title'],
+            'name': join_truthy_strings(contact['first_name'], contact['last_name']),
         }
 
     def _get_contacts(self, contacts):
         """
         Get a serialized representation of a list of Contacts.
         """
-        return [
-            self._get_contact(contact)
-            for contact in contacts.order_by('pk')
-        ]
+        return [self._get_contact(contact) for contact in contacts or ()]
 
     def _get_adviser(self, adviser):
         """
         Get a serialized representation of Adviser.
         """
         return {} if adviser is None else {
-            'id': f'dit:DataHubAdviser:{adviser.pk}',
+            'id': f'dit:DataHubAdviser:{adviser["pk"]}',
             'type': ['Person', 'dit:Adviser'],
-            'dit:emailAddress': adviser.contact_email or adviser.email,
-            'name': adviser.name,
+            'dit:emailAddress': adviser['contact_email'] or adviser['email'],
+            'name': join_truthy_strings(adviser['first_name'], adviser['last_name']),
         }
 
     def _get_adviser_with_team(self, adviser, team):
@@ -70,15 +189,16 @@ class ActivitySerializer(serializers.Serializer):
         return adviser_with_team
 
     def _get_adviser_with_team_and_role(self, adviser, role, type):
-        adviser = self._get_adviser_with_team(adviser, adviser.dit_team)
+        team = get_related_data(adviser, 'dit_team') if adviser is not None else None
+        adviser = self._get_adviser_with_team(adviser, team)
         adviser[f'dit:{type}:role'] = role
         return adviser
 
     def _get_team(self, team):
         return {} if team is None else {
-            'id': f'dit:DataHubTeam:{team.pk}',
+            'id': f'dit:DataHubTeam:{team["pk"]}',
             'type': ['Group', 'dit:Team'],
-            'name': team.name,
+            'name': team['name'],
         }
 
     def _get_generator(self):
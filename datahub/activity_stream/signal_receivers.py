@@ -0,0 +1,44 @@
+from functools import partial
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+
+from datahub.activity_stream.tail_page_cache import invalidate_tail_pages
+from datahub.company_referral.models import CompanyReferral
+from datahub.interaction.models import Interaction
+from datahub.investment.investor_profile.models import LargeCapitalInvestorProfile
+from datahub.investment.opportunity.models import LargeCapitalOpportunity
+from datahub.investment.project.models import InvestmentProject
+from datahub.omis.order.models import Order
+
+# The models of the querysets of the activity stream views
+ACTIVITY_STREAM_MODELS = (
+    CompanyReferral,
+    Interaction,
+    InvestmentProject,
+    LargeCapitalInvestorProfile,
+    LargeCapitalOpportunity,
+    Order,
+)
+
+
+def invalidate_tail_pages_on_commit(sender, **kwargs):
+    """
+    Stops cached activity stream pages for a model from being used when an object is saved or
+    deleted.
+
+    This happens once the transaction has been committed, so that a page generated before
+    the change is visible isn't cached for the new version.
+    """
+    if settings.ACTIVITY_STREAM_TAIL_PAGE_CACHE_ENABLED:
+        transaction.on_commit(partial(invalidate_tail_pages, sender))
+
+
+for model in ACTIVITY_STREAM_MODELS:
+    for signal in (post_save, post_delete):
+        signal.connect(
+            invalidate_tail_pages_on_commit,
+            sender=model,
+            dispatch_uid=f'invalidate_{model._meta.model_name}_activity_stream_tail_pages',
+        )
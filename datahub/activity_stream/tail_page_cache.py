@@ -0,0 +1,58 @@
+"""
+Caching of the newest ("tail") page of activity stream endpoints.
+
+The activity stream service polls the newest page of each endpoint very frequently, and it
+usually hasn't changed since the previous poll. Pages without a next link are hence cached
+(keyed by URL), so that repeat polls are served from the cache without querying the database.
+
+The cache key also includes a version for the model of the view's queryset. The version is
+changed whenever an object of that model is saved or deleted (once the transaction has been
+committed, see datahub.activity_stream.signal_receivers), so that the pages cached for the
+previous version are no longer used.
+
+Changes that don't send signals (e.g. QuerySet.update() and bulk_create()) and changes to
+related objects don't change the version, so these can take up to
+settings.ACTIVITY_STREAM_TAIL_PAGE_CACHE_TIMEOUT seconds to be reflected in a cached page.
+"""
+from hashlib import blake2b
+from uuid import uuid4
+
+from django.conf import settings
+from django.core.cache import cache
+
+TAIL_PAGE_CACHE_KEY_PREFIX = 'activity-stream-tail-page'
+TAIL_PAGE_VERSION_KEY_PREFIX = 'activity-stream-tail-page-version'
+
+
+def get_tail_page_cache_key(request, model):
+    """
+    Gets the cache key for a page of an activity stream endpoint for a model.
+
+    This only uses the cache (and not the database).
+    """
+    version = cache.get_or_set(_get_version_key(model), uuid4().hex, timeout=None)
+    url_hash = blake2b(request.build_absolute_uri().encode('utf-8'), digest_size=16).hexdigest()
+
+    return f'{TAIL_PAGE_CACHE_KEY_PREFIX}:{url_hash}:{version}'
+
+
+def get_cached_tail_page(cache_key):
+    """Gets a cached page (if there is one)."""
+    return cache.get(cache_key)
+
+
+def cache_tail_page(cache_key, data):
+    """Caches a page if it's the newest page (i.e. it has no next link)."""
+    if data['next'] is not None:
+        return
+
+    cache.set(cache_key, data, timeout=settings.ACTIVITY_STREAM_TAIL_PAGE_CACHE_TIMEOUT)
+
+
+def invalidate_tail_pages(model):
+    """Changes the version for a model, so that its cached pages are no longer used."""
+    cache.set(_get_version_key(model), uuid4().hex, timeout=None)
+
+
+def _get_version_key(model):
+    return f'{TAIL_PAGE_VERSION_KEY_PREFIX}:{model._meta.label_lower}'
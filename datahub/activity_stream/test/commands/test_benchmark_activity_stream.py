@@ -0,0 +1,42 @@
+from io import StringIO
+
+import pytest
+from django.core import management
+
+from datahub.activity_stream.management.commands import benchmark_activity_stream
+from datahub.omis.order.test.factories import OrderFactory
+
+pytestmark = pytest.mark.django_db
+
+
+def test_benchmarks_endpoint():
+    """Test that the command reports timings for both page query modes."""
+    OrderFactory.create_batch(3)
+    stdout = StringIO()
+
+    management.call_command(
+        benchmark_activity_stream.Command(),
+        endpoint=['omis-order-added'],
+        runs=2,
+        stdout=stdout,
+    )
+
+    lines = stdout.getvalue().splitlines()
+    assert len(lines) == 2
+    assert lines[0].startswith('omis-order-added (3 objects, lean page query): first page ')
+    assert lines[1].startswith('omis-order-added (3 objects, full page query): first page ')
+    assert ', middle page ' in lines[0]
+    assert ', last page ' in lines[0]
+
+
+def test_skips_endpoint_without_objects():
+    """Test that endpoints without any objects are skipped."""
+    stdout = StringIO()
+
+    management.call_command(
+        benchmark_activity_stream.Command(),
+        endpoint=['omis-order-added'],
+        stdout=stdout,
+    )
+
+    assert stdout.getvalue() == 'omis-order-added: no objects to benchmark, skipping\n'
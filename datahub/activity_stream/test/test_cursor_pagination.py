@@ -1,9 +1,16 @@
 import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 from rest_framework import status
 
 from datahub.activity_stream.test import hawk
 from datahub.activity_stream.test.utils import get_url
+from datahub.company_referral.test.factories import CompanyReferralFactory
 from datahub.interaction.test.factories import CompanyInteractionFactory
+from datahub.investment.investor_profile.test.factories import (
+    LargeCapitalInvestorProfileFactory,
+)
+from datahub.investment.opportunity.test.factories import LargeCapitalOpportunityFactory
 from datahub.investment.project.test.factories import InvestmentProjectFactory
 from datahub.omis.order.test.factories import OrderFactory
 
@@ -44,3 +51,85 @@ def test_cursor_pagination(factory, endpoint, api_client, monkeypatch):
     page_1_data_2 = response.json()
     assert page_1_data['orderedItems'] == page_1_data_2['orderedItems']
     assert page_1_data_2['next'] == page_2_url
+
+
+@pytest.mark.parametrize(
+    'factory, endpoint',
+    (
+        (CompanyInteractionFactory, 'api-v3:activity-stream:interactions'),
+        (InvestmentProjectFactory, 'api-v3:activity-stream:investment-project-added'),
+        (OrderFactory, 'api-v3:activity-stream:omis-order-added'),
+        (CompanyReferralFactory, 'api-v3:activity-stream:company-referrals'),
+        (LargeCapitalOpportunityFactory, 'api-v3:activity-stream:large-capital-opportunity'),
+        (
+            LargeCapitalInvestorProfileFactory,
+            'api-v3:activity-stream:large-capital-investor-profiles',
+        ),
+    ),
+)
+@pytest.mark.django_db
+def test_lean_page_query_returns_same_pages(factory, endpoint, api_client, monkeypatch):
+    """
+    Test that pages fetched using the lean page query are the same as those fetched using the
+    view's queryset directly.
+    """
+    page_size = 2
+    monkeypatch.setattr(
+        'datahub.activity_stream.pagination.ActivityCursorPagination.page_size',
+        page_size,
+    )
+    factory.create_batch(page_size * 2 + 1)
+
+    def _get_all_pages():
+        pages = []
+        url = get_url(endpoint)
+        while url:
+            response = hawk.get(api_client, url)
+            assert response.status_code == status.HTTP_200_OK
+            page = response.json()
+            pages.append(page)
+            url = page['next']
+        return pages
+
+    lean_pages = _get_all_pages()
+    monkeypatch.setattr(
+        'datahub.activity_stream.pagination.ActivityCursorPagination.use_lean_page_query',
+        False,
+    )
+    full_pages = _get_all_pages()
+
+    assert len(lean_pages) == 3
+    assert lean_pages == full_pages
+
+
+@pytest.mark.parametrize(
+    'factory, endpoint',
+    (
+        (CompanyInteractionFactory, 'api-v3:activity-stream:interactions'),
+        (InvestmentProjectFactory, 'api-v3:activity-stream:investment-project-added'),
+        (OrderFactory, 'api-v3:activity-stream:omis-order-added'),
+        (CompanyReferralFactory, 'api-v3:activity-stream:company-referrals'),
+        (LargeCapitalOpportunityFactory, 'api-v3:activity-stream:large-capital-opportunity'),
+        (
+            LargeCapitalInvestorProfileFactory,
+            'api-v3:activity-stream:large-capital-investor-profiles',
+        ),
+    ),
+)
+@pytest.mark.django_db
+def test_num_queries_does_not_depend_on_page_size(factory, endpoint, api_client):
+    """
+    Test that the number of queries made to fetch a page does not depend on the number of
+    activities in it (as related objects are fetched using joins and subqueries).
+    """
+    def _get_num_queries():
+        with CaptureQueriesContext(connection) as queries:
+            response = hawk.get(api_client, get_url(endpoint))
+        assert response.status_code == status.HTTP_200_OK
+        return len(queries)
+
+    factory()
+    num_queries_for_one_activity = _get_num_queries()
+
+    factory.create_batch(5)
+    assert _get_num_queries() == num_queries_for_one_activity
@@ -0,0 +1,111 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework import status
+
+from datahub.activity_stream.signal_receivers import ACTIVITY_STREAM_MODELS
+from datahub.activity_stream.test import hawk
+from datahub.activity_stream.test.utils import get_url
+from datahub.activity_stream.urls import activity_stream_urls
+from datahub.company_referral.models import CompanyReferral
+from datahub.company_referral.test.factories import CompanyReferralFactory
+
+pytestmark = pytest.mark.django_db
+
+URL_NAME = 'api-v3:activity-stream:company-referrals'
+
+
+@pytest.fixture
+def tail_page_cache_enabled(local_memory_cache, settings, synchronous_on_commit):
+    """Enables the activity stream tail page cache."""
+    settings.ACTIVITY_STREAM_TAIL_PAGE_CACHE_ENABLED = True
+    yield
+
+
+def _get_subjects(api_client, url):
+    response = hawk.get(api_client, url)
+    assert response.status_code == status.HTTP_200_OK
+    response_data = response.json()
+    subjects = [item['object']['dit:subject'] for item in response_data['orderedItems']]
+    return subjects, response_data['next']
+
+
+def test_serves_tail_page_from_cache(tail_page_cache_enabled, api_client):
+    """Test that the newest page is served from the cache while no objects are saved."""
+    CompanyReferralFactory(subject='original subject')
+    url = get_url(URL_NAME)
+    assert _get_subjects(api_client, url) == (['original subject'], None)
+
+    # update() doesn't send any signals, so the cached page is still used
+    CompanyReferral.objects.update(subject='updated subject')
+
+    assert _get_subjects(api_client, url) == (['original subject'], None)
+
+
+def test_serves_cached_tail_page_without_querying_database(tail_page_cache_enabled, api_client):
+    """Test that no database queries are made when the newest page is served from the cache."""
+    CompanyReferralFactory()
+    url = get_url(URL_NAME)
+    _get_subjects(api_client, url)
+
+    with CaptureQueriesContext(connection) as queries:
+        _get_subjects(api_client, url)
+
+    assert not queries
+
+
+def test_regenerates_tail_page_when_object_saved(tail_page_cache_enabled, api_client):
+    """Test that the newest page is generated again when an object is saved."""
+    company_referral = CompanyReferralFactory(subject='original subject')
+    url = get_url(URL_NAME)
+    assert _get_subjects(api_client, url) == (['original subject'], None)
+
+    company_referral.subject = 'updated subject'
+    company_referral.save()
+
+    assert _get_subjects(api_client, url) == (['updated subject'], None)
+
+
+def test_regenerates_tail_page_when_object_deleted(tail_page_cache_enabled, api_client):
+    """Test that the newest page is generated again when an object is deleted."""
+    company_referral = CompanyReferralFactory(subject='original subject')
+    url = get_url(URL_NAME)
+    assert _get_subjects(api_client, url) == (['original subject'], None)
+
+    company_referral.delete()
+
+    assert _get_subjects(api_client, url) == ([], None)
+
+
+def test_does_not_cache_pages_with_next_link(tail_page_cache_enabled, api_client, monkeypatch):
+    """Test that pages that aren't the newest page are not cached."""
+    monkeypatch.setattr(
+        'datahub.activity_stream.pagination.ActivityCursorPagination.page_size',
+        1,
+    )
+    CompanyReferralFactory.create_batch(2, subject='original subject')
+    url = get_url(URL_NAME)
+    subjects, next_url = _get_subjects(api_client, url)
+    assert subjects == ['original subject']
+    assert next_url
+
+    CompanyReferral.objects.update(subject='updated subject')
+
+    assert _get_subjects(api_client, url) == (['updated subject'], next_url)
+
+
+def test_does_not_cache_when_disabled(local_memory_cache, api_client):
+    """Test that pages are not cached when the cache is disabled."""
+    CompanyReferralFactory(subject='original subject')
+    url = get_url(URL_NAME)
+    assert _get_subjects(api_client, url) == (['original subject'], None)
+
+    CompanyReferral.objects.update(subject='updated subject')
+
+    assert _get_subjects(api_client, url) == (['updated subject'], None)
+
+
+def test_activity_stream_models_include_all_views():
+    """Test that cached pages are invalidated for the models of all activity stream views."""
+    view_models = {pattern.callback.cls.queryset.model for pattern in activity_stream_urls}
+    assert view_models == set(ACTIVITY_STREAM_MODELS)
@@ -1,4 +1,12 @@
+from django.conf import settings
+from rest_framework.response import Response
+
 from config.settings.types import HawkScope
+from datahub.activity_stream.tail_page_cache import (
+    cache_tail_page,
+    get_cached_tail_page,
+    get_tail_page_cache_key,
+)
 from datahub.core.auth import PaaSIPAuthentication
 from datahub.core.hawk_receiver import (
     HawkAuthentication,
@@ -13,8 +21,37 @@ class ActivityViewSet(HawkResponseSigningMixin, CoreViewSet):
     Generic view for activities.
 
     Sets up authentication, permission and scope.
+
+    Activities are serialised from values() rows (see ActivitySerializer). These are only
+    fetched for the objects in the requested page (see get_page_queryset()), so queryset
+    should not use select_related() or prefetch_related().
+
+    The newest page is cached if ACTIVITY_STREAM_TAIL_PAGE_CACHE_ENABLED is set (see
+    datahub.activity_stream.tail_page_cache).
     """
 
     authentication_classes = (PaaSIPAuthentication, HawkAuthentication)
     permission_classes = (HawkScopePermission,)
     required_hawk_scope = HawkScope.activity_stream
+
+    def get_page_queryset(self, queryset):
+        """Gets a values() queryset with the fields used by the serializer."""
+        return self.get_serializer_class().get_values_queryset(queryset)
+
+    def list(self, request, *args, **kwargs):
+        """
+        Gets a page of activities (from the cache for the newest page if possible).
+
+        Cached pages are served without querying the database.
+        """
+        if not settings.ACTIVITY_STREAM_TAIL_PAGE_CACHE_ENABLED:
+            return super().list(request, *args, **kwargs)
+
+        cache_key = get_tail_page_cache_key(request, self.get_queryset().model)
+        cached_data = get_cached_tail_page(cache_key)
+        if cached_data is not None:
+            return Response(cached_data)
+
+        response = super().list(request, *args, **kwargs)
+        cache_tail_page(cache_key, response.data)
+        return response
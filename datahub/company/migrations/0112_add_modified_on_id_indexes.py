@@ -0,0 +1,21 @@
+# Generated by Django 3.1.12 on 2026-10-18 12:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('company', '0111_add_telephone_validation'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='company',
+            index=models.Index(fields=['modified_on', 'id'], name='company_com_modifie_16ce27_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='contact',
+            index=models.Index(fields=['modified_on', 'id'], name='company_con_modifie_c95a28_idx'),
+        ),
+    ]
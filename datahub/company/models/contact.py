@@ -105,6 +105,8 @@ class Contact(ArchivableModel, BaseModel):
         indexes = [
             # For datasets app which includes API endpoints to be consumed by data-flow
             models.Index(fields=('created_on', 'id')),
+            # For the modified_since query parameter of the datasets app
+            models.Index(fields=('modified_on', 'id')),
         ]
 
     @property
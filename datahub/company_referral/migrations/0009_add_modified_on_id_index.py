@@ -0,0 +1,17 @@
+# Generated by Django 3.1.12 on 2026-10-18 12:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('company_referral', '0008_add_help_text'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='companyreferral',
+            index=models.Index(fields=['modified_on', 'id'], name='company_ref_modifie_568254_idx'),
+        ),
+    ]
@@ -3,6 +3,7 @@ from functools import partial
 
 from django.conf import settings
 from django.core.cache import cache
+from django.http import FileResponse
 from mohawk import Receiver
 from mohawk.exc import HawkFail
 from rest_framework.authentication import BaseAuthentication
@@ -59,8 +60,15 @@ class HawkResponseSigningMixin:
         If the request was authenticated using Hawk, this adds a post-render callback to the
         response which sets the Server-Authorization header, so that the originator of the
         request can authenticate the response.
+
+        File responses aren't rendered, so these are instead signed straight away using the
+        file being streamed (which must be seekable).
         """
         finalized_response = super().finalize_response(request, response, *args, **kwargs)
+
+        if isinstance(finalized_response, FileResponse):
+            return _sign_file_response(request, finalized_response)
+
         callback = partial(_sign_rendered_response, request)
         finalized_response.add_post_render_callback(callback)
         return finalized_response
@@ -132,6 +140,18 @@ def _authorise(request):
     )
 
 
+def _sign_file_response(request, response):
+    if isinstance(request.successful_authenticator, HawkAuthentication):
+        file = response.file_to_stream
+        position = file.tell()
+        response['Server-Authorization'] = request.auth.respond(
+            content=file,
+            content_type=response['Content-Type'],
+        )
+        file.seek(position)
+    return response
+
+
 def _sign_rendered_response(request, response):
     if isinstance(request.successful_authenticator, HawkAuthentication):
         response['Server-Authorization'] = request.auth.respond(
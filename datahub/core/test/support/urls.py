@@ -1,6 +1,7 @@
 from django.urls import path
 
 from datahub.core.test.support.views import (
+    HawkFileView,
     HawkViewWithoutScope,
     HawkViewWithScope,
     max_upload_size_view,
@@ -43,6 +44,11 @@ urlpatterns = [
         HawkViewWithScope.as_view(),
         name='test-hawk-with-scope',
     ),
+    path(
+        'test-hawk-file/',
+        HawkFileView.as_view(),
+        name='test-hawk-file',
+    ),
     path(
         'test-paas-ip/',
         PaasIPView.as_view(),
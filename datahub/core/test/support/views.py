@@ -1,3 +1,6 @@
+from io import BytesIO
+
+from django.http import FileResponse
 from django.template.response import TemplateResponse
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
@@ -68,6 +71,17 @@ class HawkViewWithScope(HawkResponseSigningMixin, APIView):
         return Response({'content': 'hawk-test-view-with-scope'})
 
 
+class HawkFileView(HawkResponseSigningMixin, APIView):
+    """View using Hawk authentication that returns a file response."""
+
+    authentication_classes = (HawkAuthentication,)
+    permission_classes = ()
+
+    def get(self, request):
+        """Simple test view with a fixed file response."""
+        return FileResponse(BytesIO(b'hawk-test-file-view'), content_type='text/plain')
+
+
 class PaasIPView(APIView):
     """View using PaaS IP Authentication."""
 
@@ -27,6 +27,10 @@ def _url_with_scope():
     return 'http://testserver' + reverse('test-hawk-with-scope')
 
 
+def _url_file():
+    return 'http://testserver' + reverse('test-hawk-file')
+
+
 def _auth_sender(
     key_id='test-id-without-scope',
     secret_key='test-key-without-scope',
@@ -251,6 +255,31 @@ class TestHawkResponseSigningMixin:
                 content_type='incorrect',
             )
 
+    def test_signs_file_responses(self, api_client):
+        """Test that file responses are signed using the content of the file."""
+        sender = _auth_sender(url=_url_file)
+        response = api_client.get(
+            _url_file(),
+            content_type='',
+            HTTP_AUTHORIZATION=sender.request_header,
+        )
+
+        assert response.status_code == status.HTTP_200_OK
+
+        content = b''.join(response.streaming_content)
+        assert content == b'hawk-test-file-view'
+        sender.accept_response(
+            response_header=response['Server-Authorization'],
+            content=content,
+            content_type=response['Content-Type'],
+        )
+        with pytest.raises(mohawk.exc.MisComputedContentHash):
+            sender.accept_response(
+                response_header=response['Server-Authorization'],
+                content='incorrect',
+                content_type=response['Content-Type'],
+            )
+
     def test_does_not_sign_non_hawk_requests(self):
         """Test that a 403 is returned if the request is not authenticated using Hawk."""
         from rest_framework.test import force_authenticate
@@ -34,6 +34,7 @@ class TestAdviserDatasetViewSet(BaseDatasetViewTest):
 
     view_url = reverse('api-v4:dataset:advisers-dataset')
     factory = AdviserFactory
+    supports_modified_since = False
 
     def test_success(self, data_flow_api_client):
         """Test that endpoint returns with expected data for a single company"""
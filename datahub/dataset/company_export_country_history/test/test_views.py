@@ -28,6 +28,7 @@ class TestCompanyExportCountryHistoryDatasetView(BaseDatasetViewTest):
     """
 
     factory = CompanyExportCountryHistoryFactory
+    supports_modified_since = False
     view_url = reverse('api-v4:dataset:company-export-country-history-dataset')
 
     def test_success(self, data_flow_api_client):
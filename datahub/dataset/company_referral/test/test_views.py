@@ -26,6 +26,7 @@ def get_expected_data_from_company_referral(referral):
             if referral.interaction_id is not None
             else None
         ),
+        'modified_on': format_date_or_datetime(referral.modified_on),
         'notes': referral.notes,
         'recipient_id': str(referral.recipient_id),
         'status': str(referral.status),
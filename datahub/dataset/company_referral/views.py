@@ -19,6 +19,7 @@ class CompanyReferralDatasetView(BaseDatasetView):
             'created_by_id',
             'id',
             'interaction_id',
+            'modified_on',
             'notes',
             'recipient_id',
             'status',
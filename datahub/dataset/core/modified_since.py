@@ -0,0 +1,108 @@
+"""
+Incremental fetching of the records in a dataset that have changed since a particular time.
+
+When the modified_since query parameter is set (to a date and time), dataset views only return
+records with a modified_on value on or after that time, ordered by (modified_on, pk) instead of
+the ordering of the view's pagination class.
+
+The first page of the response also includes (as deleted) the IDs of the records that have
+been deleted since that time. These are taken from the deletion log (see
+datahub.dataset.signal_receivers), which only covers the models of datasets supporting this
+parameter. At most MAX_DELETED_IDS IDs are included; if there are more, deleted_until is set to
+the time of the first deletion not included, and the rest can be fetched by making another
+request with modified_since set to that time.
+
+Deletion log entries are only kept for settings.DATASET_DELETED_RECORD_RETENTION_DAYS days (see
+datahub.dataset.tasks), so modified_since can't be set to a time before that period. Clients
+that last fetched changes before then need to fetch the full dataset instead.
+
+The parameter is only supported by datasets whose model has a modified_on field (unless the
+view opts out, e.g. because its records are mostly built from related objects whose changes
+don't update modified_on). It cannot be combined with the stream query parameter (as deleted
+IDs can't be included in streamed responses).
+"""
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.exceptions import FieldDoesNotExist
+from django.utils.timezone import now
+from rest_framework.exceptions import ValidationError
+from rest_framework.fields import DateTimeField
+
+from datahub.dataset.models import DeletedRecord
+
+MODIFIED_SINCE_QUERY_PARAM = 'modified_since'
+MODIFIED_SINCE_ORDERING = ('modified_on', 'pk')
+DELETED_RESPONSE_KEY = 'deleted'
+DELETED_UNTIL_RESPONSE_KEY = 'deleted_until'
+MAX_DELETED_IDS = 10000
+
+
+def get_modified_since(request, is_supported):
+    """
+    Gets the value of the modified_since query parameter as an aware datetime.
+
+    None is returned if the query parameter is not set.
+    """
+    if MODIFIED_SINCE_QUERY_PARAM not in request.query_params:
+        return None
+
+    if not is_supported:
+        raise ValidationError({
+            MODIFIED_SINCE_QUERY_PARAM: ['Not supported by this dataset.'],
+        })
+
+    field = DateTimeField()
+    try:
+        modified_since = field.run_validation(request.query_params[MODIFIED_SINCE_QUERY_PARAM])
+    except ValidationError as exc:
+        raise ValidationError({MODIFIED_SINCE_QUERY_PARAM: exc.detail})
+
+    retention_days = settings.DATASET_DELETED_RECORD_RETENTION_DAYS
+    if modified_since < now() - timedelta(days=retention_days):
+        raise ValidationError({
+            MODIFIED_SINCE_QUERY_PARAM: [
+                f'Must be within the last {retention_days} days, as deleted records are only '
+                f'kept for that long.',
+            ],
+        })
+
+    return modified_since
+
+
+def get_deleted_ids(model, modified_since):
+    """
+    Gets the IDs of the objects of a model that have been deleted since a time.
+
+    At most MAX_DELETED_IDS IDs are returned. The time of the first deletion not returned is
+    also returned (or None if all IDs were returned).
+    """
+    deleted_records = list(
+        DeletedRecord.objects.filter(
+            model=model._meta.label_lower,
+            deleted_on__gte=modified_since,
+        ).order_by(
+            'deleted_on',
+            'pk',
+        ).values_list(
+            'object_id',
+            'deleted_on',
+        )[:MAX_DELETED_IDS + 1],
+    )
+
+    deleted_ids = [object_id for object_id, _ in deleted_records[:MAX_DELETED_IDS]]
+    deleted_until = None
+
+    if len(deleted_records) > MAX_DELETED_IDS:
+        _, deleted_until = deleted_records[MAX_DELETED_IDS]
+
+    return deleted_ids, deleted_until
+
+
+def has_modified_on_field(model):
+    """Checks whether a model has a modified_on field (and so supports modified_since)."""
+    try:
+        model._meta.get_field('modified_on')
+    except FieldDoesNotExist:
+        return False
+    return True
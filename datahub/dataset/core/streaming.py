@@ -0,0 +1,268 @@
+"""
+Streaming of whole datasets in a single response.
+
+Dataset views normally return pages of records, so pulling a large dataset takes many
+requests. When the stream query parameter is set (to ndjson or csv), records (after the
+watermark query parameter, if set) are instead returned in a single response.
+
+At most STREAM_MAX_LIMIT records are returned (or fewer if the limit query parameter is set),
+so that each response is generated well within request timeouts. Large datasets are pulled in
+a few large responses, by passing the watermark of each response to the next request until
+fewer records than the limit are returned.
+
+Records are read from the database using a server-side cursor and written (as
+newline-delimited JSON or gzip-compressed CSV) to a spooled temporary file, which is only
+written to disk once it gets large. The response is then streamed from that file. The body is
+generated before the response is sent so that it can be signed using Hawk (as the signature
+includes a hash of the body).
+
+Records are ordered by the ordering of the view's pagination class. The X-Dataset-Watermark
+response header contains the values of those fields for the last record. It can be passed back
+as the watermark query parameter to get the records after it (e.g. to resume an interrupted
+pull, or to get the next set of records when the limit has been reached). The header
+is omitted if there are no records, or if any of the values for the last record are null.
+"""
+import json
+from csv import DictWriter
+from datetime import date, time
+from functools import reduce
+from gzip import GzipFile
+from itertools import chain, islice
+from operator import or_
+from tempfile import SpooledTemporaryFile
+from typing import Callable, NamedTuple
+
+from django.core.exceptions import ValidationError as DjangoValidationError
+from django.db.models import Q
+from django.http import FileResponse
+from rest_framework.exceptions import ValidationError
+from rest_framework.fields import IntegerField
+from rest_framework.utils.encoders import JSONEncoder
+
+from datahub.core.utils import EchoUTF8
+
+STREAM_QUERY_PARAM = 'stream'
+WATERMARK_QUERY_PARAM = 'watermark'
+LIMIT_QUERY_PARAM = 'limit'
+WATERMARK_HEADER = 'X-Dataset-Watermark'
+WATERMARK_SEPARATOR = ','
+# The maximum (and default) number of records returned in a single response
+STREAM_MAX_LIMIT = 50000
+# The number of records fetched from the server-side cursor at a time (this is also the number
+# of records passed to the view's transformation hook at a time)
+STREAM_CHUNK_SIZE = 2000
+# The size at which the response body is written to disk (instead of being kept in memory)
+SPOOL_MAX_SIZE = 16 * 1024 * 1024
+RESPONSE_BLOCK_SIZE = 64 * 1024
+
+
+class StreamFormat(NamedTuple):
+    """A format that datasets can be streamed in."""
+
+    content_type: str
+    file_extension: str
+    write_rows: Callable
+
+
+def _write_ndjson(file, rows):
+    for row in rows:
+        data = json.dumps(row, cls=JSONEncoder, ensure_ascii=False, separators=(',', ':'))
+        file.write(data.encode('utf-8'))
+        file.write(b'\n')
+
+
+def _write_gzipped_csv(file, rows):
+    """
+    Writes rows as gzip-compressed CSV.
+
+    The column names are taken from the first row (so nothing is written if there are no
+    rows).
+    """
+    with GzipFile(fileobj=file, mode='wb') as gzip_file:
+        rows = iter(rows)
+        first_row = next(rows, None)
+        if first_row is None:
+            return
+
+        field_names = first_row.keys()
+        writer = DictWriter(EchoUTF8(), fieldnames=field_names)
+        gzip_file.write(writer.writerow({field_name: field_name for field_name in field_names}))
+
+        for row in chain((first_row,), rows):
+            gzip_file.write(writer.writerow(_transform_csv_row(row)))
+
+
+STREAM_FORMATS = {
+    'ndjson': StreamFormat(
+        content_type='application/x-ndjson',
+        file_extension='ndjson',
+        write_rows=_write_ndjson,
+    ),
+    'csv': StreamFormat(
+        content_type='application/gzip',
+        file_extension='csv.gz',
+        write_rows=_write_gzipped_csv,
+    ),
+}
+
+
+def create_stream_response(request, queryset, ordering, transform_rows):
+    """
+    Creates a response containing the records in a dataset (after the watermark in the
+    request, if there is one), up to the limit in the request or STREAM_MAX_LIMIT.
+
+    transform_rows is called with each chunk of records (as a list), and should return an
+    iterable of the rows to write.
+    """
+    stream_format = _get_stream_format(request)
+    queryset = _filter_by_watermark(
+        queryset,
+        ordering,
+        request.query_params.get(WATERMARK_QUERY_PARAM),
+    ).order_by(*ordering)
+
+    queryset = queryset[:_get_limit(request)]
+
+    last_row = None
+
+    def _iter_rows():
+        nonlocal last_row
+
+        records = queryset.iterator(chunk_size=STREAM_CHUNK_SIZE)
+        while True:
+            chunk = list(islice(records, STREAM_CHUNK_SIZE))
+            if not chunk:
+                return
+
+            last_row = chunk[-1]
+            yield from transform_rows(chunk)
+
+    file = SpooledTemporaryFile(max_size=SPOOL_MAX_SIZE)
+    try:
+        stream_format.write_rows(file, _iter_rows())
+    except Exception:
+        file.close()
+        raise
+
+    file.seek(0)
+    url_name = request.resolver_match.url_name if request.resolver_match else 'dataset'
+    response = FileResponse(
+        file,
+        as_attachment=True,
+        filename=f'{url_name}.{stream_format.file_extension}',
+        content_type=stream_format.content_type,
+    )
+    response.block_size = RESPONSE_BLOCK_SIZE
+
+    watermark = _get_watermark(last_row, ordering, queryset.model) if last_row else None
+    if watermark is not None:
+        response[WATERMARK_HEADER] = watermark
+
+    return response
+
+
+def _get_stream_format(request):
+    format_name = request.query_params[STREAM_QUERY_PARAM]
+    if format_name not in STREAM_FORMATS:
+        raise ValidationError({
+            STREAM_QUERY_PARAM: [f'Must be one of: {", ".join(STREAM_FORMATS)}.'],
+        })
+    return STREAM_FORMATS[format_name]
+
+
+def _get_limit(request):
+    if LIMIT_QUERY_PARAM not in request.query_params:
+        return STREAM_MAX_LIMIT
+
+    field = IntegerField(min_value=1, max_value=STREAM_MAX_LIMIT)
+    try:
+        return field.run_validation(request.query_params[LIMIT_QUERY_PARAM])
+    except ValidationError as exc:
+        raise ValidationError({LIMIT_QUERY_PARAM: exc.detail})
+
+
+def _filter_by_watermark(queryset, ordering, watermark):
+    """Filters a queryset so that it only contains records after a watermark."""
+    if not watermark:
+        return queryset
+
+    values = watermark.split(WATERMARK_SEPARATOR)
+    if len(values) != len(ordering):
+        raise ValidationError({
+            WATERMARK_QUERY_PARAM: [f'Must contain {len(ordering)} comma-separated values.'],
+        })
+
+    field_names = [field_name.lstrip('-') for field_name in ordering]
+    try:
+        values = [
+            _get_model_field(queryset.model, field_name).to_python(value)
+            for field_name, value in zip(field_names, values)
+        ]
+    except DjangoValidationError as exc:
+        raise ValidationError({WATERMARK_QUERY_PARAM: exc.messages})
+
+    after_lookups = [
+        f'{field_name.lstrip("-")}__{"lt" if field_name.startswith("-") else "gt"}'
+        for field_name in ordering
+    ]
+    # For ordering (a, b), this is equivalent to (a > value_a) OR (a = value_a AND b > value_b)
+    watermark_filter = reduce(
+        or_,
+        (
+            Q(**dict(zip(field_names[:index], values[:index])), **{lookup: values[index]})
+            for index, lookup in enumerate(after_lookups)
+        ),
+    )
+
+    return queryset.filter(watermark_filter)
+
+
+def _get_watermark(row, ordering, model):
+    values = [
+        _get_row_value(row, field_name.lstrip('-'), model)
+        for field_name in ordering
+    ]
+    if any(value is None for value in values):
+        return None
+
+    return WATERMARK_SEPARATOR.join(_format_value(value) for value in values)
+
+
+def _get_row_value(row, field_name, model):
+    """Gets the value of a field for a model instance or values() row."""
+    if not isinstance(row, dict):
+        return getattr(row, field_name)
+
+    if field_name == 'pk' and field_name not in row:
+        return row[model._meta.pk.attname]
+
+    return row[field_name]
+
+
+def _get_model_field(model, field_name):
+    if field_name == 'pk':
+        return model._meta.pk
+    return model._meta.get_field(field_name)
+
+
+def _transform_csv_row(row):
+    return {key: _transform_csv_value(value) for key, value in row.items()}
+
+
+def _transform_csv_value(value):
+    """
+    Transforms values before they are written to a CSV file.
+
+    Unlike datahub.core.csv.transform_csv_value(), this does not lose any precision (as the
+    files are intended to be loaded into other systems, rather than opened in Excel).
+    """
+    if isinstance(value, (list, dict)):
+        return json.dumps(value, cls=JSONEncoder, ensure_ascii=False)
+    return _format_value(value) if isinstance(value, (date, time)) else value
+
+
+def _format_value(value):
+    """Formats dates and times in the same way as in JSON responses."""
+    if isinstance(value, (date, time)):
+        return JSONEncoder().default(value)
+    return str(value)
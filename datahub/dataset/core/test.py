@@ -1,8 +1,27 @@
+import json
+from csv import DictReader
+from gzip import decompress
+from io import StringIO
 from unittest import mock
 
 import pytest
+from freezegun import freeze_time
 from rest_framework import status
 
+from datahub.dataset.core.streaming import STREAM_MAX_LIMIT, WATERMARK_HEADER
+
+
+def _get_paginated_results(client, url):
+    response = client.get(url, params={'page_size': 100})
+    assert response.status_code == status.HTTP_200_OK
+    return response.json()['results']
+
+
+def _get_streamed_content(client, url, **params):
+    response = client.get(url, params=params)
+    assert response.status_code == status.HTTP_200_OK
+    return response, b''.join(response.streaming_content)
+
 
 class BaseDatasetViewTest:
     """Base test class for dataset view tests.
@@ -14,6 +33,8 @@ class BaseDatasetViewTest:
 
     view_url = None
     factory = None
+    # Whether the dataset supports the modified_since query parameter
+    supports_modified_since = True
 
     @pytest.mark.parametrize('method', ('delete', 'patch', 'post', 'put'))
     def test_other_methods_not_allowed(
@@ -82,3 +103,113 @@ class BaseDatasetViewTest:
         assert response_for_page_size_10.status_code == status.HTTP_200_OK
         assert len(response_for_page_size_1.json()['results']) == 1
         assert len(response_for_page_size_10.json()['results']) == 2
+
+    def test_stream_ndjson(self, data_flow_api_client):
+        """Test that the streamed NDJSON records are the same as the paginated records."""
+        self.factory.create_batch(2)
+        response, content = _get_streamed_content(
+            data_flow_api_client,
+            self.view_url,
+            stream='ndjson',
+        )
+
+        assert response['Content-Type'] == 'application/x-ndjson'
+        assert 'Server-Authorization' in response
+        rows = [json.loads(line) for line in content.splitlines()]
+        assert rows
+        assert rows == _get_paginated_results(data_flow_api_client, self.view_url)
+
+    def test_stream_csv(self, data_flow_api_client):
+        """Test that all records are streamed as gzip-compressed CSV."""
+        self.factory.create_batch(2)
+        response, content = _get_streamed_content(
+            data_flow_api_client,
+            self.view_url,
+            stream='csv',
+        )
+
+        assert response['Content-Type'] == 'application/gzip'
+        rows = list(DictReader(StringIO(decompress(content).decode('utf-8'))))
+        paginated_results = _get_paginated_results(data_flow_api_client, self.view_url)
+        assert len(rows) == len(paginated_results)
+        assert list(rows[0].keys()) == list(paginated_results[0].keys())
+
+    def test_stream_resumes_from_watermark(self, data_flow_api_client):
+        """Test that records after the watermark of a previous response are streamed."""
+        self.factory.create_batch(2)
+        paginated_results = _get_paginated_results(data_flow_api_client, self.view_url)
+
+        response, content = _get_streamed_content(
+            data_flow_api_client,
+            self.view_url,
+            stream='ndjson',
+            limit=1,
+        )
+        assert [json.loads(line) for line in content.splitlines()] == paginated_results[:1]
+
+        response, content = _get_streamed_content(
+            data_flow_api_client,
+            self.view_url,
+            stream='ndjson',
+            watermark=response[WATERMARK_HEADER],
+        )
+        assert [json.loads(line) for line in content.splitlines()] == paginated_results[1:]
+
+    @mock.patch('datahub.dataset.core.streaming.STREAM_MAX_LIMIT', 1)
+    def test_stream_limits_records_by_default(self, data_flow_api_client):
+        """Test that at most STREAM_MAX_LIMIT records are streamed if no limit is specified."""
+        self.factory.create_batch(2)
+        paginated_results = _get_paginated_results(data_flow_api_client, self.view_url)
+
+        response, content = _get_streamed_content(
+            data_flow_api_client,
+            self.view_url,
+            stream='ndjson',
+        )
+        assert [json.loads(line) for line in content.splitlines()] == paginated_results[:1]
+
+    @pytest.mark.parametrize(
+        'params',
+        (
+            {'stream': 'xml'},
+            {'stream': 'ndjson', 'limit': '0'},
+            {'stream': 'ndjson', 'limit': str(STREAM_MAX_LIMIT + 1)},
+            {'stream': 'ndjson', 'watermark': 'invalid'},
+        ),
+    )
+    def test_stream_invalid_params(self, data_flow_api_client, params):
+        """Test that a 400 is returned for invalid streaming query parameters."""
+        response = data_flow_api_client.get(self.view_url, params=params)
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+    def test_modified_since(self, data_flow_api_client):
+        """Test that only records modified since the modified_since time are returned."""
+        if not self.supports_modified_since:
+            pytest.skip('modified_since is not supported by this dataset')
+
+        with freeze_time('2021-01-01 12:00:00'):
+            self.factory()
+        with freeze_time('2021-01-03 12:00:00'):
+            self.factory()
+
+        with freeze_time('2021-01-05 12:00:00'):
+            response = data_flow_api_client.get(
+                self.view_url,
+                params={'modified_since': '2021-01-02T00:00:00Z'},
+            )
+        assert response.status_code == status.HTTP_200_OK
+        response_data = response.json()
+        assert len(response_data['results']) == 1
+        assert response_data['deleted'] == []
+        assert response_data['deleted_until'] is None
+
+    def test_modified_since_not_supported(self, data_flow_api_client):
+        """Test that a 400 is returned for modified_since if the dataset does not support it."""
+        if self.supports_modified_since:
+            pytest.skip('modified_since is supported by this dataset')
+
+        response = data_flow_api_client.get(
+            self.view_url,
+            params={'modified_since': '2021-01-02T00:00:00Z'},
+        )
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
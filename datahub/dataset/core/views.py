@@ -1,3 +1,4 @@
+from rest_framework.exceptions import ValidationError
 from rest_framework.views import APIView
 
 from config.settings.types import HawkScope
@@ -7,27 +8,79 @@ from datahub.core.hawk_receiver import (
     HawkResponseSigningMixin,
     HawkScopePermission,
 )
+from datahub.dataset.core.modified_since import (
+    DELETED_RESPONSE_KEY,
+    DELETED_UNTIL_RESPONSE_KEY,
+    get_deleted_ids,
+    get_modified_since,
+    has_modified_on_field,
+    MODIFIED_SINCE_ORDERING,
+    MODIFIED_SINCE_QUERY_PARAM,
+)
 from datahub.dataset.core.pagination import DatasetCursorPagination
+from datahub.dataset.core.streaming import create_stream_response, STREAM_QUERY_PARAM
 
 
 class BaseDatasetView(HawkResponseSigningMixin, APIView):
     """
     Base API view to be used for creating endpoints for consumption
     by Data Flow and insertion into Data Workspace.
+
+    Records are paginated, unless the stream query parameter is set (see
+    datahub.dataset.core.streaming). The modified_since query parameter can be used to only
+    get the records that have changed since a particular time (see
+    datahub.dataset.core.modified_since).
     """
 
     authentication_classes = (PaaSIPAuthentication, HawkAuthentication)
     permission_classes = (HawkScopePermission, )
     required_hawk_scope = HawkScope.data_flow_api
     pagination_class = DatasetCursorPagination
+    # Whether the modified_since query parameter is supported (it also requires the model to
+    # have a modified_on field)
+    supports_modified_since = True
 
     def get(self, request):
         """Endpoint which serves all records for a specific Dataset"""
         dataset = self.get_dataset()
+        ordering = self.pagination_class.ordering
+        modified_since = get_modified_since(
+            request,
+            self.supports_modified_since and has_modified_on_field(dataset.model),
+        )
+
+        if modified_since is not None:
+            dataset = dataset.filter(modified_on__gte=modified_since)
+            ordering = MODIFIED_SINCE_ORDERING
+
+        if STREAM_QUERY_PARAM in request.query_params:
+            if modified_since is not None:
+                raise ValidationError({
+                    MODIFIED_SINCE_QUERY_PARAM: [
+                        f'Cannot be used with the {STREAM_QUERY_PARAM} query parameter.',
+                    ],
+                })
+
+            return create_stream_response(
+                request,
+                dataset,
+                ordering,
+                self._transform_streamed_rows,
+            )
+
         paginator = self.pagination_class()
+        paginator.ordering = ordering
         page = paginator.paginate_queryset(dataset, request, view=self)
         self._enrich_data(page)
-        return paginator.get_paginated_response(page)
+        response = paginator.get_paginated_response(page)
+
+        is_first_page = paginator.cursor_query_param not in request.query_params
+        if modified_since is not None and is_first_page:
+            deleted_ids, deleted_until = get_deleted_ids(dataset.model, modified_since)
+            response.data[DELETED_RESPONSE_KEY] = deleted_ids
+            response.data[DELETED_UNTIL_RESPONSE_KEY] = deleted_until
+
+        return response
 
     def _enrich_data(self, dataset):
         """
@@ -37,6 +90,15 @@ class BaseDatasetView(HawkResponseSigningMixin, APIView):
         """
         return dataset
 
+    def _transform_streamed_rows(self, rows):
+        """
+        Hook for transforming a chunk of records before they are streamed.
+        By default it enriches them using _enrich_data(), but can be changed in
+        subclasses if the pagination class also transforms records.
+        """
+        self._enrich_data(rows)
+        return rows
+
     def get_dataset(self):
         """Return a list of records"""
         raise NotImplementedError
@@ -25,6 +25,7 @@ def get_expected_data_from_event(event):
         'id': str(event.id),
         'lead_team_id': str(event.lead_team_id),
         'location_type__name': event.location_type.name,
+        'modified_on': format_date_or_datetime(event.modified_on),
         'name': event.name,
         'notes': event.notes,
         'organiser_id': str(event.organiser_id),
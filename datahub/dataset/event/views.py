@@ -36,6 +36,7 @@ class EventsDatasetView(BaseDatasetView):
             'id',
             'lead_team_id',
             'location_type__name',
+            'modified_on',
             'name',
             'notes',
             'organiser_id',
@@ -17,6 +17,7 @@ def get_expected_data_from_interaction_export_country(interaction_export_country
         'id': str(interaction_export_country.id),
         'interaction__company_id': str(interaction_export_country.interaction.company_id),
         'interaction__id': str(interaction_export_country.interaction_id),
+        'modified_on': format_date_or_datetime(interaction_export_country.modified_on),
         'status': interaction_export_country.status,
     }
 
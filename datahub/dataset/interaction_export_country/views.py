@@ -17,5 +17,6 @@ class InteractionsExportCountryDatasetView(BaseDatasetView):
             'id',
             'interaction__company_id',
             'interaction__id',
+            'modified_on',
             'status',
         )
@@ -13,6 +13,7 @@ from datahub.dataset.core.views import BaseDatasetView
 from datahub.dataset.investment_project.pagination import (
     InvestmentProjectActivityDatasetViewCursorPagination,
 )
+from datahub.dataset.investment_project.spi import SPIReportFormatter
 from datahub.investment.project.models import (
     InvestmentProject,
     InvestmentProjectStageLog,
@@ -162,7 +163,14 @@ class InvestmentProjectsActivityDatasetView(BaseDatasetView):
     """
 
     pagination_class = InvestmentProjectActivityDatasetViewCursorPagination
+    # Most of the SPI report fields come from related objects (such as propositions and
+    # interactions), whose changes don't update the modified_on value of the project
+    supports_modified_since = False
 
     def get_dataset(self):
         """Get dataset."""
         return get_spi_report_queryset()
+
+    def _transform_streamed_rows(self, rows):
+        """Formats records in the same way as the pagination class."""
+        return SPIReportFormatter().format(super()._transform_streamed_rows(rows))
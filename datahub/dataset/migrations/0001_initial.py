@@ -0,0 +1,31 @@
+# Generated by Django 3.1.12 on 2021-06-14 10:00
+
+from django.db import migrations, models
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DeletedRecord',
+            fields=[
+                ('id', models.BigAutoField(primary_key=True, serialize=False)),
+                ('model', models.CharField(max_length=255)),
+                ('object_id', models.CharField(max_length=255)),
+                ('deleted_on', models.DateTimeField(default=django.utils.timezone.now, editable=False)),
+            ],
+            options={
+                'ordering': ('deleted_on', 'pk'),
+            },
+        ),
+        migrations.AddIndex(
+            model_name='deletedrecord',
+            index=models.Index(fields=['model', 'deleted_on'], name='dataset_del_model_5dc59d_idx'),
+        ),
+    ]
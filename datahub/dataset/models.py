@@ -0,0 +1,29 @@
+from django.conf import settings
+from django.db import models
+from django.utils.timezone import now
+
+
+class DeletedRecord(models.Model):
+    """
+    Deletion log entry.
+
+    Records that an object in one of the datasets was deleted, so that consumers of the dataset
+    views can remove it when applying changes since a particular time (see the modified_since
+    query parameter of datahub.dataset.core.views.BaseDatasetView).
+    """
+
+    id = models.BigAutoField(primary_key=True)
+    # The label of the model of the object (e.g. company.company)
+    model = models.CharField(max_length=settings.CHAR_FIELD_MAX_LENGTH)
+    object_id = models.CharField(max_length=settings.CHAR_FIELD_MAX_LENGTH)
+    deleted_on = models.DateTimeField(default=now, editable=False)
+
+    def __str__(self):
+        """Human-friendly string representation."""
+        return f'{self.deleted_on} – {self.model} – {self.object_id}'
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['model', 'deleted_on']),
+        ]
+        ordering = ('deleted_on', 'pk')
@@ -37,6 +37,7 @@ def get_expected_data_from_order(order):
         'delivery_date': format_date_or_datetime(order.delivery_date),
         'id': str(order.id),
         'invoice__subtotal_cost': get_attr_or_none(order, 'invoice.subtotal_cost'),
+        'modified_on': format_date_or_datetime(order.modified_on),
         'paid_on': format_date_or_datetime(order.paid_on),
         'primary_market__name': get_attr_or_none(order, 'primary_market.name'),
         'quote__accepted_on': format_date_or_datetime(
@@ -34,6 +34,7 @@ class OMISDatasetView(BaseDatasetView):
             'delivery_date',
             'id',
             'invoice__subtotal_cost',
+            'modified_on',
             'paid_on',
             'primary_market__name',
             'quote__accepted_on',
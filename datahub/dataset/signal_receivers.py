@@ -0,0 +1,46 @@
+from django.db.models.signals import post_delete
+
+from datahub.company.models import Company, CompanyExportCountry, Contact
+from datahub.company_referral.models import CompanyReferral
+from datahub.dataset.models import DeletedRecord
+from datahub.event.models import Event
+from datahub.interaction.models import Interaction, InteractionExportCountry
+from datahub.investment.project.models import InvestmentProject
+from datahub.omis.order.models import Order
+from datahub.user.company_list.models import PipelineItem
+
+# The models of the datasets that support the modified_since query parameter (i.e. the ones
+# with a modified_on field)
+DATASET_MODELS = (
+    Company,
+    CompanyExportCountry,
+    CompanyReferral,
+    Contact,
+    Event,
+    Interaction,
+    InteractionExportCountry,
+    InvestmentProject,
+    Order,
+    PipelineItem,
+)
+
+
+def record_deletion(sender, instance, **kwargs):
+    """
+    Records the deletion of an object in a dataset.
+
+    This is called within the transaction of the deletion, so the record is only kept if the
+    deletion is committed. Objects deleted using a cascade are also recorded.
+    """
+    DeletedRecord.objects.create(
+        model=sender._meta.label_lower,
+        object_id=str(instance.pk),
+    )
+
+
+for model in DATASET_MODELS:
+    post_delete.connect(
+        record_deletion,
+        sender=model,
+        dispatch_uid=f'record_{model._meta.model_name}_deletion',
+    )
@@ -0,0 +1,42 @@
+from datetime import timedelta
+from logging import getLogger
+
+from celery import shared_task
+from django.conf import settings
+from django.db.models import Subquery
+from django.utils.timezone import now
+
+from datahub.dataset.models import DeletedRecord
+
+logger = getLogger(__name__)
+
+
+@shared_task(acks_late=True)
+def delete_old_deleted_records(batch_size=5000):
+    """
+    Task that deletes deletion log entries older than the retention period
+    (settings.DATASET_DELETED_RECORD_RETENTION_DAYS).
+
+    Entries are deleted in batches to avoid lengthy locks on a large number of rows.
+    """
+    cut_off = now() - timedelta(days=settings.DATASET_DELETED_RECORD_RETENTION_DAYS)
+
+    # Unevaluated subquery to select a batch of rows (the oldest entries have the lowest IDs)
+    subquery = DeletedRecord.objects.filter(
+        deleted_on__lt=cut_off,
+    ).order_by(
+        'pk',
+    ).values(
+        'pk',
+    )[:batch_size]
+
+    num_deleted, _ = DeletedRecord.objects.filter(pk__in=Subquery(subquery)).delete()
+
+    logger.info(f'{num_deleted} deletion log entries older than {cut_off} deleted')
+
+    # If there are definitely no more rows to delete, return
+    if num_deleted < batch_size:
+        return
+
+    # Schedule another task to delete another batch of rows
+    delete_old_deleted_records.apply_async(kwargs={'batch_size': batch_size})
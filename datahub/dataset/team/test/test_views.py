@@ -28,6 +28,7 @@ class TestTeamDatasetViewSet(BaseDatasetViewTest):
 
     view_url = reverse('api-v4:dataset:teams-dataset')
     factory = TeamFactory
+    supports_modified_since = False
 
     def test_success(self, data_flow_api_client):
         """Test that endpoint returns with expected data for a single company"""
@@ -0,0 +1,132 @@
+from urllib.parse import parse_qs, urlparse
+
+import pytest
+from freezegun import freeze_time
+from rest_framework import status
+from rest_framework.reverse import reverse
+
+from datahub.company.test.factories import ContactFactory
+
+REQUEST_TIME = '2021-01-05 12:00:00'
+
+
+@pytest.mark.django_db
+class TestModifiedSince:
+    """Tests for the modified_since query parameter of dataset views."""
+
+    view_url = reverse('api-v4:dataset:contacts-dataset')
+
+    def test_orders_by_modified_on(self, data_flow_api_client):
+        """Test that records are filtered and ordered using modified_on instead of created_on."""
+        with freeze_time('2021-01-01 12:00:00'):
+            ContactFactory()
+        with freeze_time('2021-01-02 12:00:00'):
+            contact_modified_last = ContactFactory()
+        with freeze_time('2021-01-03 12:00:00'):
+            contact_modified_first = ContactFactory()
+        with freeze_time('2021-01-04 12:00:00'):
+            contact_modified_last.save()
+
+        with freeze_time(REQUEST_TIME):
+            response = data_flow_api_client.get(
+                self.view_url,
+                params={'modified_since': '2021-01-02T00:00:00Z'},
+            )
+        assert response.status_code == status.HTTP_200_OK
+        assert [result['id'] for result in response.json()['results']] == [
+            str(contact_modified_first.pk),
+            str(contact_modified_last.pk),
+        ]
+
+    def test_includes_deleted_ids_in_first_page(self, data_flow_api_client):
+        """Test that the IDs of records deleted since modified_since are in the first page."""
+        with freeze_time('2021-01-01 12:00:00'):
+            ContactFactory.create_batch(2)
+            contact_deleted_first, contact_deleted_last = ContactFactory.create_batch(2)
+            contact_deleted_first_pk = str(contact_deleted_first.pk)
+            contact_deleted_first.delete()
+        with freeze_time('2021-01-03 12:00:00'):
+            contact_deleted_last_pk = str(contact_deleted_last.pk)
+            contact_deleted_last.delete()
+
+        with freeze_time(REQUEST_TIME):
+            response = data_flow_api_client.get(
+                self.view_url,
+                params={'modified_since': '2021-01-02T00:00:00Z'},
+            )
+        assert response.status_code == status.HTTP_200_OK
+        assert response.json() == {
+            'next': None,
+            'previous': None,
+            'results': [],
+            'deleted': [contact_deleted_last_pk],
+            'deleted_until': None,
+        }
+
+        params = {'modified_since': '2020-12-01T00:00:00Z', 'page_size': 1}
+        with freeze_time(REQUEST_TIME):
+            response = data_flow_api_client.get(self.view_url, params=params)
+        assert response.status_code == status.HTTP_200_OK
+        response_data = response.json()
+        assert len(response_data['results']) == 1
+        assert response_data['deleted'] == [contact_deleted_first_pk, contact_deleted_last_pk]
+
+        cursor = parse_qs(urlparse(response_data['next']).query)['cursor'][0]
+        with freeze_time(REQUEST_TIME):
+            response = data_flow_api_client.get(
+                self.view_url,
+                params={**params, 'cursor': cursor},
+            )
+        assert response.status_code == status.HTTP_200_OK
+        response_data = response.json()
+        assert len(response_data['results']) == 1
+        assert 'deleted' not in response_data
+
+    def test_limits_number_of_deleted_ids(self, data_flow_api_client, monkeypatch):
+        """
+        Test that at most MAX_DELETED_IDS deleted IDs are returned, and that the remaining ones
+        can be fetched using deleted_until.
+        """
+        monkeypatch.setattr('datahub.dataset.core.modified_since.MAX_DELETED_IDS', 2)
+        deleted_pks = []
+        for day in range(2, 5):
+            with freeze_time(f'2021-01-0{day} 12:00:00'):
+                contact = ContactFactory()
+                deleted_pks.append(str(contact.pk))
+                contact.delete()
+
+        with freeze_time(REQUEST_TIME):
+            response = data_flow_api_client.get(
+                self.view_url,
+                params={'modified_since': '2021-01-01T00:00:00Z'},
+            )
+        assert response.status_code == status.HTTP_200_OK
+        response_data = response.json()
+        assert response_data['deleted'] == deleted_pks[:2]
+        assert response_data['deleted_until'] == '2021-01-04T12:00:00Z'
+
+        with freeze_time(REQUEST_TIME):
+            response = data_flow_api_client.get(
+                self.view_url,
+                params={'modified_since': response_data['deleted_until']},
+            )
+        assert response.status_code == status.HTTP_200_OK
+        response_data = response.json()
+        assert response_data['deleted'] == deleted_pks[2:]
+        assert response_data['deleted_until'] is None
+
+    @pytest.mark.parametrize(
+        'params',
+        (
+            {'modified_since': 'invalid'},
+            {'modified_since': '2021-01-02T00:00:00Z', 'stream': 'ndjson'},
+            # Before the retention period of the deletion log
+            {'modified_since': '2020-10-06T12:00:00Z'},
+        ),
+    )
+    def test_invalid_params(self, data_flow_api_client, settings, params):
+        """Test that a 400 is returned for invalid modified_since query parameters."""
+        settings.DATASET_DELETED_RECORD_RETENTION_DAYS = 90
+        with freeze_time(REQUEST_TIME):
+            response = data_flow_api_client.get(self.view_url, params=params)
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
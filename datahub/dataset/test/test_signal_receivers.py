@@ -0,0 +1,59 @@
+import pytest
+from freezegun import freeze_time
+
+from datahub.company.models import Company
+from datahub.company.test.factories import CompanyFactory, ContactFactory
+from datahub.dataset.core.modified_since import has_modified_on_field
+from datahub.dataset.models import DeletedRecord
+from datahub.dataset.signal_receivers import DATASET_MODELS
+from datahub.dataset.urls import urlpatterns
+from datahub.metadata.test.factories import TeamFactory
+
+
+@pytest.mark.django_db
+class TestRecordDeletion:
+    """Tests for the deletion log signal receiver."""
+
+    @freeze_time('2021-01-01 12:00:00')
+    def test_records_deletion(self):
+        """Test that deleting an object in a dataset adds a record to the deletion log."""
+        contact = ContactFactory()
+        contact_pk = contact.pk
+        contact.delete()
+
+        deleted_record = DeletedRecord.objects.get()
+        assert deleted_record.model == 'company.contact'
+        assert deleted_record.object_id == str(contact_pk)
+        assert deleted_record.deleted_on.isoformat() == '2021-01-01T12:00:00+00:00'
+
+    def test_records_bulk_deletion(self):
+        """Test that deleting a queryset records each deleted object."""
+        companies = CompanyFactory.create_batch(2)
+        Company.objects.filter(
+            pk__in=[company.pk for company in companies],
+        ).delete()
+
+        assert {
+            deleted_record.object_id for deleted_record in DeletedRecord.objects.all()
+        } == {str(company.pk) for company in companies}
+
+    def test_ignores_other_models(self):
+        """Test that deleting an object not in a dataset does not add to the deletion log."""
+        TeamFactory().delete()
+
+        assert not DeletedRecord.objects.exists()
+
+
+def test_dataset_models_include_all_supporting_datasets():
+    """
+    Test that deletions are recorded for the models of all datasets that support the
+    modified_since query parameter.
+    """
+    view_classes = [pattern.callback.view_class for pattern in urlpatterns]
+    dataset_models = [view_class().get_dataset().model for view_class in view_classes]
+    supporting_models = {
+        model
+        for view_class, model in zip(view_classes, dataset_models)
+        if view_class.supports_modified_since and has_modified_on_field(model)
+    }
+    assert supporting_models == set(DATASET_MODELS)
@@ -0,0 +1,32 @@
+from datetime import timedelta
+
+import pytest
+from django.utils.timezone import now
+from freezegun import freeze_time
+
+from datahub.dataset.models import DeletedRecord
+from datahub.dataset.tasks import delete_old_deleted_records
+
+
+@pytest.mark.django_db
+class TestDeleteOldDeletedRecords:
+    """Tests for the delete_old_deleted_records task."""
+
+    @pytest.mark.parametrize('batch_size', (1, 2, 10))
+    def test_deletes_records_older_than_retention_period(self, settings, batch_size):
+        """
+        Test that deletion log entries older than the retention period are deleted (in
+        batches), and that newer entries are kept.
+        """
+        settings.DATASET_DELETED_RECORD_RETENTION_DAYS = 30
+        current_time = now()
+        with freeze_time(current_time - timedelta(days=31)):
+            for object_id in ('1', '2', '3'):
+                DeletedRecord.objects.create(model='company.contact', object_id=object_id)
+        with freeze_time(current_time - timedelta(days=29)):
+            DeletedRecord.objects.create(model='company.contact', object_id='4')
+
+        with freeze_time(current_time):
+            delete_old_deleted_records.apply(kwargs={'batch_size': batch_size})
+
+        assert list(DeletedRecord.objects.values_list('object_id', flat=True)) == ['4']
@@ -0,0 +1,17 @@
+# Generated by Django 3.1.12 on 2026-10-18 12:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('event', '0019_delete_old_tradeagreement'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='event',
+            index=models.Index(fields=['modified_on', 'id'], name='event_event_modifie_937d36_idx'),
+        ),
+    ]
@@ -76,6 +76,8 @@ class Event(BaseModel, DisableableModel):
         indexes = [
             # For datasets app which includes API endpoints to be consumed by data-flow
             models.Index(fields=('created_on', 'id')),
+            # For the modified_since query parameter of the datasets app
+            models.Index(fields=('modified_on', 'id')),
         ]
 
     def get_absolute_url(self):
@@ -0,0 +1,17 @@
+# Generated by Django 3.1.12 on 2026-10-18 12:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('investor_profile', '0001_squashed'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='largecapitalinvestorprofile',
+            index=models.Index(fields=['modified_on', 'id'], name='investor_pr_modifie_9b475a_idx'),
+        ),
+    ]
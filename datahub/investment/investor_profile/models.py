@@ -154,6 +154,10 @@ class LargeCapitalInvestorProfile(BaseModel):
         permissions = (
             ('export_largecapitalinvestorprofile', 'Can export large capital investor profiles'),
         )
+        indexes = [
+            # For activity stream
+            models.Index(fields=('modified_on', 'id')),
+        ]
 
     def __str__(self):
         """Human-readable representation"""
@@ -0,0 +1,17 @@
+# Generated by Django 3.1.12 on 2026-10-18 12:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('opportunity', '0003_add_export_permission'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='largecapitalopportunity',
+            index=models.Index(fields=['modified_on', 'id'], name='opportunity_modifie_fd6bba_idx'),
+        ),
+    ]
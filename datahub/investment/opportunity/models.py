@@ -171,6 +171,10 @@ class LargeCapitalOpportunity(BaseModel):
         permissions = (
             ('export_largecapitalopportunity', 'Can export large capital opportunity'),
         )
+        indexes = [
+            # For activity stream
+            models.Index(fields=('modified_on', 'id')),
+        ]
 
     def get_absolute_url(self):
         """URL to the object in the Data Hub internal front end."""
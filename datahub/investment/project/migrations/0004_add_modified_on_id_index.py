@@ -0,0 +1,17 @@
+# Generated by Django 3.1.12 on 2026-10-18 12:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('investment', '0003_remove_change_stage_to_won_permission'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='investmentproject',
+            index=models.Index(fields=['modified_on', 'id'], name='investment__modifie_30238e_idx'),
+        ),
+    ]
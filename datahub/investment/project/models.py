@@ -543,6 +543,8 @@ class InvestmentProject(
         indexes = [
             # For activity stream
             models.Index(fields=('created_on', 'id')),
+            # For the modified_since query parameter of the datasets app
+            models.Index(fields=('modified_on', 'id')),
         ]
 
     @cached_property
@@ -304,6 +304,8 @@ class Order(BaseModel):
         indexes = [
             # For activity stream
             models.Index(fields=('created_on', 'id')),
+            # For the modified_since query parameter of the datasets app
+            models.Index(fields=('modified_on', 'id')),
         ]
 
     def __str__(self):
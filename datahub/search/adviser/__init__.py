@@ -0,0 +1,3 @@
+from datahub.search.adviser.apps import AdviserSearchApp
+
+__all__ = ('AdviserSearchApp',)
@@ -0,0 +1,21 @@
+from datahub.company.models import Advisor as DBAdvisor
+from datahub.search.adviser.models import Adviser
+from datahub.search.apps import SearchApp
+
+
+class AdviserSearchApp(SearchApp):
+    """
+    SearchApp for advisers.
+
+    This is only used for typeahead searches (and not in global search).
+    """
+
+    name = 'adviser'
+    es_model = Adviser
+    exclude_from_global_search = True
+    # Advisers don't have a modified_on field
+    incremental_sync_fields = ()
+    view_permissions = ('company.view_advisor',)
+    queryset = DBAdvisor.objects.select_related(
+        'dit_team',
+    )
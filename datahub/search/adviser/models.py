@@ -0,0 +1,41 @@
+from elasticsearch_dsl import Boolean, Keyword, Object, Text
+
+from datahub.search import dict_utils, fields
+from datahub.search.models import BaseESModel
+
+
+class Adviser(BaseESModel):
+    """Elasticsearch representation of Advisor model."""
+
+    id = Keyword()
+    first_name = fields.NormalizedKeyword()
+    last_name = fields.NormalizedKeyword()
+    name = Text(
+        fields={
+            'keyword': fields.NormalizedKeyword(),
+            'trigram': fields.TrigramText(),
+            'typeahead': fields.TypeaheadText(),
+        },
+    )
+    dit_team = Object(
+        properties={
+            'id': Keyword(),
+            'name': Text(
+                fields={
+                    'keyword': fields.NormalizedKeyword(),
+                    'typeahead': fields.TypeaheadText(),
+                },
+            ),
+        },
+    )
+    is_active = Boolean()
+
+    MAPPINGS = {
+        'dit_team': dict_utils.id_name_dict,
+    }
+
+    SEARCH_FIELDS = (
+        'name',
+        'name.trigram',
+        'dit_team.name',
+    )
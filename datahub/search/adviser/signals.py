@@ -0,0 +1,44 @@
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+
+from datahub.company.models import Advisor as DBAdvisor
+from datahub.metadata.models import Team as DBTeam
+from datahub.search.adviser import AdviserSearchApp
+from datahub.search.adviser.models import Adviser as ESAdviser
+from datahub.search.deletion import delete_document
+from datahub.search.signals import SignalReceiver
+from datahub.search.sync_object import sync_object_async, sync_related_objects_async
+
+# Fields that aren't part of adviser documents, and are updated frequently (on login)
+UNINDEXED_UPDATE_FIELDS = frozenset({'last_login'})
+
+
+def adviser_sync_es(instance, update_fields=None, **kwargs):
+    """Sync adviser to Elasticsearch (unless only unindexed fields were updated)."""
+    if update_fields and update_fields <= UNINDEXED_UPDATE_FIELDS:
+        return
+
+    transaction.on_commit(
+        lambda: sync_object_async(AdviserSearchApp, instance.pk),
+    )
+
+
+def remove_adviser_from_es(instance):
+    """Remove adviser from Elasticsearch."""
+    transaction.on_commit(
+        lambda pk=instance.pk: delete_document(ESAdviser, pk),
+    )
+
+
+def sync_related_advisers_to_es(instance):
+    """Sync advisers in a team (e.g. when the team is renamed)."""
+    transaction.on_commit(
+        lambda: sync_related_objects_async(instance, 'advisor_set'),
+    )
+
+
+receivers = (
+    SignalReceiver(post_save, DBAdvisor, adviser_sync_es, forward_kwargs=True),
+    SignalReceiver(post_save, DBTeam, sync_related_advisers_to_es),
+    SignalReceiver(post_delete, DBAdvisor, remove_adviser_from_es),
+)
@@ -0,0 +1,64 @@
+from elasticsearch_dsl import Mapping
+
+from datahub.search.adviser import AdviserSearchApp
+
+
+def test_mapping(es):
+    """Test the ES mapping for an adviser."""
+    mapping = Mapping.from_es(
+        AdviserSearchApp.es_model.get_write_index(),
+    )
+
+    assert mapping.to_dict() == {
+        'properties': {
+            '_document_type': {
+                'type': 'keyword',
+            },
+            'dit_team': {
+                'properties': {
+                    'id': {'type': 'keyword'},
+                    'name': {
+                        'type': 'text',
+                        'fields': {
+                            'keyword': {
+                                'normalizer': 'lowercase_asciifolding_normalizer',
+                                'type': 'keyword',
+                            },
+                            'typeahead': {
+                                'max_shingle_size': 3,
+                                'type': 'search_as_you_type',
+                            },
+                        },
+                    },
+                },
+                'type': 'object',
+            },
+            'first_name': {
+                'normalizer': 'lowercase_asciifolding_normalizer',
+                'type': 'keyword',
+            },
+            'id': {'type': 'keyword'},
+            'is_active': {'type': 'boolean'},
+            'last_name': {
+                'normalizer': 'lowercase_asciifolding_normalizer',
+                'type': 'keyword',
+            },
+            'name': {
+                'type': 'text',
+                'fields': {
+                    'keyword': {
+                        'normalizer': 'lowercase_asciifolding_normalizer',
+                        'type': 'keyword',
+                    },
+                    'trigram': {
+                        'analyzer': 'trigram_analyzer',
+                        'type': 'text',
+                    },
+                    'typeahead': {
+                        'max_shingle_size': 3,
+                        'type': 'search_as_you_type',
+                    },
+                },
+            },
+        },
+    }
@@ -0,0 +1,37 @@
+import pytest
+
+from datahub.company.test.factories import AdviserFactory
+from datahub.search.adviser import AdviserSearchApp
+from datahub.search.adviser.models import Adviser as ESAdviser
+
+pytestmark = pytest.mark.django_db
+
+
+def test_adviser_dbmodel_to_dict(es):
+    """Tests conversion of db model to dict."""
+    adviser = AdviserFactory()
+    db_adviser = AdviserSearchApp.queryset.get(pk=adviser.pk)
+
+    result = ESAdviser.db_object_to_dict(db_adviser)
+
+    assert result == {
+        '_document_type': AdviserSearchApp.name,
+        'id': adviser.pk,
+        'first_name': adviser.first_name,
+        'last_name': adviser.last_name,
+        'name': adviser.name,
+        'dit_team': {
+            'id': str(adviser.dit_team.pk),
+            'name': adviser.dit_team.name,
+        },
+        'is_active': adviser.is_active,
+    }
+
+
+def test_adviser_dbmodels_to_es_documents(es):
+    """Tests conversion of db models to Elasticsearch documents."""
+    advisers = AdviserFactory.create_batch(2)
+
+    result = ESAdviser.db_objects_to_es_documents(advisers)
+
+    assert len(list(result)) == len(advisers)
@@ -0,0 +1,67 @@
+from unittest.mock import Mock
+
+import pytest
+from django.utils.timezone import now
+
+from datahub.company.test.factories import AdviserFactory
+from datahub.search.adviser import AdviserSearchApp
+from datahub.search.test.utils import get_documents_by_ids
+
+pytestmark = pytest.mark.django_db
+
+
+def test_adviser_auto_sync_to_es(es_with_signals):
+    """Tests if adviser gets synced to Elasticsearch."""
+    adviser = AdviserFactory(first_name='very_hard_to_find_adviser')
+    es_with_signals.indices.refresh()
+
+    result = get_documents_by_ids(es_with_signals, AdviserSearchApp, [adviser.pk])
+
+    document = result['docs'][0]
+    assert document['found']
+    assert document['_source']['first_name'] == 'very_hard_to_find_adviser'
+
+
+def test_adviser_auto_updates_to_es_when_team_renamed(es_with_signals):
+    """Tests if advisers get updated in Elasticsearch when their team is renamed."""
+    adviser = AdviserFactory()
+    team = adviser.dit_team
+    team.name = 'very_hard_to_find_team'
+    team.save()
+    es_with_signals.indices.refresh()
+
+    result = get_documents_by_ids(es_with_signals, AdviserSearchApp, [adviser.pk])
+
+    assert result['docs'][0]['_source']['dit_team'] == {
+        'id': str(team.pk),
+        'name': 'very_hard_to_find_team',
+    }
+
+
+def test_adviser_not_synced_when_only_last_login_updated(es_with_signals, monkeypatch):
+    """Tests that advisers aren't synced when only their last login time changes."""
+    adviser = AdviserFactory()
+    sync_object_async_mock = Mock()
+    monkeypatch.setattr(
+        'datahub.search.adviser.signals.sync_object_async',
+        sync_object_async_mock,
+    )
+
+    adviser.last_login = now()
+    adviser.save(update_fields=('last_login',))
+
+    assert not sync_object_async_mock.called
+
+
+def test_adviser_deleted_from_es(es_with_signals):
+    """Tests if adviser gets deleted from Elasticsearch when deleted."""
+    adviser = AdviserFactory()
+    es_with_signals.indices.refresh()
+    adviser_id = adviser.pk
+
+    adviser.delete()
+    es_with_signals.indices.refresh()
+
+    result = get_documents_by_ids(es_with_signals, AdviserSearchApp, [adviser_id])
+
+    assert not result['docs'][0]['found']
@@ -0,0 +1,150 @@
+import pytest
+from rest_framework import status
+from rest_framework.reverse import reverse
+
+from datahub.company.test.factories import AdviserFactory
+from datahub.core.test_utils import APITestMixin, create_test_user
+from datahub.metadata.test.factories import TeamFactory
+from datahub.search.adviser import AdviserSearchApp
+
+pytestmark = [
+    pytest.mark.django_db,
+    # Index objects for this search app only
+    pytest.mark.es_collector_apps.with_args(AdviserSearchApp),
+]
+
+
+@pytest.fixture
+def setup_data(es_with_collector):
+    """Sets up data for the tests."""
+    advisers = [
+        AdviserFactory(
+            first_name='Alexandra',
+            last_name='Hamilton',
+            dit_team=TeamFactory(name='Healthcare sector team'),
+        ),
+        AdviserFactory(
+            first_name='Alex',
+            last_name='Duncan',
+            dit_team=TeamFactory(name='Digital trade team'),
+        ),
+        AdviserFactory(
+            first_name='Hamish',
+            last_name='Wright',
+            dit_team=TeamFactory(name='Aerospace team'),
+        ),
+    ]
+    es_with_collector.flush_and_refresh()
+
+    yield advisers
+
+
+class TestAdviserTypeaheadView(APITestMixin):
+    """Tests for the adviser typeahead view."""
+
+    def test_no_permissions(self, es):
+        """Should return 403."""
+        user = create_test_user(dit_team=TeamFactory())
+        api_client = self.create_api_client(user=user)
+        url = reverse('api-v4:search:adviser-typeahead')
+
+        response = api_client.get(url, {'term': 'ale'})
+
+        assert response.status_code == status.HTTP_403_FORBIDDEN
+
+    @pytest.mark.parametrize(
+        'term,expected_names',
+        (
+            # Prefix of the first word
+            ('ale', {'Alexandra Hamilton', 'Alex Duncan'}),
+            # Complete first word and prefix of the second word
+            ('alex dun', {'Alex Duncan'}),
+            # Prefix of the last name
+            ('ham', {'Alexandra Hamilton', 'Hamish Wright'}),
+            # Prefix of a team name
+            ('aero', {'Hamish Wright'}),
+            # Case and whitespace are normalised
+            ('  HAMISH   wr ', {'Hamish Wright'}),
+            ('xyz', set()),
+        ),
+    )
+    def test_search(self, setup_data, term, expected_names):
+        """Test that advisers are matched by prefixes of their name and team name."""
+        url = reverse('api-v4:search:adviser-typeahead')
+
+        response = self.api_client.get(url, {'term': term})
+
+        assert response.status_code == status.HTTP_200_OK
+        results = response.json()['results']
+        assert {result['name'] for result in results} == expected_names
+
+    def test_response_body(self, setup_data):
+        """Test that only the typeahead fields are returned."""
+        adviser = setup_data[2]
+        url = reverse('api-v4:search:adviser-typeahead')
+
+        response = self.api_client.get(url, {'term': 'hamish'})
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.json() == {
+            'results': [
+                {
+                    'id': str(adviser.pk),
+                    'name': adviser.name,
+                    'first_name': adviser.first_name,
+                    'last_name': adviser.last_name,
+                    'is_active': adviser.is_active,
+                    'dit_team': {
+                        'id': str(adviser.dit_team.pk),
+                        'name': adviser.dit_team.name,
+                    },
+                },
+            ],
+        }
+
+    def test_limit(self, setup_data):
+        """Test that the number of results can be limited."""
+        url = reverse('api-v4:search:adviser-typeahead')
+
+        response = self.api_client.get(url, {'term': 'ale', 'limit': 1})
+
+        assert response.status_code == status.HTTP_200_OK
+        assert len(response.json()['results']) == 1
+
+    @pytest.mark.parametrize(
+        'query,expected_errors',
+        (
+            ({}, {'term': ['This field is required.']}),
+            (
+                {'term': 'a' * 101},
+                {'term': ['Ensure this field has no more than 100 characters.']},
+            ),
+            (
+                {'term': 'ale', 'limit': 51},
+                {'limit': ['Ensure this value is less than or equal to 50.']},
+            ),
+        ),
+    )
+    def test_validation(self, es, query, expected_errors):
+        """Test that invalid query parameters are rejected."""
+        url = reverse('api-v4:search:adviser-typeahead')
+
+        response = self.api_client.get(url, query)
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert response.json() == expected_errors
+
+    def test_caches_response(self, setup_data, local_memory_cache, settings, monkeypatch):
+        """Test that responses are cached for each term."""
+        settings.SEARCH_TYPEAHEAD_CACHE_TIMEOUT = 10
+        url = reverse('api-v4:search:adviser-typeahead')
+        response = self.api_client.get(url, {'term': 'ale'})
+
+        def _fail(*args, **kwargs):
+            raise AssertionError('Elasticsearch should not be queried')
+
+        monkeypatch.setattr('datahub.search.views.execute_search_query', _fail)
+        cached_response = self.api_client.get(url, {'term': 'ALE '})
+
+        assert cached_response.status_code == status.HTTP_200_OK
+        assert cached_response.json() == response.json()
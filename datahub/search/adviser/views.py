@@ -0,0 +1,26 @@
+from datahub.search.adviser import AdviserSearchApp
+from datahub.search.views import register_v4_view, SearchTypeaheadAPIView
+
+
+@register_v4_view(sub_path='typeahead')
+class SearchAdviserTypeaheadAPIView(SearchTypeaheadAPIView):
+    """
+    Adviser typeahead search view.
+
+    Terms are matched against adviser names and team names (like the autocomplete filter of
+    the adviser list view).
+    """
+
+    search_app = AdviserSearchApp
+    typeahead_fields = (
+        'name.typeahead',
+        'dit_team.name.typeahead',
+    )
+    fields_to_include = (
+        'id',
+        'name',
+        'first_name',
+        'last_name',
+        'is_active',
+        'dit_team',
+    )
@@ -15,6 +15,9 @@ class SearchApp:
     name = None
     es_model = None
     bulk_batch_size = 2000
+    # Timestamp fields (which can span relationships) used to find objects that have changed
+    # since the last incremental sync. An empty sequence disables incremental syncing.
+    incremental_sync_fields = ('modified_on',)
 
     queryset = None
     exclude_from_global_search = False
@@ -171,3 +174,6 @@ class SearchConfig(AppConfig):
                 app.connect_signals()
 
             app.load_views()
+
+        # Connects the signal receivers that invalidate cached search permissions
+        import datahub.search.permission_cache  # noqa: F401
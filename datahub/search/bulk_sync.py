@@ -1,12 +1,24 @@
+from concurrent.futures import ThreadPoolExecutor
 from logging import getLogger
+from time import perf_counter
+
+from django.core.cache import cache
+from django.db import connections
 
 from datahub.core.utils import slice_iterable_into_chunks
-from datahub.search.elasticsearch import bulk
+from datahub.search.elasticsearch import parallel_bulk
+from datahub.search.metrics import record_bulk_write
+from datahub.search.result_cache import invalidate_search_result_cache
+from datahub.search.utils import get_dual_write_indices
 
 logger = getLogger(__name__)
 
 PROGRESS_INTERVAL = 20000
 BULK_INDEX_TIMEOUT_SECS = 300
+# Completed partitions are remembered for long enough for a redelivered (acks_late) task to
+# pick up where the previous attempt stopped
+PARTITION_CHECKPOINT_TIMEOUT_SECS = 2 * 24 * 60 * 60
+PARTITION_COMPLETE = 'complete'
 
 
 def sync_app(search_app, batch_size=None, post_batch_callback=None):
@@ -56,19 +68,222 @@ def sync_app(search_app, batch_size=None, post_batch_callback=None):
         )
 
 
-def sync_objects(es_model, model_objects, read_indices, write_index, post_batch_callback=None):
-    """Syncs an iterable of model instances to Elasticsearch."""
-    actions = list(
-        es_model.db_objects_to_es_documents(model_objects, index=write_index),
+def get_pk_partitions(search_app, partition_size, run_id=None):
+    """
+    Splits the primary keys of a search app's queryset into contiguous ranges of (roughly)
+    partition_size rows each.
+
+    Each partition is returned as a (start_pk, end_pk) tuple, where start_pk is inclusive and
+    end_pk is exclusive. None is used for the open ends of the first and last partitions, so
+    that rows created after the partitions were calculated are still included.
+
+    Primary keys are returned as strings so that partitions can be passed to Celery tasks.
+
+    If a run_id is specified, the partitions are cached so that a resumed run uses the same
+    partitions (and hence the same checkpoints) as the original one.
+    """
+    partitions_key = f'search-sync-partitions:{run_id}' if run_id else None
+    if partitions_key:
+        cached_partitions = cache.get(partitions_key)
+        if cached_partitions is not None:
+            return cached_partitions
+
+    pks = search_app.queryset.order_by('pk').values_list('pk', flat=True).iterator(
+        chunk_size=partition_size,
     )
-    num_actions = len(actions)
-    bulk(
-        actions=actions,
-        chunk_size=num_actions,
+    boundaries = [
+        str(pk) for index, pk in enumerate(pks)
+        if index and index % partition_size == 0
+    ]
+    partitions = list(zip([None, *boundaries], [*boundaries, None]))
+
+    if partitions_key:
+        cache.set(partitions_key, partitions, PARTITION_CHECKPOINT_TIMEOUT_SECS)
+
+    return partitions
+
+
+def is_partition_complete(run_id, partition):
+    """Returns whether a partition was fully synced as part of a particular run."""
+    return cache.get(_partition_checkpoint_key(run_id, partition)) == PARTITION_COMPLETE
+
+
+def sync_app_partition(
+    search_app,
+    partition,
+    run_id=None,
+    batch_size=None,
+    post_batch_callback=None,
+):
+    """
+    Syncs the objects for an app in a single primary key range (as returned by
+    get_pk_partitions()) to Elasticsearch.
+
+    Objects are synced in primary key order. If a run_id is specified, the last primary key
+    synced is checkpointed after every batch so that, if the sync is interrupted, a later call
+    with the same run_id resumes from where the previous one stopped.
+
+    Returns the number of objects synced.
+    """
+    model_name = search_app.es_model.__name__
+    batch_size = batch_size or search_app.bulk_batch_size
+    start_pk, end_pk = partition
+    checkpoint_key = _partition_checkpoint_key(run_id, partition) if run_id else None
+    last_synced_pk = cache.get(checkpoint_key) if checkpoint_key else None
+
+    if last_synced_pk == PARTITION_COMPLETE:
+        logger.info(f'{model_name} partition {_format_partition(partition)} already synced')
+        return 0
+
+    queryset = search_app.queryset.order_by('pk')
+    if last_synced_pk is not None:
+        logger.info(
+            f'Resuming {model_name} partition {_format_partition(partition)} after '
+            f'{last_synced_pk}',
+        )
+        queryset = queryset.filter(pk__gt=last_synced_pk)
+    elif start_pk is not None:
+        queryset = queryset.filter(pk__gte=start_pk)
+
+    if end_pk is not None:
+        queryset = queryset.filter(pk__lt=end_pk)
+
+    read_indices, write_index = search_app.es_model.get_read_and_write_indices()
+
+    num_objects_synced = 0
+    start_time = perf_counter()
+    it = queryset.values_list('pk', flat=True).iterator(chunk_size=batch_size)
+    for batch in slice_iterable_into_chunks(it, batch_size):
+        objs = search_app.queryset.filter(pk__in=batch)
+        num_objects_synced += sync_objects(
+            search_app.es_model,
+            objs,
+            read_indices,
+            write_index,
+            post_batch_callback=post_batch_callback,
+        )
+
+        if checkpoint_key:
+            cache.set(checkpoint_key, str(batch[-1]), PARTITION_CHECKPOINT_TIMEOUT_SECS)
+
+    if checkpoint_key:
+        cache.set(checkpoint_key, PARTITION_COMPLETE, PARTITION_CHECKPOINT_TIMEOUT_SECS)
+
+    duration = perf_counter() - start_time
+    rate = num_objects_synced / duration if duration else 0
+    logger.info(
+        f'{model_name} partition {_format_partition(partition)}: {num_objects_synced} objects '
+        f'synced in {duration:.1f}s ({rate:.0f} objects/s)',
+    )
+    return num_objects_synced
+
+
+def sync_app_in_partitions(
+    search_app,
+    partition_size,
+    num_workers,
+    run_id=None,
+    post_batch_callback=None,
+):
+    """
+    Syncs objects for an app to Elasticsearch by splitting its primary keys into partitions and
+    syncing them concurrently using a pool of num_workers threads.
+
+    If a run_id is specified, progress is checkpointed (see sync_app_partition()) so that
+    calling this function again with the same run_id skips work that has already been done.
+    """
+    model_name = search_app.es_model.__name__
+    partitions = get_pk_partitions(search_app, partition_size, run_id=run_id)
+    logger.info(
+        f'Processing {model_name} records in {len(partitions)} partitions using '
+        f'{num_workers} workers',
+    )
+
+    def _sync_partition(partition):
+        try:
+            return sync_app_partition(
+                search_app,
+                partition,
+                run_id=run_id,
+                post_batch_callback=post_batch_callback,
+            )
+        finally:
+            # Each thread gets its own database connection, which must be explicitly closed
+            connections.close_all()
+
+    start_time = perf_counter()
+    with ThreadPoolExecutor(max_workers=num_workers) as executor:
+        num_objects_synced = sum(executor.map(_sync_partition, partitions))
+
+    duration = perf_counter() - start_time
+    rate = num_objects_synced / duration if duration else 0
+    logger.info(
+        f'{model_name}: {num_objects_synced} objects synced in {duration:.1f}s '
+        f'({rate:.0f} objects/s)',
+    )
+    return num_objects_synced
+
+
+def sync_objects(es_model, model_objects, read_indices, write_index, post_batch_callback=None):
+    """
+    Syncs an iterable of model instances to Elasticsearch.
+
+    Documents are generated lazily and streamed to Elasticsearch using concurrent bulk
+    requests, so that serialisation overlaps with indexing and only a bounded number of
+    documents are held in memory at any one time.
+
+    If a migration using the Elasticsearch reindex API is in progress, documents are also
+    written to the old index (which is still used for searches).
+
+    The size, duration and rate of the bulk write are recorded as metrics (see
+    datahub.search.metrics), and cached search responses for the search model are
+    invalidated.
+
+    post_batch_callback, if specified, is called with the read indices, the write index and a
+    list of the synced documents (with only the _id key populated). Only documents that
+    Elasticsearch accepted for the write index are included (and counted).
+    """
+    synced_ids = []
+    dual_write_indices = get_dual_write_indices(read_indices, write_index)
+
+    def _generate_actions():
+        for action in es_model.db_objects_to_es_documents(model_objects, index=write_index):
+            yield action
+
+            for index in dual_write_indices:
+                yield {**action, '_index': index}
+
+    def _record_synced_item(item):
+        # Items are keyed by the type of operation (e.g. {'index': {'_id': ..., ...}})
+        (item_result,) = item.values()
+        # Writes to the old index during a reindex migration are not counted
+        if item_result['_index'] == write_index:
+            synced_ids.append(item_result['_id'])
+
+    start_time = perf_counter()
+    parallel_bulk(
+        actions=_generate_actions(),
         request_timeout=BULK_INDEX_TIMEOUT_SECS,
+        success_callback=_record_synced_item,
     )
+    duration = perf_counter() - start_time
+
+    if synced_ids:
+        record_bulk_write(es_model.get_app_name(), len(synced_ids), duration)
+        invalidate_search_result_cache(es_model.get_app_name())
 
     if post_batch_callback:
-        post_batch_callback(read_indices, write_index, actions)
+        synced_docs = [{'_id': synced_id} for synced_id in synced_ids]
+        post_batch_callback(read_indices, write_index, synced_docs)
+
+    return len(synced_ids)
+
+
+def _format_partition(partition):
+    start_pk, end_pk = partition
+    return f'[{start_pk}, {end_pk})'
+
 
-    return num_actions
+def _partition_checkpoint_key(run_id, partition):
+    start_pk, end_pk = partition
+    return f'search-sync-partition:{run_id}:{start_pk}:{end_pk}'
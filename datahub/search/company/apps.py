@@ -13,6 +13,11 @@ class CompanySearchApp(SearchApp):
     es_model = Company
     view_permissions = (f'company.{CompanyPermission.view_company}',)
     export_permission = f'company.{CompanyPermission.export_company}'
+    incremental_sync_fields = (
+        'modified_on',
+        'interactions__modified_on',
+        'global_headquarters__modified_on',
+    )
     queryset = DBCompany.objects.select_related(
         'archived_by',
         'business_type',
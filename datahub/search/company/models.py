@@ -43,6 +43,7 @@ class Company(BaseESModel):
         fields={
             'keyword': fields.NormalizedKeyword(),
             'trigram': fields.TrigramText(),
+            'typeahead': fields.TypeaheadText(),
         },
     )
     reference_code = fields.NormalizedKeyword()
@@ -50,7 +51,12 @@ class Company(BaseESModel):
     address = fields.address_field()
     registered_address = fields.address_field()
     one_list_group_global_account_manager = _adviser_field_with_indexed_id()
-    trading_names = fields.TextWithTrigram()
+    trading_names = Text(
+        fields={
+            'trigram': fields.TrigramText(),
+            'typeahead': fields.TypeaheadText(),
+        },
+    )
     turnover_range = fields.id_name_field()
     uk_region = fields.id_name_field()
     uk_based = Boolean()
@@ -63,6 +69,10 @@ class Company(BaseESModel):
     export_segment = Text()
     export_sub_segment = Text()
 
+    PREFETCH_LOOKUPS = (
+        'export_countries__country',
+    )
+
     COMPUTED_MAPPINGS = {
         'address': partial(dict_utils.address_dict, prefix='address'),
         'registered_address': partial(dict_utils.address_dict, prefix='registered_address'),
@@ -148,6 +148,10 @@ def test_mapping(es):
                         'analyzer': 'trigram_analyzer',
                         'type': 'text',
                     },
+                    'typeahead': {
+                        'max_shingle_size': 3,
+                        'type': 'search_as_you_type',
+                    },
                 },
             },
             'reference_code': {
@@ -301,6 +305,10 @@ def test_mapping(es):
                         'analyzer': 'trigram_analyzer',
                         'type': 'text',
                     },
+                    'typeahead': {
+                        'max_shingle_size': 3,
+                        'type': 'search_as_you_type',
+                    },
                 },
             },
             'turnover_range': {
@@ -490,19 +498,10 @@ def test_limited_get_search_by_entity_query():
                                     },
                                 },
                                 {
-                                    'bool': {
-                                        'should': [
-                                            {
-                                                'match': {
-                                                    'address.country.id': {
-                                                        'query':
-                                                            '80756b9a-5d95-e211-a939-e4115bead28a',
-                                                        'operator': 'and',
-                                                    },
-                                                },
-                                            },
+                                    'terms': {
+                                        'address.country.id': [
+                                            '80756b9a-5d95-e211-a939-e4115bead28a',
                                         ],
-                                        'minimum_should_match': 1,
                                     },
                                 }, {
                                     'range': {
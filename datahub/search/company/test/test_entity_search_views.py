@@ -1174,3 +1174,62 @@ class TestCompanyExportView(APITestMixin):
         ]
 
         assert list(dict(row) for row in reader) == format_csv_data(expected_row_data)
+
+
+class TestCompanyTypeaheadView(APITestMixin):
+    """Tests for the company typeahead view."""
+
+    @pytest.mark.parametrize(
+        'term,expected_names',
+        (
+            ('bla', {'Blackwater Engineering', 'Blue Sky Logistics'}),
+            ('blackwater eng', {'Blackwater Engineering'}),
+            # Prefix of a trading name
+            ('horiz', {'Blue Sky Logistics'}),
+            ('xyz', set()),
+        ),
+    )
+    def test_search(self, es_with_collector, term, expected_names):
+        """Test that companies are matched by prefixes of their name and trading names."""
+        CompanyFactory(name='Blackwater Engineering', trading_names=[])
+        CompanyFactory(name='Blue Sky Logistics', trading_names=['Blanc Horizon'])
+        es_with_collector.flush_and_refresh()
+
+        url = reverse('api-v4:search:company-typeahead')
+        response = self.api_client.get(url, {'term': term})
+
+        assert response.status_code == status.HTTP_200_OK
+        results = response.json()['results']
+        assert {result['name'] for result in results} == expected_names
+
+    def test_response_body(self, es_with_collector):
+        """Test that only the typeahead fields are returned."""
+        company = CompanyFactory(
+            name='Blackwater Engineering',
+            trading_names=['Blackwater'],
+            address_town='Bristol',
+            address_country_id=constants.Country.united_kingdom.value.id,
+        )
+        es_with_collector.flush_and_refresh()
+
+        url = reverse('api-v4:search:company-typeahead')
+        response = self.api_client.get(url, {'term': 'blackwater'})
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.json() == {
+            'results': [
+                {
+                    'id': str(company.pk),
+                    'name': company.name,
+                    'trading_names': company.trading_names,
+                    'archived': company.archived,
+                    'address': {
+                        'town': 'Bristol',
+                        'country': {
+                            'id': str(company.address_country.pk),
+                            'name': company.address_country.name,
+                        },
+                    },
+                },
+            ],
+        }
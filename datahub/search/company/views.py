@@ -25,6 +25,7 @@ from datahub.search.views import (
     register_v4_view,
     SearchAPIView,
     SearchExportAPIView,
+    SearchTypeaheadAPIView,
 )
 
 
@@ -237,3 +238,22 @@ class SearchCompanyExportAPIView(SearchCompanyAPIViewMixin, SearchExportAPIView)
             'upper_headquarter_type_name': 'Headquarter type',
         })
         return field_titles
+
+
+@register_v4_view(sub_path='typeahead')
+class SearchCompanyTypeaheadAPIView(SearchTypeaheadAPIView):
+    """Company typeahead search view."""
+
+    search_app = CompanySearchApp
+    typeahead_fields = (
+        'name.typeahead',
+        'trading_names.typeahead',
+    )
+    fields_to_include = (
+        'id',
+        'name',
+        'trading_names',
+        'archived',
+        'address.town',
+        'address.country',
+    )
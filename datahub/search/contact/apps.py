@@ -10,6 +10,10 @@ class ContactSearchApp(SearchApp):
     es_model = Contact
     view_permissions = (f'company.{ContactPermission.view_contact}',)
     export_permission = f'company.{ContactPermission.export_contact}'
+    incremental_sync_fields = (
+        'modified_on',
+        'company__modified_on',
+    )
     queryset = DBContact.objects.select_related(
         'title',
         'company',
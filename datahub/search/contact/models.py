@@ -45,6 +45,7 @@ class Contact(BaseESModel):
         fields={
             'keyword': fields.NormalizedKeyword(),
             'trigram': fields.TrigramText(),
+            'typeahead': fields.TypeaheadText(),
         },
     )
     notes = fields.EnglishText()
@@ -54,6 +55,10 @@ class Contact(BaseESModel):
     telephone_number = Keyword()
     title = fields.id_name_field()
 
+    PREFETCH_LOOKUPS = (
+        'created_by__dit_team',
+    )
+
     MAPPINGS = {
         'adviser': dict_utils.contact_or_adviser_dict,
         'archived_by': dict_utils.contact_or_adviser_dict,
@@ -229,6 +229,10 @@ def test_mapping(es):
                         'analyzer': 'trigram_analyzer',
                         'type': 'text',
                     },
+                    'typeahead': {
+                        'max_shingle_size': 3,
+                        'type': 'search_as_you_type',
+                    },
                 },
             },
             'notes': {
@@ -424,19 +428,10 @@ def test_get_limited_search_by_entity_query():
                                     },
                                 },
                                 {
-                                    'bool': {
-                                        'should': [
-                                            {
-                                                'match': {
-                                                    'address_country.id': {
-                                                        'query':
-                                                            '80756b9a-5d95-e211-a939-e4115bead28a',
-                                                        'operator': 'and',
-                                                    },
-                                                },
-                                            },
+                                    'terms': {
+                                        'address_country.id': [
+                                            '80756b9a-5d95-e211-a939-e4115bead28a',
                                         ],
-                                        'minimum_should_match': 1,
                                     },
                                 }, {
                                     'range': {
@@ -768,3 +768,54 @@ class TestBasicSearch(APITestMixin):
             assert v == result[k]
 
         assert contact.address_country.name == result['address_country']['name']
+
+
+class TestContactTypeaheadView(APITestMixin):
+    """Tests for the contact typeahead view."""
+
+    @pytest.mark.parametrize(
+        'term,expected_names',
+        (
+            ('jan', {'Janet Roberts', 'Jane Robinson'}),
+            ('jane rob', {'Jane Robinson'}),
+            ('robe', {'Janet Roberts'}),
+            ('xyz', set()),
+        ),
+    )
+    def test_search(self, es_with_collector, term, expected_names):
+        """Test that contacts are matched by prefixes of their name."""
+        company = CompanyFactory()
+        ContactFactory(first_name='Janet', last_name='Roberts', company=company)
+        ContactFactory(first_name='Jane', last_name='Robinson', company=company)
+        es_with_collector.flush_and_refresh()
+
+        url = reverse('api-v4:search:contact-typeahead')
+        response = self.api_client.get(url, {'term': term})
+
+        assert response.status_code == status.HTTP_200_OK
+        results = response.json()['results']
+        assert {result['name'] for result in results} == expected_names
+
+    def test_response_body(self, es_with_collector):
+        """Test that only the typeahead fields are returned."""
+        contact = ContactFactory(first_name='Janet', last_name='Roberts')
+        es_with_collector.flush_and_refresh()
+
+        url = reverse('api-v4:search:contact-typeahead')
+        response = self.api_client.get(url, {'term': 'janet'})
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.json() == {
+            'results': [
+                {
+                    'id': str(contact.pk),
+                    'name': contact.name,
+                    'job_title': contact.job_title,
+                    'archived': contact.archived,
+                    'company': {
+                        'id': str(contact.company.pk),
+                        'name': contact.company.name,
+                    },
+                },
+            ],
+        }
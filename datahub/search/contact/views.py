@@ -18,7 +18,13 @@ from datahub.interaction.models import Interaction as DBInteraction
 from datahub.metadata.query_utils import get_sector_name_subquery
 from datahub.search.contact import ContactSearchApp
 from datahub.search.contact.serializers import SearchContactQuerySerializer
-from datahub.search.views import register_v3_view, SearchAPIView, SearchExportAPIView
+from datahub.search.views import (
+    register_v3_view,
+    register_v4_view,
+    SearchAPIView,
+    SearchExportAPIView,
+    SearchTypeaheadAPIView,
+)
 
 
 class SearchContactAPIViewMixin:
@@ -89,9 +95,6 @@ class SearchContactExportAPIView(SearchContactAPIViewMixin, SearchExportAPIView)
 
     consent_page_size = 100
 
-    db_sort_by_remappings = {
-        'address_country.name': 'computed_country_name',
-    }
     queryset = DBContact.objects.annotate(
         name=get_full_name_expression(),
         link=get_front_end_url_expression('contact', 'pk'),
@@ -167,23 +170,39 @@ class SearchContactExportAPIView(SearchContactAPIViewMixin, SearchExportAPIView)
                 row['accepts_dit_email_marketing'] = consent_lookups.get(row['email'], False)
                 yield row
 
-    def _get_rows(self, ids, search_ordering):
+    def _get_rows(self, ids):
         """
-        Get row queryset for constent service.
+        Get rows with consent from the consent service.
 
-        This populates accepts_dit_email_marketing field from the consent service and
-        removes the accepts_dit_email_marketing from the field query because the field is not in
-        the db.
+        This populates accepts_dit_email_marketing field from the consent service.
         """
-        db_ordering = self._translate_search_ordering_to_django_ordering(search_ordering)
-        field_titles = self.field_titles.copy()
-        del field_titles['accepts_dit_email_marketing']
-        rows = self.queryset.filter(
-            pk__in=ids,
-        ).order_by(
-            *db_ordering,
-        ).values(
-            *field_titles,
-        ).iterator()
-
+        rows = super()._get_rows(ids)
         return self._add_consent_response(rows)
+
+    def _get_db_field_names(self):
+        """
+        Gets the names of the fields to fetch from the database.
+
+        accepts_dit_email_marketing is removed because the field is not in the db.
+        """
+        return [
+            field for field in self.field_titles if field != 'accepts_dit_email_marketing'
+        ]
+
+
+@register_v4_view(sub_path='typeahead')
+class SearchContactTypeaheadAPIView(SearchTypeaheadAPIView):
+    """Contact typeahead search view."""
+
+    search_app = ContactSearchApp
+    typeahead_fields = (
+        'name.typeahead',
+    )
+    fields_to_include = (
+        'id',
+        'name',
+        'job_title',
+        'archived',
+        'company.id',
+        'company.name',
+    )
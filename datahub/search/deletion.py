@@ -7,7 +7,9 @@ from django.db.models.signals import post_delete, pre_delete
 from datahub.core.exceptions import DataHubException
 from datahub.search.apps import get_search_app_by_model, get_search_apps
 from datahub.search.elasticsearch import bulk, get_client
+from datahub.search.result_cache import invalidate_search_result_cache
 from datahub.search.signals import SignalReceiver
+from datahub.search.utils import get_dual_write_indices
 
 
 BULK_DELETION_TIMEOUT_SECS = 300
@@ -120,7 +122,10 @@ class Collector:
     def _delete_from_es(self):
         for model, es_docs in self.deletions.items():
             search_app = get_search_app_by_model(model)
-            delete_documents(search_app.es_model.get_write_alias(), es_docs)
+            for index in _get_indices_to_delete_from(search_app.es_model):
+                delete_documents(index, es_docs)
+
+            invalidate_search_result_cache(search_app.name)
 
     def delete_from_es(self):
         """Deletes all the deleted django models from ES."""
@@ -158,7 +163,7 @@ def delete_document(model, document_id, indices=None, ignore_404_responses=True)
     """Deletes specified model's document."""
     client = get_client()
     if indices is None:
-        indices = [model.get_write_alias()]
+        indices = _get_indices_to_delete_from(model)
     ignored_response_statuses = (404,) if ignore_404_responses else ()
 
     for index in indices:
@@ -167,3 +172,16 @@ def delete_document(model, document_id, indices=None, ignore_404_responses=True)
             id=document_id,
             ignore=ignored_response_statuses,
         )
+
+    invalidate_search_result_cache(model.get_app_name())
+
+
+def _get_indices_to_delete_from(es_model):
+    """
+    Gets the indices that documents should be deleted from.
+
+    This is normally just the write alias, but also includes the old index during a migration
+    using the Elasticsearch reindex API (as documents are written to both indices).
+    """
+    read_indices, write_index = es_model.get_read_and_write_indices(use_cache=True)
+    return [es_model.get_write_alias(), *get_dual_write_indices(read_indices, write_index)]
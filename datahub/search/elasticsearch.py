@@ -1,14 +1,31 @@
+from concurrent.futures import ThreadPoolExecutor
 from contextlib import contextmanager
+from datetime import datetime, timezone
+from itertools import chain
 from logging import getLogger
+from threading import BoundedSemaphore, Event
+from time import monotonic
+from typing import NamedTuple
 
 from django.conf import settings
-from elasticsearch.helpers import bulk as es_bulk
+from django.core.cache import cache
+from elasticsearch.helpers import (
+    bulk as es_bulk,
+    scan as es_scan,
+    streaming_bulk as es_streaming_bulk,
+)
 from elasticsearch_dsl import analysis, Index
 from elasticsearch_dsl.connections import connections
 
+from datahub.core.utils import slice_iterable_into_chunks
+
 
 logger = getLogger(__name__)
 
+ALIAS_CACHE_TIMEOUT_SECS = 60
+# Shared (Django cache) counter incremented whenever aliases are changed
+ALIAS_VERSION_CACHE_KEY = 'search-alias-version'
+
 
 # Normalises values to improve sorting (by keeping e, E, è, ê etc. together)
 lowercase_asciifolding_normalizer = analysis.normalizer(
@@ -157,6 +174,16 @@ def index_exists(index_name):
     return client.indices.exists(index_name)
 
 
+class _CachedAliasIndices(NamedTuple):
+    indices: list
+    alias_version: int
+    expires_at: float
+
+
+# Process-local cache of alias-to-index lookups
+_alias_cache = {}
+
+
 def create_index(index_name, mapping, alias_names=()):
     """
     Creates an index, initialises it with a mapping, and optionally associates aliases with it.
@@ -178,12 +205,16 @@ def create_index(index_name, mapping, alias_names=()):
 
     index.create()
 
+    if alias_names:
+        invalidate_alias_cache()
+
 
 def delete_index(index_name):
     """Deletes an index."""
     logger.info(f'Deleting the {index_name} index...')
     client = get_client()
     client.indices.delete(index_name)
+    invalidate_alias_cache()
 
 
 def get_indices_for_aliases(*alias_names):
@@ -199,6 +230,48 @@ def get_indices_for_aliases(*alias_names):
     return [alias_to_index_mapping[alias_name] for alias_name in alias_names]
 
 
+def get_cached_indices_for_aliases(*alias_names):
+    """
+    Gets the indices referenced by one or more aliases, using a process-local cache.
+
+    Results are cached for up to ALIAS_CACHE_TIMEOUT_SECS. They are also discarded as soon as
+    aliases are changed by any process (such as during a migration), as alias changes increment
+    a version number stored in the (shared) Django cache.
+    """
+    alias_version = cache.get(ALIAS_VERSION_CACHE_KEY, 0)
+    cached_value = _alias_cache.get(alias_names)
+
+    if (
+        cached_value
+        and cached_value.alias_version == alias_version
+        and cached_value.expires_at > monotonic()
+    ):
+        return cached_value.indices
+
+    indices = get_indices_for_aliases(*alias_names)
+    _alias_cache[alias_names] = _CachedAliasIndices(
+        indices,
+        alias_version,
+        monotonic() + ALIAS_CACHE_TIMEOUT_SECS,
+    )
+    return indices
+
+
+def invalidate_alias_cache():
+    """
+    Discards cached alias-to-index lookups in all processes.
+
+    This is called automatically when aliases are changed using the functions in this module.
+    """
+    _alias_cache.clear()
+
+    try:
+        cache.incr(ALIAS_VERSION_CACHE_KEY)
+    except ValueError:
+        # The key doesn't exist yet
+        cache.set(ALIAS_VERSION_CACHE_KEY, 1, timeout=None)
+
+
 def get_aliases_for_index(index_name):
     """Gets the aliases referencing an index."""
     client = get_client()
@@ -217,6 +290,86 @@ def delete_alias(alias_name):
     logger.info(f'Deleting the {alias_name} alias...')
     client = get_client()
     client.indices.delete_alias('_all', alias_name)
+    invalidate_alias_cache()
+
+
+def get_index_mapping(index_name):
+    """Gets the mapping of an index (as returned by Elasticsearch)."""
+    client = get_client()
+    response = client.indices.get_mapping(index=index_name)
+    return response[index_name]['mappings']
+
+
+def get_index_creation_time(index_name):
+    """Gets the time an index was created (as an aware datetime)."""
+    client = get_client()
+    response = client.indices.get_settings(index=index_name, name='index.creation_date')
+    creation_timestamp_ms = int(response[index_name]['settings']['index']['creation_date'])
+    return datetime.fromtimestamp(creation_timestamp_ms / 1000, tz=timezone.utc)
+
+
+def get_document_count(index_name, refresh=False):
+    """
+    Gets the number of documents in an index.
+
+    If refresh is True, the index is refreshed first so that recent changes are included.
+    """
+    client = get_client()
+    if refresh:
+        client.indices.refresh(index=index_name)
+    return client.count(index=index_name)['count']
+
+
+def get_document_ids(index_name):
+    """Returns a generator of the IDs of all documents in an index (using a scroll)."""
+    hits = es_scan(
+        get_client(),
+        index=index_name,
+        query={'query': {'match_all': {}}},
+        _source=False,
+    )
+    return (hit['_id'] for hit in hits)
+
+
+def start_reindex(source_index_name, dest_index_name, slices='auto'):
+    """
+    Starts copying all documents from one index to another using the reindex API.
+
+    Documents that already exist in the destination index are left as they are (so that
+    documents written to the destination index while the reindex is in progress are not
+    overwritten with older copies).
+
+    This returns immediately with the ID of the Elasticsearch task performing the reindex
+    (see get_task()).
+    """
+    client = get_client()
+    response = client.reindex(
+        body={
+            'conflicts': 'proceed',
+            'source': {
+                'index': source_index_name,
+            },
+            'dest': {
+                'index': dest_index_name,
+                'op_type': 'create',
+            },
+        },
+        slices=slices,
+        wait_for_completion=False,
+    )
+    return response['task']
+
+
+def get_task(task_id):
+    """Gets information about an Elasticsearch task (e.g. one started by start_reindex())."""
+    client = get_client()
+    return client.tasks.get(task_id=task_id)
+
+
+def cancel_task(task_id):
+    """Cancels an Elasticsearch task (e.g. one started by start_reindex())."""
+    client = get_client()
+    client.tasks.cancel(task_id=task_id)
 
 
 class _AliasUpdater:
@@ -251,6 +404,7 @@ class _AliasUpdater:
             'actions': self.actions,
         })
         self.actions = []
+        invalidate_alias_cache()
 
 
 @contextmanager
@@ -285,6 +439,7 @@ def associate_index_with_alias(alias_name, index_name):
     """
     client = get_client()
     client.indices.put_alias(index_name, alias_name)
+    invalidate_alias_cache()
 
 
 def bulk(
@@ -301,3 +456,126 @@ def bulk(
         max_chunk_bytes=max_chunk_bytes,
         **kwargs,
     )
+
+
+def parallel_bulk(
+    actions,
+    chunk_size=500,
+    max_chunk_bytes=settings.ES_BULK_MAX_CHUNK_BYTES,
+    thread_count=settings.ES_BULK_THREAD_COUNT,
+    queue_size=settings.ES_BULK_QUEUE_SIZE,
+    max_retries=settings.ES_BULK_MAX_RETRIES,
+    initial_backoff=2,
+    max_backoff=60,
+    success_callback=None,
+    **kwargs,
+):
+    """
+    Send data in bulk to Elasticsearch using concurrent requests.
+
+    actions can be any iterable (including a generator) and is consumed lazily in chunks of
+    chunk_size. Up to thread_count chunks are sent concurrently, and up to queue_size further
+    chunks are buffered; once that limit is reached, consumption of actions pauses until a
+    request completes.
+
+    Each chunk is further split so that no request exceeds max_chunk_bytes. Items rejected by
+    Elasticsearch because it's overloaded (429 responses) are retried up to max_retries times
+    with an exponential back-off (starting at initial_backoff seconds), rather than failing the
+    whole operation.
+
+    If sending a chunk raises an exception, no further chunks are sent and the exception is
+    re-raised (once the chunks already being sent have completed).
+
+    As with bulk(), the return value is a tuple of the number of successful actions and a list
+    of errors (which is only non-empty if raise_on_error=False is passed). If specified,
+    success_callback is called (possibly from multiple threads) with each successful item in
+    the bulk responses (e.g. {'index': {'_index': ..., '_id': ..., ...}}).
+    """
+    client = get_client()
+    streaming_bulk_kwargs = {
+        'chunk_size': chunk_size,
+        'max_chunk_bytes': max_chunk_bytes,
+        'max_retries': max_retries,
+        'initial_backoff': initial_backoff,
+        'max_backoff': max_backoff,
+        **kwargs,
+    }
+
+    def _send_chunk(chunk):
+        return _send_bulk_chunk(client, chunk, streaming_bulk_kwargs, success_callback)
+
+    chunks = slice_iterable_into_chunks(actions, chunk_size)
+    first_chunk = next(chunks, None)
+    second_chunk = next(chunks, None)
+
+    if first_chunk is None:
+        return 0, []
+
+    # Avoid the overhead of the thread pool for small operations (e.g. syncing a single object)
+    if second_chunk is None:
+        return _send_chunk(first_chunk)
+
+    return _send_bulk_chunks_concurrently(
+        _send_chunk,
+        chain((first_chunk, second_chunk), chunks),
+        thread_count,
+        queue_size,
+    )
+
+
+def _send_bulk_chunks_concurrently(send_chunk, chunks, thread_count, queue_size):
+    """
+    Sends chunks of actions using a thread pool (see parallel_bulk()).
+
+    Sending stops after a chunk raises an exception.
+    """
+    semaphore = BoundedSemaphore(thread_count + queue_size)
+    chunk_failed = Event()
+
+    def _send_chunk_and_release(chunk):
+        try:
+            return send_chunk(chunk)
+        except Exception:
+            chunk_failed.set()
+            raise
+        finally:
+            semaphore.release()
+
+    futures = []
+    with ThreadPoolExecutor(max_workers=thread_count) as executor:
+        for chunk in chunks:
+            semaphore.acquire()
+            if chunk_failed.is_set():
+                break
+            futures.append(executor.submit(_send_chunk_and_release, chunk))
+
+        if chunk_failed.is_set():
+            # Chunks that haven't started yet are not sent
+            for future in futures:
+                future.cancel()
+
+    return _combine_bulk_results(
+        future.result() for future in futures if not future.cancelled()
+    )
+
+
+def _send_bulk_chunk(client, chunk, streaming_bulk_kwargs, success_callback):
+    num_successful = 0
+    errors = []
+    for ok, item in es_streaming_bulk(client, chunk, **streaming_bulk_kwargs):
+        if ok:
+            num_successful += 1
+            if success_callback:
+                success_callback(item)
+        else:
+            errors.append(item)
+    return num_successful, errors
+
+
+def _combine_bulk_results(results):
+    num_successful = 0
+    errors = []
+    for chunk_num_successful, chunk_errors in results:
+        num_successful += chunk_num_successful
+        errors.extend(chunk_errors)
+    return num_successful, errors
@@ -3,6 +3,7 @@ from urllib.parse import urlparse
 
 from django.conf import settings
 from elasticsearch.exceptions import ConnectionError
+from elasticsearch_dsl import MultiSearch
 
 from datahub.core.exceptions import APIBadGatewayException
 from datahub.core.utils import log_to_sentry
@@ -19,10 +20,44 @@ def execute_search_query(query):
     try:
         response = query.params(request_timeout=settings.ES_SEARCH_REQUEST_TIMEOUT).execute()
     except ConnectionError:
-        raise APIBadGatewayException(
-            f'Upstream service unavailable: {urlparse(settings.ES_URL).netloc}',
-        )
+        raise _get_bad_gateway_exception()
 
+    _log_query_if_slow(query, response)
+    return response
+
+
+def execute_multi_search_query(queries):
+    """
+    Executes several Elasticsearch queries in a single request using the multi-search API.
+
+    The responses are returned in the same order as the queries. As with
+    execute_search_query(), the globally configured request timeout is used and slow queries
+    are logged.
+    """
+    multi_search = MultiSearch()
+    for query in queries:
+        multi_search = multi_search.add(query)
+
+    try:
+        responses = multi_search.params(
+            request_timeout=settings.ES_SEARCH_REQUEST_TIMEOUT,
+        ).execute()
+    except ConnectionError:
+        raise _get_bad_gateway_exception()
+
+    for query, response in zip(queries, responses):
+        _log_query_if_slow(query, response)
+
+    return responses
+
+
+def _get_bad_gateway_exception():
+    return APIBadGatewayException(
+        f'Upstream service unavailable: {urlparse(settings.ES_URL).netloc}',
+    )
+
+
+def _log_query_if_slow(query, response):
     if response.took >= settings.ES_SEARCH_REQUEST_WARNING_THRESHOLD * 1000:
         logger.warning(f'Elasticsearch query took a long time ({response.took / 1000:.2f}s)')
 
@@ -32,5 +67,3 @@ def execute_search_query(query):
             'timed_out': response.timed_out,
         }
         log_to_sentry('Elasticsearch query took a long time', extra=log_data)
-
-    return response
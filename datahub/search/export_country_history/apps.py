@@ -11,6 +11,7 @@ class ExportCountryHistoryApp(SearchApp):
     name = 'export-country-history'
     es_model = ExportCountryHistory
     exclude_from_global_search = True
+    incremental_sync_fields = ('history_date',)
     queryset = DBCompanyExportCountryHistory.objects.select_related(
         'history_user',
         'country',
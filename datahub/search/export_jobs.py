@@ -0,0 +1,152 @@
+"""
+Asynchronous search exports.
+
+Instead of streaming a CSV file in the response, an asynchronous export starts a Celery task
+(datahub.search.tasks.export_search_results) that writes the search results to S3 as a
+gzip-compressed CSV file. The status of the job (and a download URL once the file is ready)
+can then be retrieved using the search export job endpoint.
+
+The status of each job is stored in the cache.
+"""
+import tempfile
+from uuid import uuid4
+
+from django.core.cache import cache
+from django.utils.module_loading import import_string
+
+from datahub.core.utils import StrEnum
+from datahub.documents.utils import get_bucket_name, get_s3_client_for_bucket, sign_s3_url
+from datahub.search.apps import get_search_app
+from datahub.user_event_log.constants import UserEventType
+from datahub.user_event_log.models import UserEvent
+
+EXPORT_BUCKET_ID = 'default'
+EXPORT_JOB_CACHE_KEY_PREFIX = 'search-export-job'
+# How long the status of an export job is kept for (in seconds)
+EXPORT_JOB_CACHE_TIMEOUT = 24 * 60 * 60
+# How long download URLs for completed exports are valid for (in seconds)
+EXPORT_DOWNLOAD_URL_EXPIRY = 60 * 60
+
+
+class ExportJobStatus(StrEnum):
+    """Search export job statuses."""
+
+    pending = 'pending'
+    complete = 'complete'
+    failed = 'failed'
+
+
+def create_export_job(adviser):
+    """Creates a pending export job for an adviser and returns its ID."""
+    job_id = str(uuid4())
+    _set_export_job(
+        job_id,
+        {
+            'adviser_id': str(adviser.pk),
+            'status': ExportJobStatus.pending,
+        },
+    )
+    return job_id
+
+
+def get_export_job(job_id):
+    """
+    Gets the status of an export job (or None if the job does not exist or has expired).
+
+    The download URL is included for completed jobs.
+    """
+    job = cache.get(_get_export_job_cache_key(job_id))
+    if job is None:
+        return None
+
+    return {
+        'id': job_id,
+        'adviser_id': job['adviser_id'],
+        'status': job['status'],
+        'num_results': job.get('num_results'),
+        'download_url': _get_download_url(job),
+    }
+
+
+def run_export_job(
+    job_id,
+    view_path,
+    search_app_name,
+    query,
+    adviser_id,
+    api_url_path,
+    args,
+):
+    """
+    Exports search results to S3 as a gzip-compressed CSV file, and records a user event.
+
+    :param view_path: the import path of the SearchExportAPIView subclass for the export
+    :param query: the serialised Elasticsearch query (including permission filters)
+    :param api_url_path: the path of the request that started the export
+    :param args: the validated request arguments (as recorded in the user event)
+    """
+    view_cls = import_string(view_path)
+    view = view_cls(search_app=get_search_app(search_app_name))
+    s3_key = f'search-exports/{job_id}/{view.get_base_filename()}.csv.gz'
+
+    try:
+        with tempfile.TemporaryFile(mode='wb+') as file:
+            num_results = view.write_gzipped_csv(file, query)
+
+            file.seek(0)
+
+            s3_client = get_s3_client_for_bucket(EXPORT_BUCKET_ID)
+            s3_client.upload_fileobj(
+                file,
+                get_bucket_name(EXPORT_BUCKET_ID),
+                s3_key,
+                ExtraArgs={
+                    'ContentType': 'application/gzip',
+                    'ServerSideEncryption': 'AES256',
+                },
+            )
+    except Exception:
+        _set_export_job(
+            job_id,
+            {
+                'adviser_id': adviser_id,
+                'status': ExportJobStatus.failed,
+            },
+        )
+        raise
+
+    UserEvent.objects.create(
+        adviser_id=adviser_id,
+        type=UserEventType.SEARCH_EXPORT,
+        api_url_path=api_url_path,
+        data={
+            'num_results': num_results,
+            'args': args,
+            'job_id': job_id,
+        },
+    )
+
+    _set_export_job(
+        job_id,
+        {
+            'adviser_id': adviser_id,
+            'status': ExportJobStatus.complete,
+            'num_results': num_results,
+            's3_key': s3_key,
+        },
+    )
+
+
+def _get_download_url(job):
+    if job['status'] != ExportJobStatus.complete:
+        return None
+
+    return sign_s3_url(EXPORT_BUCKET_ID, job['s3_key'], expires=EXPORT_DOWNLOAD_URL_EXPIRY)
+
+
+def _set_export_job(job_id, job):
+    cache.set(_get_export_job_cache_key(job_id), job, timeout=EXPORT_JOB_CACHE_TIMEOUT)
+
+
+def _get_export_job_cache_key(job_id):
+    return f'{EXPORT_JOB_CACHE_KEY_PREFIX}:{job_id}'
@@ -1,6 +1,6 @@
 from functools import partial
 
-from elasticsearch_dsl import Date, Keyword, Object, Text
+from elasticsearch_dsl import Date, Keyword, Object, SearchAsYouType, Text
 
 from datahub.search.elasticsearch import (
     lowercase_asciifolding_normalizer,
@@ -21,6 +21,9 @@ TextWithTrigram = partial(
         'trigram': TrigramText(),
     },
 )
+# Text with shingle and edge n-gram sub-fields for typeahead searches (using multi_match
+# queries of type bool_prefix)
+TypeaheadText = partial(SearchAsYouType, max_shingle_size=3)
 # Keyword with normalisation that recognises UK postcodes to improve searching
 PostcodeKeyword = partial(
     Text,
@@ -0,0 +1,120 @@
+from datetime import timedelta
+from functools import reduce
+from logging import getLogger
+from operator import or_
+
+from django.db.models import Q
+from django.utils.timezone import now
+
+from datahub.core.utils import slice_iterable_into_chunks
+from datahub.search.bulk_sync import sync_objects
+from datahub.search.migrate_utils import delete_from_secondary_indices_callback
+from datahub.search.sync_watermark.models import IncrementalSyncWatermark
+
+logger = getLogger(__name__)
+
+# Rows modified up to this long before the previous watermark are synced again, to allow for
+# transactions that were still in progress when the previous incremental sync ran
+WATERMARK_OVERLAP = timedelta(minutes=5)
+
+
+def get_incremental_sync_watermark(search_app):
+    """
+    Gets the time up to which changes have been synced by the last incremental sync of a search
+    app.
+
+    Returns None if an incremental sync has never been run for the search app.
+    """
+    return IncrementalSyncWatermark.objects.filter(
+        search_app=search_app.name,
+    ).values_list('watermark', flat=True).first()
+
+
+def set_incremental_sync_watermark(search_app, watermark):
+    """Sets the time up to which changes have been synced for a search app."""
+    IncrementalSyncWatermark.objects.update_or_create(
+        search_app=search_app.name,
+        defaults={'watermark': watermark},
+    )
+
+
+def sync_app_incrementally(search_app, batch_size=None):
+    """
+    Syncs objects for an app that have changed since the last incremental sync.
+
+    An object is considered changed if any of the fields in search_app.incremental_sync_fields
+    (which can span relationships) is later than the watermark of the previous run.
+
+    If there is no watermark (i.e. this is the first run), the watermark is initialised and
+    nothing is synced (sync_app() should be used for a full sync).
+
+    This is migration-safe – if a migration is in progress, objects are added to the new index
+    and then deleted from the old index.
+
+    Returns the number of objects synced.
+    """
+    app_name = search_app.name
+    if not search_app.incremental_sync_fields:
+        logger.info(f'Incremental sync is not supported for the {app_name} search app')
+        return 0
+
+    new_watermark = now()
+    watermark = get_incremental_sync_watermark(search_app)
+
+    if watermark is None:
+        logger.warning(
+            f'No incremental sync watermark found for the {app_name} search app. The watermark '
+            f'has been initialised; run a full sync if changes may have been missed.',
+        )
+        set_incremental_sync_watermark(search_app, new_watermark)
+        return 0
+
+    changed_since = watermark - WATERMARK_OVERLAP
+    num_objects_synced = sync_objects_changed_since(
+        search_app,
+        changed_since,
+        batch_size=batch_size,
+    )
+
+    set_incremental_sync_watermark(search_app, new_watermark)
+
+    logger.info(
+        f'{num_objects_synced} {app_name} objects changed since {changed_since} synced',
+    )
+    return num_objects_synced
+
+
+def sync_objects_changed_since(search_app, changed_since, batch_size=None):
+    """
+    Syncs objects for an app where any of the fields in search_app.incremental_sync_fields is
+    later than changed_since.
+
+    This is migration-safe – if a migration is in progress, objects are added to the new index
+    and then deleted from the old index.
+
+    Returns the number of objects synced.
+    """
+    batch_size = batch_size or search_app.bulk_batch_size
+    changed_filter = reduce(
+        or_,
+        (Q(**{f'{field}__gt': changed_since}) for field in search_app.incremental_sync_fields),
+    )
+    changed_pks = search_app.queryset.filter(
+        changed_filter,
+    ).order_by().values_list('pk', flat=True).distinct()
+
+    es_model = search_app.es_model
+    read_indices, write_index = es_model.get_read_and_write_indices()
+    num_objects_synced = 0
+
+    it = changed_pks.iterator(chunk_size=batch_size)
+    for batch in slice_iterable_into_chunks(it, batch_size):
+        num_objects_synced += sync_objects(
+            es_model,
+            search_app.queryset.filter(pk__in=batch),
+            read_indices,
+            write_index,
+            post_batch_callback=delete_from_secondary_indices_callback,
+        )
+
+    return num_objects_synced
@@ -17,6 +17,12 @@ class InteractionSearchApp(SearchApp):
     es_model = Interaction
     view_permissions = (f'interaction.{InteractionPermission.view_all}',)
     export_permission = f'interaction.{InteractionPermission.export}'
+    incremental_sync_fields = (
+        'modified_on',
+        'company__modified_on',
+        'contacts__modified_on',
+        'investment_project__modified_on',
+    )
     queryset = DBInteraction.objects.select_related(
         'company',
         'company__sector',
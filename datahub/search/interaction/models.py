@@ -105,6 +105,16 @@ class Interaction(BaseESModel):
     were_countries_discussed = Boolean()
     export_countries = _export_country_field()
 
+    PREFETCH_LOOKUPS = (
+        'contacts',
+        'companies',
+        'policy_areas',
+        'policy_issue_types',
+        'dit_participants__adviser',
+        'dit_participants__team',
+        'export_countries__country',
+    )
+
     MAPPINGS = {
         'company': dict_utils.company_dict,
         'companies': _companies_list,
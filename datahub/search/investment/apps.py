@@ -28,6 +28,10 @@ class InvestmentSearchApp(SearchApp):
         f'investment.{InvestmentProjectPermission.view_associated}',
     )
     export_permission = f'investment.{InvestmentProjectPermission.export}'
+    incremental_sync_fields = (
+        'modified_on',
+        'interactions__modified_on',
+    )
     queryset = DBInvestmentProject.objects.select_related(
         'archived_by',
         'average_salary',
@@ -846,19 +846,10 @@ def test_limited_get_search_by_entity_query():
                         'bool': {
                             'must': [
                                 {
-                                    'bool': {
-                                        'should': [
-                                            {
-                                                'match': {
-                                                    'investor_company_country.id': {
-                                                        'query':
-                                                            '80756b9a-5d95-e211-a939-e4115bead28a',
-                                                        'operator': 'and',
-                                                    },
-                                                },
-                                            },
+                                    'terms': {
+                                        'investor_company_country.id': [
+                                            '80756b9a-5d95-e211-a939-e4115bead28a',
                                         ],
-                                        'minimum_should_match': 1,
                                     },
                                 }, {
                                     'range': {
@@ -16,6 +16,10 @@ class LargeCapitalOpportunitySearchApp(SearchApp):
     )
     export_permission = f'opportunity.{LargeCapitalOpportunityPermission.export}'
     exclude_from_global_search = True
+    incremental_sync_fields = (
+        'modified_on',
+        'promoters__modified_on',
+    )
     queryset = DBLargeCapitalOpportunity.objects.select_related(
         'lead_dit_relationship_manager',
         'type',
@@ -14,6 +14,10 @@ class LargeInvestorProfileSearchApp(SearchApp):
     view_permissions = (f'investor_profile.{InvestorProfilePermission.view_investor_profile}',)
     export_permission = f'investor_profile.{InvestorProfilePermission.export}'
     exclude_from_global_search = True
+    incremental_sync_fields = (
+        'modified_on',
+        'investor_company__modified_on',
+    )
     queryset = DBLargeCapitalInvestorProfile.objects.select_related(
         'investor_company',
         'investor_type',
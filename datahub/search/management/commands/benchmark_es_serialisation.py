@@ -0,0 +1,80 @@
+from statistics import mean
+from time import perf_counter
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db.models import prefetch_related_objects
+
+from datahub.search.apps import get_search_apps, get_search_apps_by_name
+
+DEFAULT_SEARCH_APPS = ('company', 'interaction', 'investment_project')
+
+
+class Command(BaseCommand):
+    """
+    Command to benchmark the conversion of DB objects to Elasticsearch documents.
+
+    Objects (and their related objects) are loaded from the database before timing starts, so
+    that only the serialisation itself is measured.
+    """
+
+    help = 'Benchmarks the conversion of DB objects to Elasticsearch documents.'
+
+    def add_arguments(self, parser):
+        """Define extra arguments."""
+        parser.add_argument(
+            '--model',
+            action='append',
+            choices=[search_app.name for search_app in get_search_apps()],
+            help=f'Search app to benchmark. Defaults to {", ".join(DEFAULT_SEARCH_APPS)}.',
+        )
+        parser.add_argument(
+            '--num-objects',
+            type=int,
+            default=1000,
+            help='The number of objects to serialise in each run.',
+        )
+        parser.add_argument(
+            '--runs',
+            type=int,
+            default=5,
+            help='The number of timed runs for each search app.',
+        )
+
+    def handle(self, *args, **options):
+        """Run the benchmark for each of the specified search apps."""
+        app_names = options['model'] or DEFAULT_SEARCH_APPS
+        search_apps = get_search_apps_by_name(app_names)
+
+        unknown_app_names = set(app_names) - {search_app.name for search_app in search_apps}
+        if unknown_app_names:
+            raise CommandError(f'Unknown search apps: {", ".join(sorted(unknown_app_names))}.')
+
+        for search_app in search_apps:
+            self._benchmark_search_app(search_app, options['num_objects'], options['runs'])
+
+    def _benchmark_search_app(self, search_app, num_objects, num_runs):
+        es_model = search_app.es_model
+        db_objects = list(search_app.queryset.order_by('pk')[:num_objects])
+        prefetch_related_objects(db_objects, *es_model.PREFETCH_LOOKUPS)
+
+        if not db_objects:
+            self.stdout.write(f'{search_app.name}: no objects to serialise, skipping')
+            return
+
+        # Warm up (so that one-off work such as compiling serialisation plans isn't timed)
+        es_model.db_object_to_dict(db_objects[0])
+
+        durations = []
+        for _ in range(num_runs):
+            start_time = perf_counter()
+            for db_object in db_objects:
+                es_model.db_object_to_dict(db_object)
+            durations.append(perf_counter() - start_time)
+
+        best_duration = min(durations)
+        self.stdout.write(
+            f'{search_app.name}: {len(db_objects)} objects, {num_runs} runs, '
+            f'best {best_duration * 1000:.1f}ms, mean {mean(durations) * 1000:.1f}ms '
+            f'({len(db_objects) / best_duration:.0f} objects/s, '
+            f'{best_duration / len(db_objects) * 1e6:.1f}µs/object)',
+        )
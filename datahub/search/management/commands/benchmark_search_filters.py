@@ -0,0 +1,126 @@
+from statistics import mean
+
+from django.core.management.base import BaseCommand
+from elasticsearch_dsl import Search
+
+from datahub.search.apps import get_search_apps, get_search_apps_by_name
+from datahub.search.elasticsearch import get_client
+from datahub.search.query_builder import get_search_by_entities_query
+from datahub.search.utils import get_model_term_filter_field_paths
+
+DEFAULT_SEARCH_APPS = ('company', 'interaction')
+# Filter modes being compared (None means that the default term filter fields are used)
+FILTER_MODES = {
+    'match': frozenset(),
+    'term': None,
+}
+IGNORED_FILTER_FIELDS = {'id', '_document_type'}
+
+
+class Command(BaseCommand):
+    """
+    Command to compare the latency and query cache hit rate of searches using match filters
+    with searches using term filters.
+
+    Filter values are taken from an existing document for each search app, and filters are
+    built for its ID and boolean fields. The Elasticsearch query cache for the index is cleared
+    before each filter mode is benchmarked, and the request cache is bypassed.
+    """
+
+    help = 'Compares the performance of match and term search filters.'
+
+    def add_arguments(self, parser):
+        """Define extra arguments."""
+        parser.add_argument(
+            '--model',
+            action='append',
+            choices=[search_app.name for search_app in get_search_apps()],
+            help=f'Search app to benchmark. Defaults to {", ".join(DEFAULT_SEARCH_APPS)}.',
+        )
+        parser.add_argument(
+            '--runs',
+            type=int,
+            default=20,
+            help='The number of searches to run for each search app and filter mode.',
+        )
+
+    def handle(self, *args, **options):
+        """Run the benchmark for each of the specified search apps."""
+        search_apps = get_search_apps_by_name(options['model'] or DEFAULT_SEARCH_APPS)
+
+        for search_app in search_apps:
+            self._benchmark_search_app(search_app, options['runs'])
+
+    def _benchmark_search_app(self, search_app, num_runs):
+        es_model = search_app.es_model
+        filter_data = _get_filter_data(es_model)
+
+        if not filter_data:
+            self.stdout.write(f'{search_app.name}: no documents to benchmark, skipping')
+            return
+
+        for mode, term_filter_fields in FILTER_MODES.items():
+            query = get_search_by_entities_query(
+                [es_model],
+                term='',
+                filter_data=filter_data,
+                term_filter_fields=term_filter_fields,
+            ).params(
+                request_cache=False,
+            )
+            self._benchmark_query(search_app, mode, query, num_runs)
+
+    def _benchmark_query(self, search_app, mode, query, num_runs):
+        index = search_app.es_model.get_read_alias()
+        client = get_client()
+        client.indices.clear_cache(index=index, query=True)
+        hits_before, misses_before = _get_query_cache_stats(index)
+
+        durations = [query.execute().took for _ in range(num_runs)]
+
+        hits_after, misses_after = _get_query_cache_stats(index)
+        num_hits = hits_after - hits_before
+        num_misses = misses_after - misses_before
+        num_lookups = num_hits + num_misses
+        hit_rate = num_hits / num_lookups * 100 if num_lookups else 0
+
+        self.stdout.write(
+            f'{search_app.name} ({mode} filters): {num_runs} runs, '
+            f'best {min(durations)}ms, mean {mean(durations):.1f}ms, '
+            f'query cache hit rate {hit_rate:.1f}% ({num_hits} hits, {num_misses} misses)',
+        )
+
+
+def _get_filter_data(es_model):
+    """Builds filters for the ID and boolean fields of an existing document."""
+    search = Search(index=es_model.get_read_alias()).extra(size=1)
+    hits = search.execute().hits
+    if not hits:
+        return {}
+
+    document = hits[0].to_dict()
+    filter_data = {}
+
+    for path in sorted(get_model_term_filter_field_paths(es_model) - IGNORED_FILTER_FIELDS):
+        value = _get_value_at_path(document, path)
+        if (path.endswith('.id') and isinstance(value, str)) or isinstance(value, bool):
+            filter_data[path] = value
+
+    return filter_data
+
+
+def _get_value_at_path(document, path):
+    value = document
+    for key in path.split('.'):
+        if isinstance(value, list):
+            value = value[0] if value else None
+        if not isinstance(value, dict):
+            return None
+        value = value.get(key)
+    return value
+
+
+def _get_query_cache_stats(index):
+    stats = get_client().indices.stats(index=index, metric='query_cache')
+    query_cache_stats = stats['_all']['total']['query_cache']
+    return query_cache_stats['hit_count'], query_cache_stats['miss_count']
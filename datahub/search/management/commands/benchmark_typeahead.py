@@ -0,0 +1,158 @@
+from math import ceil
+from time import perf_counter
+
+from django.core.management.base import BaseCommand
+from elasticsearch_dsl import Search
+
+from datahub.company.models import Advisor
+from datahub.company.views import AdviserFilter
+from datahub.search.query_builder import get_typeahead_query
+from datahub.search.views import v4_view_registry
+
+TYPEAHEAD_SUB_PATH = 'typeahead'
+# The lengths of the prefixes (of document names) that are searched for
+PREFIX_LENGTHS = (1, 2, 3, 5, 8)
+PERCENTILES = (50, 95, 99)
+
+
+class Command(BaseCommand):
+    """
+    Command to measure the latency of typeahead searches.
+
+    Prefixes are taken from the names of existing documents for each search app with a
+    typeahead view, and the 50th, 95th and 99th percentile latencies (including the round trip
+    to Elasticsearch) are reported and compared with --target-p99.
+
+    The typeahead response cache is not used, and no permission filters are applied.
+    """
+
+    help = 'Measures the latency of typeahead searches.'
+
+    def add_arguments(self, parser):
+        """Define extra arguments."""
+        parser.add_argument(
+            '--model',
+            action='append',
+            choices=sorted(_get_typeahead_views_by_name()),
+            help='Search app to benchmark. Defaults to all search apps with a typeahead view.',
+        )
+        parser.add_argument(
+            '--documents',
+            type=int,
+            default=50,
+            help='The number of documents to take prefixes from for each search app.',
+        )
+        parser.add_argument(
+            '--target-p99',
+            type=float,
+            default=50,
+            help='The target 99th percentile latency (in milliseconds).',
+        )
+        parser.add_argument(
+            '--compare-db',
+            action='store_true',
+            help=(
+                'Also measure the latency of the database autocomplete filter for the same '
+                'prefixes (advisers only).'
+            ),
+        )
+
+    def handle(self, *args, **options):
+        """Run the benchmark for each of the specified search apps."""
+        views_by_name = _get_typeahead_views_by_name()
+        app_names = options['model'] or sorted(views_by_name)
+
+        for app_name in app_names:
+            view_cls = views_by_name[app_name]
+            prefixes = _get_prefixes(view_cls.search_app.es_model, options['documents'])
+
+            if not prefixes:
+                self.stdout.write(f'{app_name}: no documents to benchmark, skipping')
+                continue
+
+            durations = [_time_typeahead_search(view_cls, prefix) for prefix in prefixes]
+            self._write_result(app_name, durations, options['target_p99'])
+
+            if options['compare_db'] and app_name == 'adviser':
+                db_durations = [_time_adviser_autocomplete(prefix) for prefix in prefixes]
+                self._write_result(
+                    f'{app_name} (database autocomplete)',
+                    db_durations,
+                    options['target_p99'],
+                )
+
+    def _write_result(self, label, durations, target_p99):
+        percentiles = {
+            percentile: _get_percentile(durations, percentile) for percentile in PERCENTILES
+        }
+        formatted_percentiles = ', '.join(
+            f'p{percentile} {duration:.1f}ms' for percentile, duration in percentiles.items()
+        )
+        outcome = 'met' if percentiles[99] <= target_p99 else 'missed'
+
+        self.stdout.write(
+            f'{label}: {len(durations)} queries, {formatted_percentiles} '
+            f'(p99 target {target_p99:g}ms {outcome})',
+        )
+
+
+def _get_typeahead_views_by_name():
+    return {
+        search_app.name: view_cls
+        for (search_app, _, sub_path), view_cls in v4_view_registry.items()
+        if sub_path == TYPEAHEAD_SUB_PATH
+    }
+
+
+def _get_prefixes(es_model, num_documents):
+    """Gets (normalised) prefixes of the names of existing documents."""
+    search = Search(
+        index=es_model.get_read_alias(),
+    ).source(
+        includes=['name'],
+    ).extra(
+        size=num_documents,
+    )
+
+    prefixes = []
+    for hit in search.execute().hits:
+        name = ' '.join(str(getattr(hit, 'name', '')).lower().split())
+        for length in PREFIX_LENGTHS:
+            prefix = name[:length].strip()
+            if prefix and prefix not in prefixes:
+                prefixes.append(prefix)
+
+    return prefixes
+
+
+def _time_typeahead_search(view_cls, prefix):
+    query = get_typeahead_query(
+        view_cls.search_app.es_model,
+        prefix,
+        view_cls.typeahead_fields,
+        fields_to_include=view_cls.fields_to_include,
+    ).params(
+        request_cache=False,
+    )
+    return _time_call(query.execute)
+
+
+def _time_adviser_autocomplete(prefix):
+    queryset = AdviserFilter(
+        data={'autocomplete': prefix},
+        queryset=Advisor.objects.all(),
+    ).qs
+    return _time_call(lambda: list(queryset[:10]))
+
+
+def _time_call(func):
+    start = perf_counter()
+    func()
+    return (perf_counter() - start) * 1000
+
+
+def _get_percentile(values, percentile):
+    """Gets a percentile of a list of values using the nearest-rank method."""
+    sorted_values = sorted(values)
+    rank = max(ceil(percentile / 100 * len(sorted_values)), 1)
+    return sorted_values[rank - 1]
@@ -0,0 +1,152 @@
+from random import randint
+from uuid import uuid4
+
+from django.core.management.base import BaseCommand
+from django.db.models import Max, Min, UUIDField
+from django.utils.dateparse import parse_datetime
+from elasticsearch_dsl import Search
+
+from datahub.search.apps import get_search_apps, get_search_apps_by_name
+from datahub.search.metrics import record_stale_document_percentage
+from datahub.search.utils import get_model_field_names
+
+MODIFIED_ON_FIELD = 'modified_on'
+
+
+class Command(BaseCommand):
+    """
+    Command to estimate how far Elasticsearch is lagging behind the database.
+
+    For each search app, a sample of objects is taken (see _sample_modified_on_values()), and
+    the modified_on value of each object is compared with the modified_on value of its
+    Elasticsearch document. Documents that are missing or have an earlier modified_on value are
+    considered stale.
+
+    (Search apps without a modified_on field are skipped.)
+    """
+
+    help = 'Reports the percentage of a random sample of search documents that are stale.'
+
+    def add_arguments(self, parser):
+        """Define extra arguments."""
+        parser.add_argument(
+            '--model',
+            action='append',
+            choices=[search_app.name for search_app in get_search_apps()],
+            help='Search app to check. If not specified, all search apps are checked.',
+        )
+        parser.add_argument(
+            '--sample-size',
+            type=int,
+            default=500,
+            help='The number of objects to sample for each search app.',
+        )
+
+    def handle(self, *args, **options):
+        """Sample objects for each of the specified search apps."""
+        for search_app in get_search_apps_by_name(options['model']):
+            if MODIFIED_ON_FIELD not in get_model_field_names(search_app.es_model):
+                continue
+
+            self._check_search_app(search_app, options['sample_size'])
+
+    def _check_search_app(self, search_app, sample_size):
+        db_model = search_app.queryset.model
+        db_modified_on_values = _sample_modified_on_values(db_model, sample_size)
+
+        if not db_modified_on_values:
+            self.stdout.write(f'{search_app.name}: no objects to sample, skipping')
+            return
+
+        es_modified_on_values = _get_es_modified_on_values(
+            search_app.es_model,
+            [str(pk) for pk in db_modified_on_values],
+        )
+        num_missing = 0
+        num_out_of_date = 0
+
+        for pk, db_modified_on in db_modified_on_values.items():
+            if str(pk) not in es_modified_on_values:
+                num_missing += 1
+            elif _is_out_of_date(db_modified_on, es_modified_on_values[str(pk)]):
+                num_out_of_date += 1
+
+        num_sampled = len(db_modified_on_values)
+        num_stale = num_missing + num_out_of_date
+        percentage = num_stale / num_sampled * 100
+        record_stale_document_percentage(search_app.name, percentage)
+
+        self.stdout.write(
+            f'{search_app.name}: {num_stale} of {num_sampled} sampled documents stale '
+            f'({percentage:.1f}%; {num_missing} missing, {num_out_of_date} out of date)',
+        )
+
+
+def _sample_modified_on_values(db_model, sample_size):
+    """
+    Gets the modified_on values of a sample of objects (keyed by primary key).
+
+    The sample is a range of primary keys starting at a random value (wrapping around to the
+    lowest primary key if needed). This only reads the primary key index, rather than randomly
+    sorting the whole table. (As most models have random UUID primary keys, the sample is
+    still effectively random.)
+    """
+    queryset = db_model.objects.order_by('pk').values_list('pk', MODIFIED_ON_FIELD)
+    start_pk = _get_random_pk(db_model)
+    if start_pk is None:
+        return {}
+
+    modified_on_values = dict(queryset.filter(pk__gte=start_pk)[:sample_size])
+    num_remaining = sample_size - len(modified_on_values)
+    if num_remaining:
+        modified_on_values.update(queryset.filter(pk__lt=start_pk)[:num_remaining])
+
+    return modified_on_values
+
+
+def _get_random_pk(db_model):
+    """
+    Gets a random value within the range of primary keys of a model (which must have a UUID or
+    integer primary key).
+
+    For integer primary keys, None is returned if there are no objects.
+    """
+    if isinstance(db_model._meta.pk, UUIDField):
+        return uuid4()
+
+    pk_range = db_model.objects.aggregate(min_pk=Min('pk'), max_pk=Max('pk'))
+    if pk_range['min_pk'] is None:
+        return None
+
+    return randint(pk_range['min_pk'], pk_range['max_pk'])
+
+
+def _get_es_modified_on_values(es_model, ids):
+    search = Search(
+        index=es_model.get_read_alias(),
+    ).filter(
+        'ids',
+        values=ids,
+    ).source(
+        [MODIFIED_ON_FIELD],
+    ).extra(
+        # Documents can exist in more than one index during a migration
+        size=len(ids) * 2,
+    )
+
+    modified_on_values = {}
+    for hit in search.execute():
+        modified_on = hit.to_dict().get(MODIFIED_ON_FIELD)
+        modified_on = parse_datetime(modified_on) if modified_on else None
+        existing_modified_on = modified_on_values.get(hit.meta.id)
+
+        if existing_modified_on is None or (modified_on and modified_on > existing_modified_on):
+            modified_on_values[hit.meta.id] = modified_on
+
+    return modified_on_values
+
+
+def _is_out_of_date(db_modified_on, es_modified_on):
+    if db_modified_on is None:
+        return False
+    return es_modified_on is None or es_modified_on < db_modified_on
@@ -3,7 +3,7 @@ from logging import getLogger, WARNING
 from django.core.management.base import BaseCommand, CommandError
 
 from datahub.search.apps import are_apps_initialised, get_search_apps, get_search_apps_by_name
-from datahub.search.tasks import sync_model
+from datahub.search.tasks import sync_model, sync_model_incrementally
 
 logger = getLogger(__name__)
 
@@ -27,6 +27,18 @@ class Command(BaseCommand):
             help='If specified, the command runs in the foreground without needing Celery '
                  'running. (By default, it runs asynchronously using Celery.)',
         )
+        parser.add_argument(
+            '--incremental',
+            action='store_true',
+            help='If specified, only objects that have changed since the last incremental sync '
+                 'are synced.',
+        )
+        parser.add_argument(
+            '--partition-size',
+            type=int,
+            help='If specified, each model is split into primary key ranges of this size, which '
+                 'are synced by separate (resumable) Celery tasks.',
+        )
 
     def handle(self, *args, **options):
         """Handle."""
@@ -40,12 +52,17 @@ class Command(BaseCommand):
                 'Index and mapping not initialised, please run `migrate_es` first.',
             )
 
+        task = sync_model_incrementally if options['incremental'] else sync_model
+        task_kwargs = {}
+        if options['partition_size'] and not options['incremental']:
+            task_kwargs['partition_size'] = options['partition_size']
+
         for app in apps:
             task_args = (app.name,)
 
             if options['foreground']:
-                sync_model.apply(args=task_args, throw=True)
+                task.apply(args=task_args, kwargs=task_kwargs, throw=True)
             else:
-                sync_model.apply_async(args=task_args)
+                task.apply_async(args=task_args, kwargs=task_kwargs)
 
         logger.info('Elasticsearch sync complete!')
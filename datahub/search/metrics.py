@@ -0,0 +1,57 @@
+from datahub.core.statsd import statsd
+
+METRIC_PREFIX = 'search'
+
+
+def record_bulk_write(search_app_name, num_documents, duration):
+    """
+    Records metrics for documents written to Elasticsearch in bulk.
+
+    This records the duration and size of the bulk operation (as timers, so that percentiles
+    are available), a counter of documents indexed and the indexing rate.
+
+    duration is in seconds.
+    """
+    with statsd().pipeline() as pipeline:
+        pipeline.timing(_get_metric_name(search_app_name, 'bulk.duration'), duration * 1000)
+        pipeline.timing(_get_metric_name(search_app_name, 'bulk.size'), num_documents)
+        pipeline.incr(_get_metric_name(search_app_name, 'documents_indexed'), num_documents)
+
+        if duration:
+            pipeline.gauge(
+                _get_metric_name(search_app_name, 'documents_per_second'),
+                num_documents / duration,
+            )
+
+
+def record_sync_lags(search_app_name, lags):
+    """
+    Records the time between objects being queued for syncing and being written to
+    Elasticsearch.
+
+    lags is an iterable of durations in seconds.
+    """
+    metric_name = _get_metric_name(search_app_name, 'sync_lag')
+
+    with statsd().pipeline() as pipeline:
+        for lag in lags:
+            pipeline.timing(metric_name, lag * 1000)
+
+
+def record_sync_queue_depth(search_app_name, depth):
+    """Records the number of objects waiting in the sync queue of a search app."""
+    statsd().gauge(_get_metric_name(search_app_name, 'sync_queue.depth'), depth)
+
+
+def record_sync_retry(search_app_name):
+    """Records that syncing an object is being retried after an error."""
+    statsd().incr(_get_metric_name(search_app_name, 'sync.retries'))
+
+
+def record_stale_document_percentage(search_app_name, percentage):
+    """Records the percentage of sampled documents that were found to be out of date."""
+    statsd().gauge(_get_metric_name(search_app_name, 'stale_documents_percentage'), percentage)
+
+
+def _get_metric_name(search_app_name, name):
+    return f'{METRIC_PREFIX}.{search_app_name}.{name}'
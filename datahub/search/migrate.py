@@ -2,6 +2,7 @@ from logging import getLogger
 
 from datahub.core.exceptions import DataHubException
 from datahub.search.elasticsearch import create_index, start_alias_transaction
+from datahub.search.reindex_migration import can_migrate_by_reindex, start_reindex_migration
 from datahub.search.tasks import complete_model_migration, sync_model
 
 logger = getLogger(__name__)
@@ -58,6 +59,12 @@ def _perform_migration(search_app):
 
     create_index(new_index_name, es_model._doc_type.mapping)
 
+    if can_migrate_by_reindex(search_app, current_write_index):
+        logger.info(f'Using the reindex API to migrate the {app_name} search app')
+        start_reindex_migration(search_app, current_write_index, new_index_name)
+        _schedule_resync(search_app)
+        return
+
     with start_alias_transaction() as alias_transaction:
         alias_transaction.associate_indices_with_alias(read_alias_name, [new_index_name])
         alias_transaction.associate_indices_with_alias(write_alias_name, [new_index_name])
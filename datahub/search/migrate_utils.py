@@ -1,22 +1,29 @@
 from logging import getLogger
 
+from django.conf import settings
+
 from datahub.core.exceptions import DataHubException
-from datahub.search.bulk_sync import sync_app
+from datahub.search.bulk_sync import sync_app, sync_app_in_partitions
 from datahub.search.deletion import delete_documents
 from datahub.search.elasticsearch import (
     delete_index,
     get_aliases_for_index,
     start_alias_transaction,
 )
+from datahub.search.utils import is_reindex_migration_state
 
 
 BULK_DELETION_TIMEOUT_SECS = 300
 logger = getLogger(__name__)
 
 
-def resync_after_migrate(search_app):
+def resync_after_migrate(search_app, run_id=None):
     """
     Completes a migration by performing a full resync, updating aliases and removing old indices.
+
+    If settings.SEARCH_SYNC_PARTITION_SIZE is set, the resync is split into partitions that are
+    synced concurrently by settings.SEARCH_SYNC_NUM_WORKERS threads. Progress is checkpointed
+    against run_id so that an interrupted resync can be resumed.
     """
     if not search_app.es_model.was_migration_started():
         logger.warning(
@@ -25,7 +32,17 @@ def resync_after_migrate(search_app):
         )
         return
 
-    sync_app(search_app, post_batch_callback=delete_from_secondary_indices_callback)
+    if settings.SEARCH_SYNC_PARTITION_SIZE:
+        sync_app_in_partitions(
+            search_app,
+            settings.SEARCH_SYNC_PARTITION_SIZE,
+            settings.SEARCH_SYNC_NUM_WORKERS,
+            run_id=run_id,
+            post_batch_callback=delete_from_secondary_indices_callback,
+        )
+    else:
+        sync_app(search_app, post_batch_callback=delete_from_secondary_indices_callback)
+
     _clean_up_aliases_and_indices(search_app)
 
 
@@ -57,7 +74,13 @@ def delete_from_secondary_indices_callback(read_indices, write_index, actions):
 
     This is used to avoid multiple, differing copies of documents existing at the same time
     whilst documents are being migrated from one index to another.
+
+    Nothing is deleted during a migration using the Elasticsearch reindex API, as documents are
+    written to both the old and new index until the migration completes.
     """
+    if is_reindex_migration_state(read_indices, write_index):
+        return
+
     remove_indices = read_indices - {write_index}
     for index in remove_indices:
         delete_documents(index, actions)
@@ -1,22 +1,35 @@
+from functools import lru_cache
 from hashlib import blake2b
 from logging import getLogger
+from operator import attrgetter
 
 from django.conf import settings
+from django.db.models import prefetch_related_objects
 from elasticsearch_dsl import Document, Keyword, MetaField
 
 from datahub.core.exceptions import DataHubException
+from datahub.core.utils import slice_iterable_into_chunks
 from datahub.search.apps import get_search_app_by_search_model
 from datahub.search.elasticsearch import (
     alias_exists,
     associate_index_with_alias,
     create_index,
+    get_cached_indices_for_aliases,
     get_indices_for_aliases,
 )
-from datahub.search.utils import get_model_non_mapped_field_names, serialise_mapping
+from datahub.search.utils import (
+    get_model_non_mapped_field_names,
+    is_reindex_migration_state,
+    serialise_mapping,
+)
 
 
 logger = getLogger(__name__)
 
+# Number of DB objects that related objects are loaded for at a time when converting
+# DB objects to Elasticsearch documents
+SERIALISATION_CHUNK_SIZE = 500
+
 
 class BaseESModel(Document):
     """Helps convert Django models to dictionaries."""
@@ -32,6 +45,13 @@ class BaseESModel(Document):
 
     SEARCH_FIELDS = ()
 
+    # Related objects accessed by MAPPINGS and COMPUTED_MAPPINGS, as lookups accepted by
+    # prefetch_related() (including Prefetch objects).
+    # These are loaded for each chunk of DB objects being converted to documents using one
+    # query per lookup (instead of one query per DB object). Lookups already satisfied by
+    # select_related() or prefetch_related() on the search app queryset are skipped.
+    PREFETCH_LOOKUPS = ()
+
     # Fields that have been renamed in some way, and were used as part of a filter.
     # While an index migration is in progress, a composite filter must be used so that the
     # filter works with both the old and new index.
@@ -65,9 +85,17 @@ class BaseESModel(Document):
         return _get_write_index(indices)
 
     @classmethod
-    def get_read_and_write_indices(cls):
-        """Gets the indices currently referenced by the read and write aliases."""
-        read_indices, write_indices = get_indices_for_aliases(
+    def get_read_and_write_indices(cls, use_cache=False):
+        """
+        Gets the indices currently referenced by the read and write aliases.
+
+        If use_cache is True, a process-local cache is used to avoid an Elasticsearch request
+        for every call (see get_cached_indices_for_aliases()). This is intended for frequent
+        operations such as syncing single objects, and is still migration-safe as the cache is
+        invalidated whenever aliases change.
+        """
+        get_indices = get_cached_indices_for_aliases if use_cache else get_indices_for_aliases
+        read_indices, write_indices = get_indices(
             cls.get_read_alias(), cls.get_write_alias(),
         )
         return read_indices, _get_write_index(write_indices)
@@ -116,8 +144,20 @@ class BaseESModel(Document):
 
         This could be a a migration still in progress, or an aborted migration.
         """
-        read_indices, _ = cls.get_read_and_write_indices()
-        return len(read_indices) != 1
+        read_indices, write_index = cls.get_read_and_write_indices()
+        return len(read_indices) != 1 or write_index not in read_indices
+
+    @classmethod
+    def was_reindex_migration_started(cls):
+        """
+        Returns whether a migration using the Elasticsearch reindex API was started and has not
+        completed.
+
+        During such a migration, the read alias references only the old index and the write
+        alias references only the new index (see datahub.search.reindex_migration).
+        """
+        read_indices, write_index = cls.get_read_and_write_indices()
+        return is_reindex_migration_state(read_indices, write_index)
 
     @classmethod
     def set_up_index_and_aliases(cls):
@@ -160,25 +200,60 @@ class BaseESModel(Document):
     @classmethod
     def db_object_to_dict(cls, db_object):
         """Converts a DB model object to a dictionary suitable for Elasticsearch."""
-        mapped_values = (
-            (col, fn, getattr(db_object, col)) for col, fn in cls.MAPPINGS.items()
-        )
-        fields = get_model_non_mapped_field_names(cls)
+        document_type, field_getters = _get_serialisation_plan(cls)
 
-        result = {
-            **{col: fn(val) if val is not None else None for col, fn, val in mapped_values},
-            **{col: fn(db_object) for col, fn in cls.COMPUTED_MAPPINGS.items()},
-            **{field: getattr(db_object, field) for field in fields},
-            '_document_type': cls.get_app_name(),
-        }
+        result = {field: getter(db_object) for field, getter in field_getters}
+        result['_document_type'] = document_type
 
         return result
 
     @classmethod
     def db_objects_to_es_documents(cls, db_objects, index=None):
-        """Converts DB model objects to Elasticsearch documents."""
-        for db_object in db_objects:
-            yield cls.es_document(db_object, index=index)
+        """
+        Converts DB model objects to Elasticsearch documents.
+
+        DB objects are processed in chunks of SERIALISATION_CHUNK_SIZE, and the related
+        objects in PREFETCH_LOOKUPS are loaded for each chunk before its documents are
+        generated. Documents are still generated lazily.
+        """
+        for chunk in slice_iterable_into_chunks(db_objects, SERIALISATION_CHUNK_SIZE):
+            prefetch_related_objects(chunk, *cls.PREFETCH_LOOKUPS)
+
+            for db_object in chunk:
+                yield cls.es_document(db_object, index=index)
+
+
+@lru_cache(maxsize=None)
+def _get_serialisation_plan(es_model):
+    """
+    Gets the document type and a tuple of (field name, getter) pairs used to convert DB
+    objects to dictionaries for a search model.
+
+    This is only computed once per search model (per process), so that
+    db_object_to_dict() does not have to work out the fields to include or look up the
+    search app for every object.
+    """
+    mapped_field_getters = tuple(
+        (field, _make_mapped_field_getter(field, transform))
+        for field, transform in es_model.MAPPINGS.items()
+    )
+    computed_field_getters = tuple(es_model.COMPUTED_MAPPINGS.items())
+    other_field_getters = tuple(
+        (field, attrgetter(field)) for field in get_model_non_mapped_field_names(es_model)
+    )
+
+    field_getters = mapped_field_getters + computed_field_getters + other_field_getters
+    return es_model.get_app_name(), field_getters
+
+
+def _make_mapped_field_getter(field, transform):
+    get_value = attrgetter(field)
+
+    def _get_mapped_field(db_object):
+        value = get_value(db_object)
+        return transform(value) if value is not None else None
+
+    return _get_mapped_field
 
 
 def _get_write_index(indices):
@@ -17,6 +17,11 @@ class OrderSearchApp(SearchApp):
     es_model = Order
     view_permissions = (f'order.{OrderPermission.view}',)
     export_permission = f'order.{OrderPermission.export}'
+    incremental_sync_fields = (
+        'modified_on',
+        'company__modified_on',
+        'contact__modified_on',
+    )
     queryset = DBOrder.objects.select_related(
         'company',
         'contact',
@@ -69,6 +69,19 @@ class Order(BaseESModel):
     billing_address_postcode = Text()
     billing_address_country = fields.id_name_field()
 
+    PREFETCH_LOOKUPS = (
+        'created_by__dit_team',
+        'uk_region',
+        'service_types',
+        'subscribers__adviser__dit_team',
+        'assignees__adviser__dit_team',
+        'billing_address_country',
+        'completed_by',
+        'cancelled_by',
+        'cancellation_reason',
+        'invoice',
+    )
+
     MAPPINGS = {
         'company': dict_utils.company_dict,
         'contact': dict_utils.contact_or_adviser_dict,
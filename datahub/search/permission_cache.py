@@ -0,0 +1,187 @@
+"""
+Caching of the permission checks and permission filters used by search views.
+
+Working out which search apps an adviser can access (and the permission filters that apply
+to each of them) involves permission look-ups for every search app and, for investment
+projects, resolving team association rules. When SEARCH_PERMISSION_CACHE_ENABLED is set, the
+results are cached for each adviser.
+
+Cache keys include the adviser's team and superuser status, and a version number that is
+incremented whenever permissions, groups, the groups of team roles or the roles of teams
+are changed (see the signal receivers below).
+"""
+from typing import NamedTuple
+
+from django.conf import settings
+from django.contrib.auth.models import Group
+from django.core.cache import cache
+from django.db.models.signals import m2m_changed, post_delete, post_save
+from django.dispatch import receiver
+
+from datahub.company.models import Advisor
+from datahub.metadata.models import Team, TeamRole
+from datahub.search.apps import EXCLUDE_ALL, get_search_apps
+from datahub.search.permissions import has_permissions_for_app
+
+PERMISSION_CACHE_KEY_PREFIX = 'search-permissions'
+PERMISSION_CACHE_VERSION_KEY = 'search-permissions-version'
+# Stands in for EXCLUDE_ALL in cached permission filters (as EXCLUDE_ALL is compared by
+# identity, which isn't preserved when values are pickled)
+_CACHED_EXCLUDE_ALL = 'exclude-all'
+
+
+class SearchAppAccess(NamedTuple):
+    """The permissions and permission filters for a search app for a user."""
+
+    has_view_permission: bool
+    # The return value of SearchApp.get_permission_filters() (only resolved if the user has
+    # view permission)
+    permission_filters: object
+
+
+def get_search_app_access(request, search_app):
+    """Gets the permissions and permission filters for a search app for the current user."""
+    if not (settings.SEARCH_PERMISSION_CACHE_ENABLED and _is_cacheable_user(request.user)):
+        return _resolve_search_app_access(request, search_app)
+
+    return get_search_app_access_by_name(request)[search_app.name]
+
+
+def get_search_app_access_by_name(request):
+    """
+    Gets the permissions and permission filters for all search apps for the current user
+    (as a dict keyed by search app name).
+
+    The result is cached for authenticated users if SEARCH_PERMISSION_CACHE_ENABLED is set.
+    """
+    if not (settings.SEARCH_PERMISSION_CACHE_ENABLED and _is_cacheable_user(request.user)):
+        return _resolve_access_for_all_search_apps(request)
+
+    cache_key = _get_permission_cache_key(request.user)
+    cached_access = cache.get(cache_key)
+
+    if cached_access is not None:
+        return {
+            app_name: _deserialise_search_app_access(access)
+            for app_name, access in cached_access.items()
+        }
+
+    access_by_name = _resolve_access_for_all_search_apps(request)
+    cache.set(
+        cache_key,
+        {
+            app_name: _serialise_search_app_access(access)
+            for app_name, access in access_by_name.items()
+        },
+        timeout=settings.SEARCH_PERMISSION_CACHE_TIMEOUT,
+    )
+    return access_by_name
+
+
+def get_permission_filters(request, search_app):
+    """
+    Gets the permission filters for a search app for the current user (using the cache if it's
+    enabled).
+
+    If the user doesn't have view permission for the search app, the filters are not cached
+    and search_app.get_permission_filters() is called directly.
+    """
+    access = get_search_app_access(request, search_app)
+
+    if not access.has_view_permission:
+        return search_app.get_permission_filters(request)
+
+    return access.permission_filters
+
+
+def invalidate_search_permission_cache():
+    """
+    Invalidates the cached permissions of all advisers.
+
+    This works by incrementing the version number that is part of all cache keys (so that old
+    entries are no longer used and expire naturally).
+    """
+    if not settings.SEARCH_PERMISSION_CACHE_ENABLED:
+        return
+
+    try:
+        cache.incr(PERMISSION_CACHE_VERSION_KEY)
+    except ValueError:
+        # The key doesn't exist yet
+        cache.add(PERMISSION_CACHE_VERSION_KEY, 1, timeout=None)
+
+
+def _resolve_access_for_all_search_apps(request):
+    return {
+        search_app.name: _resolve_search_app_access(request, search_app)
+        for search_app in get_search_apps()
+    }
+
+
+def _resolve_search_app_access(request, search_app):
+    has_view_permission = has_permissions_for_app(request.user, search_app)
+    permission_filters = (
+        search_app.get_permission_filters(request) if has_view_permission else None
+    )
+
+    return SearchAppAccess(
+        has_view_permission=has_view_permission,
+        permission_filters=permission_filters,
+    )
+
+
+def _serialise_search_app_access(access):
+    if access.permission_filters is EXCLUDE_ALL:
+        return access._replace(permission_filters=_CACHED_EXCLUDE_ALL)
+    return access
+
+
+def _deserialise_search_app_access(access):
+    if access.permission_filters == _CACHED_EXCLUDE_ALL:
+        return access._replace(permission_filters=EXCLUDE_ALL)
+    return access
+
+
+def _is_cacheable_user(user):
+    return bool(user and user.is_authenticated and user.is_active)
+
+
+def _get_permission_cache_key(user):
+    version = cache.get(PERMISSION_CACHE_VERSION_KEY, 0)
+    return (
+        f'{PERMISSION_CACHE_KEY_PREFIX}:{version}:{user.pk}:{user.dit_team_id}:'
+        f'{int(user.is_superuser)}'
+    )
+
+
+@receiver(
+    m2m_changed,
+    sender=Advisor.groups.through,
+    dispatch_uid='search_permission_cache_adviser_groups_changed',
+)
+@receiver(
+    m2m_changed,
+    sender=Advisor.user_permissions.through,
+    dispatch_uid='search_permission_cache_adviser_permissions_changed',
+)
+@receiver(
+    m2m_changed,
+    sender=Group.permissions.through,
+    dispatch_uid='search_permission_cache_group_permissions_changed',
+)
+@receiver(
+    m2m_changed,
+    sender=TeamRole.groups.through,
+    dispatch_uid='search_permission_cache_team_role_groups_changed',
+)
+def _invalidate_on_m2m_changed(sender, action, pk_set, **kwargs):
+    if action == 'post_clear' or (action in ('post_add', 'post_remove') and pk_set):
+        invalidate_search_permission_cache()
+
+
+# Team roles can't be deleted while they're in use, so only changes to teams (e.g. to their
+# role) and the deletion of groups need to be handled here
+@receiver(post_save, sender=Team, dispatch_uid='search_permission_cache_team_saved')
+@receiver(post_delete, sender=Group, dispatch_uid='search_permission_cache_group_deleted')
+def _invalidate_on_save_or_delete(sender, **kwargs):
+    invalidate_search_permission_cache()
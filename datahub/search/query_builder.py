@@ -1,5 +1,7 @@
 from collections import defaultdict
-from itertools import chain
+from functools import lru_cache
+from itertools import chain, count
+from typing import NamedTuple, Optional
 
 from elasticsearch_dsl import Search
 from elasticsearch_dsl.query import (
@@ -11,11 +13,15 @@ from elasticsearch_dsl.query import (
     Query,
     Range,
     Term,
+    Terms,
 )
 
 from datahub.search.apps import EXCLUDE_ALL, get_global_search_apps_as_mapping
+from datahub.search.utils import get_model_term_filter_field_paths
 
 MAX_RESULTS = 10000
+# The maximum number of compiled query templates to keep (per process)
+QUERY_TEMPLATE_CACHE_SIZE = 1024
 
 
 class MatchNone(Query):
@@ -31,6 +37,7 @@ def get_basic_search_query(
         offset=0,
         limit=100,
         fields_to_exclude=None,
+        search_after=None,
 ):
     """
     Performs basic search for the given term in the given entity using the SEARCH_FIELDS.
@@ -40,9 +47,9 @@ def get_basic_search_query(
                                          filters. Only entities in this list are included in the
                                          results, and those are entities are also filtered using
                                          the corresponding permission filters.
+    :param search_after: Sort values of the last result of the previous page (when paginating
+                         using a cursor instead of offset)
     """
-    limit = _clip_limit(offset, limit)
-
     search_apps = tuple(get_global_search_apps_as_mapping().values())
     indices = [app.es_model.get_read_alias() for app in search_apps]
     fields = set(chain.from_iterable(app.es_model.SEARCH_FIELDS for app in search_apps))
@@ -75,7 +82,7 @@ def get_basic_search_query(
         'count_by_type', 'terms', field='_document_type',
     )
 
-    return search[offset:offset + limit]
+    return limit_search_query(search, offset=offset, limit=limit, search_after=search_after)
 
 
 def get_search_by_entities_query(
@@ -87,20 +94,35 @@ def get_search_by_entities_query(
         ordering=None,
         fields_to_include=None,
         fields_to_exclude=None,
+        term_filter_fields=None,
 ):
     """
     Performs filtered search for the given term across given entities.
-    """
-    filter_data = filter_data or {}
-    query = []
-    if term != '':
-        for entity in entities:
-            query.append(_build_term_query(term, fields=entity.SEARCH_FIELDS))
 
-    filters, ranges = _split_range_fields(filter_data)
+    The query and filters are generated from a compiled query template (see
+    _get_query_template()), so the query tree is only built once for each query shape.
 
-    # document must match all filters in the list (and)
-    must_filter = _build_must_queries(filters, ranges, composite_field_mapping)
+    :param term_filter_fields: Fields to filter using term queries instead of match queries.
+                               Defaults to the keyword (including ID) and boolean fields
+                               common to all the entities.
+    """
+    filter_data = filter_data or {}
+    if term_filter_fields is None:
+        term_filter_fields = get_term_filter_fields(entities)
+
+    parameter_values = []
+    template = _get_query_template(
+        tuple(entities),
+        _get_term_shape(term, parameter_values),
+        _get_value_shape(filter_data, parameter_values),
+        _get_composite_field_mapping_shape(composite_field_mapping),
+        _get_permission_filters_shape(permission_filters, parameter_values),
+        term_filter_fields,
+    )
+    term_queries, permission_query, filter_query = _substitute_query_parameters(
+        template,
+        parameter_values,
+    )
 
     s = Search(
         index=[
@@ -108,16 +130,15 @@ def get_search_by_entities_query(
             for entity in entities
         ],
     ).query(
-        Bool(must=query),
+        Bool(must=[_CompiledQuery(term_query) for term_query in term_queries]),
     ).extra(
         track_total_hits=True,
     )
 
-    permission_query = _build_entity_permission_query(permission_filters)
-    if permission_query:
-        s = s.filter(permission_query)
+    if permission_query is not None:
+        s = s.filter(_CompiledQuery(permission_query))
 
-    s = s.filter(Bool(must=must_filter))
+    s = s.filter(_CompiledQuery(filter_query))
     s = _apply_sorting_to_query(s, ordering)
     return _apply_source_filtering_to_query(
         s,
@@ -126,10 +147,295 @@ def get_search_by_entities_query(
     )
 
 
-def limit_search_query(query, offset=0, limit=100):
-    """Limits search query to the page defined by offset and limit."""
+def get_typeahead_query(
+        entity,
+        term,
+        typeahead_fields,
+        permission_filters=None,
+        fields_to_include=None,
+        limit=10,
+):
+    """
+    Gets a typeahead (search-as-you-type) query for an entity.
+
+    Each word in the term must match a word in any of typeahead_fields, with the last word
+    being matched as a prefix. typeahead_fields should be search_as_you_type fields (see
+    fields.TypeaheadText); their shingle sub-fields are also searched so that consecutive words
+    are ranked higher.
+    """
+    fields = [
+        sub_field
+        for field in typeahead_fields
+        for sub_field in (field, f'{field}._2gram', f'{field}._3gram')
+    ]
+
+    search = Search(
+        index=entity.get_read_alias(),
+    ).query(
+        MultiMatch(
+            query=term,
+            fields=fields,
+            type='bool_prefix',
+            operator='and',
+        ),
+    )
+
+    permission_query = _build_entity_permission_query(permission_filters)
+    if permission_query:
+        search = search.filter(permission_query)
+
+    search = search.sort(
+        '_score',
+        'id',
+    ).source(
+        includes=fields_to_include,
+    )
+    return limit_search_query(search, limit=limit)
+
+
+def get_term_filter_fields(entities):
+    """
+    Gets the fields that can be filtered using term queries for all of the given entities.
+
+    These are fields that are not analysed (keyword fields without a normaliser, and boolean
+    fields). term and terms queries are cheaper than match queries for these fields (as the
+    filter values don't need to be analysed), and terms queries can be cached by
+    Elasticsearch.
+    """
+    return frozenset.intersection(
+        *(get_model_term_filter_field_paths(entity) for entity in entities),
+    )
+
+
+class _QueryParameter:
+    """
+    Placeholder for a value in a query template.
+
+    Placeholders are truthy or falsy according to the value they stand for, as the
+    truthiness of some filter values (e.g. for *_exists filters) changes the query structure.
+    """
+
+    __slots__ = ('index', 'is_truthy')
+
+    def __init__(self, index, is_truthy):
+        self.index = index
+        self.is_truthy = is_truthy
+
+    def __bool__(self):
+        return self.is_truthy
+
+
+class _QueryTemplate(NamedTuple):
+    term_queries: list
+    permission_query: Optional[dict]
+    filter_query: dict
+
+
+class _CompiledQuery(Query):
+    """A query that has already been converted to a dict (from a query template)."""
+
+    name = 'compiled_query'
+
+    def __init__(self, query_dict=None):
+        super().__init__(query_dict=query_dict)
+
+    def to_dict(self):
+        """Returns the dict that the query was created with."""
+        return self._params['query_dict']
+
+
+@lru_cache(maxsize=QUERY_TEMPLATE_CACHE_SIZE)
+def _get_query_template(
+        entities,
+        term_shape,
+        filter_data_shape,
+        composite_field_mapping_shape,
+        permission_filters_shape,
+        term_filter_fields,
+):
+    """
+    Builds and caches the query template for a query shape.
+
+    The query is built using placeholders (_QueryParameter instances) in place of the term
+    and filter values and then converted to dicts. The placeholders are created in the same
+    order as the values are collected by the _get_*_shape() functions, so that they can be
+    replaced with the values for each request (see _substitute_query_parameters()).
+
+    Only the parts of the query that are expensive to build and don't depend on the view's
+    ordering or source filtering are included in the template.
+    """
+    parameter_indices = count()
+    term = term_shape if term_shape == '' else _make_placeholders(
+        term_shape,
+        parameter_indices,
+    )
+    filter_data = _make_placeholders(filter_data_shape, parameter_indices)
+    permission_filters = _make_permission_filters_placeholders(
+        permission_filters_shape,
+        parameter_indices,
+    )
+    composite_field_mapping = _make_composite_field_mapping(composite_field_mapping_shape)
+
+    term_queries = []
+    if term != '':
+        term_queries = [
+            _build_term_query(term, fields=entity.SEARCH_FIELDS).to_dict()
+            for entity in entities
+        ]
+
+    permission_query = _build_entity_permission_query(permission_filters)
+
+    filters, ranges = _split_range_fields(filter_data)
+    must_filter = _build_must_queries(
+        filters,
+        ranges,
+        composite_field_mapping,
+        term_filter_fields=term_filter_fields,
+    )
+
+    return _QueryTemplate(
+        term_queries=term_queries,
+        permission_query=permission_query.to_dict() if permission_query else None,
+        filter_query=Bool(must=must_filter).to_dict(),
+    )
+
+
+def _get_term_shape(term, parameter_values):
+    # An empty term results in a match_all query, so it's part of the shape of the query
+    if term == '':
+        return term
+
+    return _get_value_shape(term, parameter_values)
+
+
+def _get_value_shape(value, parameter_values):
+    """
+    Gets the shape of a filter value, and appends the values of any parameters to
+    parameter_values.
+
+    None values, and the structure of lists and dicts, are part of the shape of the query.
+    Other values are parameters.
+    """
+    if value is None:
+        return None
+
+    if isinstance(value, list):
+        return (
+            list,
+            tuple(_get_value_shape(item, parameter_values) for item in value),
+        )
+
+    if isinstance(value, dict):
+        return (
+            dict,
+            tuple(
+                (key, _get_value_shape(item, parameter_values))
+                for key, item in value.items()
+            ),
+        )
+
+    parameter_values.append(value)
+    return (_QueryParameter, bool(value))
+
+
+def _get_permission_filters_shape(permission_filters, parameter_values):
+    if permission_filters is None or permission_filters is EXCLUDE_ALL:
+        return permission_filters
+
+    return tuple(
+        (field, _get_value_shape(value, parameter_values))
+        for field, value in permission_filters
+    )
+
+
+def _get_composite_field_mapping_shape(composite_field_mapping):
+    if composite_field_mapping is None:
+        return None
+
+    return tuple(
+        (field, tuple(composite_fields))
+        for field, composite_fields in composite_field_mapping.items()
+    )
+
+
+def _make_placeholders(shape, parameter_indices):
+    """Creates a value with placeholders from a shape returned by _get_value_shape()."""
+    if shape is None:
+        return None
+
+    shape_type, shape_items = shape
+
+    if shape_type is list:
+        return [_make_placeholders(item, parameter_indices) for item in shape_items]
+
+    if shape_type is dict:
+        return {
+            key: _make_placeholders(item, parameter_indices)
+            for key, item in shape_items
+        }
+
+    return _QueryParameter(next(parameter_indices), shape_items)
+
+
+def _make_permission_filters_placeholders(shape, parameter_indices):
+    if shape is None or shape is EXCLUDE_ALL:
+        return shape
+
+    return [
+        (field, _make_placeholders(value_shape, parameter_indices))
+        for field, value_shape in shape
+    ]
+
+
+def _make_composite_field_mapping(shape):
+    if shape is None:
+        return None
+
+    return {field: list(composite_fields) for field, composite_fields in shape}
+
+
+def _substitute_query_parameters(node, parameter_values):
+    """Returns a copy of a query template with its placeholders replaced with values."""
+    if isinstance(node, _QueryParameter):
+        return parameter_values[node.index]
+
+    if isinstance(node, dict):
+        return {
+            key: _substitute_query_parameters(value, parameter_values)
+            for key, value in node.items()
+        }
+
+    if isinstance(node, _QueryTemplate):
+        return _QueryTemplate._make(
+            _substitute_query_parameters(value, parameter_values) for value in node
+        )
+
+    if isinstance(node, (list, tuple)):
+        return type(node)(_substitute_query_parameters(value, parameter_values) for value in node)
+
+    return node
+
+
+def limit_search_query(query, offset=0, limit=100, search_after=None):
+    """
+    Limits search query to the page defined by offset and limit.
+
+    If search_after is specified, the page starts after the result with those sort values
+    (offset should be 0 in this case). Unlike offset, this can be used to page beyond the
+    first MAX_RESULTS results.
+    """
     limit = _clip_limit(offset, limit)
-    return query[offset:offset + limit]
+    query = query[offset:offset + limit]
+
+    if search_after is not None:
+        query = query.extra(search_after=search_after)
+
+    return query
+
+
+def get_search_page_size(limit):
+    """Gets the number of results that will be returned for a page of the specified limit."""
+    return _clip_limit(0, limit)
 
 
 def _split_range_fields(fields):
@@ -251,7 +557,7 @@ def _build_exists_query(field, value):
     return Bool(**query)
 
 
-def _build_single_field_query(field, value):
+def _build_single_field_query(field, value, term_filter_fields=frozenset()):
     """
     Used by _build_field_query and always expecting value as a single value.
     You should never need to use this, it's more likely you want _build_field_query instead.
@@ -264,6 +570,9 @@ def _build_single_field_query(field, value):
         parent_field = field.rsplit('.', maxsplit=1)[0]
         return _build_exists_query(f'{parent_field}_exists', False)
 
+    if field in term_filter_fields:
+        return Term(**{field: value})
+
     field_query = {
         'query': value,
         'operator': 'and',
@@ -271,25 +580,34 @@ def _build_single_field_query(field, value):
     return Match(**{field: field_query})
 
 
-def _build_field_query(field, value):
-    """Builds a field query."""
+def _build_field_query(field, value, term_filter_fields=frozenset()):
+    """
+    Builds a field query.
+
+    term (or terms) queries are used for fields in term_filter_fields (keyword and boolean
+    fields, which are not analysed), and match queries for other fields.
+    """
     if isinstance(value, list):
+        if field in term_filter_fields and None not in value:
+            return Terms(**{field: value})
+
         # perform "or" query
         should_filter = [
-            _build_single_field_query(field, single_value) for single_value in value
+            _build_single_field_query(field, single_value, term_filter_fields)
+            for single_value in value
         ]
         return Bool(should=should_filter, minimum_should_match=1)
 
-    return _build_single_field_query(field, value)
+    return _build_single_field_query(field, value, term_filter_fields)
 
 
-def _build_field_queries(filters):
+def _build_field_queries(filters, term_filter_fields=frozenset()):
     """
     Builds field queries.
     Same as _build_field_query but expects a dict of field/values and returns a list of queries.
     """
     return [
-        _build_field_query(field, value)
+        _build_field_query(field, value, term_filter_fields)
         for field, value in filters.items()
     ]
 
@@ -302,7 +620,7 @@ def _build_range_queries(filters):
     ]
 
 
-def _build_nested_queries(field, nested_filters):
+def _build_nested_queries(field, nested_filters, term_filter_fields=frozenset()):
     """Builds nested queries."""
     normalised_nested_filters = {
         f'{field}_{nested_field}': nested_value
@@ -311,12 +629,12 @@ def _build_nested_queries(field, nested_filters):
 
     filters, ranges = _split_range_fields(normalised_nested_filters)
     return [
-        *_build_field_queries(filters),
+        *_build_field_queries(filters, term_filter_fields),
         *_build_range_queries(ranges),
     ]
 
 
-def _build_must_queries(filters, ranges, composite_field_mapping):
+def _build_must_queries(filters, ranges, composite_field_mapping, term_filter_fields=frozenset()):
     """Builds a "must" filter query."""
     must_filter = []
 
@@ -329,9 +647,10 @@ def _build_must_queries(filters, ranges, composite_field_mapping):
             composite_fields = composite_field_mapping[field]
             should_filters = _build_field_queries(
                 {composite_field: value for composite_field in composite_fields},
+                term_filter_fields,
             )
         elif isinstance(value, dict):
-            should_filters = _build_nested_queries(field, value)
+            should_filters = _build_nested_queries(field, value, term_filter_fields)
 
         if should_filters:
             # builds an "or" query for given list of fields
@@ -340,7 +659,7 @@ def _build_must_queries(filters, ranges, composite_field_mapping):
             )
         else:
             must_filter.append(
-                _build_field_query(field, value),
+                _build_field_query(field, value, term_filter_fields),
             )
 
     if ranges:
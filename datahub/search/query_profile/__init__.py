@@ -0,0 +1,10 @@
+"""
+Profiling of search queries.
+
+When enabled, a fraction of search queries (and optionally all queries from staff users) are
+executed with the Elasticsearch profile API, and the results are stored in the
+SearchQueryProfile model together with the shape of each query (the query with values such
+as search terms and filter values removed).
+
+An admin report lists the slowest query shapes by search app.
+"""
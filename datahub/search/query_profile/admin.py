@@ -0,0 +1,30 @@
+from django.contrib import admin
+
+from datahub.core.admin import format_json_as_html, ViewOnlyAdmin
+from datahub.search.query_profile.models import SearchQueryProfile
+
+
+@admin.register(SearchQueryProfile)
+class SearchQueryProfileAdmin(ViewOnlyAdmin):
+    """Admin configuration for SearchQueryProfile."""
+
+    list_display = ('timestamp', 'search_app', 'view_name', 'took')
+    list_filter = ('search_app',)
+    fields = (
+        'id',
+        'timestamp',
+        'search_app',
+        'view_name',
+        'took',
+        'query_shape_hash',
+        'query_shape',
+        'pretty_shard_timings',
+    )
+    search_fields = ('=query_shape_hash',)
+    readonly_fields = fields
+
+    def pretty_shard_timings(self, obj):
+        """Returns the shard timings formatted with indentation."""
+        return format_json_as_html(obj.shard_timings)
+
+    pretty_shard_timings.short_description = 'shard timings (ms)'
@@ -0,0 +1,37 @@
+from django.db.models import Avg, Count, Max, Min
+
+from datahub.admin_report.report import QuerySetReport
+from datahub.search.query_profile.models import SearchQueryProfile
+
+
+class SlowestSearchQueryShapesReport(QuerySetReport):
+    """Admin report listing search query shapes by search app, slowest first."""
+
+    id = 'slowest-search-query-shapes'
+    name = 'Slowest search query shapes'
+    model = SearchQueryProfile
+    permissions_required = ('search_query_profile.view_searchqueryprofile',)
+    queryset = SearchQueryProfile.objects.values(
+        'search_app',
+        'view_name',
+        'query_shape_hash',
+    ).annotate(
+        num_queries=Count('pk'),
+        mean_took=Avg('took'),
+        max_took=Max('took'),
+        # All profiles with the same hash have the same query shape
+        shape=Min('query_shape'),
+    ).order_by(
+        '-mean_took',
+        'search_app',
+        'query_shape_hash',
+    )
+    field_titles = {
+        'search_app': 'Search app',
+        'view_name': 'View',
+        'num_queries': 'Number of queries profiled',
+        'mean_took': 'Mean time (ms)',
+        'max_took': 'Max time (ms)',
+        'query_shape_hash': 'Query shape hash',
+        'shape': 'Query shape',
+    }
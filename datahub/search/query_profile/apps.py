@@ -0,0 +1,9 @@
+from django.apps import AppConfig
+
+
+class QueryProfileConfig(AppConfig):
+    """App config for the search query_profile app."""
+
+    name = 'datahub.search.query_profile'
+    label = 'search_query_profile'
+    verbose_name = 'Search query profiling'
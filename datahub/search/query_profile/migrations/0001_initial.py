@@ -0,0 +1,36 @@
+# Generated by Django 3.1.12 on 2026-10-18 12:00
+
+from django.db import migrations, models
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SearchQueryProfile',
+            fields=[
+                ('id', models.BigAutoField(primary_key=True, serialize=False)),
+                ('timestamp', models.DateTimeField(db_index=True, default=django.utils.timezone.now, editable=False)),
+                ('search_app', models.CharField(max_length=255)),
+                ('view_name', models.CharField(max_length=255)),
+                ('query_shape', models.TextField()),
+                ('query_shape_hash', models.CharField(max_length=255)),
+                ('took', models.PositiveIntegerField()),
+                ('shard_timings', models.JSONField()),
+            ],
+            options={
+                'ordering': ('-timestamp', '-pk'),
+                'default_permissions': ('view',),
+            },
+        ),
+        migrations.AddIndex(
+            model_name='searchqueryprofile',
+            index=models.Index(fields=['search_app', 'query_shape_hash'], name='search_quer_search__076964_idx'),
+        ),
+    ]
@@ -0,0 +1,36 @@
+from django.conf import settings
+from django.db import models
+from django.utils.timezone import now
+
+MAX_LENGTH = settings.CHAR_FIELD_MAX_LENGTH
+
+
+class SearchQueryProfile(models.Model):
+    """
+    The profile of a search query.
+
+    Search terms and filter values are removed from the stored query (query_shape) so that
+    queries with the same structure can be grouped together.
+    """
+
+    id = models.BigAutoField(primary_key=True)
+    timestamp = models.DateTimeField(db_index=True, default=now, editable=False)
+    search_app = models.CharField(max_length=MAX_LENGTH)
+    view_name = models.CharField(max_length=MAX_LENGTH)
+    query_shape = models.TextField()
+    query_shape_hash = models.CharField(max_length=MAX_LENGTH)
+    # As reported by Elasticsearch (in milliseconds)
+    took = models.PositiveIntegerField()
+    # Timings (in milliseconds) for each shard
+    shard_timings = models.JSONField()
+
+    def __str__(self):
+        """Human-friendly string representation."""
+        return f'{self.timestamp} – {self.view_name} – {self.took}ms'
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['search_app', 'query_shape_hash']),
+        ]
+        ordering = ('-timestamp', '-pk')
+        default_permissions = ('view',)
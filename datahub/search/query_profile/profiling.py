@@ -0,0 +1,131 @@
+import json
+from hashlib import blake2b
+from random import random
+
+from django.conf import settings
+
+from datahub.search.query_profile.models import SearchQueryProfile
+
+# Keys whose values are part of the structure of a query (rather than values provided by the
+# user) and so are kept in query shapes
+STRUCTURAL_KEYS = frozenset(
+    (
+        'analyzer',
+        'boost',
+        'excludes',
+        'field',
+        'fields',
+        'includes',
+        'minimum_should_match',
+        'operator',
+        'path',
+        'sort',
+        'type',
+    ),
+)
+# Keys that are removed from query shapes as they are not relevant to how a query performs
+IGNORED_KEYS = frozenset(('from', 'profile', 'search_after', 'size'))
+VALUE_PLACEHOLDER = '?'
+
+
+def should_profile_search_request(request):
+    """
+    Returns whether the search queries for a request should be profiled.
+
+    This is the case for requests from staff users (if
+    settings.SEARCH_QUERY_PROFILING_STAFF_ENABLED is set), and a random
+    settings.SEARCH_QUERY_PROFILING_SAMPLE_RATE fraction of other requests.
+    """
+    if settings.SEARCH_QUERY_PROFILING_STAFF_ENABLED and request.user.is_staff:
+        return True
+
+    sample_rate = settings.SEARCH_QUERY_PROFILING_SAMPLE_RATE
+    return bool(sample_rate) and random() < sample_rate
+
+
+def enable_query_profiling(query):
+    """Returns a copy of an Elasticsearch query with the profile API enabled."""
+    return query.extra(profile=True)
+
+
+def record_search_query_profile(search_app_name, view_cls, query, response):
+    """
+    Stores the profile of an executed Elasticsearch query.
+
+    Nothing is stored if the query was not executed with profiling enabled.
+    """
+    profile = getattr(response, 'profile', None)
+    if profile is None:
+        return
+
+    query_shape = json.dumps(get_query_shape(query.to_dict()), sort_keys=True)
+
+    SearchQueryProfile.objects.create(
+        search_app=search_app_name,
+        view_name=f'{view_cls.__module__}.{view_cls.__qualname__}',
+        query_shape=query_shape,
+        query_shape_hash=blake2b(query_shape.encode('utf-8'), digest_size=16).hexdigest(),
+        took=response.took,
+        shard_timings=[_get_shard_timings(shard) for shard in profile.to_dict()['shards']],
+    )
+
+
+def get_query_shape(query_dict):
+    """
+    Gets the shape of an Elasticsearch query (as a dict).
+
+    Values such as search terms, filter values and pagination parameters are replaced with a
+    placeholder (or removed), while field names and other structural values are kept.
+    """
+    return {
+        key: _get_value_shape(key, value)
+        for key, value in query_dict.items()
+        if key not in IGNORED_KEYS
+    }
+
+
+def _get_value_shape(key, value):
+    if key in STRUCTURAL_KEYS:
+        return value
+
+    if isinstance(value, dict):
+        return {
+            sub_key: _get_value_shape(sub_key, sub_value)
+            for sub_key, sub_value in value.items()
+        }
+
+    if isinstance(value, list):
+        if value and all(not isinstance(item, (dict, list)) for item in value):
+            # Lists of values (e.g. for terms queries) are collapsed to a single placeholder
+            # so that the number of values doesn't affect the shape
+            return [VALUE_PLACEHOLDER]
+
+        return [_get_value_shape(None, item) for item in value]
+
+    return VALUE_PLACEHOLDER
+
+
+def _get_shard_timings(shard):
+    searches = shard['searches']
+
+    return {
+        'id': shard['id'],
+        'query_time': _nanos_to_millis(
+            sum(query['time_in_nanos'] for search in searches for query in search['query']),
+        ),
+        'rewrite_time': _nanos_to_millis(sum(search['rewrite_time'] for search in searches)),
+        'collector_time': _nanos_to_millis(
+            sum(
+                collector['time_in_nanos']
+                for search in searches
+                for collector in search['collector']
+            ),
+        ),
+        'aggregation_time': _nanos_to_millis(
+            sum(aggregation['time_in_nanos'] for aggregation in shard['aggregations']),
+        ),
+    }
+
+
+def _nanos_to_millis(nanos):
+    return nanos / 1_000_000
@@ -0,0 +1,50 @@
+from csv import DictReader
+from io import StringIO
+
+import pytest
+from django.urls import reverse
+from rest_framework import status
+
+from datahub.core.test_utils import AdminTestMixin, create_test_user
+from datahub.search.query_profile.models import SearchQueryProfile
+
+pytestmark = pytest.mark.django_db
+
+
+class TestSlowestSearchQueryShapesReport(AdminTestMixin):
+    """Tests for the slowest search query shapes report."""
+
+    def test_report_download(self):
+        """Test that profiles are grouped by query shape and sorted by mean time."""
+        for query_shape_hash, took in (('fast', 10), ('slow', 100), ('slow', 200)):
+            SearchQueryProfile.objects.create(
+                search_app='company',
+                view_name='CompanySearchView',
+                query_shape=f'{{"shape": "{query_shape_hash}"}}',
+                query_shape_hash=query_shape_hash,
+                took=took,
+                shard_timings=[],
+            )
+
+        url = reverse(
+            'admin-report:download-report',
+            kwargs={'report_id': 'slowest-search-query-shapes'},
+        )
+        user = create_test_user(
+            permission_codenames=('view_searchqueryprofile',),
+            is_staff=True,
+            password=self.PASSWORD,
+        )
+        client = self.create_client(user=user)
+
+        response = client.get(url)
+
+        assert response.status_code == status.HTTP_200_OK
+        reader = DictReader(StringIO(response.getvalue().decode('utf-8-sig')))
+        assert [
+            (row['Query shape hash'], row['Number of queries profiled'], row['Max time (ms)'])
+            for row in reader
+        ] == [
+            ('slow', '2', '200'),
+            ('fast', '1', '10'),
+        ]
@@ -0,0 +1,200 @@
+import json
+from unittest.mock import Mock
+
+import pytest
+from elasticsearch_dsl import Search
+from elasticsearch_dsl.response import Response
+from rest_framework import status
+from rest_framework.reverse import reverse
+
+from datahub.core.test_utils import APITestMixin, create_test_user
+from datahub.search.query_profile.models import SearchQueryProfile
+from datahub.search.query_profile.profiling import (
+    get_query_shape,
+    record_search_query_profile,
+    should_profile_search_request,
+)
+from datahub.search.test.search_support.models import SimpleModel
+from datahub.search.test.search_support.simplemodel.views import SearchSimpleModelAPIView
+
+pytestmark = pytest.mark.django_db
+
+
+def _create_shard_profile(shard_id):
+    return {
+        'id': shard_id,
+        'searches': [
+            {
+                'query': [{'time_in_nanos': 2_000_000}, {'time_in_nanos': 1_000_000}],
+                'rewrite_time': 500_000,
+                'collector': [{'time_in_nanos': 250_000}],
+            },
+        ],
+        'aggregations': [{'time_in_nanos': 1_500_000}],
+    }
+
+
+def test_get_query_shape():
+    """Test that values are removed from a query but field names and structure are kept."""
+    query = {
+        'query': {
+            'bool': {
+                'must': [
+                    {
+                        'multi_match': {
+                            'query': 'test',
+                            'fields': ['name', 'name.trigram'],
+                            'type': 'cross_fields',
+                            'operator': 'and',
+                        },
+                    },
+                ],
+                'filter': [
+                    {'terms': {'sector.id': ['a', 'b', 'c']}},
+                    {'range': {'date': {'gte': '2020-01-01'}}},
+                    {'exists': {'field': 'archived_on'}},
+                ],
+            },
+        },
+        'sort': [{'date': {'order': 'asc', 'missing': '_first'}}, 'id'],
+        'from': 100,
+        'size': 10,
+        'profile': True,
+    }
+
+    assert get_query_shape(query) == {
+        'query': {
+            'bool': {
+                'must': [
+                    {
+                        'multi_match': {
+                            'query': '?',
+                            'fields': ['name', 'name.trigram'],
+                            'type': 'cross_fields',
+                            'operator': 'and',
+                        },
+                    },
+                ],
+                'filter': [
+                    {'terms': {'sector.id': ['?']}},
+                    {'range': {'date': {'gte': '?'}}},
+                    {'exists': {'field': 'archived_on'}},
+                ],
+            },
+        },
+        'sort': [{'date': {'order': 'asc', 'missing': '_first'}}, 'id'],
+    }
+
+
+@pytest.mark.parametrize(
+    'is_staff,staff_enabled,sample_rate,expected_result',
+    (
+        (False, False, 0, False),
+        (True, False, 0, False),
+        (True, True, 0, True),
+        (False, True, 0, False),
+        (False, False, 1, True),
+    ),
+)
+def test_should_profile_search_request(
+    settings,
+    is_staff,
+    staff_enabled,
+    sample_rate,
+    expected_result,
+):
+    """Test that staff requests and sampled requests are profiled when enabled."""
+    settings.SEARCH_QUERY_PROFILING_STAFF_ENABLED = staff_enabled
+    settings.SEARCH_QUERY_PROFILING_SAMPLE_RATE = sample_rate
+    request = Mock(user=Mock(is_staff=is_staff))
+
+    assert should_profile_search_request(request) == expected_result
+
+
+def test_record_search_query_profile():
+    """Test that the query shape and shard timings are stored."""
+    query = Search().query('match', name='test')
+    response = Response(
+        query,
+        {
+            'took': 12,
+            'hits': {'hits': []},
+            'profile': {'shards': [_create_shard_profile('[node][index][0]')]},
+        },
+    )
+
+    record_search_query_profile('simplemodel', SearchSimpleModelAPIView, query, response)
+
+    profile = SearchQueryProfile.objects.get()
+    assert profile.search_app == 'simplemodel'
+    assert profile.view_name == (
+        'datahub.search.test.search_support.simplemodel.views.SearchSimpleModelAPIView'
+    )
+    assert json.loads(profile.query_shape) == {'query': {'match': {'name': '?'}}}
+    assert profile.took == 12
+    assert profile.shard_timings == [
+        {
+            'id': '[node][index][0]',
+            'query_time': 3.0,
+            'rewrite_time': 0.5,
+            'collector_time': 0.25,
+            'aggregation_time': 1.5,
+        },
+    ]
+
+
+def test_record_search_query_profile_without_profile():
+    """Test that nothing is stored if the query was not profiled."""
+    query = Search().query('match', name='test')
+    response = Response(query, {'took': 12, 'hits': {'hits': []}})
+
+    record_search_query_profile('simplemodel', SearchSimpleModelAPIView, query, response)
+
+    assert not SearchQueryProfile.objects.exists()
+
+
+class TestProfiledSearch(APITestMixin):
+    """Tests for profiling of search views."""
+
+    @pytest.mark.parametrize(
+        'url_name,request_kwargs,expected_search_app',
+        (
+            (
+                'api-v3:search:simplemodel',
+                {'method': 'post', 'data': {'original_query': 'Uranus'}},
+                'simplemodel',
+            ),
+            (
+                'api-v3:search:basic',
+                {'method': 'get', 'data': {'term': 'Uranus', 'entity': 'simplemodel'}},
+                'global',
+            ),
+        ),
+    )
+    def test_profiles_staff_searches(
+        self,
+        es_with_collector,
+        settings,
+        url_name,
+        request_kwargs,
+        expected_search_app,
+    ):
+        """Test that searches by staff users are profiled when enabled."""
+        settings.SEARCH_QUERY_PROFILING_STAFF_ENABLED = True
+        SimpleModel.objects.create(name='Uranus')
+        es_with_collector.flush_and_refresh()
+
+        user = create_test_user(
+            permission_codenames=['view_simplemodel'],
+            is_staff=True,
+        )
+        api_client = self.create_api_client(user=user)
+        method = getattr(api_client, request_kwargs['method'])
+
+        response = method(reverse(url_name), data=request_kwargs['data'])
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.json()['count'] == 1
+        profile = SearchQueryProfile.objects.get()
+        assert profile.search_app == expected_search_app
+        assert profile.shard_timings
@@ -0,0 +1,281 @@
+"""
+Migration of search apps to new indices using the Elasticsearch reindex API.
+
+This is used (instead of a full resync from the database) when
+settings.SEARCH_MIGRATION_REINDEX_ENABLED is True and the mapping change does not add,
+remove or move any document fields (for example, when only analysers or field types have
+changed). Existing documents can then be copied as they are.
+
+During such a migration:
+
+- the read alias continues to reference only the old index (so searches return complete
+results throughout)
+- the write alias references only the new index
+- documents are written to (and deleted from) both the old and new indices
+(see datahub.search.utils.get_dual_write_indices())
+
+Once documents have been copied and document counts reconcile, the read alias is switched
+to the new index and the old index is deleted.
+"""
+from logging import getLogger
+from time import monotonic, sleep
+
+from django.conf import settings
+
+from datahub.core.exceptions import DataHubException
+from datahub.core.utils import slice_iterable_into_chunks
+from datahub.search.bulk_sync import sync_app, sync_objects
+from datahub.search.deletion import delete_documents
+from datahub.search.elasticsearch import (
+    cancel_task,
+    delete_index,
+    get_aliases_for_index,
+    get_document_count,
+    get_document_ids,
+    get_index_creation_time,
+    get_index_mapping,
+    get_task,
+    start_alias_transaction,
+    start_reindex,
+)
+from datahub.search.incremental_sync import sync_objects_changed_since, WATERMARK_OVERLAP
+from datahub.search.migrate_utils import delete_from_secondary_indices_callback
+
+logger = getLogger(__name__)
+
+REINDEX_POLL_INTERVAL_SECS = 10
+# The maximum time to wait for the reindex task to complete (after which it's cancelled)
+REINDEX_TIMEOUT_SECS = 6 * 60 * 60
+REINDEX_SLICES = 'auto'
+
+
+def can_migrate_by_reindex(search_app, current_index_name):
+    """
+    Returns whether a search app can be migrated from its current index using the
+    Elasticsearch reindex API.
+
+    This is the case when it's enabled using settings.SEARCH_MIGRATION_REINDEX_ENABLED and the
+    current and target mappings have the same document fields (multi-fields such as
+    .trigram are ignored as they don't appear in documents).
+    """
+    if not settings.SEARCH_MIGRATION_REINDEX_ENABLED:
+        return False
+
+    current_mapping = get_index_mapping(current_index_name)
+    target_mapping = search_app.es_model._doc_type.mapping.to_dict()
+    return _get_document_field_paths(current_mapping) == _get_document_field_paths(
+        target_mapping,
+    )
+
+
+def start_reindex_migration(search_app, current_index_name, new_index_name):
+    """
+    Starts a reindex migration by pointing the write alias at the new index.
+
+    The read alias is left referencing only the current index until the migration is
+    completed by complete_reindex_migration().
+    """
+    write_alias_name = search_app.es_model.get_write_alias()
+
+    with start_alias_transaction() as alias_transaction:
+        alias_transaction.associate_indices_with_alias(write_alias_name, [new_index_name])
+        alias_transaction.dissociate_indices_from_alias(write_alias_name, [current_index_name])
+
+
+def complete_reindex_migration(search_app):
+    """
+    Completes a reindex migration.
+
+    This:
+
+    - copies documents from the old index to the new index using the reindex API (leaving
+    documents that were written to the new index during the migration untouched)
+    - syncs objects changed since the new index was created from the database (to catch
+    any changes missed by the reindex)
+    - reconciles the documents in the two indices
+    - switches the read alias to the new index, and deletes the old index
+
+    If copying documents fails, the write alias is pointed back at the old index and the new
+    index is deleted (so that the migration can be started again using migrate_es).
+
+    This is safe to run again if interrupted.
+    """
+    es_model = search_app.es_model
+    read_indices, new_index = es_model.get_read_and_write_indices()
+
+    if not es_model.was_reindex_migration_started():
+        raise DataHubException(
+            f'Unexpected alias state for a reindex migration of the {search_app.name} search '
+            f'app, aborting...',
+        )
+
+    old_index, = read_indices
+
+    try:
+        _reindex(search_app, old_index, new_index)
+    except Exception:
+        _abort_reindex_migration(search_app, old_index, new_index)
+        raise
+
+    _catch_up(search_app, new_index)
+    _reconcile_documents(search_app, old_index, new_index)
+    _switch_read_alias(search_app, old_index, new_index)
+
+    logger.info(f'Reindex migration of the {search_app.name} search app complete')
+
+
+def _reindex(search_app, old_index, new_index):
+    logger.info(f'Copying {search_app.name} documents from {old_index} to {new_index}...')
+
+    task_id = start_reindex(old_index, new_index, slices=REINDEX_SLICES)
+    deadline = monotonic() + REINDEX_TIMEOUT_SECS
+
+    while True:
+        sleep(REINDEX_POLL_INTERVAL_SECS)
+        task = get_task(task_id)
+        _log_reindex_progress(search_app, task['task']['status'])
+
+        if task['completed']:
+            break
+
+        if monotonic() >= deadline:
+            cancel_task(task_id)
+            raise DataHubException(
+                f'Reindexing {old_index} to {new_index} did not complete within '
+                f'{REINDEX_TIMEOUT_SECS} seconds, the reindex task ({task_id}) has been '
+                f'cancelled',
+            )
+
+    failures = task.get('error') or task.get('response', {}).get('failures')
+    if failures:
+        raise DataHubException(
+            f'Errors occurred while reindexing {old_index} to {new_index}: {failures!r}',
+        )
+
+
+def _abort_reindex_migration(search_app, old_index, new_index):
+    """
+    Points the write alias back at the old index and deletes the new index.
+
+    Documents continue to be written to the old index during a reindex migration, so the old
+    index is up to date and the migration can be attempted again by running migrate_es.
+    """
+    logger.warning(
+        f'Reindex migration of the {search_app.name} search app failed, reverting the write '
+        f'alias to {old_index}...',
+    )
+    write_alias_name = search_app.es_model.get_write_alias()
+
+    with start_alias_transaction() as alias_transaction:
+        alias_transaction.associate_indices_with_alias(write_alias_name, [old_index])
+        alias_transaction.dissociate_indices_from_alias(write_alias_name, [new_index])
+
+    if not get_aliases_for_index(new_index):
+        delete_index(new_index)
+
+
+def _log_reindex_progress(search_app, status):
+    total = status['total']
+    num_processed = status['created'] + status['version_conflicts']
+    percentage = num_processed / total * 100 if total else 100
+    logger.info(
+        f'{search_app.name} reindex progress: {num_processed}/{total} documents '
+        f'({percentage:.1f}%)',
+    )
+
+
+def _catch_up(search_app, new_index):
+    if not search_app.incremental_sync_fields:
+        logger.info(f'Performing full catch-up sync for the {search_app.name} search app...')
+        sync_app(search_app, post_batch_callback=delete_from_secondary_indices_callback)
+        return
+
+    changed_since = get_index_creation_time(new_index) - WATERMARK_OVERLAP
+    num_objects_synced = sync_objects_changed_since(search_app, changed_since)
+    logger.info(
+        f'{num_objects_synced} {search_app.name} objects changed during the migration synced',
+    )
+
+
+def _reconcile_documents(search_app, old_index, new_index):
+    """
+    Makes sure that the new index contains the same documents as the old index.
+
+    Document IDs are always compared, as equal document counts don't mean that the indices
+    contain the same documents (for example, the new index could be missing one document and
+    have an extra one).
+
+    Documents missing from the new index are synced from the database, unless the object no
+    longer exists in the database (in which case the document is deleted from the old index
+    instead).
+    """
+    # This also refreshes the indices so that recent changes are included
+    old_count = get_document_count(old_index, refresh=True)
+    new_count = get_document_count(new_index, refresh=True)
+
+    old_ids = set(get_document_ids(old_index))
+    new_ids = set(get_document_ids(new_index))
+
+    if old_ids == new_ids:
+        logger.info(f'{search_app.name} documents reconciled ({new_count} documents)')
+        return
+
+    logger.warning(
+        f'{search_app.name} document IDs differ ({old_index}: {old_count}, {new_index}: '
+        f'{new_count} documents), reconciling...',
+    )
+
+    extra_ids = new_ids - old_ids
+    if extra_ids:
+        delete_documents(new_index, [{'_id': id_} for id_ in extra_ids])
+
+    missing_ids = old_ids - new_ids
+    deleted_ids = set()
+    es_model = search_app.es_model
+    for batch in slice_iterable_into_chunks(missing_ids, search_app.bulk_batch_size):
+        queryset = search_app.queryset.filter(pk__in=batch)
+        existing_ids = {str(pk) for pk in queryset.values_list('pk', flat=True)}
+        batch_deleted_ids = set(batch) - existing_ids
+
+        if batch_deleted_ids:
+            delete_documents(old_index, [{'_id': id_} for id_ in batch_deleted_ids])
+            deleted_ids |= batch_deleted_ids
+
+        sync_objects(es_model, queryset, {old_index}, new_index)
+
+    old_count = get_document_count(old_index, refresh=True)
+    new_count = get_document_count(new_index, refresh=True)
+
+    if old_count != new_count:
+        raise DataHubException(
+            f'{search_app.name} document counts could not be reconciled ({old_index}: '
+            f'{old_count}, {new_index}: {new_count}), aborting migration...',
+        )
+
+    logger.info(
+        f'{search_app.name} document counts reconciled ({new_count} documents, '
+        f'{len(extra_ids)} removed, {len(missing_ids) - len(deleted_ids)} added, '
+        f'{len(deleted_ids)} deleted from the database removed from {old_index})',
+    )
+
+
+def _switch_read_alias(search_app, old_index, new_index):
+    read_alias_name = search_app.es_model.get_read_alias()
+
+    with start_alias_transaction() as alias_transaction:
+        alias_transaction.associate_indices_with_alias(read_alias_name, [new_index])
+        alias_transaction.dissociate_indices_from_alias(read_alias_name, [old_index])
+
+    if not get_aliases_for_index(old_index):
+        delete_index(old_index)
+
+
+def _get_document_field_paths(mapping, prefix=''):
+    paths = set()
+
+    for field_name, field_mapping in mapping.get('properties', {}).items():
+        path = f'{prefix}{field_name}'
+        paths.add(path)
+        paths |= _get_document_field_paths(field_mapping, prefix=f'{path}.')
+
+    return paths
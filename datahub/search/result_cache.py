@@ -0,0 +1,130 @@
+import json
+from hashlib import blake2b
+
+from django.conf import settings
+from django.core.cache import cache
+
+GENERATION_CACHE_KEY_PREFIX = 'search-result-cache-generation'
+RESULT_CACHE_KEY_PREFIX = 'search-result-cache'
+TYPEAHEAD_CACHE_KEY_PREFIX = 'search-typeahead-cache'
+
+
+def get_cached_search_response(view_cls, entities, query):
+    """
+    Gets a cached search response for a query (if there is one).
+
+    Returns None if there is no cached response or the cache is disabled.
+    """
+    if not settings.SEARCH_RESULT_CACHE_ENABLED:
+        return None
+
+    return cache.get(_get_result_cache_key(view_cls, entities, query))
+
+
+def cache_search_response(view_cls, entities, query, response):
+    """
+    Caches a search response for a query (if the cache is enabled).
+
+    Cached responses expire after settings.SEARCH_RESULT_CACHE_TIMEOUT seconds, and are
+    invalidated earlier when documents for any of the search models in entities are written
+    (see invalidate_search_result_cache()).
+    """
+    if not settings.SEARCH_RESULT_CACHE_ENABLED:
+        return
+
+    cache.set(
+        _get_result_cache_key(view_cls, entities, query),
+        response,
+        timeout=settings.SEARCH_RESULT_CACHE_TIMEOUT,
+    )
+
+
+def get_cached_typeahead_response(search_app_name, query):
+    """
+    Gets a cached typeahead response for a query (if there is one).
+
+    Returns None if there is no cached response or the typeahead cache is disabled.
+    """
+    if not settings.SEARCH_TYPEAHEAD_CACHE_TIMEOUT:
+        return None
+
+    return cache.get(_get_typeahead_cache_key(search_app_name, query))
+
+
+def cache_typeahead_response(search_app_name, query, response):
+    """
+    Caches a typeahead response for a query (if the typeahead cache is enabled).
+
+    Typeahead responses are cached for a short time (settings.SEARCH_TYPEAHEAD_CACHE_TIMEOUT
+    seconds) as the same prefixes are typed by many users. They are also invalidated in the
+    same way as other cached search responses when the result cache is enabled.
+    """
+    if not settings.SEARCH_TYPEAHEAD_CACHE_TIMEOUT:
+        return
+
+    cache.set(
+        _get_typeahead_cache_key(search_app_name, query),
+        response,
+        timeout=settings.SEARCH_TYPEAHEAD_CACHE_TIMEOUT,
+    )
+
+
+def invalidate_search_result_cache(search_app_name):
+    """
+    Invalidates all cached search responses involving a search app.
+
+    This works by incrementing a generation counter that is part of the cache key of all
+    responses for the search app (so that old entries are no longer used and expire
+    naturally).
+    """
+    if not settings.SEARCH_RESULT_CACHE_ENABLED:
+        return
+
+    generation_key = _get_generation_cache_key(search_app_name)
+
+    try:
+        cache.incr(generation_key)
+    except ValueError:
+        # The key doesn't exist yet
+        cache.add(generation_key, 1, timeout=None)
+
+
+def _get_result_cache_key(view_cls, entities, query):
+    """
+    Gets the cache key for a query.
+
+    The key includes a hash of the full query, which includes any permission filters from
+    get_permission_filters(), so responses are only shared between users with the same
+    effective permissions.
+    """
+    app_names = sorted(entity.get_app_name() for entity in entities)
+    generation_keys = [_get_generation_cache_key(app_name) for app_name in app_names]
+    generations = cache.get_many(generation_keys)
+
+    key_data = {
+        'view': f'{view_cls.__module__}.{view_cls.__qualname__}',
+        'generations': [generations.get(key, 0) for key in generation_keys],
+        'query': query.to_dict(),
+    }
+    serialised_key_data = json.dumps(key_data, sort_keys=True, default=str).encode('utf-8')
+    key_hash = blake2b(serialised_key_data, digest_size=16).hexdigest()
+
+    return f'{RESULT_CACHE_KEY_PREFIX}:{"-".join(app_names)}:{key_hash}'
+
+
+def _get_typeahead_cache_key(search_app_name, query):
+    """
+    Gets the cache key for a typeahead query.
+
+    As with other search responses, the key includes a hash of the full query (including any
+    permission filters).
+    """
+    generation = cache.get(_get_generation_cache_key(search_app_name), 0)
+    serialised_query = json.dumps(query.to_dict(), sort_keys=True, default=str).encode('utf-8')
+    query_hash = blake2b(serialised_query, digest_size=16).hexdigest()
+
+    return f'{TYPEAHEAD_CACHE_KEY_PREFIX}:{search_app_name}:{generation}:{query_hash}'
+
+
+def _get_generation_cache_key(search_app_name):
+    return f'{GENERATION_CACHE_KEY_PREFIX}:{search_app_name}'
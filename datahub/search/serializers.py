@@ -4,7 +4,16 @@ from rest_framework.settings import api_settings
 
 from datahub.search.apps import get_global_search_apps_as_mapping
 from datahub.search.query_builder import MAX_RESULTS
-from datahub.search.utils import SearchOrdering, SortDirection
+from datahub.search.utils import (
+    decode_search_cursor,
+    encode_search_cursor,
+    SearchOrdering,
+    SortDirection,
+)
+
+DEFAULT_TYPEAHEAD_LIMIT = 10
+MAX_TYPEAHEAD_LIMIT = 50
+MAX_TYPEAHEAD_TERM_LENGTH = 100
 
 
 class SingleOrListField(serializers.ListField):
@@ -89,6 +98,35 @@ class _ESOrderingField(serializers.Field):
         return f'{value.field}:{value.direction}'
 
 
+class _SearchCursorField(serializers.Field):
+    """
+    Serialiser field for a cursor used to get the next page of search results.
+
+    A null value or empty string is used to request the first page.
+    """
+
+    default_error_messages = {
+        'invalid': gettext_lazy('Invalid cursor.'),
+    }
+
+    def to_internal_value(self, data):
+        """Decodes a cursor to a list of sort values."""
+        if data == '':
+            return None
+
+        if not isinstance(data, str):
+            self.fail('invalid')
+
+        try:
+            return decode_search_cursor(data)
+        except ValueError:
+            self.fail('invalid')
+
+    def to_representation(self, value):
+        """Encodes a list of sort values as a cursor."""
+        return encode_search_cursor(value)
+
+
 class BaseSearchQuerySerializer(serializers.Serializer):
     """Base serialiser for basic (global) and entity search."""
 
@@ -99,12 +137,24 @@ class BaseSearchQuerySerializer(serializers.Serializer):
     offset = serializers.IntegerField(default=0, min_value=0, max_value=MAX_RESULTS - 1)
     limit = serializers.IntegerField(default=api_settings.PAGE_SIZE, min_value=1)
     sortby = _ESOrderingField(required=False)
+    # If specified, results are paginated using search_after (instead of offset) so that
+    # results beyond the first 10,000 can be retrieved
+    cursor = _SearchCursorField(required=False, allow_null=True)
 
     def __init__(self, *args, **kwrags):
         """Initialises the serialiser and configures the `sortby` field."""
         super().__init__(*args, **kwrags)
         self.fields['sortby'].configure(self.SORT_BY_FIELDS, self.DEFAULT_ORDERING)
 
+    def validate(self, data):
+        """Checks that offset is not used in combination with cursor."""
+        if 'cursor' in data and data['offset']:
+            raise serializers.ValidationError(
+                {'offset': gettext_lazy('offset cannot be used with cursor.')},
+            )
+
+        return data
+
 
 class _ESModelChoiceField(serializers.Field):
     """Serialiser field for selecting an ES model by name."""
@@ -140,6 +190,46 @@ class BasicSearchQuerySerializer(BaseSearchQuerySerializer):
     term = serializers.CharField(required=True, allow_blank=True)
 
 
+class BatchSearchQuerySerializer(serializers.Serializer):
+    """Serialiser used to validate batch search POST bodies."""
+
+    term = serializers.CharField(default='', allow_blank=True)
+    # Entity search request bodies (without original_query), keyed by search app name
+    entities = serializers.DictField(child=serializers.DictField(), allow_empty=False)
+
+    def validate_entities(self, value):
+        """Checks that the entities are global search apps."""
+        invalid_app_names = value.keys() - get_global_search_apps_as_mapping().keys()
+        if invalid_app_names:
+            raise serializers.ValidationError(
+                gettext_lazy('"{input}" is not a valid choice.').format(
+                    input=sorted(invalid_app_names)[0],
+                ),
+            )
+
+        return value
+
+
+class TypeaheadQuerySerializer(serializers.Serializer):
+    """Serialiser used to validate typeahead search query parameters."""
+
+    term = serializers.CharField(max_length=MAX_TYPEAHEAD_TERM_LENGTH)
+    limit = serializers.IntegerField(
+        default=DEFAULT_TYPEAHEAD_LIMIT,
+        min_value=1,
+        max_value=MAX_TYPEAHEAD_LIMIT,
+    )
+
+    def validate_term(self, value):
+        """
+        Normalises the term.
+
+        The term is lowercased and consecutive whitespace is collapsed, so that equivalent
+        prefixes result in the same query (and cache key).
+        """
+        return ' '.join(value.lower().split())
+
+
 class EntitySearchQuerySerializer(BaseSearchQuerySerializer):
     """Serialiser used to validate entity search POST bodies."""
 
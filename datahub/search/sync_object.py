@@ -1,7 +1,11 @@
 from logging import getLogger
+from time import time
+
+from django.conf import settings
 
 from datahub.search.bulk_sync import sync_objects
 from datahub.search.migrate_utils import delete_from_secondary_indices_callback
+from datahub.search.sync_queue import enqueue_objects_for_sync
 from datahub.search.tasks import sync_object_task, sync_related_objects_task
 
 logger = getLogger(__name__)
@@ -15,7 +19,7 @@ def sync_object(search_app, pk):
     new index and then deleted from the old index.
     """
     es_model = search_app.es_model
-    read_indices, write_index = es_model.get_read_and_write_indices()
+    read_indices, write_index = es_model.get_read_and_write_indices(use_cache=True)
 
     obj = search_app.queryset.get(pk=pk)
     sync_objects(
@@ -27,6 +31,28 @@ def sync_object(search_app, pk):
     )
 
 
+def sync_object_batch(search_app, pks):
+    """
+    Syncs a batch of objects to Elasticsearch using a single query and bulk request.
+
+    Unlike sync_object(), objects that no longer exist are silently skipped.
+
+    This function is migration-safe – if a migration is in progress, the objects are added to
+    the new index and then deleted from the old index.
+    """
+    es_model = search_app.es_model
+    read_indices, write_index = es_model.get_read_and_write_indices(use_cache=True)
+
+    objs = search_app.queryset.filter(pk__in=pks)
+    sync_objects(
+        es_model,
+        objs,
+        read_indices,
+        write_index,
+        post_batch_callback=delete_from_secondary_indices_callback,
+    )
+
+
 def sync_object_async(search_app, pk):
     """
     Syncs a single object to Elasticsearch asynchronously (by scheduling a Celery task).
@@ -36,8 +62,19 @@ def sync_object_async(search_app, pk):
 
     Syncing an object is migration-safe – if a migration is in progress, the object is
     added to the new index and then deleted from the old index.
+
+    If settings.SEARCH_SYNC_QUEUE_ENABLED is True, the object is added to the sync queue of the
+    search app (instead of a Celery task being scheduled for it). The queue is periodically
+    drained by the drain_sync_queues task, which syncs queued objects in bulk.
     """
-    result = sync_object_task.apply_async(args=(search_app.name, pk))
+    if settings.SEARCH_SYNC_QUEUE_ENABLED:
+        enqueue_objects_for_sync(search_app, [pk])
+        return
+
+    result = sync_object_task.apply_async(
+        args=(search_app.name, pk),
+        kwargs={'enqueued_on': time()},
+    )
     logger.info(
         f'Task {result.id} scheduled to synchronise object {pk} for search app '
         f'{search_app.name}',
@@ -0,0 +1,97 @@
+from logging import getLogger
+from time import time
+
+from django_redis import get_redis_connection
+
+from datahub.search.bulk_sync import sync_objects
+from datahub.search.metrics import record_sync_lags
+from datahub.search.migrate_utils import delete_from_secondary_indices_callback
+
+logger = getLogger(__name__)
+
+SYNC_QUEUE_KEY_PREFIX = 'search-sync-queue'
+
+
+def enqueue_objects_for_sync(search_app, pks):
+    """
+    Adds objects to the sync queue of a search app.
+
+    The queue is a Redis sorted set scored by the time objects were first added, so an object
+    that is added multiple times before the queue is drained is only synced once (and the
+    time it has been waiting is not reset).
+    """
+    redis = get_redis_connection()
+    enqueued_on = time()
+    redis.zadd(_get_queue_key(search_app), {str(pk): enqueued_on for pk in pks}, nx=True)
+
+
+def get_sync_queue_depth(search_app):
+    """Returns the number of objects waiting in the sync queue of a search app."""
+    redis = get_redis_connection()
+    return redis.zcard(_get_queue_key(search_app))
+
+
+def drain_sync_queue(search_app, batch_size=None):
+    """
+    Syncs all objects in the sync queue of a search app to Elasticsearch.
+
+    Objects are removed from the queue in batches of batch_size (oldest first), and each batch
+    is synced using a single bulk request. If syncing a batch fails, the batch is put back in
+    the queue so that it's picked up again by the next drain.
+
+    The time each object spent in the queue is recorded as the search app's sync lag metric.
+
+    Like sync_object(), this is migration-safe.
+
+    Returns the number of objects synced.
+    """
+    batch_size = batch_size or search_app.bulk_batch_size
+    es_model = search_app.es_model
+    redis = get_redis_connection()
+    queue_key = _get_queue_key(search_app)
+    indices = None
+    num_objects_synced = 0
+
+    while True:
+        enqueued_times = {
+            pk.decode(): enqueued_on
+            for pk, enqueued_on in redis.zpopmin(queue_key, batch_size)
+        }
+        if not enqueued_times:
+            break
+
+        pks = list(enqueued_times)
+
+        try:
+            if indices is None:
+                indices = es_model.get_read_and_write_indices(use_cache=True)
+
+            read_indices, write_index = indices
+            num_objects_synced += sync_objects(
+                es_model,
+                search_app.queryset.filter(pk__in=pks),
+                read_indices,
+                write_index,
+                post_batch_callback=delete_from_secondary_indices_callback,
+            )
+        except Exception:
+            redis.zadd(queue_key, enqueued_times, nx=True)
+            raise
+
+        synced_on = time()
+        record_sync_lags(
+            search_app.name,
+            (synced_on - enqueued_on for enqueued_on in enqueued_times.values()),
+        )
+
+    if num_objects_synced:
+        logger.info(
+            f'{num_objects_synced} objects synced from the sync queue for search app '
+            f'{search_app.name}',
+        )
+
+    return num_objects_synced
+
+
+def _get_queue_key(search_app):
+    return f'{SYNC_QUEUE_KEY_PREFIX}:{search_app.name}'
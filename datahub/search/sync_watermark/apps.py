@@ -0,0 +1,9 @@
+from django.apps import AppConfig
+
+
+class SyncWatermarkConfig(AppConfig):
+    """App config for the search sync_watermark app."""
+
+    name = 'datahub.search.sync_watermark'
+    label = 'search_sync_watermark'
+    verbose_name = 'Search sync watermarks'
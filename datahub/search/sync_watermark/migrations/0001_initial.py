@@ -0,0 +1,24 @@
+# Generated by Django 3.1.12 on 2026-10-18 12:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='IncrementalSyncWatermark',
+            fields=[
+                ('search_app', models.CharField(max_length=255, primary_key=True, serialize=False)),
+                ('watermark', models.DateTimeField()),
+            ],
+            options={
+                'default_permissions': (),
+            },
+        ),
+    ]
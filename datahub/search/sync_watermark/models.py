@@ -0,0 +1,23 @@
+from django.conf import settings
+from django.db import models
+
+MAX_LENGTH = settings.CHAR_FIELD_MAX_LENGTH
+
+
+class IncrementalSyncWatermark(models.Model):
+    """
+    The time up to which changes have been synced by the last incremental sync of a search app.
+
+    This is stored in the database (rather than the cache) so that it is not lost if the cache
+    is flushed, which would otherwise cause changes to be skipped until a full sync was run.
+    """
+
+    search_app = models.CharField(max_length=MAX_LENGTH, primary_key=True)
+    watermark = models.DateTimeField()
+
+    def __str__(self):
+        """Human-friendly string representation."""
+        return f'{self.search_app} – {self.watermark}'
+
+    class Meta:
+        default_permissions = ()
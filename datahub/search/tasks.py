@@ -1,18 +1,36 @@
+from time import time
+
 from celery import shared_task
 from celery.utils.log import get_task_logger
 from django.apps import apps
+from django.conf import settings
 from django_pglocks import advisory_lock
 
+from datahub.core.utils import slice_iterable_into_chunks
 from datahub.search.apps import get_search_app, get_search_app_by_model, get_search_apps
-from datahub.search.bulk_sync import sync_app
+from datahub.search.bulk_sync import (
+    get_pk_partitions,
+    is_partition_complete,
+    sync_app,
+    sync_app_partition,
+)
+from datahub.search.export_jobs import run_export_job
+from datahub.search.incremental_sync import sync_app_incrementally
+from datahub.search.metrics import (
+    record_sync_lags,
+    record_sync_queue_depth,
+    record_sync_retry,
+)
 from datahub.search.migrate_utils import resync_after_migrate
+from datahub.search.reindex_migration import complete_reindex_migration
+from datahub.search.sync_queue import drain_sync_queue, get_sync_queue_depth
 
 
 logger = get_task_logger(__name__)
 
 
 @shared_task(acks_late=True, priority=9)
-def sync_all_models():
+def sync_all_models(partition_size=None):
     """
     Task that starts sub-tasks to sync all models to Elasticsearch.
 
@@ -20,27 +38,115 @@ def sync_all_models():
 
     priority is set to the lowest priority (for Redis, 0 is the highest priority).
     """
+    kwargs = {'partition_size': partition_size} if partition_size else {}
+
     for search_app in get_search_apps():
         sync_model.apply_async(
             args=(search_app.name,),
+            kwargs=kwargs,
         )
 
 
-@shared_task(acks_late=True, priority=9, queue='long-running')
-def sync_model(search_app_name):
+@shared_task(bind=True, acks_late=True, priority=9, queue='long-running')
+def sync_model(self, search_app_name, partition_size=None):
     """
     Task that syncs a single model to Elasticsearch.
 
-    acks_late is set to True so that the task restarts if interrupted.
+    If partition_size (or settings.SEARCH_SYNC_PARTITION_SIZE) is set, the primary keys of the
+    model are split into ranges of that size, and each range is synced by a separate
+    sync_model_partition sub-task (so that they can be processed in parallel by multiple
+    workers).
+
+    acks_late is set to True so that the task restarts if interrupted. When partitioning, the
+    ID of this task is used to checkpoint progress, so a restarted task only reschedules
+    partitions that have not been completed.
 
     priority is set to the lowest priority (for Redis, 0 is the highest priority).
     """
     search_app = get_search_app(search_app_name)
-    sync_app(search_app)
+    partition_size = partition_size or settings.SEARCH_SYNC_PARTITION_SIZE
+
+    if not partition_size:
+        sync_app(search_app)
+        return
+
+    run_id = self.request.id
+    for partition in get_pk_partitions(search_app, partition_size, run_id=run_id):
+        if is_partition_complete(run_id, partition):
+            continue
+
+        sync_model_partition.apply_async(
+            args=(search_app_name, partition, run_id),
+        )
+
 
+@shared_task(
+    acks_late=True,
+    priority=9,
+    queue='long-running',
+    max_retries=5,
+    autoretry_for=(Exception,),
+    retry_backoff=30,
+)
+def sync_model_partition(search_app_name, partition, run_id):
+    """
+    Task that syncs a single primary key range of a model to Elasticsearch.
+
+    The last synced primary key is checkpointed after each batch, so that if the task is
+    retried or redelivered it resumes where it stopped.
 
-@shared_task(acks_late=True, max_retries=15, autoretry_for=(Exception,), retry_backoff=1)
-def sync_object_task(search_app_name, pk):
+    priority is set to the lowest priority (for Redis, 0 is the highest priority).
+    """
+    search_app = get_search_app(search_app_name)
+    sync_app_partition(search_app, tuple(partition), run_id=run_id)
+
+
+@shared_task(acks_late=True, priority=7)
+def sync_all_models_incrementally():
+    """
+    Task that starts sub-tasks to sync objects that have changed since the last incremental
+    sync, for all models.
+
+    This is intended to be run frequently by Celery Beat, to repair any drift between the
+    database and Elasticsearch (e.g. due to lost signal-triggered sync tasks).
+    """
+    for search_app in get_search_apps():
+        sync_model_incrementally.apply_async(
+            args=(search_app.name,),
+        )
+
+
+@shared_task(acks_late=True, priority=7)
+def sync_model_incrementally(search_app_name):
+    """
+    Task that syncs objects for a single model that have changed since the last incremental
+    sync.
+
+    An advisory lock is used so that only one incremental sync runs for each model at a time.
+    """
+    with advisory_lock(
+        f'leeloo-sync_model_incrementally-{search_app_name}',
+        wait=False,
+    ) as lock_held:
+        if not lock_held:
+            logger.info(
+                f'Another incremental sync is in progress for the {search_app_name} search '
+                f'app. Aborting...',
+            )
+            return
+
+        search_app = get_search_app(search_app_name)
+        sync_app_incrementally(search_app)
+
+
+@shared_task(
+    bind=True,
+    acks_late=True,
+    max_retries=15,
+    autoretry_for=(Exception,),
+    retry_backoff=1,
+)
+def sync_object_task(self, search_app_name, pk, enqueued_on=None):
     """
     Syncs a single object to Elasticsearch.
 
@@ -48,13 +154,69 @@ def sync_object_task(search_app_name, pk):
     The wait between attempts is approximately 2 ** attempt_num seconds (with some jitter
     added).
 
+    If enqueued_on (the time the task was scheduled, as a Unix timestamp) is specified, the
+    time between then and the object being synced is recorded as a metric.
+
     This task is named sync_object_task to avoid a conflict with sync_object.
     """
     from datahub.search.sync_object import sync_object
 
+    if self.request.retries:
+        record_sync_retry(search_app_name)
+
     search_app = get_search_app(search_app_name)
     sync_object(search_app, pk)
 
+    if enqueued_on is not None:
+        record_sync_lags(search_app_name, (time() - enqueued_on,))
+
+
+@shared_task(
+    bind=True,
+    acks_late=True,
+    max_retries=15,
+    autoretry_for=(Exception,),
+    retry_backoff=1,
+)
+def sync_object_batch_task(self, search_app_name, pks):
+    """
+    Syncs a batch of objects to Elasticsearch using a single bulk request.
+
+    If an error occurs, the task will be automatically retried with an exponential back-off.
+    The wait between attempts is approximately 2 ** attempt_num seconds (with some jitter
+    added).
+    """
+    from datahub.search.sync_object import sync_object_batch
+
+    if self.request.retries:
+        record_sync_retry(search_app_name)
+
+    search_app = get_search_app(search_app_name)
+    sync_object_batch(search_app, pks)
+
+
+@shared_task(acks_late=True, priority=5)
+def drain_sync_queues():
+    """
+    Syncs the objects in the sync queues of all search apps to Elasticsearch.
+
+    This is intended to be run frequently (e.g. every few seconds) by Celery Beat when
+    settings.SEARCH_SYNC_QUEUE_ENABLED is True.
+
+    Queued objects are removed from the queue atomically, so it's safe for multiple instances
+    of this task to run at the same time.
+
+    Errors are logged for each search app, so that a failure for one search app doesn't stop
+    the queues of the others from being drained. (Objects in a batch that failed to sync are
+    put back in the queue, and picked up by the next run.)
+    """
+    for search_app in get_search_apps():
+        try:
+            record_sync_queue_depth(search_app.name, get_sync_queue_depth(search_app))
+            drain_sync_queue(search_app)
+        except Exception:
+            logger.exception(f'Failed to drain the sync queue for search app {search_app.name}')
+
 
 @shared_task(
     bind=True,
@@ -80,6 +242,9 @@ def sync_related_objects_task(
         related_obj_pk=company.pk
         related_obj_field_name='interactions'
 
+    Related objects are synced in batches (of the related search app's bulk_batch_size), with
+    one sync_object_batch_task scheduled per batch.
+
     Note that a lower priority (higher number) is used for syncing related objects, as syncing
     them is less important than syncing the primary object that was modified.
 
@@ -95,8 +260,11 @@ def sync_related_objects_task(
     queryset = manager.values_list('pk', flat=True)
     search_app = get_search_app_by_model(manager.model)
 
-    for pk in queryset:
-        sync_object_task.apply_async(args=(search_app.name, pk), priority=self.priority)
+    for batch in slice_iterable_into_chunks(queryset, search_app.bulk_batch_size):
+        sync_object_batch_task.apply_async(
+            args=(search_app.name, [str(pk) for pk in batch]),
+            priority=self.priority,
+        )
 
 
 @shared_task(
@@ -130,4 +298,33 @@ Rescheduling the {search_app_name} search app migration to attempt to resolve th
             )
             return
 
-        resync_after_migrate(search_app)
+        if search_app.es_model.was_reindex_migration_started():
+            complete_reindex_migration(search_app)
+        else:
+            resync_after_migrate(search_app, run_id=self.request.id)
+
+
+@shared_task(acks_late=True, priority=6, queue='long-running')
+def export_search_results(
+    job_id,
+    view_path,
+    search_app_name,
+    query,
+    adviser_id,
+    api_url_path,
+    args,
+):
+    """
+    Task that exports search results to S3 as a gzip-compressed CSV file.
+
+    See datahub.search.export_jobs.run_export_job() for more details.
+    """
+    run_export_job(
+        job_id,
+        view_path,
+        search_app_name,
+        query,
+        adviser_id,
+        api_url_path,
+        args,
+    )
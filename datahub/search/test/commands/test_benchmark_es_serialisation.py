@@ -0,0 +1,37 @@
+from io import StringIO
+
+import pytest
+from django.core import management
+
+from datahub.company.test.factories import CompanyFactory
+from datahub.search.management.commands import benchmark_es_serialisation
+
+pytestmark = pytest.mark.django_db
+
+
+def test_benchmarks_search_app():
+    """Test that the command serialises objects and reports timings for a search app."""
+    CompanyFactory.create_batch(2)
+    stdout = StringIO()
+
+    management.call_command(
+        benchmark_es_serialisation.Command(),
+        model=['company'],
+        runs=2,
+        stdout=stdout,
+    )
+
+    assert stdout.getvalue().startswith('company: 2 objects, 2 runs, best ')
+
+
+def test_skips_search_app_without_objects():
+    """Test that search apps without any objects are skipped."""
+    stdout = StringIO()
+
+    management.call_command(
+        benchmark_es_serialisation.Command(),
+        model=['company'],
+        stdout=stdout,
+    )
+
+    assert stdout.getvalue() == 'company: no objects to serialise, skipping\n'
@@ -0,0 +1,41 @@
+from io import StringIO
+
+import pytest
+from django.core import management
+
+from datahub.company.test.factories import CompanyFactory
+from datahub.search.management.commands import benchmark_search_filters
+
+pytestmark = pytest.mark.django_db
+
+
+def test_benchmarks_search_app(es_with_collector):
+    """Test that the command reports timings and cache hit rates for both filter modes."""
+    CompanyFactory()
+    es_with_collector.flush_and_refresh()
+    stdout = StringIO()
+
+    management.call_command(
+        benchmark_search_filters.Command(),
+        model=['company'],
+        runs=2,
+        stdout=stdout,
+    )
+
+    lines = stdout.getvalue().splitlines()
+    assert len(lines) == 2
+    assert lines[0].startswith('company (match filters): 2 runs, best ')
+    assert lines[1].startswith('company (term filters): 2 runs, best ')
+
+
+def test_skips_search_app_without_documents(es):
+    """Test that search apps without any documents are skipped."""
+    stdout = StringIO()
+
+    management.call_command(
+        benchmark_search_filters.Command(),
+        model=['company'],
+        stdout=stdout,
+    )
+
+    assert stdout.getvalue() == 'company: no documents to benchmark, skipping\n'
@@ -0,0 +1,74 @@
+from io import StringIO
+
+import pytest
+from django.core import management
+
+from datahub.company.test.factories import AdviserFactory
+from datahub.search.management.commands import benchmark_typeahead
+
+pytestmark = pytest.mark.django_db
+
+
+def test_benchmarks_typeahead_searches(es_with_collector):
+    """Test that the command reports latency percentiles for typeahead searches."""
+    AdviserFactory(first_name='Alexandra', last_name='Hamilton')
+    es_with_collector.flush_and_refresh()
+    stdout = StringIO()
+
+    management.call_command(
+        benchmark_typeahead.Command(),
+        model=['adviser'],
+        target_p99=1000,
+        stdout=stdout,
+    )
+
+    lines = stdout.getvalue().splitlines()
+    assert len(lines) == 1
+    assert lines[0].startswith('adviser: 5 queries, p50 ')
+    assert ', p95 ' in lines[0]
+    assert lines[0].endswith('(p99 target 1000ms met)')
+
+
+def test_compares_adviser_searches_with_database(es_with_collector):
+    """Test that the database autocomplete filter can also be benchmarked for advisers."""
+    AdviserFactory(first_name='Alexandra', last_name='Hamilton')
+    es_with_collector.flush_and_refresh()
+    stdout = StringIO()
+
+    management.call_command(
+        benchmark_typeahead.Command(),
+        model=['adviser'],
+        compare_db=True,
+        stdout=stdout,
+    )
+
+    lines = stdout.getvalue().splitlines()
+    assert len(lines) == 2
+    assert lines[1].startswith('adviser (database autocomplete): 5 queries, p50 ')
+
+
+def test_skips_search_app_without_documents(es):
+    """Test that search apps without any documents are skipped."""
+    stdout = StringIO()
+
+    management.call_command(
+        benchmark_typeahead.Command(),
+        model=['company'],
+        stdout=stdout,
+    )
+
+    assert stdout.getvalue() == 'company: no documents to benchmark, skipping\n'
+
+
+@pytest.mark.parametrize(
+    'values,percentile,expected_value',
+    (
+        ([5], 99, 5),
+        ([1, 2, 3, 4], 50, 2),
+        (list(range(1, 101)), 95, 95),
+        (list(range(100, 0, -1)), 99, 99),
+    ),
+)
+def test_get_percentile(values, percentile, expected_value):
+    """Test that percentiles are calculated using the nearest-rank method."""
+    assert benchmark_typeahead._get_percentile(values, percentile) == expected_value
@@ -0,0 +1,66 @@
+from datetime import timedelta
+from io import StringIO
+from unittest.mock import Mock
+
+import pytest
+from django.core import management
+from django.utils.timezone import now
+
+from datahub.company.models import Company
+from datahub.company.test.factories import CompanyFactory
+from datahub.search.management.commands import sample_search_sync_staleness
+
+pytestmark = pytest.mark.django_db
+
+
+def test_reports_stale_documents(es_with_collector, monkeypatch):
+    """Test that missing and out-of-date documents are reported as stale."""
+    record_mock = Mock()
+    monkeypatch.setattr(
+        'datahub.search.management.commands.sample_search_sync_staleness.'
+        'record_stale_document_percentage',
+        record_mock,
+    )
+    up_to_date_company, out_of_date_company = CompanyFactory.create_batch(2)
+    es_with_collector.flush_and_refresh()
+
+    # Create a company that hasn't been synced, and update another without syncing it
+    CompanyFactory()
+    Company.objects.filter(pk=out_of_date_company.pk).update(
+        modified_on=now() + timedelta(minutes=1),
+    )
+    stdout = StringIO()
+
+    management.call_command(
+        sample_search_sync_staleness.Command(),
+        model=['company'],
+        stdout=stdout,
+    )
+
+    assert stdout.getvalue() == (
+        'company: 2 of 3 sampled documents stale (66.7%; 1 missing, 1 out of date)\n'
+    )
+    record_mock.assert_called_once_with('company', pytest.approx(200 / 3))
+
+
+def test_limits_sample_size(es_with_collector, monkeypatch):
+    """Test that only the specified number of (distinct) objects are sampled."""
+    monkeypatch.setattr(
+        'datahub.search.management.commands.sample_search_sync_staleness.'
+        'record_stale_document_percentage',
+        Mock(),
+    )
+    CompanyFactory.create_batch(5)
+    es_with_collector.flush_and_refresh()
+    stdout = StringIO()
+
+    management.call_command(
+        sample_search_sync_staleness.Command(),
+        model=['company'],
+        sample_size=3,
+        stdout=stdout,
+    )
+
+    assert stdout.getvalue() == (
+        'company: 0 of 3 sampled documents stale (0.0%; 0 missing, 0 out of date)\n'
+    )
@@ -78,3 +78,20 @@ def test_sync_invalid_model(sync_model_mock):
     management.call_command(sync_es.Command(), model='invalid')
 
     assert sync_model_mock.apply_async.call_count == 0
+
+
+@mock.patch('datahub.search.management.commands.sync_es.sync_model_incrementally')
+@mock.patch('datahub.search.management.commands.sync_es.sync_model')
+@mock.patch(
+    'datahub.search.apps.index_exists',
+    mock.Mock(return_value=True),
+)
+def test_sync_incrementally(sync_model_mock, sync_model_incrementally_mock):
+    """
+    Test that --incremental can be used to only sync objects changed since the last
+    incremental sync.
+    """
+    management.call_command(sync_es.Command(), incremental=True)
+
+    assert sync_model_incrementally_mock.apply_async.call_count == len(get_search_apps())
+    assert not sync_model_mock.apply_async.called
@@ -1,20 +1,33 @@
-from unittest.mock import Mock
+from unittest.mock import ANY, Mock
 
 import pytest
 
 from datahub.company.models import Company
 from datahub.company.test.factories import CompanyFactory
 from datahub.core.test_utils import MockQuerySet
-from datahub.search.bulk_sync import sync_app, sync_objects
+from datahub.search.bulk_sync import (
+    get_pk_partitions,
+    is_partition_complete,
+    sync_app,
+    sync_app_in_partitions,
+    sync_app_partition,
+    sync_objects,
+)
 from datahub.search.company import CompanySearchApp
 from datahub.search.signals import disable_search_signal_receivers
-from datahub.search.test.utils import create_mock_search_app
+from datahub.search.test.search_support.models import SimpleModel
+from datahub.search.test.search_support.simplemodel import SimpleModelSearchApp
+from datahub.search.test.utils import (
+    create_consuming_bulk_mock,
+    create_mock_search_app,
+    doc_exists,
+)
 
 
 def test_sync_app_with_default_batch_size(monkeypatch):
     """Tests syncing an app to Elasticsearch with the default batch size."""
-    bulk_mock = Mock()
-    monkeypatch.setattr('datahub.search.bulk_sync.bulk', bulk_mock)
+    bulk_mock = create_consuming_bulk_mock()
+    monkeypatch.setattr('datahub.search.bulk_sync.parallel_bulk', bulk_mock)
 
     search_app = create_mock_search_app(
         queryset=MockQuerySet([Mock(id=1), Mock(id=2)]),
@@ -26,8 +39,8 @@ def test_sync_app_with_default_batch_size(monkeypatch):
 
 def test_sync_app_with_overridden_batch_size(monkeypatch):
     """Tests syncing an app to Elasticsearch with an overridden batch size."""
-    bulk_mock = Mock()
-    monkeypatch.setattr('datahub.search.bulk_sync.bulk', bulk_mock)
+    bulk_mock = create_consuming_bulk_mock()
+    monkeypatch.setattr('datahub.search.bulk_sync.parallel_bulk', bulk_mock)
 
     search_app = create_mock_search_app(
         queryset=MockQuerySet([Mock(id=1), Mock(id=2)]),
@@ -39,8 +52,8 @@ def test_sync_app_with_overridden_batch_size(monkeypatch):
 
 def test_sync_app_logic(monkeypatch):
     """Tests syncing an app to Elasticsearch during a mapping migration."""
-    bulk_mock = Mock()
-    monkeypatch.setattr('datahub.search.bulk_sync.bulk', bulk_mock)
+    bulk_mock = create_consuming_bulk_mock()
+    monkeypatch.setattr('datahub.search.bulk_sync.parallel_bulk', bulk_mock)
     search_app = create_mock_search_app(
         current_mapping_hash='mapping-hash',
         target_mapping_hash='mapping-hash',
@@ -49,7 +62,7 @@ def test_sync_app_logic(monkeypatch):
         queryset=MockQuerySet([Mock(id=1), Mock(id=2)]),
     )
     sync_app(search_app, batch_size=1000)
-    assert bulk_mock.call_args_list[0][1]['actions'] == [
+    assert bulk_mock.consumed_actions[0] == [
         {
             '_index': 'index1',
             '_id': 1,
@@ -92,3 +105,178 @@ def test_sync_app_uses_latest_data(monkeypatch, es):
         id=company.pk,
     )
     assert fetched_company['_source']['name'] == 'new name'
+
+
+def test_sync_objects_passes_synced_ids_to_callback(monkeypatch):
+    """Test that sync_objects() passes the IDs of the synced documents to the callback."""
+    monkeypatch.setattr('datahub.search.bulk_sync.parallel_bulk', create_consuming_bulk_mock())
+    search_app = create_mock_search_app()
+    callback = Mock()
+
+    num_synced = sync_objects(
+        search_app.es_model,
+        [Mock(id=1), Mock(id=2)],
+        {'index1', 'index2'},
+        'index1',
+        post_batch_callback=callback,
+    )
+
+    assert num_synced == 2
+    callback.assert_called_once_with(
+        {'index1', 'index2'},
+        'index1',
+        [{'_id': 1}, {'_id': 2}],
+    )
+
+
+def test_sync_objects_only_counts_accepted_documents(monkeypatch):
+    """
+    Test that sync_objects() only counts (and passes to the callback) the documents that
+    Elasticsearch accepted.
+    """
+    def _bulk(actions, success_callback=None, **kwargs):
+        actions = list(actions)
+        success_callback({'index': {'_index': 'index1', '_id': actions[0]['_id']}})
+        return 1, [{'index': {'_index': 'index1', '_id': actions[1]['_id'], 'status': 400}}]
+
+    monkeypatch.setattr('datahub.search.bulk_sync.parallel_bulk', Mock(side_effect=_bulk))
+    search_app = create_mock_search_app()
+    callback = Mock()
+
+    num_synced = sync_objects(
+        search_app.es_model,
+        [Mock(id=1), Mock(id=2)],
+        {'index1'},
+        'index1',
+        post_batch_callback=callback,
+    )
+
+    assert num_synced == 1
+    callback.assert_called_once_with({'index1'}, 'index1', [{'_id': 1}])
+
+
+def test_sync_objects_writes_to_old_index_during_reindex_migration(monkeypatch):
+    """
+    Test that sync_objects() also writes documents to the old index during a migration using
+    the reindex API (when the read alias only references the old index).
+    """
+    bulk_mock = create_consuming_bulk_mock()
+    monkeypatch.setattr('datahub.search.bulk_sync.parallel_bulk', bulk_mock)
+    search_app = create_mock_search_app()
+
+    num_synced = sync_objects(search_app.es_model, [Mock(id=1)], {'old-index'}, 'new-index')
+
+    assert num_synced == 1
+    assert bulk_mock.consumed_actions[0] == [
+        {'_index': 'new-index', '_id': 1, '_type': 'test-type'},
+        {'_index': 'old-index', '_id': 1, '_type': 'test-type'},
+    ]
+
+
+@pytest.mark.django_db
+def test_get_pk_partitions():
+    """Test that get_pk_partitions() splits primary keys into contiguous, open-ended ranges."""
+    objs = SimpleModel.objects.bulk_create([SimpleModel(name=str(i)) for i in range(5)])
+    pks = sorted(str(obj.pk) for obj in objs)
+
+    partitions = get_pk_partitions(SimpleModelSearchApp, 2)
+
+    assert partitions == [
+        (None, pks[2]),
+        (pks[2], pks[4]),
+        (pks[4], None),
+    ]
+
+
+@pytest.mark.django_db
+def test_get_pk_partitions_reuses_partitions_for_run(local_memory_cache):
+    """Test that partitions are reused when a run is resumed (even if rows have been added)."""
+    SimpleModel.objects.bulk_create([SimpleModel(name=str(i)) for i in range(3)])
+    partitions = get_pk_partitions(SimpleModelSearchApp, 2, run_id='test-run')
+
+    SimpleModel.objects.bulk_create([SimpleModel(name=str(i)) for i in range(3)])
+
+    assert get_pk_partitions(SimpleModelSearchApp, 2, run_id='test-run') == partitions
+
+
+@pytest.mark.django_db
+def test_sync_app_partition_syncs_range(es):
+    """Test that sync_app_partition() only syncs objects in the specified range."""
+    objs = SimpleModel.objects.bulk_create([SimpleModel(name=str(i)) for i in range(4)])
+    pks = sorted(str(obj.pk) for obj in objs)
+
+    num_synced = sync_app_partition(SimpleModelSearchApp, (pks[1], pks[3]), batch_size=1)
+    es.indices.refresh()
+
+    assert num_synced == 2
+    assert [doc_exists(es, SimpleModelSearchApp, pk) for pk in pks] == [
+        False,
+        True,
+        True,
+        False,
+    ]
+
+
+@pytest.mark.django_db
+def test_sync_app_partition_resumes_from_checkpoint(local_memory_cache, monkeypatch):
+    """
+    Test that sync_app_partition() resumes from the last checkpoint and marks the partition
+    as complete when finished.
+    """
+    objs = SimpleModel.objects.bulk_create([SimpleModel(name=str(i)) for i in range(4)])
+    pks = sorted(str(obj.pk) for obj in objs)
+    partition = (None, None)
+
+    sync_objects_mock = Mock(side_effect=[1, ValueError])
+    monkeypatch.setattr('datahub.search.bulk_sync.sync_objects', sync_objects_mock)
+
+    with pytest.raises(ValueError):
+        sync_app_partition(SimpleModelSearchApp, partition, run_id='test-run', batch_size=1)
+
+    assert not is_partition_complete('test-run', partition)
+
+    sync_objects_mock.reset_mock(side_effect=True)
+    sync_objects_mock.return_value = 1
+
+    num_synced = sync_app_partition(
+        SimpleModelSearchApp,
+        partition,
+        run_id='test-run',
+        batch_size=1,
+    )
+
+    synced_pks = [str(call[0][1][0].pk) for call in sync_objects_mock.call_args_list]
+    assert synced_pks == pks[1:]
+    assert num_synced == 3
+    assert is_partition_complete('test-run', partition)
+
+    # A completed partition should not be synced again
+    sync_objects_mock.reset_mock()
+    sync_app_partition(SimpleModelSearchApp, partition, run_id='test-run', batch_size=1)
+    sync_objects_mock.assert_not_called()
+
+
+def test_sync_app_in_partitions(monkeypatch):
+    """Test that sync_app_in_partitions() syncs every partition and returns the total."""
+    partitions = [(None, 'b'), ('b', 'd'), ('d', None)]
+    monkeypatch.setattr(
+        'datahub.search.bulk_sync.get_pk_partitions',
+        Mock(return_value=partitions),
+    )
+    sync_app_partition_mock = Mock(return_value=2)
+    monkeypatch.setattr('datahub.search.bulk_sync.sync_app_partition', sync_app_partition_mock)
+
+    search_app = create_mock_search_app()
+    num_synced = sync_app_in_partitions(search_app, 2, 2, run_id='test-run')
+
+    assert num_synced == 6
+    assert sorted(
+        (call[0][1] for call in sync_app_partition_mock.call_args_list),
+        key=str,
+    ) == sorted(partitions, key=str)
+    sync_app_partition_mock.assert_called_with(
+        search_app,
+        ANY,
+        run_id='test-run',
+        post_batch_callback=None,
+    )
@@ -2,6 +2,7 @@ from unittest import mock
 
 import pytest
 from django.conf import settings
+from django.core.cache import cache
 from elasticsearch_dsl import Keyword, Mapping
 
 from datahub.search import elasticsearch
@@ -22,6 +23,92 @@ def test_bulk(es_bulk, mock_es_client):
     )
 
 
+@pytest.mark.parametrize('num_actions', (0, 3, 25))
+@mock.patch('datahub.search.elasticsearch.es_streaming_bulk')
+def test_parallel_bulk(es_streaming_bulk, mock_es_client, num_actions):
+    """
+    Test that parallel_bulk() consumes a generator of actions in chunks, sending each chunk
+    with retries enabled, and totals the results.
+    """
+    es_streaming_bulk.side_effect = lambda client, chunk, **kwargs: (
+        (True, {'index': {'_id': action['_id']}}) for action in chunk
+    )
+    actions = ({'_id': index} for index in range(num_actions))
+
+    num_successful, errors = elasticsearch.parallel_bulk(
+        actions=actions,
+        chunk_size=10,
+        thread_count=2,
+        queue_size=1,
+        max_retries=3,
+    )
+
+    assert num_successful == num_actions
+    assert errors == []
+
+    sent_ids = sorted(
+        action['_id']
+        for call in es_streaming_bulk.call_args_list
+        for action in call[0][1]
+    )
+    assert sent_ids == list(range(num_actions))
+    assert es_streaming_bulk.call_count == -(-num_actions // 10)
+    for call in es_streaming_bulk.call_args_list:
+        assert call[0][0] is mock_es_client.return_value
+        assert call[1]['max_retries'] == 3
+        assert call[1]['max_chunk_bytes'] == settings.ES_BULK_MAX_CHUNK_BYTES
+
+
+@mock.patch('datahub.search.elasticsearch.es_streaming_bulk')
+def test_parallel_bulk_collects_errors(es_streaming_bulk, mock_es_client):
+    """Test that parallel_bulk() returns failed items when raise_on_error=False."""
+    error = {'index': {'_id': 2, 'status': 400}}
+    es_streaming_bulk.return_value = iter([(True, {}), (False, error)])
+
+    result = elasticsearch.parallel_bulk(
+        actions=[{'_id': 1}, {'_id': 2}],
+        raise_on_error=False,
+    )
+
+    assert result == (1, [error])
+    assert es_streaming_bulk.call_args[1]['raise_on_error'] is False
+
+
+@mock.patch('datahub.search.elasticsearch.es_streaming_bulk')
+def test_parallel_bulk_calls_success_callback(es_streaming_bulk, mock_es_client):
+    """Test that parallel_bulk() passes successful items to success_callback."""
+    success_item = {'index': {'_id': 1, 'status': 200}}
+    error = {'index': {'_id': 2, 'status': 400}}
+    es_streaming_bulk.return_value = iter([(True, success_item), (False, error)])
+    success_callback = mock.Mock()
+
+    elasticsearch.parallel_bulk(
+        actions=[{'_id': 1}, {'_id': 2}],
+        raise_on_error=False,
+        success_callback=success_callback,
+    )
+
+    success_callback.assert_called_once_with(success_item)
+    assert 'success_callback' not in es_streaming_bulk.call_args[1]
+
+
+@mock.patch('datahub.search.elasticsearch.es_streaming_bulk')
+def test_parallel_bulk_stops_after_error(es_streaming_bulk, mock_es_client):
+    """Test that parallel_bulk() doesn't send further chunks once sending a chunk fails."""
+    es_streaming_bulk.side_effect = ValueError
+    actions = ({'_id': index} for index in range(30))
+
+    with pytest.raises(ValueError):
+        elasticsearch.parallel_bulk(
+            actions=actions,
+            chunk_size=10,
+            thread_count=1,
+            queue_size=0,
+        )
+
+    assert es_streaming_bulk.call_count == 1
+
+
 @pytest.mark.parametrize('expected', (True, False))
 def test_index_exists(mock_es_client, expected):
     """Tests that `index_exists` returns True if the index exists, False otherwise."""
@@ -173,6 +260,72 @@ def test_get_indices_for_aliases(mock_es_client, aliases, response, result):
     assert elasticsearch.get_indices_for_aliases(*aliases) == result
 
 
+class TestGetCachedIndicesForAliases:
+    """Tests for get_cached_indices_for_aliases()."""
+
+    ALIAS_RESPONSE = {
+        'index1': {
+            'aliases': {
+                'alias1': {},
+            },
+        },
+    }
+
+    @pytest.fixture(autouse=True)
+    def _clear_alias_cache(self, local_memory_cache, monkeypatch):
+        monkeypatch.setattr('datahub.search.elasticsearch._alias_cache', {})
+
+    def test_uses_cached_result(self, mock_es_client):
+        """Test that repeated lookups only make one Elasticsearch request."""
+        client = mock_es_client.return_value
+        client.indices.get_alias.return_value = self.ALIAS_RESPONSE
+
+        for _ in range(3):
+            assert elasticsearch.get_cached_indices_for_aliases('alias1') == [{'index1'}]
+
+        assert client.indices.get_alias.call_count == 1
+
+    def test_refetches_after_alias_change(self, mock_es_client):
+        """Test that the cache is invalidated when aliases are changed."""
+        client = mock_es_client.return_value
+        client.indices.get_alias.return_value = self.ALIAS_RESPONSE
+        elasticsearch.get_cached_indices_for_aliases('alias1')
+
+        with elasticsearch.start_alias_transaction() as alias_transaction:
+            alias_transaction.associate_indices_with_alias('alias1', ['index2'])
+
+        elasticsearch.get_cached_indices_for_aliases('alias1')
+        assert client.indices.get_alias.call_count == 2
+
+    def test_refetches_after_alias_change_in_another_process(self, mock_es_client):
+        """
+        Test that the cache is invalidated when the shared alias version changes (e.g. because
+        another process changed aliases).
+        """
+        client = mock_es_client.return_value
+        client.indices.get_alias.return_value = self.ALIAS_RESPONSE
+        elasticsearch.get_cached_indices_for_aliases('alias1')
+
+        cache.set(elasticsearch.ALIAS_VERSION_CACHE_KEY, 10)
+
+        elasticsearch.get_cached_indices_for_aliases('alias1')
+        assert client.indices.get_alias.call_count == 2
+
+    def test_refetches_after_timeout(self, mock_es_client, monkeypatch):
+        """Test that cached results expire."""
+        client = mock_es_client.return_value
+        client.indices.get_alias.return_value = self.ALIAS_RESPONSE
+        monkeypatch.setattr('datahub.search.elasticsearch.monotonic', lambda: 0)
+        elasticsearch.get_cached_indices_for_aliases('alias1')
+
+        monkeypatch.setattr(
+            'datahub.search.elasticsearch.monotonic',
+            lambda: elasticsearch.ALIAS_CACHE_TIMEOUT_SECS + 1,
+        )
+        elasticsearch.get_cached_indices_for_aliases('alias1')
+        assert client.indices.get_alias.call_count == 2
+
+
 def test_get_aliases_for_index(mock_es_client):
     """Test get_aliases_for_index()."""
     index = 'test-index'
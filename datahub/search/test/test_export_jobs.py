@@ -0,0 +1,126 @@
+import gzip
+from csv import DictReader
+from io import StringIO
+from unittest.mock import Mock
+
+import pytest
+
+from datahub.company.test.factories import AdviserFactory
+from datahub.search.export_jobs import (
+    create_export_job,
+    ExportJobStatus,
+    get_export_job,
+    run_export_job,
+)
+from datahub.search.test.search_support.models import SimpleModel
+from datahub.search.test.search_support.simplemodel import SimpleModelSearchApp
+from datahub.user_event_log.constants import UserEventType
+from datahub.user_event_log.models import UserEvent
+
+pytestmark = pytest.mark.django_db
+
+VIEW_PATH = (
+    'datahub.search.test.search_support.simplemodel.views.SearchSimpleModelExportAPIView'
+)
+
+
+@pytest.fixture
+def mock_s3_client(monkeypatch):
+    """Patches the S3 client used for exports and yields it."""
+    s3_client = Mock()
+    monkeypatch.setattr(
+        'datahub.search.export_jobs.get_s3_client_for_bucket',
+        Mock(return_value=s3_client),
+    )
+    monkeypatch.setattr(
+        'datahub.search.export_jobs.sign_s3_url',
+        Mock(return_value='https://signed-url'),
+    )
+    yield s3_client
+
+
+def _run_export_job(job_id, adviser):
+    run_export_job(
+        job_id,
+        VIEW_PATH,
+        SimpleModelSearchApp.name,
+        {'sort': ['id']},
+        str(adviser.pk),
+        '/v3/search/simplemodel/export',
+        {'original_query': ''},
+    )
+
+
+def test_create_export_job(local_memory_cache):
+    """Test that a created export job is pending."""
+    adviser = AdviserFactory()
+
+    job_id = create_export_job(adviser)
+
+    assert get_export_job(job_id) == {
+        'id': job_id,
+        'adviser_id': str(adviser.pk),
+        'status': ExportJobStatus.pending,
+        'num_results': None,
+        'download_url': None,
+    }
+
+
+def test_run_export_job(es_with_collector, local_memory_cache, mock_s3_client):
+    """
+    Test that search results are uploaded to S3 as gzip-compressed CSV, a user event is
+    recorded and the job is marked as complete.
+    """
+    uploaded_data = {}
+
+    def _upload_fileobj(file, bucket, key, **kwargs):
+        uploaded_data['key'] = key
+        uploaded_data['contents'] = gzip.decompress(file.read()).decode('utf-8-sig')
+
+    mock_s3_client.upload_fileobj.side_effect = _upload_fileobj
+    names = ['Saturn 1', 'Saturn 2']
+    for name in names:
+        SimpleModel.objects.create(name=name)
+
+    es_with_collector.flush_and_refresh()
+
+    adviser = AdviserFactory()
+    job_id = create_export_job(adviser)
+    _run_export_job(job_id, adviser)
+
+    assert uploaded_data['key'].startswith(f'search-exports/{job_id}/')
+    assert uploaded_data['key'].endswith('.csv.gz')
+    reader = DictReader(StringIO(uploaded_data['contents']))
+    assert sorted(row['Name'] for row in reader) == names
+
+    user_event = UserEvent.objects.get()
+    assert user_event.adviser == adviser
+    assert user_event.type == UserEventType.SEARCH_EXPORT
+    assert user_event.api_url_path == '/v3/search/simplemodel/export'
+    assert user_event.data == {
+        'num_results': 2,
+        'args': {'original_query': ''},
+        'job_id': job_id,
+    }
+
+    assert get_export_job(job_id) == {
+        'id': job_id,
+        'adviser_id': str(adviser.pk),
+        'status': ExportJobStatus.complete,
+        'num_results': 2,
+        'download_url': 'https://signed-url',
+    }
+
+
+def test_run_export_job_failure(es, local_memory_cache, mock_s3_client):
+    """Test that the job is marked as failed if an error occurs."""
+    mock_s3_client.upload_fileobj.side_effect = ValueError
+
+    adviser = AdviserFactory()
+    job_id = create_export_job(adviser)
+
+    with pytest.raises(ValueError):
+        _run_export_job(job_id, adviser)
+
+    assert get_export_job(job_id)['status'] == ExportJobStatus.failed
+    assert not UserEvent.objects.exists()
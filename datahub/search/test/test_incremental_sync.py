@@ -0,0 +1,90 @@
+from datetime import timedelta
+from unittest.mock import Mock
+
+import pytest
+from django.core.cache import cache
+from django.utils.timezone import now
+from freezegun import freeze_time
+
+from datahub.search.incremental_sync import (
+    get_incremental_sync_watermark,
+    set_incremental_sync_watermark,
+    sync_app_incrementally,
+    WATERMARK_OVERLAP,
+)
+from datahub.search.tasks import sync_model_incrementally
+from datahub.search.test.search_support.models import SimpleModel
+from datahub.search.test.search_support.simplemodel import SimpleModelSearchApp
+from datahub.search.test.utils import doc_exists
+
+FROZEN_TIME = '2020-01-01T12:00:00Z'
+
+
+@pytest.mark.django_db
+@freeze_time(FROZEN_TIME)
+def test_sync_app_incrementally_initialises_watermark(monkeypatch):
+    """Test that the first incremental sync only initialises the watermark."""
+    sync_objects_mock = Mock()
+    monkeypatch.setattr('datahub.search.incremental_sync.sync_objects', sync_objects_mock)
+    SimpleModel.objects.create()
+
+    assert sync_app_incrementally(SimpleModelSearchApp) == 0
+    assert get_incremental_sync_watermark(SimpleModelSearchApp) == now()
+    sync_objects_mock.assert_not_called()
+
+
+@pytest.mark.django_db
+def test_sync_app_incrementally_syncs_changed_objects(es):
+    """
+    Test that only objects modified since the previous watermark (less the overlap) are
+    synced, and that the watermark is advanced.
+    """
+    watermark = now() - timedelta(hours=1)
+    set_incremental_sync_watermark(SimpleModelSearchApp, watermark)
+
+    old_obj = SimpleModel.objects.create()
+    new_obj = SimpleModel.objects.create()
+    SimpleModel.objects.filter(pk=old_obj.pk).update(
+        modified_on=watermark - WATERMARK_OVERLAP - timedelta(minutes=1),
+    )
+
+    num_synced = sync_app_incrementally(SimpleModelSearchApp)
+    es.indices.refresh()
+
+    assert num_synced == 1
+    assert doc_exists(es, SimpleModelSearchApp, new_obj.pk)
+    assert not doc_exists(es, SimpleModelSearchApp, old_obj.pk)
+    assert get_incremental_sync_watermark(SimpleModelSearchApp) > watermark
+
+
+@pytest.mark.django_db
+def test_watermark_is_not_stored_in_the_cache(local_memory_cache):
+    """Test that the watermark is kept if the cache is cleared."""
+    watermark = now() - timedelta(hours=1)
+    set_incremental_sync_watermark(SimpleModelSearchApp, watermark)
+    cache.clear()
+
+    assert get_incremental_sync_watermark(SimpleModelSearchApp) == watermark
+
+
+@pytest.mark.django_db
+def test_sync_app_incrementally_without_fields(monkeypatch):
+    """Test that apps with no incremental sync fields are skipped."""
+    monkeypatch.setattr(SimpleModelSearchApp, 'incremental_sync_fields', ())
+
+    assert sync_app_incrementally(SimpleModelSearchApp) == 0
+    assert get_incremental_sync_watermark(SimpleModelSearchApp) is None
+
+
+@pytest.mark.django_db
+def test_sync_model_incrementally_task(monkeypatch):
+    """Test that the sync_model_incrementally task calls sync_app_incrementally()."""
+    sync_app_incrementally_mock = Mock()
+    monkeypatch.setattr(
+        'datahub.search.tasks.sync_app_incrementally',
+        sync_app_incrementally_mock,
+    )
+
+    sync_model_incrementally.apply(args=(SimpleModelSearchApp.name,))
+
+    sync_app_incrementally_mock.assert_called_once_with(SimpleModelSearchApp)
@@ -0,0 +1,35 @@
+from unittest.mock import call, MagicMock
+
+import pytest
+
+from datahub.search.metrics import record_bulk_write, record_sync_lags
+
+
+@pytest.fixture
+def mock_statsd(monkeypatch):
+    """Patches statsd() so that a mock client is used, and yields the mock pipeline."""
+    mock_client = MagicMock()
+    monkeypatch.setattr('datahub.search.metrics.statsd', lambda: mock_client)
+    yield mock_client.pipeline.return_value.__enter__.return_value
+
+
+def test_record_bulk_write(mock_statsd):
+    """Test that record_bulk_write() records the duration, size and rate of a bulk write."""
+    record_bulk_write('company', 100, 0.5)
+
+    assert mock_statsd.timing.call_args_list == [
+        call('search.company.bulk.duration', 500),
+        call('search.company.bulk.size', 100),
+    ]
+    mock_statsd.incr.assert_called_once_with('search.company.documents_indexed', 100)
+    mock_statsd.gauge.assert_called_once_with('search.company.documents_per_second', 200)
+
+
+def test_record_sync_lags(mock_statsd):
+    """Test that record_sync_lags() records each lag in milliseconds."""
+    record_sync_lags('contact', [1, 2.5])
+
+    assert mock_statsd.timing.call_args_list == [
+        call('search.contact.sync_lag', 1000),
+        call('search.contact.sync_lag', 2500),
+    ]
@@ -121,6 +121,52 @@ def test_migrate_app_with_app_needing_migration(monkeypatch, mock_es_client):
     )
 
 
+def test_migrate_app_with_reindex_migration(monkeypatch, mock_es_client):
+    """
+    Test that migrate_app() only points the write alias at the new index when the app can be
+    migrated using the reindex API.
+    """
+    migrate_model_task_mock = Mock()
+    monkeypatch.setattr('datahub.search.migrate.complete_model_migration', migrate_model_task_mock)
+    monkeypatch.setattr('datahub.search.migrate.create_index', Mock())
+    monkeypatch.setattr('datahub.search.migrate.can_migrate_by_reindex', Mock(return_value=True))
+
+    mock_client = mock_es_client.return_value
+    old_index = 'test-index'
+    new_index = 'test-index-target-hash'
+    target_hash = 'target-hash'
+    mock_app = create_mock_search_app(
+        current_mapping_hash='current-hash',
+        target_mapping_hash=target_hash,
+        write_index=old_index,
+    )
+
+    migrate_app(mock_app)
+
+    mock_client.indices.update_aliases.assert_called_once_with(
+        body={
+            'actions': [
+                {
+                    'add': {
+                        'alias': 'test-write-alias',
+                        'indices': [new_index],
+                    },
+                },
+                {
+                    'remove': {
+                        'alias': 'test-write-alias',
+                        'indices': [old_index],
+                    },
+                },
+            ],
+        },
+    )
+
+    migrate_model_task_mock.apply_async.assert_called_once_with(
+        args=(mock_app.name, target_hash),
+    )
+
+
 def test_migrate_app_with_app_not_needing_migration(monkeypatch, mock_es_client):
     """Test that migrate_app() migrates an app needing migration."""
     migrate_model_task_mock = Mock()
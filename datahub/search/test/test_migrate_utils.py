@@ -8,7 +8,7 @@ from datahub.search.migrate_utils import (
     delete_from_secondary_indices_callback,
     resync_after_migrate,
 )
-from datahub.search.test.utils import create_mock_search_app
+from datahub.search.test.utils import create_consuming_bulk_mock, create_mock_search_app
 
 
 class TestResyncAfterMigrate:
@@ -19,9 +19,9 @@ class TestResyncAfterMigrate:
         Test that resync_after_migrate() resyncs the app, updates the read alias and deletes the
         old index.
         """
-        index_bulk_mock = Mock()
+        index_bulk_mock = create_consuming_bulk_mock()
         delete_bulk_mock = Mock(return_value=(True, ({'delete': {'status': 404}},)))
-        monkeypatch.setattr('datahub.search.bulk_sync.bulk', index_bulk_mock)
+        monkeypatch.setattr('datahub.search.bulk_sync.parallel_bulk', index_bulk_mock)
         monkeypatch.setattr('datahub.search.deletion.bulk', delete_bulk_mock)
 
         get_aliases_for_index_mock = Mock(return_value=set())
@@ -42,7 +42,7 @@ class TestResyncAfterMigrate:
         resync_after_migrate(mock_app)
 
         assert index_bulk_mock.call_count == 1
-        assert index_bulk_mock.call_args_list[0][1]['actions'] == [
+        assert index_bulk_mock.consumed_actions[0] == [
             {
                 '_index': 'index1',
                 '_id': 1,
@@ -92,14 +92,49 @@ class TestResyncAfterMigrate:
         assert mock_client.indices.delete.call_count == 1
         mock_client.indices.delete.assert_any_call('index2')
 
+    def test_partitioned_resync(self, monkeypatch, mock_es_client):
+        """
+        Test that resync_after_migrate() syncs the app in parallel partitions when
+        SEARCH_SYNC_PARTITION_SIZE is set.
+        """
+        monkeypatch.setattr('django.conf.settings.SEARCH_SYNC_PARTITION_SIZE', 100)
+        monkeypatch.setattr('django.conf.settings.SEARCH_SYNC_NUM_WORKERS', 3)
+        sync_app_mock = Mock()
+        monkeypatch.setattr('datahub.search.migrate_utils.sync_app', sync_app_mock)
+        sync_app_in_partitions_mock = Mock()
+        monkeypatch.setattr(
+            'datahub.search.migrate_utils.sync_app_in_partitions',
+            sync_app_in_partitions_mock,
+        )
+        monkeypatch.setattr(
+            'datahub.search.migrate_utils.get_aliases_for_index',
+            Mock(return_value=set()),
+        )
+
+        mock_app = create_mock_search_app(
+            read_indices={'index1', 'index2'},
+            write_index='index1',
+        )
+
+        resync_after_migrate(mock_app, run_id='test-run')
+
+        sync_app_mock.assert_not_called()
+        sync_app_in_partitions_mock.assert_called_once_with(
+            mock_app,
+            100,
+            3,
+            run_id='test-run',
+            post_batch_callback=delete_from_secondary_indices_callback,
+        )
+
     def test_resync_with_deletion_error(self, monkeypatch, mock_es_client):
         """
         Test that resync_after_migrate() raises an exception when there is an error deleting
         documents.
         """
-        index_bulk_mock = Mock()
+        index_bulk_mock = create_consuming_bulk_mock()
         delete_bulk_mock = Mock(return_value=(True, ({'delete': {'status': 500}},)))
-        monkeypatch.setattr('datahub.search.bulk_sync.bulk', index_bulk_mock)
+        monkeypatch.setattr('datahub.search.bulk_sync.parallel_bulk', index_bulk_mock)
         monkeypatch.setattr('datahub.search.deletion.bulk', delete_bulk_mock)
 
         get_aliases_for_index_mock = Mock(return_value=set())
@@ -220,3 +255,16 @@ class TestResyncAfterMigrate:
             mock_app,
             post_batch_callback=delete_from_secondary_indices_callback,
         )
+
+
+def test_delete_from_secondary_indices_callback_during_reindex_migration(monkeypatch):
+    """
+    Test that delete_from_secondary_indices_callback() does not delete documents from the old
+    index during a migration using the reindex API.
+    """
+    delete_documents_mock = Mock()
+    monkeypatch.setattr('datahub.search.migrate_utils.delete_documents', delete_documents_mock)
+
+    delete_from_secondary_indices_callback({'old-index'}, 'new-index', [{'_id': 1}])
+
+    delete_documents_mock.assert_not_called()
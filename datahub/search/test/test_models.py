@@ -3,8 +3,16 @@ import inspect
 import pytest
 from django.utils.functional import cached_property
 
+from datahub.company.test.factories import CompanyFactory, ContactFactory
+from datahub.interaction.test.factories import CompanyInteractionFactory
+from datahub.omis.order.test.factories import OrderCompleteFactory
+from datahub.search.company import CompanySearchApp
+from datahub.search.contact import ContactSearchApp
+from datahub.search.interaction import InteractionSearchApp
+from datahub.search.omis import OrderSearchApp
 from datahub.search.test.search_support.models import SimpleModel
 from datahub.search.test.search_support.simplemodel.models import ESSimpleModel
+from datahub.search.test.utils import count_queries_for_es_documents
 from datahub.search.utils import get_model_field_names
 
 
@@ -36,6 +44,35 @@ class TestBaseESModel:
 
         assert doc == expected_doc
 
+    @pytest.mark.django_db
+    @pytest.mark.parametrize(
+        'search_app,factory',
+        (
+            (CompanySearchApp, CompanyFactory),
+            (ContactSearchApp, ContactFactory),
+            (InteractionSearchApp, CompanyInteractionFactory),
+            (OrderSearchApp, OrderCompleteFactory),
+        ),
+    )
+    def test_db_objects_to_es_documents_query_count(self, search_app, factory):
+        """
+        Test that db_objects_to_es_documents() makes the same number of queries regardless of
+        the number of objects being converted.
+        """
+        single_object_pks = [factory().pk]
+        multiple_object_pks = [obj.pk for obj in factory.create_batch(5)]
+
+        single_object_query_count = count_queries_for_es_documents(
+            search_app,
+            single_object_pks,
+        )
+        multiple_object_query_count = count_queries_for_es_documents(
+            search_app,
+            multiple_object_pks,
+        )
+
+        assert single_object_query_count == multiple_object_query_count
+
 
 def test_validate_model_fields(search_app):
     """Test that all top-level fields defined in search models are valid."""
@@ -0,0 +1,155 @@
+from unittest.mock import Mock
+
+import pytest
+from django.contrib.auth.models import Group, Permission
+from django.core.cache import cache
+
+from datahub.company.models import Advisor
+from datahub.core.test_utils import create_test_user
+from datahub.metadata.test.factories import TeamFactory, TeamRoleFactory
+from datahub.search.apps import EXCLUDE_ALL
+from datahub.search.investment.apps import InvestmentSearchApp
+from datahub.search.permission_cache import (
+    get_permission_filters,
+    get_search_app_access,
+    get_search_app_access_by_name,
+    PERMISSION_CACHE_VERSION_KEY,
+)
+from datahub.search.permissions import has_permissions_for_app
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture
+def has_permissions_for_app_mock(monkeypatch):
+    """Wraps has_permissions_for_app() so that calls can be counted."""
+    mock = Mock(wraps=has_permissions_for_app)
+    monkeypatch.setattr('datahub.search.permission_cache.has_permissions_for_app', mock)
+    yield mock
+
+
+@pytest.fixture
+def permission_cache_enabled(local_memory_cache, settings):
+    """Enables the search permission cache."""
+    settings.SEARCH_PERMISSION_CACHE_ENABLED = True
+    yield
+
+
+def _make_request(user):
+    # The user is fetched again so that Django's per-instance permission cache isn't used
+    return Mock(user=Advisor.objects.get(pk=user.pk), method='POST')
+
+
+def test_caches_access_for_all_search_apps(
+    permission_cache_enabled,
+    has_permissions_for_app_mock,
+):
+    """Test that permissions and permission filters are only resolved once for an adviser."""
+    team = TeamFactory()
+    user = create_test_user(
+        permission_codenames=['view_associated_investmentproject'],
+        dit_team=team,
+    )
+
+    access_by_name = get_search_app_access_by_name(_make_request(user))
+    num_calls = has_permissions_for_app_mock.call_count
+    cached_access_by_name = get_search_app_access_by_name(_make_request(user))
+
+    assert num_calls > 0
+    assert has_permissions_for_app_mock.call_count == num_calls
+    assert cached_access_by_name == access_by_name
+
+    investment_access = cached_access_by_name[InvestmentSearchApp.name]
+    assert investment_access.has_view_permission
+    assert investment_access.permission_filters == InvestmentSearchApp.get_permission_filters(
+        _make_request(user),
+    )
+    assert ('created_by.dit_team.id', team.pk) in investment_access.permission_filters
+
+
+def test_caches_exclude_all(permission_cache_enabled):
+    """Test that EXCLUDE_ALL is preserved when permission filters are read from the cache."""
+    user = create_test_user(permission_codenames=['view_associated_investmentproject'])
+
+    for _ in range(2):
+        assert get_permission_filters(_make_request(user), InvestmentSearchApp) is EXCLUDE_ALL
+
+
+def test_does_not_cache_when_disabled(local_memory_cache, has_permissions_for_app_mock):
+    """Test that permissions are resolved for every request when the cache is disabled."""
+    user = create_test_user(permission_codenames=['view_all_investmentproject'])
+
+    get_search_app_access(_make_request(user), InvestmentSearchApp)
+    get_search_app_access(_make_request(user), InvestmentSearchApp)
+
+    assert has_permissions_for_app_mock.call_count == 2
+
+
+def test_team_is_part_of_cache_key(permission_cache_enabled):
+    """Test that cached permission filters are not used after an adviser changes team."""
+    user = create_test_user(
+        permission_codenames=['view_associated_investmentproject'],
+        dit_team=TeamFactory(),
+    )
+    get_permission_filters(_make_request(user), InvestmentSearchApp)
+
+    new_team = TeamFactory()
+    user.dit_team = new_team
+    user.save()
+
+    permission_filters = get_permission_filters(_make_request(user), InvestmentSearchApp)
+    assert ('created_by.dit_team.id', new_team.pk) in permission_filters
+
+
+def test_invalidated_when_adviser_permissions_change(permission_cache_enabled):
+    """Test that cached permissions are invalidated when an adviser's permissions change."""
+    user = create_test_user()
+    request = _make_request(user)
+    assert not get_search_app_access(request, InvestmentSearchApp).has_view_permission
+
+    user.user_permissions.add(Permission.objects.get(codename='view_all_investmentproject'))
+
+    access = get_search_app_access(_make_request(user), InvestmentSearchApp)
+    assert access.has_view_permission
+    assert access.permission_filters is None
+
+
+def _add_permission_to_group(group, team):
+    group.permissions.add(Permission.objects.get(codename='view_all_investmentproject'))
+
+
+def _add_group_to_team_role(group, team):
+    team.role.groups.add(group)
+
+
+def _change_team_role(group, team):
+    team.role = TeamRoleFactory()
+    team.save()
+
+
+def _delete_group(group, team):
+    group.delete()
+
+
+@pytest.mark.parametrize(
+    'change_permissions',
+    (
+        _add_permission_to_group,
+        _add_group_to_team_role,
+        _change_team_role,
+        _delete_group,
+    ),
+)
+def test_invalidated_when_groups_or_roles_change(
+    permission_cache_enabled,
+    change_permissions,
+):
+    """Test that the cache version is incremented when groups, roles or teams change."""
+    group = Group.objects.create(name='test group')
+    team = TeamFactory()
+    get_search_app_access_by_name(_make_request(create_test_user(dit_team=team)))
+    version = cache.get(PERMISSION_CACHE_VERSION_KEY, 0)
+
+    change_permissions(group, team)
+
+    assert cache.get(PERMISSION_CACHE_VERSION_KEY) == version + 1
@@ -1,22 +1,93 @@
 import datetime
+import json
 from unittest import mock
 from uuid import UUID
 
 import pytest
+from elasticsearch_dsl import Search
+from elasticsearch_dsl.query import Bool
 
+from datahub.search.apps import EXCLUDE_ALL
 from datahub.search.query_builder import (
+    _apply_sorting_to_query,
+    _apply_source_filtering_to_query,
     _build_entity_permission_query,
     _build_field_query,
+    _build_must_queries,
     _build_term_query,
+    _get_query_template,
     _split_range_fields,
     get_basic_search_query,
     get_search_by_entities_query,
+    get_term_filter_fields,
+    get_typeahead_query,
+    limit_search_query,
 )
 from datahub.search.test.search_support.relatedmodel.apps import RelatedModelSearchApp
 from datahub.search.test.search_support.simplemodel.apps import SimpleModelSearchApp
 from datahub.search.utils import SearchOrdering, SortDirection
 
 
+def _build_search_by_entities_query_without_template(
+        entities,
+        term=None,
+        filter_data=None,
+        composite_field_mapping=None,
+        permission_filters=None,
+        ordering=None,
+        fields_to_include=None,
+        fields_to_exclude=None,
+        term_filter_fields=None,
+):
+    """
+    Builds a filtered search query for the given term across given entities without using a
+    query template.
+
+    This is used as the reference implementation for the tests of
+    get_search_by_entities_query().
+    """
+    filter_data = filter_data or {}
+    if term_filter_fields is None:
+        term_filter_fields = get_term_filter_fields(entities)
+    query = []
+    if term != '':
+        for entity in entities:
+            query.append(_build_term_query(term, fields=entity.SEARCH_FIELDS))
+
+    filters, ranges = _split_range_fields(filter_data)
+
+    # document must match all filters in the list (and)
+    must_filter = _build_must_queries(
+        filters,
+        ranges,
+        composite_field_mapping,
+        term_filter_fields=term_filter_fields,
+    )
+
+    s = Search(
+        index=[
+            entity.get_read_alias()
+            for entity in entities
+        ],
+    ).query(
+        Bool(must=query),
+    ).extra(
+        track_total_hits=True,
+    )
+
+    permission_query = _build_entity_permission_query(permission_filters)
+    if permission_query:
+        s = s.filter(permission_query)
+
+    s = s.filter(Bool(must=must_filter))
+    s = _apply_sorting_to_query(s, ordering)
+    return _apply_source_filtering_to_query(
+        s,
+        fields_to_include=fields_to_include,
+        fields_to_exclude=fields_to_exclude,
+    )
+
+
 @pytest.mark.parametrize(
     'field,value,expected',
     (
@@ -162,6 +233,90 @@ def test_build_field_query(field, value, expected):
     assert _build_field_query(field, value).to_dict() == expected
 
 
+@pytest.mark.parametrize(
+    'field,value,expected',
+    (
+        (
+            'field_name.id',
+            'field value',
+            {'term': {'field_name.id': 'field value'}},
+        ),
+        (
+            'field_name.id',
+            ['field value 1', 'field value 2'],
+            {'terms': {'field_name.id': ['field value 1', 'field value 2']}},
+        ),
+        (
+            'is_archived',
+            False,
+            {'term': {'is_archived': False}},
+        ),
+        (
+            'field_name.id',
+            ['field value 1', None],
+            {
+                'bool': {
+                    'minimum_should_match': 1,
+                    'should': [
+                        {'term': {'field_name.id': 'field value 1'}},
+                        {
+                            'bool': {
+                                'must_not': [
+                                    {'exists': {'field': 'field_name'}},
+                                ],
+                            },
+                        },
+                    ],
+                },
+            },
+        ),
+        # Not a term filter field
+        (
+            'field_name.name',
+            'field value',
+            {
+                'match': {
+                    'field_name.name': {
+                        'query': 'field value',
+                        'operator': 'and',
+                    },
+                },
+            },
+        ),
+    ),
+)
+def test_build_field_query_with_term_filter_fields(field, value, expected):
+    """Test that term and terms queries are used for fields in term_filter_fields."""
+    term_filter_fields = frozenset(('field_name.id', 'is_archived'))
+    query = _build_field_query(field, value, term_filter_fields=term_filter_fields)
+    assert query.to_dict() == expected
+
+
+@pytest.mark.parametrize(
+    'entities,expected_fields',
+    (
+        (
+            (SimpleModelSearchApp.es_model,),
+            {'id', '_document_type'},
+        ),
+        (
+            (RelatedModelSearchApp.es_model,),
+            {'id', '_document_type', 'simpleton.id'},
+        ),
+        (
+            (SimpleModelSearchApp.es_model, RelatedModelSearchApp.es_model),
+            {'id', '_document_type'},
+        ),
+    ),
+)
+def test_get_term_filter_fields(entities, expected_fields):
+    """
+    Test that only keyword fields without normalisers and boolean fields common to all entities
+    are returned.
+    """
+    assert get_term_filter_fields(entities) == expected_fields
+
+
 @pytest.mark.parametrize(
     'term,expected',
     (
@@ -222,6 +377,87 @@ def test_offset_near_max_results(offset, limit, expected_size):
     assert query_dict['size'] == expected_size
 
 
+def test_basic_search_query_with_search_after():
+    """Tests that search_after is added to the query and the limit is not clipped by offset."""
+    query = get_basic_search_query(
+        mock.Mock(), 'test', limit=1000, search_after=[1.5, 'abc'],
+    )
+
+    query_dict = query.to_dict()
+    assert query_dict['from'] == 0
+    assert query_dict['size'] == 1000
+    assert query_dict['search_after'] == [1.5, 'abc']
+
+
+@pytest.mark.parametrize(
+    'search_after,expected_extra',
+    (
+        (None, {}),
+        (['2020-01-01', 'abc'], {'search_after': ['2020-01-01', 'abc']}),
+    ),
+)
+def test_limit_search_query(search_after, expected_extra):
+    """Tests that limit_search_query() only adds search_after when it's specified."""
+    query = get_search_by_entities_query([SimpleModelSearchApp.es_model])
+
+    query_dict = limit_search_query(query, limit=20, search_after=search_after).to_dict()
+    assert query_dict['from'] == 0
+    assert query_dict['size'] == 20
+    assert {
+        key: value for key, value in query_dict.items() if key == 'search_after'
+    } == expected_extra
+
+
+def test_get_typeahead_query():
+    """Tests that typeahead queries search the shingle sub-fields of each typeahead field."""
+    query = get_typeahead_query(
+        mock.Mock(),
+        'alex ham',
+        ('name.typeahead', 'dit_team.name.typeahead'),
+        fields_to_include=('id', 'name'),
+        limit=5,
+    )
+
+    assert query.to_dict() == {
+        'query': {
+            'multi_match': {
+                'query': 'alex ham',
+                'fields': [
+                    'name.typeahead',
+                    'name.typeahead._2gram',
+                    'name.typeahead._3gram',
+                    'dit_team.name.typeahead',
+                    'dit_team.name.typeahead._2gram',
+                    'dit_team.name.typeahead._3gram',
+                ],
+                'type': 'bool_prefix',
+                'operator': 'and',
+            },
+        },
+        'sort': ['_score', 'id'],
+        '_source': {'includes': ('id', 'name')},
+        'from': 0,
+        'size': 5,
+    }
+
+
+def test_get_typeahead_query_with_permission_filters():
+    """Tests that permission filters are applied to typeahead queries."""
+    permission_filters = [('created_by.dit_team.id', 'team-id')]
+
+    query = get_typeahead_query(
+        mock.Mock(),
+        'alex',
+        ('name.typeahead',),
+        permission_filters=permission_filters,
+    )
+
+    query_dict = query.to_dict()
+    assert query_dict['query']['bool']['filter'] == [
+        _build_entity_permission_query(permission_filters).to_dict(),
+    ]
+
+
 def test_date_range_fields():
     """Tests date range fields."""
     now = datetime.datetime(2017, 6, 13, 9, 44, 31, 62870)
@@ -573,6 +809,120 @@ def test_get_search_by_multiple_entities_query():
     ]
 
 
+@pytest.mark.parametrize(
+    'entities',
+    (
+        [SimpleModelSearchApp.es_model],
+        [SimpleModelSearchApp.es_model, RelatedModelSearchApp.es_model],
+    ),
+)
+@pytest.mark.parametrize(
+    'kwargs',
+    (
+        {},
+        {'term': ''},
+        {
+            'term': 'search term',
+            'filter_data': {
+                'name': ['test', None],
+                'id': ['a', 'b'],
+                'date_after': datetime.datetime(2020, 1, 1),
+                'date_before': '2021-01-01',
+                'name_exists': False,
+                'simpleton': {
+                    'name': 'test',
+                    'date_after': 1,
+                    'exists': True,
+                },
+                'other': None,
+                'empty': '',
+            },
+            'composite_field_mapping': {
+                'name': ['name', 'name.trigram'],
+            },
+            'permission_filters': [
+                ('created_by.dit_team.id', UUID('00000000-0000-0000-0000-000000000000')),
+                ('id', ['a']),
+            ],
+            'ordering': SearchOrdering('name.keyword', SortDirection.desc),
+            'fields_to_include': ['id'],
+            'fields_to_exclude': ['name'],
+        },
+        {'term': 'search term', 'permission_filters': EXCLUDE_ALL},
+        {'term': 'search term', 'permission_filters': []},
+        {
+            'term': 'search term',
+            'filter_data': {'id': 'a'},
+            'term_filter_fields': frozenset(),
+        },
+    ),
+)
+def test_get_search_by_entities_query_matches_builder(entities, kwargs):
+    """
+    Test that get_search_by_entities_query() (which uses query templates) generates exactly
+    the same query as the query builder, both when a template is first compiled and when it
+    is reused.
+    """
+    _get_query_template.cache_clear()
+    expected_query = _build_search_by_entities_query_without_template(entities, **kwargs)
+
+    for _ in range(2):
+        query = get_search_by_entities_query(entities, **kwargs)
+        # This also checks that the keys are in the same order
+        assert json.dumps(query.to_dict(), default=str) == json.dumps(
+            expected_query.to_dict(),
+            default=str,
+        )
+        assert query.to_dict() == expected_query.to_dict()
+        assert query._index == expected_query._index
+
+        # Further filters should also be combined in the same way
+        filtered_query = query.filter('term', id='a')
+        expected_filtered_query = expected_query.filter('term', id='a')
+        assert filtered_query.to_dict() == expected_filtered_query.to_dict()
+
+    assert _get_query_template.cache_info().misses == 1
+
+
+def test_get_search_by_entities_query_reuses_template_for_different_values():
+    """Test that queries with the same shape but different values share a template."""
+    _get_query_template.cache_clear()
+    entities = [SimpleModelSearchApp.es_model]
+    values = (
+        ('first term', ['a', 'b'], True),
+        ('second term', ['c', 'd'], False),
+    )
+
+    for term, ids, exists in values:
+        kwargs = {
+            'term': term,
+            'filter_data': {'id': ids, 'name_exists': exists},
+        }
+        query = get_search_by_entities_query(entities, **kwargs)
+        expected_query = _build_search_by_entities_query_without_template(entities, **kwargs)
+        assert query.to_dict() == expected_query.to_dict()
+
+    # The truthiness of name_exists changes the shape of the query
+    assert _get_query_template.cache_info().misses == 2
+
+    query = get_search_by_entities_query(
+        entities,
+        term='third term',
+        filter_data={'id': ['e', 'f'], 'name_exists': True},
+    )
+    assert _get_query_template.cache_info().misses == 2
+    assert query.to_dict()['query']['bool']['filter'] == [
+        {
+            'bool': {
+                'must': [
+                    {'terms': {'id': ['e', 'f']}},
+                    {'bool': {'must': [{'exists': {'field': 'name'}}]}},
+                ],
+            },
+        },
+    ]
+
+
 @mock.patch('datahub.search.query_builder.get_global_search_apps_as_mapping')
 def test_get_basic_search_query(mocked_get_global_search_apps_as_mapping):
     """Test for get_basic_search_query."""
@@ -0,0 +1,396 @@
+from datetime import datetime, timezone
+from unittest.mock import Mock
+
+import pytest
+
+from datahub.core.exceptions import DataHubException
+from datahub.core.test_utils import MockQuerySet
+from datahub.search.incremental_sync import WATERMARK_OVERLAP
+from datahub.search.reindex_migration import (
+    can_migrate_by_reindex,
+    complete_reindex_migration,
+    REINDEX_TIMEOUT_SECS,
+    start_reindex_migration,
+)
+from datahub.search.test.utils import create_mock_search_app
+
+INDEX_CREATION_TIME = datetime(2020, 1, 1, tzinfo=timezone.utc)
+
+
+def _mapping(**properties):
+    return {'dynamic': 'false', 'properties': properties}
+
+
+def _create_completed_task(failures=()):
+    return {
+        'completed': True,
+        'task': {
+            'status': {'total': 2, 'created': 2, 'version_conflicts': 0},
+        },
+        'response': {'failures': list(failures)},
+    }
+
+
+@pytest.fixture
+def mock_reindex_migration(monkeypatch):
+    """Patches the functions used by complete_reindex_migration() and yields the mocks."""
+    mocks = {
+        'cancel_task': Mock(),
+        'start_reindex': Mock(return_value='task-id'),
+        'get_task': Mock(
+            side_effect=[
+                {
+                    'completed': False,
+                    'task': {
+                        'status': {'total': 2, 'created': 1, 'version_conflicts': 0},
+                    },
+                },
+                _create_completed_task(),
+            ],
+        ),
+        'get_index_creation_time': Mock(return_value=INDEX_CREATION_TIME),
+        'get_document_count': Mock(return_value=2),
+        'get_document_ids': Mock(side_effect=lambda index_name: iter(['1', '2'])),
+        'get_aliases_for_index': Mock(return_value=set()),
+        'delete_documents': Mock(),
+        'sleep': Mock(),
+        'sync_objects': Mock(),
+        'sync_objects_changed_since': Mock(return_value=0),
+    }
+    for name, mock in mocks.items():
+        monkeypatch.setattr(f'datahub.search.reindex_migration.{name}', mock)
+
+    yield mocks
+
+
+class TestCanMigrateByReindex:
+    """Tests for can_migrate_by_reindex()."""
+
+    @pytest.mark.parametrize(
+        'current_mapping,target_mapping,enabled,expected_result',
+        (
+            # same fields (but different types and multi-fields)
+            (
+                _mapping(
+                    name={'type': 'text'},
+                    company={'type': 'object', 'properties': {'id': {'type': 'keyword'}}},
+                ),
+                _mapping(
+                    name={'type': 'keyword', 'fields': {'trigram': {'type': 'text'}}},
+                    company={'type': 'object', 'properties': {'id': {'type': 'keyword'}}},
+                ),
+                True,
+                True,
+            ),
+            # same fields but reindex migrations disabled
+            (
+                _mapping(name={'type': 'text'}),
+                _mapping(name={'type': 'text'}),
+                False,
+                False,
+            ),
+            # new field
+            (
+                _mapping(name={'type': 'text'}),
+                _mapping(name={'type': 'text'}, email={'type': 'keyword'}),
+                True,
+                False,
+            ),
+            # new sub-field
+            (
+                _mapping(company={'type': 'object', 'properties': {'id': {'type': 'keyword'}}}),
+                _mapping(
+                    company={
+                        'type': 'object',
+                        'properties': {'id': {'type': 'keyword'}, 'name': {'type': 'text'}},
+                    },
+                ),
+                True,
+                False,
+            ),
+        ),
+    )
+    def test_can_migrate_by_reindex(
+        self,
+        monkeypatch,
+        settings,
+        current_mapping,
+        target_mapping,
+        enabled,
+        expected_result,
+    ):
+        """Test that reindex migrations are only used when enabled and fields are unchanged."""
+        settings.SEARCH_MIGRATION_REINDEX_ENABLED = enabled
+        monkeypatch.setattr(
+            'datahub.search.reindex_migration.get_index_mapping',
+            Mock(return_value=current_mapping),
+        )
+        mock_app = create_mock_search_app()
+        mock_app.es_model._doc_type.mapping.to_dict.return_value = target_mapping
+
+        assert can_migrate_by_reindex(mock_app, 'test-index') == expected_result
+
+
+def test_start_reindex_migration(mock_es_client):
+    """Test that start_reindex_migration() only points the write alias at the new index."""
+    mock_app = create_mock_search_app()
+
+    start_reindex_migration(mock_app, 'old-index', 'new-index')
+
+    mock_es_client.return_value.indices.update_aliases.assert_called_once_with(
+        body={
+            'actions': [
+                {'add': {'alias': 'test-write-alias', 'indices': ['new-index']}},
+                {'remove': {'alias': 'test-write-alias', 'indices': ['old-index']}},
+            ],
+        },
+    )
+
+
+class TestCompleteReindexMigration:
+    """Tests for complete_reindex_migration()."""
+
+    def test_completes_migration(self, mock_es_client, mock_reindex_migration):
+        """
+        Test that documents are copied, changed objects are synced, and the read alias is
+        switched to the new index once document counts reconcile.
+        """
+        mock_client = mock_es_client.return_value
+        mock_app = create_mock_search_app(read_indices=('old-index',), write_index='new-index')
+        mock_app.incremental_sync_fields = ('modified_on',)
+
+        complete_reindex_migration(mock_app)
+
+        mock_reindex_migration['start_reindex'].assert_called_once_with(
+            'old-index',
+            'new-index',
+            slices='auto',
+        )
+        assert mock_reindex_migration['get_task'].call_count == 2
+        mock_reindex_migration['sync_objects_changed_since'].assert_called_once_with(
+            mock_app,
+            INDEX_CREATION_TIME - WATERMARK_OVERLAP,
+        )
+        assert mock_reindex_migration['get_document_ids'].call_count == 2
+        mock_reindex_migration['delete_documents'].assert_not_called()
+        mock_reindex_migration['sync_objects'].assert_not_called()
+
+        mock_client.indices.update_aliases.assert_called_once_with(
+            body={
+                'actions': [
+                    {'add': {'alias': 'test-read-alias', 'indices': ['new-index']}},
+                    {'remove': {'alias': 'test-read-alias', 'indices': ['old-index']}},
+                ],
+            },
+        )
+        mock_client.indices.delete.assert_called_once_with('old-index')
+
+    def test_reconciles_differing_documents(self, mock_es_client, mock_reindex_migration):
+        """
+        Test that if document counts differ, extra documents are deleted from the new index and
+        missing documents are synced to it.
+        """
+        mock_client = mock_es_client.return_value
+        mock_app = create_mock_search_app(
+            read_indices=('old-index',),
+            write_index='new-index',
+            queryset=MockQuerySet([Mock(id='2')]),
+        )
+        mock_app.incremental_sync_fields = ('modified_on',)
+        mock_reindex_migration['get_document_count'].side_effect = [2, 3, 2, 2]
+        # ID 2 is missing from the new index, and ID 4 is an extra document
+        mock_reindex_migration['get_document_ids'].side_effect = [
+            iter(['1', '2']),
+            iter(['1', '4']),
+        ]
+
+        complete_reindex_migration(mock_app)
+
+        mock_reindex_migration['delete_documents'].assert_called_once_with(
+            'new-index',
+            [{'_id': '4'}],
+        )
+        sync_objects_mock = mock_reindex_migration['sync_objects']
+        assert sync_objects_mock.call_count == 1
+        assert sync_objects_mock.call_args[0][2:] == ({'old-index'}, 'new-index')
+
+        mock_client.indices.update_aliases.assert_called_once()
+
+    def test_reconciles_differing_documents_with_equal_counts(
+        self,
+        mock_es_client,
+        mock_reindex_migration,
+    ):
+        """
+        Test that documents are reconciled if the document counts are equal but the document
+        IDs differ.
+        """
+        mock_client = mock_es_client.return_value
+        mock_app = create_mock_search_app(
+            read_indices=('old-index',),
+            write_index='new-index',
+            queryset=MockQuerySet([Mock(id='2')]),
+        )
+        mock_app.incremental_sync_fields = ('modified_on',)
+        # ID 2 is missing from the new index, and ID 4 is an extra document
+        mock_reindex_migration['get_document_ids'].side_effect = [
+            iter(['1', '2']),
+            iter(['1', '4']),
+        ]
+
+        complete_reindex_migration(mock_app)
+
+        mock_reindex_migration['delete_documents'].assert_called_once_with(
+            'new-index',
+            [{'_id': '4'}],
+        )
+        assert mock_reindex_migration['sync_objects'].call_count == 1
+        mock_client.indices.update_aliases.assert_called_once()
+
+    def test_removes_documents_deleted_from_database(
+        self,
+        mock_es_client,
+        mock_reindex_migration,
+    ):
+        """
+        Test that documents missing from the new index whose objects have been deleted from the
+        database are deleted from the old index (instead of being synced).
+        """
+        mock_client = mock_es_client.return_value
+        mock_app = create_mock_search_app(
+            read_indices=('old-index',),
+            write_index='new-index',
+            queryset=MockQuerySet([]),
+        )
+        mock_app.incremental_sync_fields = ('modified_on',)
+        mock_reindex_migration['get_document_count'].side_effect = [2, 1, 1, 1]
+        mock_reindex_migration['get_document_ids'].side_effect = [
+            iter(['1', '2']),
+            iter(['1']),
+        ]
+
+        complete_reindex_migration(mock_app)
+
+        mock_reindex_migration['delete_documents'].assert_called_once_with(
+            'old-index',
+            [{'_id': '2'}],
+        )
+        mock_client.indices.update_aliases.assert_called_once()
+
+    def test_aborts_if_counts_cannot_be_reconciled(
+        self,
+        mock_es_client,
+        mock_reindex_migration,
+    ):
+        """Test that the read alias is not switched if document counts can't be reconciled."""
+        mock_client = mock_es_client.return_value
+        mock_app = create_mock_search_app(read_indices=('old-index',), write_index='new-index')
+        mock_app.incremental_sync_fields = ('modified_on',)
+        mock_reindex_migration['get_document_count'].side_effect = [2, 3, 2, 3]
+        mock_reindex_migration['get_document_ids'].side_effect = [
+            iter(['1', '2']),
+            iter(['1', '2', '3']),
+        ]
+
+        with pytest.raises(DataHubException):
+            complete_reindex_migration(mock_app)
+
+        mock_client.indices.update_aliases.assert_not_called()
+        mock_client.indices.delete.assert_not_called()
+
+    @pytest.mark.parametrize(
+        'task',
+        (
+            _create_completed_task(failures=[{'cause': 'error'}]),
+            {
+                'completed': True,
+                'task': {
+                    'status': {'total': 2, 'created': 1, 'version_conflicts': 0},
+                },
+                'error': {'type': 'error'},
+            },
+        ),
+    )
+    def test_aborts_on_reindex_failures(self, mock_es_client, mock_reindex_migration, task):
+        """
+        Test that if the reindex reports failures, the read alias is not switched and the
+        write alias is reverted to the old index.
+        """
+        mock_client = mock_es_client.return_value
+        mock_app = create_mock_search_app(read_indices=('old-index',), write_index='new-index')
+        mock_reindex_migration['get_task'].side_effect = [task]
+
+        with pytest.raises(DataHubException):
+            complete_reindex_migration(mock_app)
+
+        mock_reindex_migration['sync_objects_changed_since'].assert_not_called()
+        mock_client.indices.update_aliases.assert_called_once_with(
+            body={
+                'actions': [
+                    {'add': {'alias': 'test-write-alias', 'indices': ['old-index']}},
+                    {'remove': {'alias': 'test-write-alias', 'indices': ['new-index']}},
+                ],
+            },
+        )
+        mock_client.indices.delete.assert_called_once_with('new-index')
+
+    def test_completes_migration_if_task_has_no_response(
+        self,
+        mock_es_client,
+        mock_reindex_migration,
+    ):
+        """Test that a completed reindex task without a response is treated as successful."""
+        mock_client = mock_es_client.return_value
+        mock_app = create_mock_search_app(read_indices=('old-index',), write_index='new-index')
+        task = _create_completed_task()
+        del task['response']
+        mock_reindex_migration['get_task'].side_effect = [task]
+
+        complete_reindex_migration(mock_app)
+
+        mock_client.indices.delete.assert_called_once_with('old-index')
+
+    def test_cancels_reindex_after_timeout(
+        self,
+        mock_es_client,
+        mock_reindex_migration,
+        monkeypatch,
+    ):
+        """Test that the reindex task is cancelled if it doesn't complete in time."""
+        mock_client = mock_es_client.return_value
+        mock_app = create_mock_search_app(read_indices=('old-index',), write_index='new-index')
+        monkeypatch.setattr(
+            'datahub.search.reindex_migration.monotonic',
+            Mock(side_effect=[0, REINDEX_TIMEOUT_SECS]),
+        )
+
+        with pytest.raises(DataHubException):
+            complete_reindex_migration(mock_app)
+
+        mock_reindex_migration['cancel_task'].assert_called_once_with('task-id')
+        mock_reindex_migration['sync_objects_changed_since'].assert_not_called()
+        mock_client.indices.update_aliases.assert_called_once_with(
+            body={
+                'actions': [
+                    {'add': {'alias': 'test-write-alias', 'indices': ['old-index']}},
+                    {'remove': {'alias': 'test-write-alias', 'indices': ['new-index']}},
+                ],
+            },
+        )
+        mock_client.indices.delete.assert_called_once_with('new-index')
+
+    def test_aborts_if_not_in_reindex_migration_state(
+        self,
+        mock_es_client,
+        mock_reindex_migration,
+    ):
+        """Test that an error is raised if the aliases aren't in the expected state."""
+        mock_app = create_mock_search_app(
+            read_indices=('old-index', 'new-index'),
+            write_index='new-index',
+        )
+
+        with pytest.raises(DataHubException):
+            complete_reindex_migration(mock_app)
+
+        mock_reindex_migration['start_reindex'].assert_not_called()
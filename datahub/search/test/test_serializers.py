@@ -1,7 +1,8 @@
 import pytest
 from rest_framework import serializers
 
-from datahub.search.serializers import SingleOrListField
+from datahub.search.serializers import EntitySearchQuerySerializer, SingleOrListField
+from datahub.search.utils import encode_search_cursor
 
 
 class TestSingleOrListField:
@@ -32,3 +33,55 @@ class TestSingleOrListField:
             field.run_validation(['', ''])
 
         assert excinfo.value.get_codes() == {0: ['blank'], 1: ['blank']}
+
+
+class TestBaseSearchQuerySerializer:
+    """Tests BaseSearchQuerySerializer (via EntitySearchQuerySerializer)."""
+
+    @pytest.mark.parametrize(
+        'cursor,expected_cursor',
+        (
+            (None, None),
+            ('', None),
+            (encode_search_cursor([1.5, 'abc']), [1.5, 'abc']),
+        ),
+    )
+    def test_cursor_is_decoded(self, cursor, expected_cursor):
+        """Test that a cursor is decoded to a list of sort values."""
+        serializer = EntitySearchQuerySerializer(data={'cursor': cursor})
+
+        assert serializer.is_valid()
+        assert serializer.validated_data['cursor'] == expected_cursor
+
+    def test_cursor_is_optional(self):
+        """Test that cursor is omitted from the validated data if it wasn't provided."""
+        serializer = EntitySearchQuerySerializer(data={})
+
+        assert serializer.is_valid()
+        assert 'cursor' not in serializer.validated_data
+
+    @pytest.mark.parametrize(
+        'cursor',
+        (
+            'not base64!',
+            'bm90IGpzb24',
+            encode_search_cursor([]),
+            encode_search_cursor([{'key': 'value'}]),
+            123,
+        ),
+    )
+    def test_invalid_cursor(self, cursor):
+        """Test that invalid cursors are rejected."""
+        serializer = EntitySearchQuerySerializer(data={'cursor': cursor})
+
+        assert not serializer.is_valid()
+        assert serializer.errors['cursor'] == ['Invalid cursor.']
+
+    def test_cursor_with_offset(self):
+        """Test that offset and cursor cannot be used together."""
+        serializer = EntitySearchQuerySerializer(
+            data={'cursor': encode_search_cursor([1.5, 'abc']), 'offset': 10},
+        )
+
+        assert not serializer.is_valid()
+        assert serializer.errors == {'offset': ['offset cannot be used with cursor.']}
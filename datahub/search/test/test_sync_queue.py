@@ -0,0 +1,142 @@
+from collections import defaultdict
+from unittest.mock import Mock
+
+import pytest
+from freezegun import freeze_time
+
+from datahub.search.apps import get_search_apps
+from datahub.search.sync_object import sync_object_async
+from datahub.search.sync_queue import (
+    drain_sync_queue,
+    enqueue_objects_for_sync,
+    get_sync_queue_depth,
+)
+from datahub.search.tasks import drain_sync_queues
+from datahub.search.test.search_support.models import SimpleModel
+from datahub.search.test.search_support.simplemodel import SimpleModelSearchApp
+from datahub.search.test.utils import doc_exists
+
+
+class FakeRedis:
+    """Minimal in-memory stand-in for the Redis sorted set commands used by the sync queue."""
+
+    def __init__(self):
+        """Initialises the instance with no keys."""
+        self.sorted_sets = defaultdict(dict)
+
+    def zadd(self, key, mapping, nx=False):
+        """Adds values (with scores) to a sorted set."""
+        sorted_set = self.sorted_sets[key]
+        for value, score in mapping.items():
+            if not nx or value.encode() not in sorted_set:
+                sorted_set[value.encode()] = score
+
+    def zcard(self, key):
+        """Returns the size of a sorted set."""
+        return len(self.sorted_sets[key])
+
+    def zpopmin(self, key, count):
+        """Removes and returns up to count of the lowest-scored values from a sorted set."""
+        sorted_set = self.sorted_sets[key]
+        items = sorted(sorted_set.items(), key=lambda item: item[1])[:count]
+        for value, _ in items:
+            del sorted_set[value]
+        return items
+
+
+@pytest.fixture
+def fake_redis(monkeypatch):
+    """Patches the sync queue so that an in-memory fake Redis connection is used."""
+    redis = FakeRedis()
+    monkeypatch.setattr('datahub.search.sync_queue.get_redis_connection', lambda: redis)
+    yield redis
+
+
+def test_enqueue_objects_for_sync_coalesces_duplicates(fake_redis):
+    """Test that an object queued multiple times is only stored once."""
+    enqueue_objects_for_sync(SimpleModelSearchApp, [1, 2])
+    enqueue_objects_for_sync(SimpleModelSearchApp, [2, 1])
+
+    assert get_sync_queue_depth(SimpleModelSearchApp) == 2
+
+
+@pytest.mark.django_db
+def test_drain_sync_queue_syncs_queued_objects(es, fake_redis):
+    """Test that drain_sync_queue() syncs all queued objects and empties the queue."""
+    objs = SimpleModel.objects.bulk_create([SimpleModel(name=str(i)) for i in range(3)])
+    enqueue_objects_for_sync(SimpleModelSearchApp, [obj.pk for obj in objs])
+
+    num_synced = drain_sync_queue(SimpleModelSearchApp, batch_size=2)
+    es.indices.refresh()
+
+    assert num_synced == 3
+    assert get_sync_queue_depth(SimpleModelSearchApp) == 0
+    assert all(doc_exists(es, SimpleModelSearchApp, obj.pk) for obj in objs)
+
+
+@pytest.mark.django_db
+def test_drain_sync_queue_records_sync_lag(es, fake_redis, monkeypatch):
+    """Test that drain_sync_queue() records how long objects were waiting in the queue."""
+    record_sync_lags_mock = Mock()
+    monkeypatch.setattr('datahub.search.sync_queue.record_sync_lags', record_sync_lags_mock)
+    obj = SimpleModel.objects.create(name='test')
+
+    with freeze_time('2020-01-01 12:00:00'):
+        enqueue_objects_for_sync(SimpleModelSearchApp, [obj.pk])
+
+    with freeze_time('2020-01-01 12:00:05'):
+        drain_sync_queue(SimpleModelSearchApp)
+
+    record_sync_lags_mock.assert_called_once()
+    search_app_name, lags = record_sync_lags_mock.call_args[0]
+    assert search_app_name == SimpleModelSearchApp.name
+    assert list(lags) == [5]
+
+
+@pytest.mark.django_db
+def test_drain_sync_queue_requeues_on_error(fake_redis, monkeypatch):
+    """Test that if a batch fails to sync, it is put back in the queue."""
+    monkeypatch.setattr(
+        'datahub.search.sync_queue.sync_objects',
+        Mock(side_effect=ValueError),
+    )
+    enqueue_objects_for_sync(SimpleModelSearchApp, ['a', 'b'])
+
+    with pytest.raises(ValueError):
+        drain_sync_queue(SimpleModelSearchApp)
+
+    assert get_sync_queue_depth(SimpleModelSearchApp) == 2
+
+
+def test_drain_sync_queues_drains_all_apps(monkeypatch):
+    """Test that the drain_sync_queues task drains the queue of every search app."""
+    drain_sync_queue_mock = Mock()
+    monkeypatch.setattr('datahub.search.tasks.drain_sync_queue', drain_sync_queue_mock)
+
+    drain_sync_queues.apply()
+
+    drained_apps = {call[0][0] for call in drain_sync_queue_mock.call_args_list}
+    assert SimpleModelSearchApp in drained_apps
+
+
+def test_drain_sync_queues_continues_after_error(monkeypatch):
+    """Test that an error draining one queue doesn't stop the other queues being drained."""
+    drain_sync_queue_mock = Mock(side_effect=ValueError)
+    monkeypatch.setattr('datahub.search.tasks.drain_sync_queue', drain_sync_queue_mock)
+    monkeypatch.setattr('datahub.search.tasks.get_sync_queue_depth', Mock(return_value=0))
+
+    drain_sync_queues.apply()
+
+    assert drain_sync_queue_mock.call_count == len(get_search_apps())
+
+
+def test_sync_object_async_uses_queue_when_enabled(fake_redis, monkeypatch):
+    """Test that sync_object_async() queues the object instead of scheduling a task."""
+    monkeypatch.setattr('django.conf.settings.SEARCH_SYNC_QUEUE_ENABLED', True)
+    sync_object_task_mock = Mock()
+    monkeypatch.setattr('datahub.search.sync_object.sync_object_task', sync_object_task_mock)
+
+    sync_object_async(SimpleModelSearchApp, 'pk-1')
+
+    sync_object_task_mock.apply_async.assert_not_called()
+    assert get_sync_queue_depth(SimpleModelSearchApp) == 1
@@ -1,4 +1,4 @@
-from unittest.mock import call, MagicMock, Mock
+from unittest.mock import ANY, call, MagicMock, Mock
 from uuid import uuid4
 
 import pytest
@@ -8,6 +8,8 @@ from datahub.search.tasks import (
     complete_model_migration,
     sync_all_models,
     sync_model,
+    sync_model_partition,
+    sync_object_batch_task,
     sync_object_task,
     sync_related_objects_task,
 )
@@ -32,6 +34,48 @@ def test_sync_model(monkeypatch):
     sync_app_mock.assert_called_once_with(get_search_app_mock.return_value)
 
 
+def test_sync_model_with_partition_size(monkeypatch):
+    """
+    Test that the sync_model task schedules a sub-task for each partition that has not
+    already been completed when a partition size is specified.
+    """
+    partitions = [(None, 'b'), ('b', 'd'), ('d', None)]
+    monkeypatch.setattr(
+        'datahub.search.tasks.get_pk_partitions',
+        Mock(return_value=partitions),
+    )
+    monkeypatch.setattr(
+        'datahub.search.tasks.is_partition_complete',
+        Mock(side_effect=lambda run_id, partition: partition == ('b', 'd')),
+    )
+    sync_app_mock = Mock()
+    monkeypatch.setattr('datahub.search.tasks.sync_app', sync_app_mock)
+    sync_model_partition_mock = Mock()
+    monkeypatch.setattr('datahub.search.tasks.sync_model_partition', sync_model_partition_mock)
+
+    result = sync_model.apply(args=(SimpleModelSearchApp.name,), kwargs={'partition_size': 2})
+
+    sync_app_mock.assert_not_called()
+    assert sync_model_partition_mock.apply_async.call_args_list == [
+        call(args=(SimpleModelSearchApp.name, (None, 'b'), result.id)),
+        call(args=(SimpleModelSearchApp.name, ('d', None), result.id)),
+    ]
+
+
+def test_sync_model_partition(monkeypatch):
+    """Test that the sync_model_partition task syncs the specified partition."""
+    sync_app_partition_mock = Mock()
+    monkeypatch.setattr('datahub.search.tasks.sync_app_partition', sync_app_partition_mock)
+
+    sync_model_partition.apply(args=(SimpleModelSearchApp.name, ['a', None], 'test-run'))
+
+    sync_app_partition_mock.assert_called_once_with(
+        SimpleModelSearchApp,
+        ('a', None),
+        run_id='test-run',
+    )
+
+
 def test_sync_all_models(monkeypatch):
     """Test that the sync_all_models task starts sub-tasks to sync all models."""
     sync_model_mock = Mock()
@@ -52,6 +96,22 @@ def test_sync_object_task_syncs(es):
     assert doc_exists(es, SimpleModelSearchApp, obj.pk)
 
 
+@pytest.mark.django_db
+def test_sync_object_task_records_sync_lag(monkeypatch, es):
+    """Test that the object task records the time since it was scheduled, if specified."""
+    record_sync_lags_mock = Mock()
+    monkeypatch.setattr('datahub.search.tasks.record_sync_lags', record_sync_lags_mock)
+    monkeypatch.setattr('datahub.search.tasks.time', Mock(return_value=1005.0))
+
+    obj = SimpleModel.objects.create()
+    sync_object_task.apply(
+        args=(SimpleModelSearchApp.name, str(obj.pk)),
+        kwargs={'enqueued_on': 1000.0},
+    )
+
+    record_sync_lags_mock.assert_called_once_with(SimpleModelSearchApp.name, (5.0,))
+
+
 def test_sync_object_task_retries_on_error(monkeypatch, es):
     """Test that the object task retries on error."""
     sync_object_mock = Mock(side_effect=[Exception, None])
@@ -71,13 +131,15 @@ def test_sync_object_task_retries_on_error(monkeypatch, es):
 )
 @pytest.mark.django_db
 def test_sync_related_objects_task_syncs(related_obj_filter, monkeypatch):
-    """Test that related objects are synced to Elasticsearch."""
-    sync_object_task_mock = Mock()
-    monkeypatch.setattr('datahub.search.tasks.sync_object_task', sync_object_task_mock)
+    """Test that related objects are synced to Elasticsearch in batches."""
+    sync_object_batch_task_mock = Mock()
+    monkeypatch.setattr('datahub.search.tasks.sync_object_batch_task', sync_object_batch_task_mock)
+    monkeypatch.setattr(RelatedModelSearchApp, 'bulk_batch_size', 2)
 
     simpleton = SimpleModel.objects.create(name='hello')
-    relation_1 = RelatedModel.objects.create(simpleton=simpleton)
-    relation_2 = RelatedModel.objects.create(simpleton=simpleton)
+    relations = RelatedModel.objects.bulk_create(
+        [RelatedModel(simpleton=simpleton) for _ in range(3)],
+    )
     RelatedModel.objects.create()  # Unrelated object, should not get synced
 
     sync_related_objects_task.apply(
@@ -89,10 +151,25 @@ def test_sync_related_objects_task_syncs(related_obj_filter, monkeypatch):
         ),
     )
 
-    assert sync_object_task_mock.apply_async.call_args_list == [
-        call(args=(RelatedModelSearchApp.name, relation_1.pk), priority=6),
-        call(args=(RelatedModelSearchApp.name, relation_2.pk), priority=6),
-    ]
+    call_args_list = sync_object_batch_task_mock.apply_async.call_args_list
+    assert len(call_args_list) == 2
+    assert all(call_[1]['priority'] == 6 for call_ in call_args_list)
+    assert [len(call_[1]['args'][1]) for call_ in call_args_list] == [2, 1]
+
+    synced_pks = {pk for call_ in call_args_list for pk in call_[1]['args'][1]}
+    assert synced_pks == {str(relation.pk) for relation in relations}
+
+
+@pytest.mark.django_db
+def test_sync_object_batch_task_syncs(es):
+    """Test that the batch task syncs multiple objects to Elasticsearch."""
+    objs = SimpleModel.objects.bulk_create([SimpleModel(), SimpleModel()])
+    sync_object_batch_task.apply(
+        args=(SimpleModelSearchApp.name, [str(obj.pk) for obj in objs]),
+    )
+    es.indices.refresh()
+
+    assert all(doc_exists(es, SimpleModelSearchApp, obj.pk) for obj in objs)
 
 
 @pytest.mark.django_db
@@ -108,7 +185,35 @@ def test_complete_model_migration(monkeypatch):
     monkeypatch.setattr('datahub.search.tasks.get_search_app', get_search_app_mock)
 
     complete_model_migration.apply(args=('test-app', 'target-hash'))
-    resync_after_migrate_mock.assert_called_once_with(mock_app)
+    resync_after_migrate_mock.assert_called_once_with(mock_app, run_id=ANY)
+
+
+@pytest.mark.django_db
+def test_complete_model_migration_with_reindex_migration(monkeypatch):
+    """
+    Test that the complete_model_migration task calls complete_reindex_migration() when a
+    migration using the reindex API was started.
+    """
+    resync_after_migrate_mock = Mock()
+    monkeypatch.setattr('datahub.search.tasks.resync_after_migrate', resync_after_migrate_mock)
+    complete_reindex_migration_mock = Mock()
+    monkeypatch.setattr(
+        'datahub.search.tasks.complete_reindex_migration',
+        complete_reindex_migration_mock,
+    )
+    mock_app = create_mock_search_app(
+        current_mapping_hash='current-hash',
+        target_mapping_hash='target-hash',
+        read_indices=('old-index',),
+        write_index='new-index',
+    )
+    get_search_app_mock = Mock(return_value=mock_app)
+    monkeypatch.setattr('datahub.search.tasks.get_search_app', get_search_app_mock)
+
+    complete_model_migration.apply(args=('test-app', 'target-hash'))
+
+    complete_reindex_migration_mock.assert_called_once_with(mock_app)
+    resync_after_migrate_mock.assert_not_called()
 
 
 @pytest.mark.django_db
@@ -1,4 +1,7 @@
 import datetime
+from csv import DictReader
+from io import StringIO
+from unittest.mock import Mock
 
 import pytest
 from django.utils.timezone import utc
@@ -13,9 +16,11 @@ from datahub.interaction.test.factories import CompanyInteractionFactory
 from datahub.investment.project.test.factories import InvestmentProjectFactory
 from datahub.metadata.test.factories import TeamFactory
 from datahub.omis.order.test.factories import OrderFactory
+from datahub.search.execute_query import execute_multi_search_query, execute_search_query
 from datahub.search.sync_object import sync_object
 from datahub.search.test.search_support.models import RelatedModel, SimpleModel
 from datahub.search.test.search_support.simplemodel import SimpleModelSearchApp
+from datahub.search.utils import encode_search_cursor
 from datahub.user_event_log.constants import UserEventType
 from datahub.user_event_log.models import UserEvent
 
@@ -97,21 +102,6 @@ class TestValidateViewSortByAttributes:
         assert not invalid_fields
 
 
-class TestValidateExportViewAttributes:
-    """Validates the field names specified in class attributes on export views."""
-
-    def test_validate_db_sort_by_remappings_keys(self, search_view):
-        """Validate that the keys of db_sort_by_remappings are valid sort by fields."""
-        if not hasattr(search_view, 'db_sort_by_remappings'):
-            return
-
-        serializer_class = search_view.serializer_class
-        invalid_fields = (
-            search_view.db_sort_by_remappings.keys() - set(serializer_class.SORT_BY_FIELDS)
-        )
-        assert not invalid_fields
-
-
 class TestBasicSearch(APITestMixin):
     """Tests for SearchBasicAPIView."""
 
@@ -152,6 +142,42 @@ class TestBasicSearch(APITestMixin):
             end = start + page_size
             assert ids[start:end] == [result['id'] for result in response.data['results']]
 
+    def test_cursor_pagination(self, es_with_collector, search_support_user):
+        """Tests that all results can be retrieved by following next_cursor."""
+        total_records = 5
+        page_size = 2
+        name = 'test record'
+
+        objects = [SimpleModel.objects.create(name=name) for _ in range(total_records)]
+        # Note: id is a Keyword field, so string sorting must be used
+        ids = sorted((obj.id for obj in objects), key=str)
+
+        es_with_collector.flush_and_refresh()
+
+        url = reverse('api-v3:search:basic')
+        api_client = self.create_api_client(user=search_support_user)
+        retrieved_ids = []
+        cursor = ''
+
+        while cursor is not None:
+            response = api_client.get(
+                url,
+                data={
+                    'term': name,
+                    'entity': 'simplemodel',
+                    'limit': page_size,
+                    'cursor': cursor,
+                },
+            )
+
+            assert response.status_code == status.HTTP_200_OK
+            response_data = response.json()
+            assert response_data['count'] == total_records
+            retrieved_ids.extend(result['id'] for result in response_data['results'])
+            cursor = response_data['next_cursor']
+
+        assert retrieved_ids == ids
+
     @pytest.mark.parametrize('entity', ('sloth', ))
     def test_400_with_invalid_entity(self, es_with_collector, entity):
         """Tests case where provided entity is invalid."""
@@ -424,6 +450,89 @@ class TestBasicSearch(APITestMixin):
         assert len(response_data['aggregations']) == 0
 
 
+class TestBatchSearch(APITestMixin):
+    """Tests for SearchBatchAPIView."""
+
+    def test_batch_search(self, es_with_collector, search_support_user, monkeypatch):
+        """Tests that entity results and counts are returned using a single multi-search."""
+        execute_multi_search_query_mock = Mock(wraps=execute_multi_search_query)
+        monkeypatch.setattr(
+            'datahub.search.views.execute_multi_search_query',
+            execute_multi_search_query_mock,
+        )
+        for name in ('Neptune 1', 'Neptune 2'):
+            SimpleModel.objects.create(name=name)
+
+        es_with_collector.flush_and_refresh()
+
+        api_client = self.create_api_client(user=search_support_user)
+        url = reverse('api-v3:search:batch')
+
+        response = api_client.post(
+            url,
+            data={
+                'term': 'Neptune',
+                'entities': {
+                    'simplemodel': {'limit': 1, 'sortby': 'name'},
+                    'relatedmodel': {},
+                },
+            },
+        )
+
+        assert response.status_code == status.HTTP_200_OK
+        response_data = response.json()
+        assert {'count': 2, 'entity': 'simplemodel'} in response_data['aggregations']
+        assert response_data['results']['simplemodel']['count'] == 2
+        assert [
+            result['name'] for result in response_data['results']['simplemodel']['results']
+        ] == ['Neptune 1']
+        assert response_data['results']['relatedmodel'] == {'count': 0, 'results': []}
+        assert execute_multi_search_query_mock.call_count == 1
+
+    @pytest.mark.parametrize(
+        'data,expected_errors',
+        (
+            (
+                {'entities': {'sloth': {}}},
+                {'entities': ['"sloth" is not a valid choice.']},
+            ),
+            (
+                {'entities': {}},
+                {'entities': ['This dictionary may not be empty.']},
+            ),
+            (
+                {'entities': {'simplemodel': {'limit': 0}}},
+                {
+                    'entities': {
+                        'simplemodel': {
+                            'limit': ['Ensure this value is greater than or equal to 1.'],
+                        },
+                    },
+                },
+            ),
+        ),
+    )
+    def test_400_with_invalid_data(self, es, search_support_user, data, expected_errors):
+        """Tests that invalid requests are rejected."""
+        api_client = self.create_api_client(user=search_support_user)
+        url = reverse('api-v3:search:batch')
+
+        response = api_client.post(url, data=data)
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert response.json() == expected_errors
+
+    def test_403_without_entity_permission(self, es):
+        """Tests that entities that the user does not have access to are rejected."""
+        user = create_test_user(permission_codenames=['view_simplemodel'])
+        api_client = self.create_api_client(user=user)
+        url = reverse('api-v3:search:batch')
+
+        response = api_client.post(url, data={'entities': {'relatedmodel': {}}})
+
+        assert response.status_code == status.HTTP_403_FORBIDDEN
+
+
 class TestEntitySearch(APITestMixin):
     """Tests for `SearchAPIView`."""
 
@@ -485,6 +594,111 @@ class TestEntitySearch(APITestMixin):
             for obj in response_data['results']
         ]
 
+    def test_cursor_pagination(self, es_with_collector, search_support_user):
+        """Tests that all results can be retrieved in order by following next_cursor."""
+        for day in (3, 1, 2):
+            SimpleModel.objects.create(name=f'Jupiter {day}', date=datetime.date(2010, 1, day))
+
+        es_with_collector.flush_and_refresh()
+
+        api_client = self.create_api_client(user=search_support_user)
+        url = reverse('api-v3:search:simplemodel')
+        page_names = []
+        cursor = None
+
+        while True:
+            response = api_client.post(
+                url,
+                data={
+                    'original_query': '',
+                    'sortby': 'date:asc',
+                    'limit': 2,
+                    'cursor': cursor,
+                },
+            )
+
+            assert response.status_code == status.HTTP_200_OK
+            response_data = response.json()
+            assert response_data['count'] == 3
+            page_names.append([result['name'] for result in response_data['results']])
+            cursor = response_data['next_cursor']
+
+            if cursor is None:
+                break
+
+        assert page_names == [['Jupiter 1', 'Jupiter 2'], ['Jupiter 3']]
+
+    def test_400_with_cursor_for_different_sorting(self, es, search_support_user):
+        """Tests that a cursor with the wrong number of sort values is rejected."""
+        api_client = self.create_api_client(user=search_support_user)
+        url = reverse('api-v3:search:simplemodel')
+
+        response = api_client.post(
+            url,
+            data={
+                'original_query': '',
+                'cursor': encode_search_cursor(['abc']),
+            },
+        )
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert response.json() == {'cursor': ['Cursor is not valid for this query.']}
+
+    def test_cached_response_is_reused(
+        self,
+        es_with_collector,
+        search_support_user,
+        local_memory_cache,
+        monkeypatch,
+        settings,
+    ):
+        """Test that identical searches are served from the result cache when it's enabled."""
+        settings.SEARCH_RESULT_CACHE_ENABLED = True
+        execute_search_query_mock = Mock(wraps=execute_search_query)
+        monkeypatch.setattr(
+            'datahub.search.views.execute_search_query',
+            execute_search_query_mock,
+        )
+        SimpleModel.objects.create(name='Mars')
+        es_with_collector.flush_and_refresh()
+
+        api_client = self.create_api_client(user=search_support_user)
+        url = reverse('api-v3:search:simplemodel')
+        data = {'original_query': 'Mars'}
+
+        first_response = api_client.post(url, data=data)
+        second_response = api_client.post(url, data=data)
+
+        assert first_response.status_code == second_response.status_code == status.HTTP_200_OK
+        assert first_response.json() == second_response.json()
+        assert execute_search_query_mock.call_count == 1
+
+    def test_cached_response_is_invalidated_after_sync(
+        self,
+        es_with_collector,
+        search_support_user,
+        local_memory_cache,
+        settings,
+    ):
+        """Test that cached search responses are not used once documents have been synced."""
+        settings.SEARCH_RESULT_CACHE_ENABLED = True
+        SimpleModel.objects.create(name='Venus 1')
+        es_with_collector.flush_and_refresh()
+
+        api_client = self.create_api_client(user=search_support_user)
+        url = reverse('api-v3:search:simplemodel')
+        data = {'original_query': 'Venus'}
+
+        first_response = api_client.post(url, data=data)
+
+        SimpleModel.objects.create(name='Venus 2')
+        es_with_collector.flush_and_refresh()
+
+        second_response = api_client.post(url, data=data)
+
+        assert first_response.json()['count'] == 1
+        assert second_response.json()['count'] == 2
+
 
 class TestSearchExportAPIView(APITestMixin):
     """Tests for SearchExportAPIView."""
@@ -510,6 +724,9 @@ class TestSearchExportAPIView(APITestMixin):
                     'name': 'test',
                 },
             )
+            # The event is recorded once the response has been streamed
+            assert UserEvent.objects.count() == 0
+            b''.join(response.streaming_content)
 
         assert response.status_code == status.HTTP_200_OK
         assert UserEvent.objects.count() == 1
@@ -529,3 +746,61 @@ class TestSearchExportAPIView(APITestMixin):
             },
             'num_results': 1,
         }
+
+    @pytest.mark.parametrize('chunk_size', (2, 1000))
+    def test_export_preserves_search_order(self, es_with_collector, settings, chunk_size):
+        """
+        Tests that rows are exported in the order of the search results when they are fetched
+        in multiple chunks.
+        """
+        settings.SEARCH_EXPORT_SCROLL_CHUNK_SIZE = chunk_size
+        user = create_test_user(permission_codenames=['view_simplemodel'])
+        api_client = self.create_api_client(user=user)
+
+        names = ['Pluto 4', 'Pluto 1', 'Pluto 5', 'Pluto 3', 'Pluto 2']
+        for name in names:
+            SimpleModel.objects.create(name=name)
+
+        es_with_collector.flush_and_refresh()
+
+        url = reverse('api-v3:search:simplemodel-export')
+        response = api_client.post(url, data={'sortby': 'name:desc'})
+
+        assert response.status_code == status.HTTP_200_OK
+        reader = DictReader(StringIO(response.getvalue().decode('utf-8-sig')))
+        assert [row['Name'] for row in reader] == sorted(names, reverse=True)
+
+    def test_async_export(self, es, local_memory_cache, monkeypatch):
+        """
+        Tests that an asynchronous export starts a task and returns a job that only the
+        requesting adviser can see.
+        """
+        mock_task = Mock()
+        monkeypatch.setattr('datahub.search.views.export_search_results', mock_task)
+        user = create_test_user(permission_codenames=['view_simplemodel'])
+        api_client = self.create_api_client(user=user)
+
+        url = reverse('api-v3:search:simplemodel-export')
+        response = api_client.post(f'{url}?async=1', data={'name': 'test'})
+
+        assert response.status_code == status.HTTP_202_ACCEPTED
+        job_id = response.json()['id']
+        task_kwargs = mock_task.apply_async.call_args[1]['kwargs']
+        assert task_kwargs['job_id'] == job_id
+        assert task_kwargs['search_app_name'] == SimpleModelSearchApp.name
+        assert task_kwargs['adviser_id'] == str(user.pk)
+        assert task_kwargs['args']['name'] == 'test'
+
+        job_url = reverse('api-v3:search:export-job', kwargs={'job_id': job_id})
+        job_response = api_client.get(job_url)
+
+        assert job_response.status_code == status.HTTP_200_OK
+        assert job_response.json() == {
+            'id': job_id,
+            'status': 'pending',
+            'num_results': None,
+            'download_url': None,
+        }
+
+        other_api_client = self.create_api_client(user=create_test_user())
+        assert other_api_client.get(job_url).status_code == status.HTTP_404_NOT_FOUND
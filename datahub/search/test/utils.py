@@ -1,5 +1,8 @@
 from unittest.mock import Mock
 
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
 
 def create_mock_search_app(
         current_mapping_hash='mapping-hash',
@@ -25,6 +28,30 @@ def create_mock_search_app(
     return mock
 
 
+def create_consuming_bulk_mock():
+    """
+    Creates a mock version of parallel_bulk() that consumes the actions passed to it.
+
+    (This is needed as actions are normally passed as a generator.)
+
+    The actions passed in each call are recorded in the consumed_actions attribute. All actions
+    are treated as successful (and passed to success_callback, if specified).
+    """
+    consumed_actions = []
+
+    def _consume_actions(actions, success_callback=None, **kwargs):
+        actions = list(actions)
+        consumed_actions.append(actions)
+
+        if success_callback:
+            for action in actions:
+                success_callback({'index': {'_index': action['_index'], '_id': action['_id']}})
+
+        return len(actions), []
+
+    return Mock(side_effect=_consume_actions, consumed_actions=consumed_actions)
+
+
 def doc_exists(es_client, search_app, id_):
     """Checks if a document exists for a specified search app."""
     return es_client.exists(
@@ -39,6 +66,20 @@ def doc_count(es_client, search_app):
     return response['count']
 
 
+def count_queries_for_es_documents(search_app, pks):
+    """
+    Returns the number of database queries made when converting the specified objects to
+    Elasticsearch documents (including the query to fetch the objects themselves).
+
+    This can be compared for batches of different sizes to check that serialisation does not
+    make queries per object.
+    """
+    queryset = search_app.queryset.filter(pk__in=pks)
+    with CaptureQueriesContext(connection) as context:
+        list(search_app.es_model.db_objects_to_es_documents(queryset))
+    return len(context.captured_queries)
+
+
 def _create_mock_es_model(
         current_mapping_hash,
         target_mapping_hash,
@@ -56,9 +97,15 @@ def _create_mock_es_model(
     return Mock(
         __name__='es-model',
         create_index=Mock(),
+        get_app_name=Mock(return_value='test-app'),
         db_objects_to_es_documents=Mock(side_effect=db_objects_to_es_documents),
         is_migration_needed=Mock(return_value=current_mapping_hash != target_mapping_hash),
-        was_migration_started=Mock(return_value=len(read_indices) > 1),
+        was_migration_started=Mock(
+            return_value=len(read_indices) != 1 or write_index not in read_indices,
+        ),
+        was_reindex_migration_started=Mock(
+            return_value=len(read_indices) == 1 and write_index not in read_indices,
+        ),
         get_current_mapping_hash=Mock(return_value=current_mapping_hash),
         get_target_mapping_hash=Mock(return_value=target_mapping_hash),
         get_read_and_write_indices=Mock(return_value=(set(read_indices), write_index)),
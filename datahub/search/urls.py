@@ -3,7 +3,14 @@
 from django.urls import path
 
 from datahub.core.utils import join_truthy_strings
-from datahub.search.views import SearchBasicAPIView, v3_view_registry, v4_view_registry, ViewType
+from datahub.search.views import (
+    SearchBasicAPIView,
+    SearchBatchAPIView,
+    SearchExportJobAPIView,
+    v3_view_registry,
+    v4_view_registry,
+    ViewType,
+)
 
 
 def _construct_path(search_app, view_type, view_cls, suffix=None):
@@ -27,6 +34,12 @@ def _construct_path(search_app, view_type, view_cls, suffix=None):
 
 urls_v3 = [
     path('search', SearchBasicAPIView.as_view(), name='basic'),
+    path('search/batch', SearchBatchAPIView.as_view(), name='batch'),
+    path(
+        'search/export-jobs/<uuid:job_id>',
+        SearchExportJobAPIView.as_view(),
+        name='export-job',
+    ),
     *[
         _construct_path(search_app, view_type, view_cls, suffix=name)
         for (search_app, view_type, name), view_cls in v3_view_registry.items()
@@ -38,6 +51,13 @@ urls_v3 = [
 
 # TODO add global search when all search apps are v4 ready
 urls_v4 = [
-    _construct_path(search_app, view_type, view_cls, suffix=name)
-    for (search_app, view_type, name), view_cls in v4_view_registry.items()
+    path(
+        'search/export-jobs/<uuid:job_id>',
+        SearchExportJobAPIView.as_view(),
+        name='export-job',
+    ),
+    *[
+        _construct_path(search_app, view_type, view_cls, suffix=name)
+        for (search_app, view_type, name), view_cls in v4_view_registry.items()
+    ],
 ]
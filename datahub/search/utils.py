@@ -1,4 +1,7 @@
 import json
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+from binascii import Error as BinasciiError
+from functools import lru_cache
 from typing import NamedTuple
 
 
@@ -34,6 +37,42 @@ def get_model_field_names(es_model):
     return get_model_fields(es_model).keys()
 
 
+@lru_cache(maxsize=None)
+def get_model_term_filter_field_paths(es_model):
+    """
+    Gets the paths of the fields of an ES model that are not analysed, and so can be filtered
+    using term queries.
+
+    These are keyword fields without a normaliser (e.g. IDs) and boolean fields (including
+    sub-fields of object fields and multi-fields such as name.keyword). Fields in nested
+    objects are excluded, as they require nested queries.
+    """
+    field_mappings = {
+        field_name: field.to_dict()
+        for field_name, field in get_model_fields(es_model).items()
+    }
+    return frozenset(_iter_term_filter_field_paths(field_mappings))
+
+
+def _iter_term_filter_field_paths(field_mappings, prefix=''):
+    for field_name, field_mapping in field_mappings.items():
+        path = f'{prefix}{field_name}'
+        field_type = field_mapping.get('type', 'object')
+
+        is_unanalysed_keyword = field_type == 'keyword' and 'normalizer' not in field_mapping
+        if is_unanalysed_keyword or field_type == 'boolean':
+            yield path
+
+        if field_type == 'nested':
+            continue
+
+        for sub_field_key in ('properties', 'fields'):
+            yield from _iter_term_filter_field_paths(
+                field_mapping.get(sub_field_key, {}),
+                prefix=f'{path}.',
+            )
+
+
 def get_model_non_mapped_field_names(es_model):
     """Gets the names of fields that are not mapped or computed."""
     return (
@@ -44,6 +83,60 @@ def get_model_non_mapped_field_names(es_model):
     )
 
 
+def is_reindex_migration_state(read_indices, write_index):
+    """
+    Returns whether aliases are in the state used during a migration using the Elasticsearch
+    reindex API (where the read alias references only the old index and the write alias
+    references only the new index).
+    """
+    return len(read_indices) == 1 and write_index not in read_indices
+
+
+def get_dual_write_indices(read_indices, write_index):
+    """
+    Gets the indices, other than the write index, that documents should also be written to.
+
+    This is only the case during a migration using the Elasticsearch reindex API, when the
+    old index (which searches still use) must be kept up to date as well as the new index.
+    """
+    if is_reindex_migration_state(read_indices, write_index):
+        return set(read_indices)
+    return set()
+
+
 def serialise_mapping(mapping_dict):
     """Serialises a mapping as JSON."""
     return json.dumps(mapping_dict, sort_keys=True, separators=(',', ':')).encode('utf-8')
+
+
+def encode_search_cursor(sort_values):
+    """
+    Encodes the sort values of the last hit of a page of search results as an opaque cursor.
+
+    The cursor can be decoded using decode_search_cursor() and passed to Elasticsearch as the
+    search_after parameter to get the next page of results.
+    """
+    serialised_sort_values = json.dumps(list(sort_values), separators=(',', ':'))
+    return urlsafe_b64encode(serialised_sort_values.encode('utf-8')).decode('ascii')
+
+
+def decode_search_cursor(cursor):
+    """
+    Decodes a cursor created by encode_search_cursor() into a list of sort values.
+
+    :raises ValueError: if the cursor is not valid
+    """
+    try:
+        sort_values = json.loads(urlsafe_b64decode(cursor.encode('ascii')))
+    except (BinasciiError, ValueError) as exc:
+        raise ValueError('Invalid search cursor') from exc
+
+    is_valid = (
+        isinstance(sort_values, list)
+        and sort_values
+        and all(isinstance(value, (str, int, float, type(None))) for value in sort_values)
+    )
+    if not is_valid:
+        raise ValueError('Invalid search cursor')
+
+    return sort_values
@@ -1,34 +1,59 @@
 """Search views."""
+import json
 from collections import namedtuple
 from enum import auto, Enum
-from itertools import islice
+from gzip import GzipFile
 
 from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db.models import F
 from django.utils.text import capfirst
 from django.utils.timezone import now
+from elasticsearch_dsl import Search
+from rest_framework import status
+from rest_framework.exceptions import NotFound, PermissionDenied, ValidationError
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 from rest_framework.schemas.openapi import AutoSchema
 from rest_framework.views import APIView
 
-from datahub.core.csv import create_csv_response
+from datahub.core.csv import create_csv_response, csv_iterator
+from datahub.core.utils import slice_iterable_into_chunks
 from datahub.search.apps import get_global_search_apps_as_mapping
-from datahub.search.execute_query import execute_search_query
-from datahub.search.permissions import (
-    has_permissions_for_app,
-    SearchAndExportPermissions,
-    SearchPermissions,
+from datahub.search.execute_query import execute_multi_search_query, execute_search_query
+from datahub.search.export_jobs import create_export_job, ExportJobStatus, get_export_job
+from datahub.search.permission_cache import (
+    get_permission_filters,
+    get_search_app_access,
+    get_search_app_access_by_name,
 )
+from datahub.search.permissions import SearchAndExportPermissions, SearchPermissions
 from datahub.search.query_builder import (
     get_basic_search_query,
     get_search_by_entities_query,
+    get_search_page_size,
+    get_typeahead_query,
     limit_search_query,
 )
+from datahub.search.query_profile.profiling import (
+    enable_query_profiling,
+    record_search_query_profile,
+    should_profile_search_request,
+)
+from datahub.search.result_cache import (
+    cache_search_response,
+    cache_typeahead_response,
+    get_cached_search_response,
+    get_cached_typeahead_response,
+)
 from datahub.search.serializers import (
     BasicSearchQuerySerializer,
+    BatchSearchQuerySerializer,
     EntitySearchQuerySerializer,
+    TypeaheadQuerySerializer,
 )
-from datahub.search.utils import SearchOrdering
+from datahub.search.tasks import export_search_results
+from datahub.search.utils import encode_search_cursor, SearchOrdering
 from datahub.user_event_log.constants import UserEventType
 from datahub.user_event_log.utils import record_user_event
 
@@ -99,6 +124,11 @@ v3_view_registry = {}
 v4_view_registry = {}
 
 SHARED_FIELDS_TO_EXCLUDE = ('_document_type',)
+# The search app name used for profiles of global search queries
+GLOBAL_SEARCH_PROFILE_NAME = 'global'
+# Alias used for the primary key when fetching rows for search exports (so that it does not
+# clash with any of the exported fields)
+EXPORT_PK_ALIAS = 'search_export_pk'
 
 
 class SearchBasicAPIView(APIView):
@@ -132,9 +162,15 @@ class SearchBasicAPIView(APIView):
             offset=validated_params['offset'],
             limit=validated_params['limit'],
             fields_to_exclude=fields_to_exclude,
+            search_after=validated_params.get('cursor'),
         )
+        _validate_cursor_for_query(query, validated_params)
+
+        if should_profile_search_request(request):
+            query = enable_query_profiling(query)
 
         results = execute_search_query(query)
+        record_search_query_profile(GLOBAL_SEARCH_PROFILE_NAME, type(self), query, results)
 
         response = {
             'count': results.hits.total.value,
@@ -143,9 +179,39 @@ class SearchBasicAPIView(APIView):
                              for x in results.aggregations['count_by_type']['buckets']],
         }
 
+        if 'cursor' in validated_params:
+            response['next_cursor'] = _get_next_cursor(results, validated_params['limit'])
+
         return Response(data=response)
 
 
+def _validate_cursor_for_query(query, validated_data):
+    """
+    Checks that a cursor (if one was provided) has a value for each sort field of a query.
+
+    This would not be the case if, for example, sortby was changed between pages.
+    """
+    cursor = validated_data.get('cursor')
+    if cursor is None:
+        return
+
+    if len(cursor) != len(query.to_dict().get('sort', ())):
+        raise ValidationError({'cursor': ['Cursor is not valid for this query.']})
+
+
+def _get_next_cursor(results, limit):
+    """
+    Gets the cursor for the page of results following the current one.
+
+    None is returned if the current page is the last one.
+    """
+    hits = results.hits
+    if not hits or len(hits) < get_search_page_size(limit):
+        return None
+
+    return encode_search_cursor(hits[-1].meta.sort)
+
+
 def _get_global_search_permission_filters(request):
     """
     Gets the permissions filters that should be applied to each search entity (to enforce
@@ -153,12 +219,97 @@ def _get_global_search_permission_filters(request):
 
     Only global search entities that the user has access to are returned.
     """
-    for app in get_global_search_apps_as_mapping().values():
-        if not has_permissions_for_app(request.user, app):
+    access_by_name = get_search_app_access_by_name(request)
+
+    for app_name, app in get_global_search_apps_as_mapping().items():
+        access = access_by_name[app_name]
+        if not access.has_view_permission:
             continue
 
-        filter_args = app.get_permission_filters(request)
-        yield (app.es_model.get_app_name(), filter_args)
+        yield (app.es_model.get_app_name(), access.permission_filters)
+
+
+class SearchBatchAPIView(APIView):
+    """
+    Performs several entity searches, and gets the global search counts by entity, in one
+    request.
+
+    The queries are the same as those of the entity search views (the v4 view is used for
+    search apps that have one, and the v3 view otherwise), and are sent to Elasticsearch
+    together using the multi-search API.
+    """
+
+    permission_classes = (IsAuthenticated,)
+
+    http_method_names = ('post',)
+    schema = SearchStubSchema()
+
+    def post(self, request, format=None):
+        """Performs the searches."""
+        serializer = BatchSearchQuerySerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        validated_data = serializer.validated_data
+
+        global_search_apps = get_global_search_apps_as_mapping()
+        entity_searches = [
+            self._get_entity_search(
+                request,
+                global_search_apps[app_name],
+                {**entity_data, 'original_query': validated_data['term']},
+            )
+            for app_name, entity_data in validated_data['entities'].items()
+        ]
+
+        # Only the aggregation is needed from the global search query (so no hits are
+        # requested and the entity used for its post-filter is irrelevant)
+        count_query = get_basic_search_query(
+            entity=entity_searches[0].view.search_app.es_model,
+            term=validated_data['term'],
+            permission_filters_by_entity=dict(_get_global_search_permission_filters(request)),
+            limit=0,
+        )
+
+        count_results, *entity_results = execute_multi_search_query(
+            [count_query, *[entity_search.query for entity_search in entity_searches]],
+        )
+
+        response = {
+            'aggregations': [
+                {'count': x['doc_count'], 'entity': x['key']}
+                for x in count_results.aggregations['count_by_type']['buckets']
+            ],
+            'results': {
+                entity_search.view.search_app.name: entity_search.view.get_response_data(
+                    results,
+                    entity_search.validated_data,
+                )
+                for entity_search, results in zip(entity_searches, entity_results)
+            },
+        }
+
+        return Response(data=response)
+
+    def _get_entity_search(self, request, search_app, data):
+        if not get_search_app_access(request, search_app).has_view_permission:
+            raise PermissionDenied()
+
+        view = _get_entity_search_view_cls(search_app)()
+
+        try:
+            validated_data = view.validate_data(data)
+            query = view.get_limited_query(request, validated_data)
+        except ValidationError as exc:
+            raise ValidationError({'entities': {search_app.name: exc.detail}})
+
+        return _EntitySearch(view, validated_data, query)
+
+
+_EntitySearch = namedtuple('_EntitySearch', ('view', 'validated_data', 'query'))
+
+
+def _get_entity_search_view_cls(search_app):
+    key = (search_app, ViewType.default, None)
+    return v4_view_registry.get(key) or v3_view_registry[key]
 
 
 class SearchAPIView(APIView):
@@ -207,7 +358,7 @@ class SearchAPIView(APIView):
         """Gets a filtered Elasticsearch query for the provided search parameters."""
         filter_data = self._get_filter_data(validated_data)
         entities = self.get_entities()
-        permission_filters = self.search_app.get_permission_filters(request)
+        permission_filters = get_permission_filters(request, self.search_app)
         ordering = _map_es_ordering(validated_data['sortby'], self.es_sort_by_remappings)
 
         fields_to_exclude = (
@@ -237,24 +388,47 @@ class SearchAPIView(APIView):
                 data[legacy_query_param] = request.query_params[legacy_query_param]
 
         validated_data = self.validate_data(data)
+        limited_query = self.get_limited_query(request, validated_data)
+
+        if should_profile_search_request(request):
+            limited_query = enable_query_profiling(limited_query)
+
+        entities = self.get_entities()
+        cached_response = get_cached_search_response(type(self), entities, limited_query)
+        if cached_response is not None:
+            return Response(data=cached_response)
+
+        results = execute_search_query(limited_query)
+        record_search_query_profile(self.search_app.name, type(self), limited_query, results)
+        response = self.get_response_data(results, validated_data)
+        cache_search_response(type(self), entities, limited_query, response)
+
+        return Response(data=response)
+
+    def get_limited_query(self, request, validated_data):
+        """Gets the Elasticsearch query for the requested page of results."""
         query = self.get_base_query(request, validated_data)
 
         limited_query = limit_search_query(
             query,
             offset=validated_data['offset'],
             limit=validated_data['limit'],
+            search_after=validated_data.get('cursor'),
         )
+        _validate_cursor_for_query(limited_query, validated_data)
+        return limited_query
 
-        results = execute_search_query(limited_query)
-
+    def get_response_data(self, results, validated_data):
+        """Gets the response data for the results of a query from get_limited_query()."""
         response = {
             'count': results.hits.total.value,
             'results': [x.to_dict() for x in results.hits],
         }
 
-        response = self.enhance_response(results, response)
+        if 'cursor' in validated_data:
+            response['next_cursor'] = _get_next_cursor(results, validated_data['limit'])
 
-        return Response(data=response)
+        return self.enhance_response(results, response)
 
     def enhance_response(self, results, response):
         """Placeholder for a method to enhance the response with custom data."""
@@ -266,32 +440,44 @@ class SearchAPIView(APIView):
 
 
 class SearchExportAPIView(SearchAPIView):
-    """Returns CSV file with all search results."""
+    """
+    Returns CSV file with all search results.
+
+    The CSV file is streamed: document IDs are read from Elasticsearch using the scroll API and
+    the corresponding rows are fetched from the database in chunks, so exports of any size
+    use a bounded amount of memory.
+
+    If the async=1 query parameter is specified, the export is instead performed in a Celery
+    task (see datahub.search.export_jobs) and the ID of the export job is returned.
+    """
+
+    ASYNC_PARAM = 'async'
 
     permission_classes = (SearchAndExportPermissions,)
     queryset = None
     field_titles = None
-    db_sort_by_remappings = {}
 
     def post(self, request, format=None):
         """Performs search and returns CSV file."""
         validated_data = self.validate_data(request.data)
 
-        es_query = self._get_es_query(request, validated_data)
-        ids = tuple(self._get_ids(es_query))
-        db_queryset = self._get_rows(ids, validated_data['sortby'])
-        base_filename = self._get_base_filename()
+        es_query = self._make_es_query_scannable(
+            self.get_base_query(request, validated_data),
+        )
 
-        user_event_data = {
-            'num_results': len(ids),
-            'args': validated_data,
-        }
+        if request.query_params.get(self.ASYNC_PARAM, '0').strip() == '1':
+            return self._start_export_job(request, es_query, validated_data)
 
-        record_user_event(request, UserEventType.SEARCH_EXPORT, data=user_event_data)
+        rows = self._record_export_after_rows(
+            request,
+            self._get_rows(self._get_ids(es_query)),
+            validated_data,
+        )
+        base_filename = self.get_base_filename()
 
-        return create_csv_response(db_queryset, self.field_titles, base_filename)
+        return create_csv_response(rows, self.field_titles, base_filename)
 
-    def _get_base_filename(self):
+    def get_base_filename(self):
         """Gets the filename (without the .csv suffix) for the CSV file download."""
         filename_parts = [
             'Data Hub',
@@ -300,21 +486,85 @@ class SearchExportAPIView(SearchAPIView):
         ]
         return ' - '.join(filename_parts)
 
-    def _get_ids(self, es_query):
+    def write_gzipped_csv(self, file, query):
+        """
+        Writes the results of a serialised Elasticsearch query to a file as gzip-compressed CSV.
+
+        This is used by asynchronous exports. The number of results is returned.
+        """
+        indices = [entity.get_read_alias() for entity in self.get_entities()]
+        es_query = self._make_es_query_scannable(
+            Search(index=indices).update_from_dict(query),
+        )
+        num_results = 0
+
+        def _count_rows(rows):
+            nonlocal num_results
+
+            for row in rows:
+                num_results += 1
+                yield row
+
+        rows = _count_rows(self._get_rows(self._get_ids(es_query)))
+
+        with GzipFile(fileobj=file, mode='wb') as gzip_file:
+            for data in csv_iterator(rows, self.field_titles):
+                gzip_file.write(data)
+
+        return num_results
+
+    def _start_export_job(self, request, es_query, validated_data):
+        job_id = create_export_job(request.user)
+        view_cls = type(self)
+
+        export_search_results.apply_async(
+            kwargs={
+                'job_id': job_id,
+                'view_path': f'{view_cls.__module__}.{view_cls.__qualname__}',
+                'search_app_name': self.search_app.name,
+                'query': es_query.to_dict(),
+                'adviser_id': str(request.user.pk),
+                'api_url_path': request.path,
+                # Converts values such as dates to JSON-compatible values
+                'args': json.loads(json.dumps(validated_data, cls=DjangoJSONEncoder)),
+            },
+        )
+
+        return Response(
+            data={
+                'id': job_id,
+                'status': ExportJobStatus.pending,
+            },
+            status=status.HTTP_202_ACCEPTED,
+        )
+
+    def _record_export_after_rows(self, request, rows, validated_data):
         """
-        Gets the document IDs from an Elasticsearch query using the scroll API.
+        Yields the rows being exported and then records a user event for the export.
 
-        The number of IDs returned is limited by settings.SEARCH_EXPORT_MAX_RESULTS.
+        The event is recorded once the rows have been streamed so that it contains the number of
+        rows actually written (as for asynchronous exports).
         """
-        for hit in islice(es_query.scan(), settings.SEARCH_EXPORT_MAX_RESULTS):
+        num_results = 0
+
+        for row in rows:
+            num_results += 1
+            yield row
+
+        user_event_data = {
+            'num_results': num_results,
+            'args': validated_data,
+        }
+
+        record_user_event(request, UserEventType.SEARCH_EXPORT, data=user_event_data)
+
+    def _get_ids(self, es_query):
+        """Gets the document IDs from an Elasticsearch query using the scroll API."""
+        for hit in es_query.scan():
             yield hit.meta.id
 
-    def _get_es_query(self, request, validated_data):
-        """Gets a scannable Elasticsearch query for the current request."""
-        return self.get_base_query(
-            request,
-            validated_data,
-        ).source(
+    def _make_es_query_scannable(self, es_query):
+        return es_query.source(
             # Stops _source from being returned in the responses
             fields=False,
         ).params(
@@ -324,42 +574,112 @@ class SearchExportAPIView(SearchAPIView):
             size=settings.SEARCH_EXPORT_SCROLL_CHUNK_SIZE,
         )
 
-    def _get_rows(self, ids, search_ordering):
+    def _get_rows(self, ids):
         """
-        Returns an iterable using QuerySet.iterator() over the search results.
+        Returns an iterator over the rows for the search results.
 
-        The search sort-by value is translated to a value compatible with the Django ORM and
-        applied to the query set to preserve the original sort order.
+        The rows are fetched from the database in chunks of
+        settings.SEARCH_EXPORT_SCROLL_CHUNK_SIZE IDs, and each chunk is put in the same order
+        as the search results (so that the sort order that the user specified is kept).
 
-        At the moment, all rows are fetched in one query (using a server-side cursor) as
-        settings.SEARCH_EXPORT_MAX_RESULTS is set to a (relatively) low value.
+        Objects that are in the search results but no longer exist in the database are
+        skipped.
         """
-        db_ordering = self._translate_search_ordering_to_django_ordering(search_ordering)
+        for id_chunk in slice_iterable_into_chunks(ids, settings.SEARCH_EXPORT_SCROLL_CHUNK_SIZE):
+            rows = self.queryset.filter(
+                pk__in=id_chunk,
+            ).values(
+                *self._get_db_field_names(),
+                **{EXPORT_PK_ALIAS: F('pk')},
+            )
+            rows_by_id = {str(row.pop(EXPORT_PK_ALIAS)): row for row in rows}
 
-        return self.queryset.filter(
-            pk__in=ids,
-        ).order_by(
-            *db_ordering,
-        ).values(
-            *self.field_titles.keys(),
-        ).iterator()
+            for id_ in id_chunk:
+                if id_ in rows_by_id:
+                    yield rows_by_id[id_]
 
-    def _translate_search_ordering_to_django_ordering(self, ordering):
+    def _get_db_field_names(self):
+        """Gets the names of the fields to fetch from the database for each row."""
+        return self.field_titles.keys()
+
+
+class SearchExportJobAPIView(APIView):
+    """Returns the status of an asynchronous search export job."""
+
+    permission_classes = (IsAuthenticated,)
+    http_method_names = ('get',)
+
+    def get(self, request, job_id, format=None):
         """
-        Converts a sort-by value as used in the search API to a tuple of values that can be
-        passed to QuerySet.order_by().
+        Gets the status of an export job.
 
-        Note that this relies on the same field names having been used; if they differ then you
-        should manually specify a remapping in the db_sort_by_remappings class attribute.
+        Only the adviser that started the export can access it.
         """
-        if not ordering:
-            return ()
+        job = get_export_job(str(job_id))
+
+        if job is None or job['adviser_id'] != str(request.user.pk):
+            raise NotFound()
+
+        return Response(
+            data={
+                'id': job['id'],
+                'status': job['status'],
+                'num_results': job['num_results'],
+                'download_url': job['download_url'],
+            },
+        )
+
+
+class SearchTypeaheadAPIView(APIView):
+    """
+    Typeahead (search-as-you-type) view for a search app.
 
-        auto_translated_field = ordering.field.replace('.', '__')
-        db_field = self.db_sort_by_remappings.get(ordering.field, auto_translated_field)
-        prefix = '-' if ordering.is_descending else ''
+    The term is matched against the search_as_you_type fields in typeahead_fields (see
+    get_typeahead_query()), and only the fields in fields_to_include are returned. Responses
+    are cached for each (normalised) term for a short time (see
+    get_cached_typeahead_response()).
+    """
+
+    schema = SearchStubSchema()
 
-        return f'{prefix}{db_field}', 'pk'
+    search_app = None
+    permission_classes = (SearchPermissions,)
+    serializer_class = TypeaheadQuerySerializer
+    typeahead_fields = ()
+    fields_to_include = ('id', 'name')
+
+    http_method_names = ('get',)
+
+    def get(self, request, format=None):
+        """Performs a typeahead search."""
+        serializer = self.serializer_class(data=request.query_params)
+        serializer.is_valid(raise_exception=True)
+        validated_params = serializer.validated_data
+
+        query = get_typeahead_query(
+            self.search_app.es_model,
+            validated_params['term'],
+            self.typeahead_fields,
+            permission_filters=get_permission_filters(request, self.search_app),
+            fields_to_include=self.fields_to_include,
+            limit=validated_params['limit'],
+        )
+
+        cached_response = get_cached_typeahead_response(self.search_app.name, query)
+        if cached_response is not None:
+            return Response(data=cached_response)
+
+        results = execute_search_query(query)
+        response = {
+            'results': [hit.to_dict() for hit in results.hits],
+        }
+        cache_typeahead_response(self.search_app.name, query, response)
+
+        return Response(data=response)
+
+    def get_serializer(self):
+        """Return query serializer for use with OpenAPI documentation."""
+        return self.serializer_class()
 
 
 class ViewType(Enum):